@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Bu betik, derlenmiş (önbellekli) prompt oluşturmayı eski, her istekte tüm
+# `_build_*` metotlarını çalıştıran oluşturucu ile karşılaştıran bir mikro
+# kıyaslamadır. Veritabanı bağlantısı gerektirmez.
+#
+# Kullanım:
+#   python -m benchmarks.bench_prompt_build [--iterations 2000] [--repeat 5]
+#
+# İçindekiler:
+# 1.0 Örnek Veriler: Ayar kombinasyonları ve örnek haber metni.
+# 2.0 Oluşturucular: Eski oluşturucu ve derlenmiş oluşturucu.
+# 3.0 Ölçüm: Her oluşturucu için istek başına süreyi ölçer.
+# 4.0 Ana Yürütme
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.prompt_service import PromptService, clear_compiled_prompt_cache
+
+# --- 1.0 Örnek Veriler ---
+
+SETTING_COMBINATIONS = [
+    {},
+    {'targetCategory': 'auto', 'titleCityInfo': 'False', 'tagCount': '5', 'outputFormat': 'json'},
+    {'targetCategory': 'ekonomi', 'titleCityInfo': 'True', 'tagCount': '7', 'newsType': 'social_media'},
+    {'targetCategory': 'spor', 'removeCompanyInfo': 'False', 'removePlateInfo': 'False', 'tagCount': '3'},
+    {'targetCategory': 'auto', 'customInstructions': 'Rakamları yazıyla değil rakamla yaz. Kaynak ajans adını belirtme.'},
+]
+
+SAMPLE_NEWS = (
+    "İstanbul'un Kadıköy ilçesinde sabah saatlerinde meydana gelen trafik kazasında 34 ABC 123 plakalı "
+    "otomobil ile XYZ Lojistik A.Ş.'ye ait kamyonet çarpıştı. Kazada yaralanan 2 kişi olay yerine gelen "
+    "sağlık ekiplerince yakındaki hastaneye kaldırıldı. Polis ekipleri kazayla ilgili inceleme başlattı. "
+) * 8
+
+
+# --- 2.0 Oluşturucular ---
+
+def build_legacy(service, config_id, user_settings, news_text):
+    """Derleme öncesi oluşturucu: her istekte tüm bölümleri yeniden üretir."""
+    prompt_parts = [
+        service._build_task_definition(),
+        service._build_writing_rules(user_settings),
+        service._build_output_requirements_modular(user_settings),
+        service._build_category_list(user_settings),
+        service._build_output_format(user_settings),
+        service._build_custom_instructions(user_settings),
+        service._build_news_content(news_text),
+        service._build_final_instruction()
+    ]
+    return '\n\n'.join(filter(None, (part.strip() for part in prompt_parts)))
+
+
+def build_compiled_cold(service, config_id, user_settings, news_text):
+    """Her çağrıda önbelleği boşaltarak derleme maliyetini de ölçer."""
+    clear_compiled_prompt_cache()
+    return service.build_complete_prompt(config_id, user_settings, news_text, compact=False)
+
+
+def build_compiled_warm(service, config_id, user_settings, news_text):
+    """Önek/sonek önbellekteyken yalnızca birleştirme maliyetini ölçer."""
+    return service.build_complete_prompt(config_id, user_settings, news_text, compact=False)
+
+
+# --- 3.0 Ölçüm ---
+
+def measure(builder, service, iterations, repeat):
+    """Bir oluşturucunun istek başına ortalama süresini (mikrosaniye) `repeat` tekrar için döndürür."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for index in range(iterations):
+            settings = SETTING_COMBINATIONS[index % len(SETTING_COMBINATIONS)]
+            builder(service, 1, settings, SAMPLE_NEWS)
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return samples
+
+
+# --- 4.0 Ana Yürütme ---
+
+def main():
+    parser = argparse.ArgumentParser(description='Prompt oluşturma mikro kıyaslaması')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    service = PromptService()
+
+    # Derlenmiş oluşturucu eski oluşturucuyla birebir aynı çıktıyı vermeli
+    for settings in SETTING_COMBINATIONS:
+        for news_text in (SAMPLE_NEWS, ''):
+            if build_legacy(service, 1, settings, news_text) != service.build_complete_prompt(1, settings, news_text, compact=False):
+                print(f"HATA: Çıktılar farklı (ayarlar: {settings}, metin boş: {not news_text})")
+                return 1
+
+    results = {
+        'eski (her istekte oluştur)': measure(build_legacy, service, args.iterations, args.repeat),
+        'derlenmiş (soğuk önbellek)': measure(build_compiled_cold, service, args.iterations, args.repeat),
+        'derlenmiş (sıcak önbellek)': measure(build_compiled_warm, service, args.iterations, args.repeat),
+    }
+
+    baseline = statistics.median(results['eski (her istekte oluştur)'])
+    print(f"{'Oluşturucu':<32}{'medyan µs/istek':>18}{'en iyi':>12}{'hızlanma':>12}")
+    for name, samples in results.items():
+        median = statistics.median(samples)
+        print(f"{name:<32}{median:>18.2f}{min(samples):>12.2f}{baseline / median:>11.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
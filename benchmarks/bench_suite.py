@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+#
+# Bu betik, prompt oluşturma ve veri erişimi sıcak yolları için tekrarlanabilir
+# bir mikro kıyaslama paketidir. Ölçümler, uygulamanın gömülü SQLite arka
+# ucuyla (DB_BACKEND=sqlite) tohumlanmış bir veritabanı (benchmarks/standin_db.py)
+# üzerinde çalışır; MySQL sunucusu gerekmez.
+#
+# Kapsanan yollar:
+#   - PromptService.build_complete_prompt (her ayar kombinasyonu, sıcak ve soğuk önbellek)
+#   - PromptService.get_full_config_data (önbellekten ve veritabanından yükleme)
+#   - Geçmiş sayfası (ilk sayfa ve imleçle derin sayfa) ile istatistik sorguları
+#   - Büyük geçmiş yanıtlarının JSON'a dönüştürülmesi
+#
+# Sonuçlar JSON olarak yazılır. compare komutu iki sonucu karşılaştırır ve
+# medyanı eşik değerinden fazla kötüleşen ölçümleri regresyon olarak işaretler
+# (regresyon varsa çıkış kodu 1 olur).
+#
+# Kullanım:
+#   python -m benchmarks.bench_suite run [--output sonuc.json] [--save-baseline] [--repeat 5] [--scale 1.0]
+#                                        [--filter prompt] [--users 20] [--history 1000] [--seed 42]
+#   python -m benchmarks.bench_suite compare [--baseline taban.json] [sonuc.json] [--threshold 10]
+#
+# İçindekiler:
+# 1.0 Ölçüm: Tek bir kıyaslamanın çalıştırılması ve özetlenmesi.
+# 2.0 Kıyaslamalar: Ölçülen fonksiyonların tanımları.
+# 3.0 Çalıştırma: Veritabanının hazırlanması ve sonuçların yazılması.
+# 4.0 Karşılaştırma: Taban çizgisine göre regresyonların işaretlenmesi.
+# 5.0 Ana Yürütme
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Kıyaslama sırasında gerçek modele bağlanılmaz
+os.environ.setdefault('MODEL_BACKEND', 'fake')
+
+from benchmarks import standin_db
+from benchmarks.bench_prompt_build import SAMPLE_NEWS, SETTING_COMBINATIONS
+from benchmarks.prompt_compaction_report import DEFAULT_CORPUS, load_corpus
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, 'latest.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'baseline.json')
+RESULT_FORMAT = 1
+
+
+# --- 1.0 Ölçüm ---
+
+def measure(func, iterations, repeat, warmup=None):
+    """
+    `func`'ı önce ısınma için, sonra `repeat` tur boyunca `iterations` kez
+    çalıştırır. Her tur için çağrı başına ortalama süreyi (mikrosaniye) döndürür.
+    """
+    for _ in range(warmup if warmup is not None else max(1, iterations // 10)):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return samples
+
+
+def summarize(samples, iterations):
+    median = statistics.median(samples)
+    return {
+        'iterations': iterations,
+        'repeat': len(samples),
+        'median_us': round(median, 3),
+        'min_us': round(min(samples), 3),
+        'mean_us': round(statistics.mean(samples), 3),
+        'stdev_us': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        'ops_per_sec': round(1e6 / median, 1) if median else None,
+    }
+
+
+# --- 2.0 Kıyaslamalar ---
+
+def define_benchmarks(user_id, history_per_user):
+    """
+    (ad, fonksiyon, varsayılan tekrar sayısı) üçlülerini döndürür. Servisler
+    burada, stand-in veritabanı kurulduktan sonra içe aktarılır.
+    """
+    from services.ai_service import AIService
+    from services.config_cache import get_config_cache
+    from services.prompt_service import PromptService, clear_compiled_prompt_cache
+    from services import user_stats
+    from database.connection import DatabaseConnection
+
+    prompt_service = PromptService()
+    ai_service = AIService(prompt_service=prompt_service)
+    config_id = prompt_service.get_active_config()['id']
+
+    benchmarks = []
+    for index, settings in enumerate(SETTING_COMBINATIONS):
+        benchmarks.append((
+            f'prompt.build_warm[{index}]',
+            lambda settings=settings: prompt_service.build_complete_prompt(config_id, settings, SAMPLE_NEWS, compact=False),
+            5000,
+        ))
+
+    def build_cold():
+        clear_compiled_prompt_cache()
+        prompt_service.build_complete_prompt(config_id, SETTING_COMBINATIONS[1], SAMPLE_NEWS, compact=False)
+
+    def build_compact_cold():
+        clear_compiled_prompt_cache()
+        prompt_service.build_complete_prompt(config_id, SETTING_COMBINATIONS[1], SAMPLE_NEWS, compact=True)
+
+    def config_load():
+        get_config_cache().invalidate()
+        prompt_service.get_full_config_data(config_id)
+
+    benchmarks += [
+        ('prompt.build_cold', build_cold, 1000),
+        ('prompt.build_compact_cold', build_compact_cold, 1000),
+        ('config.full_data_cached', lambda: prompt_service.get_full_config_data(config_id), 20000),
+        ('config.full_data_load', config_load, 500),
+    ]
+
+    # Derin sayfa: geçmişin ortasındaki bir sayfanın imleci önceden bulunur
+    cursor = None
+    for _ in range(min(20, max(1, history_per_user // 100))):
+        _, cursor = ai_service.get_processing_history(user_id, 50, cursor)
+    deep_cursor = cursor
+    first_page, _ = ai_service.get_processing_history(user_id, 1)
+    detail_id = first_page[0]['id'] if first_page else 0
+
+    aggregate_query = user_stats.AGGREGATE_QUERY.format(table='processing_history', where='AND user_id = %s')
+
+    def stats_aggregate():
+        with DatabaseConnection() as db:
+            db.execute_query(aggregate_query, (user_id,), fetch_all=True)
+
+    benchmarks += [
+        ('history.first_page_50', lambda: ai_service.get_processing_history(user_id, 50), 500),
+        ('history.deep_page_50', lambda: ai_service.get_processing_history(user_id, 50, deep_cursor), 500),
+        ('history.page_500', lambda: ai_service.get_processing_history(user_id, 500), 50),
+        ('history.detail', lambda: ai_service.get_processing_detail(detail_id, user_id), 2000),
+        ('stats.counters', lambda: ai_service.get_user_statistics(user_id), 2000),
+        ('stats.aggregate', stats_aggregate, 100),
+    ]
+
+    for size in (50, 500):
+        rows, next_cursor = ai_service.get_processing_history(user_id, size)
+        payload = {'success': True, 'history': rows, 'next_cursor': next_cursor,
+                   'has_more': next_cursor is not None, 'limit': size}
+        benchmarks.append((
+            f'json.history_{size}',
+            # Flask'ın varsayılan JSON sağlayıcısıyla aynı ayarlar (jsonify)
+            lambda payload=payload: json.dumps(payload, ensure_ascii=True, sort_keys=True,
+                                               separators=(',', ':'), default=str),
+            200 if size == 500 else 2000,
+        ))
+    return benchmarks
+
+
+# --- 3.0 Çalıştırma ---
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(args):
+    corpus = load_corpus(DEFAULT_CORPUS)
+    with tempfile.TemporaryDirectory(prefix='bench-db-') as workdir:
+        db_path = os.path.join(workdir, 'bench.sqlite3')
+        dataset = standin_db.create_database(db_path, corpus, users=args.users,
+                                             history_per_user=args.history, seed=args.seed)
+        standin_db.install(db_path)
+
+        user_id = standin_db.user_ids(args.users)[0]
+        results = {}
+        for name, func, iterations in define_benchmarks(user_id, args.history):
+            if args.filter and args.filter not in name:
+                continue
+            iterations = max(1, int(iterations * args.scale))
+            results[name] = summarize(measure(func, iterations, args.repeat), iterations)
+            print(f"{name:<32}{results[name]['median_us']:>14.2f} µs{results[name]['stdev_us']:>12.2f}")
+
+    return {
+        'format': RESULT_FORMAT,
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dataset': dataset,
+            'repeat': args.repeat,
+            'scale': args.scale,
+        },
+        'benchmarks': results,
+    }
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# --- 4.0 Karşılaştırma ---
+
+def compare_results(baseline, current, threshold, min_delta_us):
+    """
+    Ortak kıyaslamaların medyanlarını karşılaştırır. Medyanı hem yüzde
+    `threshold`'dan hem de `min_delta_us` mikrosaniyeden fazla artanlar
+    regresyon sayılır.
+
+    Returns:
+        list: (ad, taban medyan, güncel medyan, değişim yüzdesi, durum) satırları.
+    """
+    rows = []
+    base, cur = baseline.get('benchmarks', {}), current.get('benchmarks', {})
+    for name in sorted(set(base) | set(cur)):
+        if name not in cur:
+            rows.append((name, base[name]['median_us'], None, None, 'kaldırıldı'))
+            continue
+        if name not in base:
+            rows.append((name, None, cur[name]['median_us'], None, 'yeni'))
+            continue
+        old, new = base[name]['median_us'], cur[name]['median_us']
+        change = 100.0 * (new / old - 1) if old else 0.0
+        if change > threshold and new - old > min_delta_us:
+            status = 'REGRESYON'
+        elif change < -threshold and old - new > min_delta_us:
+            status = 'iyileşme'
+        else:
+            status = 'aynı'
+        rows.append((name, old, new, change, status))
+    return rows
+
+
+def print_comparison(rows, baseline, current):
+    for label, data in (('Taban', baseline), ('Güncel', current)):
+        meta = data.get('meta', {})
+        print(f"{label}: {meta.get('created_at')} (rev {meta.get('git_revision')}, Python {meta.get('python')})")
+    if baseline.get('meta', {}).get('dataset') != current.get('meta', {}).get('dataset'):
+        print("Uyarı: Veri kümeleri farklı; sorgu ölçümleri doğrudan karşılaştırılamayabilir.")
+
+    print(f"\n{'Kıyaslama':<32}{'taban µs':>12}{'güncel µs':>12}{'değişim':>10}  durum")
+    for name, old, new, change, status in rows:
+        old_text = f"{old:.2f}" if old is not None else '-'
+        new_text = f"{new:.2f}" if new is not None else '-'
+        change_text = f"{change:+.1f}%" if change is not None else '-'
+        print(f"{name:<32}{old_text:>12}{new_text:>12}{change_text:>10}  {status}")
+
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"HATA: Sonuç dosyası okunamadı ({path}): {e}")
+        return None
+
+
+# --- 5.0 Ana Yürütme ---
+
+def main():
+    parser = argparse.ArgumentParser(description='Prompt ve veri erişimi mikro kıyaslama paketi')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Kıyaslamaları çalıştır ve sonucu JSON olarak yaz')
+    run_parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Sonuç dosyası')
+    run_parser.add_argument('--save-baseline', action='store_true', help='Sonucu taban çizgisi olarak da kaydet')
+    run_parser.add_argument('--repeat', type=int, default=5, help='Her kıyaslama için tur sayısı')
+    run_parser.add_argument('--scale', type=float, default=1.0, help='Tur başına çağrı sayısı çarpanı')
+    run_parser.add_argument('--filter', help='Yalnızca adında bu metin geçen kıyaslamaları çalıştır')
+    run_parser.add_argument('--users', type=int, default=20, help='Tohum verisindeki kullanıcı sayısı')
+    run_parser.add_argument('--history', type=int, default=1000, help='Kullanıcı başına geçmiş kaydı')
+    run_parser.add_argument('--seed', type=int, default=42)
+
+    compare_parser = commands.add_parser('compare', help='Sonucu taban çizgisiyle karşılaştır')
+    compare_parser.add_argument('current', nargs='?', default=DEFAULT_OUTPUT, help='Karşılaştırılacak sonuç dosyası')
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Taban çizgisi dosyası')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='Regresyon eşiği (yüzde)')
+    compare_parser.add_argument('--min-delta-us', type=float, default=0.5,
+                                help='Bu farktan (mikrosaniye) küçük değişimler yok sayılır')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        result = run_suite(args)
+        write_json(args.output, result)
+        print(f"\nSonuçlar yazıldı: {args.output}")
+        if args.save_baseline:
+            write_json(DEFAULT_BASELINE, result)
+            print(f"Taban çizgisi güncellendi: {DEFAULT_BASELINE}")
+        return 0
+
+    baseline, current = load_json(args.baseline), load_json(args.current)
+    if baseline is None or current is None:
+        return 2
+    rows = compare_results(baseline, current, args.threshold, args.min_delta_us)
+    print_comparison(rows, baseline, current)
+    regressions = [row[0] for row in rows if row[4] == 'REGRESYON']
+    if regressions:
+        print(f"\n{len(regressions)} regresyon bulundu (eşik: %{args.threshold}).")
+        return 1
+    print("\nRegresyon yok.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+#
+# Bu betik, haber işleme endpoint'lerini N eşzamanlı editörü taklit eden
+# thread'lerle yük altında çalıştırır ve verim (istek/sn), p50/p95/p99
+# gecikme, hata oranları ile istek başına veritabanı sorgu sayısını raporlar.
+#
+# --url verilmezse uygulama bu süreçte yerel bir HTTP sunucusunda başlatılır ve
+# model olarak taklit arka uç (MODEL_BACKEND=fake) kullanılır; böylece test
+# kota harcamadan ve ağa çıkmadan tek makinede çalışır. Taklit modelin gecikme
+# ve hata oranları FAKE_MODEL_* ortam değişkenleriyle ayarlanır. Veritabanı
+# sorgu sayıları /metrics çıktısından (test öncesi ve sonrası farkı) alınır.
+#
+# Kullanım:
+#   python -m benchmarks.load_test [--editors 10] [--duration 30] [--mode process|stream|mix]
+#                                  [--think-time 1.0] [--url http://127.0.0.1:5000] [--json rapor.json]
+#
+# İçindekiler:
+# 1.0 Sunucu: Uygulamanın yerel olarak başlatılması.
+# 2.0 Editörler: İstek gönderen eşzamanlı kullanıcılar.
+# 3.0 Metrikler: /metrics çıktısından sorgu ve model sayaçlarının okunması.
+# 4.0 Rapor: Sonuçların özetlenmesi ve yazdırılması.
+# 5.0 Ana Yürütme
+
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_prompt_build import SETTING_COMBINATIONS
+from benchmarks.prompt_compaction_report import DEFAULT_CORPUS, load_corpus, percentile
+
+PROCESS_PATH = '/api/v1/news/process'
+STREAM_PATH = '/api/v1/news/process/stream'
+MODES = ('process', 'stream')
+REQUEST_TIMEOUT = 180
+
+
+# --- 1.0 Sunucu ---
+
+def start_local_server(host='127.0.0.1', port=0):
+    """
+    Uygulamayı bu süreçte çok thread'li bir WSGI sunucusunda başlatır.
+    Ortamda aksi belirtilmedikçe taklit model kullanılır ve yarım kalan iş
+    kurtarma kapatılır.
+
+    Returns:
+        tuple: (temel URL, sunucu nesnesi)
+    """
+    os.environ.setdefault('MODEL_BACKEND', 'fake')
+    os.environ.setdefault('JOB_RECOVERY_ON_STARTUP', 'false')
+
+    from werkzeug.serving import make_server
+    from main import app
+
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='load-test-server', daemon=True).start()
+    return f"http://{host}:{server.server_port}", server
+
+
+# --- 2.0 Editörler ---
+
+class Editor(threading.Thread):
+    """
+    Kendi oturum çerezini taşıyan tek bir editör. Süre dolana kadar haber
+    gönderir, her isteğin sonucunu `results` listesine ekler ve istekler
+    arasında üstel dağılımlı bir düşünme süresi bekler.
+    """
+
+    def __init__(self, index, base_url, corpus, mode, deadline, think_time, unique, results):
+        super().__init__(name=f'editor-{index}', daemon=True)
+        self.index = index
+        self.base_url = base_url
+        self.corpus = corpus
+        self.mode = mode
+        self.deadline = deadline
+        self.think_time = think_time
+        self.unique = unique
+        self.results = results
+        self.rng = random.Random(index)
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def run(self):
+        sequence = 0
+        while time.monotonic() < self.deadline:
+            sequence += 1
+            news_text = self.rng.choice(self.corpus)
+            if self.unique:
+                # Sonuç önbelleğine düşmemek için her isteğin metni farklı olur
+                news_text = f"{news_text} (Yük testi {self.index}-{sequence})"
+            mode = self.rng.choice(MODES) if self.mode == 'mix' else self.mode
+            body = json.dumps({
+                'news_text': news_text,
+                'settings': self.rng.choice(SETTING_COMBINATIONS),
+            }).encode('utf-8')
+
+            if mode == 'stream':
+                result = self.send_stream(body)
+            else:
+                result = self.send_process(body)
+            result['mode'] = mode
+            self.results.append(result)
+
+            if self.think_time > 0:
+                time.sleep(min(self.rng.expovariate(1.0 / self.think_time), max(0.0, self.deadline - time.monotonic())))
+
+    def _post(self, path, body):
+        request = urllib.request.Request(
+            self.base_url + path, data=body, method='POST',
+            headers={'Content-Type': 'application/json'}
+        )
+        return self.opener.open(request, timeout=REQUEST_TIMEOUT)
+
+    def send_process(self, body):
+        """Senkron işleme isteği gönderir; durum kodu ve süreyi döndürür."""
+        started = time.perf_counter()
+        try:
+            with self._post(PROCESS_PATH, body) as response:
+                status = response.status
+                payload = json.loads(response.read() or b'{}')
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, {}
+        except Exception as e:
+            return {'status': type(e).__name__, 'ok': False, 'latency': time.perf_counter() - started}
+        return {
+            'status': status,
+            'ok': status == 200 and bool(payload.get('success')),
+            'latency': time.perf_counter() - started,
+        }
+
+    def send_stream(self, body):
+        """
+        Akışlı işleme isteği gönderir. İlk model parçasına kadar geçen süre
+        (ttfb) ve 'done'/'error' olayına kadar geçen toplam süre ölçülür.
+        """
+        started = time.perf_counter()
+        first_chunk = None
+        outcome = None
+        try:
+            with self._post(STREAM_PATH, body) as response:
+                status = response.status
+                event = None
+                for raw_line in response:
+                    line = raw_line.decode('utf-8').rstrip('\r\n')
+                    if line.startswith('event: '):
+                        event = line[len('event: '):]
+                        if event in ('chunk', 'field') and first_chunk is None:
+                            first_chunk = time.perf_counter() - started
+                        elif event in ('done', 'error'):
+                            outcome = event
+                    elif not line and outcome:
+                        break
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except Exception as e:
+            return {'status': type(e).__name__, 'ok': False, 'latency': time.perf_counter() - started}
+        return {
+            'status': status if outcome != 'error' else 'stream_error',
+            'ok': status == 200 and outcome == 'done',
+            'latency': time.perf_counter() - started,
+            'ttfb': first_chunk,
+        }
+
+
+# --- 3.0 Metrikler ---
+
+COUNTED_SERIES = {
+    'db_query_duration_seconds_count': 'db_queries',
+    'db_query_errors_total': 'db_errors',
+    'model_request_duration_seconds_count': 'model_calls',
+    'model_errors_total': 'model_errors',
+}
+
+
+def scrape_counters(base_url):
+    """
+    /metrics çıktısındaki sorgu ve model sayaçlarının tüm etiketler üzerinden
+    toplamını döndürür. Metrikler kapalıysa None döner.
+    """
+    try:
+        with urllib.request.urlopen(base_url + '/metrics', timeout=10) as response:
+            text = response.read().decode('utf-8')
+    except Exception as e:
+        print(f"Uyarı: /metrics okunamadı, sorgu sayıları raporlanmayacak: {e}")
+        return None
+
+    counters = dict.fromkeys(COUNTED_SERIES.values(), 0)
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        name = line.split('{', 1)[0].split(' ', 1)[0]
+        if name in COUNTED_SERIES:
+            counters[COUNTED_SERIES[name]] += float(line.rsplit(' ', 1)[1])
+    return counters
+
+
+# --- 4.0 Rapor ---
+
+def summarize(results, elapsed, before, after):
+    """Mod başına verim, gecikme ve hata özetini döndürür."""
+    summary = {'elapsed_seconds': round(elapsed, 2), 'requests': len(results), 'modes': {}}
+    for mode in MODES:
+        rows = [row for row in results if row['mode'] == mode]
+        if not rows:
+            continue
+        ok = [row['latency'] for row in rows if row['ok']]
+        statuses = {}
+        for row in rows:
+            if not row['ok']:
+                statuses[str(row['status'])] = statuses.get(str(row['status']), 0) + 1
+        entry = {
+            'requests': len(rows),
+            'succeeded': len(ok),
+            'error_rate': round(1 - len(ok) / len(rows), 4),
+            'errors_by_status': statuses,
+            'throughput_rps': round(len(ok) / elapsed, 2) if elapsed else None,
+            'latency_p50': percentile(ok, 0.50),
+            'latency_p95': percentile(ok, 0.95),
+            'latency_p99': percentile(ok, 0.99),
+        }
+        ttfb = [row['ttfb'] for row in rows if row['ok'] and row.get('ttfb') is not None]
+        if ttfb:
+            entry['ttfb_p50'] = percentile(ttfb, 0.50)
+            entry['ttfb_p95'] = percentile(ttfb, 0.95)
+        summary['modes'][mode] = entry
+
+    if before is not None and after is not None:
+        deltas = {key: int(after[key] - before[key]) for key in before}
+        deltas['db_queries_per_request'] = round(deltas['db_queries'] / len(results), 2) if results else None
+        summary['server'] = deltas
+    return summary
+
+
+def _seconds(value):
+    return f"{value * 1000:.0f} ms" if value is not None else '-'
+
+
+def print_report(summary):
+    print(f"Süre: {summary['elapsed_seconds']} sn, toplam istek: {summary['requests']}")
+    for mode, row in summary['modes'].items():
+        print(f"\n[{mode}] istek: {row['requests']}  başarılı: {row['succeeded']}  "
+              f"hata oranı: %{row['error_rate'] * 100:.2f}  verim: {row['throughput_rps']} istek/sn")
+        print(f"  gecikme p50: {_seconds(row['latency_p50'])}  p95: {_seconds(row['latency_p95'])}  "
+              f"p99: {_seconds(row['latency_p99'])}")
+        if 'ttfb_p50' in row:
+            print(f"  ilk parça p50: {_seconds(row['ttfb_p50'])}  p95: {_seconds(row['ttfb_p95'])}")
+        if row['errors_by_status']:
+            print(f"  hatalar: {row['errors_by_status']}")
+    server = summary.get('server')
+    if server:
+        print(f"\nVeritabanı sorgusu: {server['db_queries']} (istek başına {server['db_queries_per_request']}), "
+              f"sorgu hatası: {server['db_errors']}")
+        print(f"Model çağrısı: {server['model_calls']}, model hatası: {server['model_errors']}")
+
+
+# --- 5.0 Ana Yürütme ---
+
+def main():
+    parser = argparse.ArgumentParser(description='Haber işleme endpoint\'leri için uçtan uca yük testi')
+    parser.add_argument('--editors', type=int, default=10, help='Eşzamanlı editör sayısı')
+    parser.add_argument('--duration', type=float, default=30, help='Test süresi (saniye)')
+    parser.add_argument('--mode', choices=MODES + ('mix',), default='process', help='Kullanılacak endpoint')
+    parser.add_argument('--think-time', type=float, default=1.0, help='İstekler arası ortalama bekleme (saniye, 0: beklemesiz)')
+    parser.add_argument('--allow-cache', action='store_true', help='Aynı metinleri tekrar gönder (sonuç önbelleği devrede kalır)')
+    parser.add_argument('--url', help='Çalışan bir sunucunun adresi; verilmezse uygulama bu süreçte başlatılır')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='Haber metinlerinden oluşan JSON dizisi')
+    parser.add_argument('--json', help='Özeti bu dosyaya JSON olarak yaz')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"HATA: Derlem boş: {args.corpus}")
+        return 1
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        base_url, server = start_local_server()
+        print(f"Uygulama {base_url} adresinde başlatıldı (MODEL_BACKEND={os.environ['MODEL_BACKEND']}).")
+
+    before = scrape_counters(base_url)
+    results = []
+    started = time.monotonic()
+    deadline = started + args.duration
+    editors = [
+        Editor(index, base_url, corpus, args.mode, deadline, args.think_time, not args.allow_cache, results)
+        for index in range(args.editors)
+    ]
+    for editor in editors:
+        editor.start()
+    for editor in editors:
+        editor.join()
+    elapsed = time.monotonic() - started
+    after = scrape_counters(base_url) if before is not None else None
+
+    if server is not None:
+        server.shutdown()
+
+    summary = summarize(results, elapsed, before, after)
+    print_report(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Bu betik, sıkıştırılmış (PROMPT_COMPACTION) ve normal prompt'ları örnek bir
+# haber derlemi üzerinde token sayısı ve uçtan uca model gecikmesi açısından
+# karşılaştırır. Veritabanı bağlantısı gerektirmez.
+#
+# Varsayılan olarak token sayıları karakter sayısından tahmin edilir ve model
+# çağrılmaz. --live verilirse (GEMINI_API_KEY gerekir) token sayıları modelin
+# count_tokens uç noktasından alınır ve her prompt modele gönderilerek gecikme
+# ölçülür; iki mod sırayla (dönüşümlü) çağrılır ki zamana bağlı sapma eşit dağılsın.
+#
+# Kullanım:
+#   python -m benchmarks.prompt_compaction_report [--corpus dosya.json] [--live] [--runs 1] [--json rapor.json]
+#
+# İçindekiler:
+# 1.0 Derlem: Örnek haberlerin yüklenmesi.
+# 2.0 Ölçüm: Token sayımı ve gecikme ölçümü.
+# 3.0 Rapor: Özet tablonun yazdırılması.
+# 4.0 Ana Yürütme
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_prompt_build import SETTING_COMBINATIONS
+from services.prompt_service import PromptService
+from services.rate_limiter import estimate_tokens
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'news_corpus.json')
+MODES = ('normal', 'compact')
+
+
+# --- 1.0 Derlem ---
+
+def load_corpus(path):
+    """Derlem dosyasını (haber metinlerinden oluşan JSON dizisi) okur."""
+    with open(path, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    return [text for text in corpus if isinstance(text, str) and text.strip()]
+
+
+# --- 2.0 Ölçüm ---
+
+def build_pairs(service, corpus):
+    """Her haber ve ayar kombinasyonu için (normal, sıkıştırılmış) prompt çiftini üretir."""
+    pairs = []
+    for news_text in corpus:
+        for settings in SETTING_COMBINATIONS:
+            pairs.append({
+                'normal': service.build_complete_prompt(1, settings, news_text, compact=False),
+                'compact': service.build_complete_prompt(1, settings, news_text, compact=True),
+            })
+    return pairs
+
+
+def make_model():
+    """Canlı ölçüm için Gemini modelini hazırlar."""
+    import google.generativeai as genai
+    from services.ai_service import AIService
+
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise SystemExit("HATA: --live için GEMINI_API_KEY ortam değişkeni gerekli.")
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(AIService.MODEL_NAME)
+
+
+def count_tokens(pairs, model=None):
+    """Her prompt'un token sayısını ekler; model yoksa tahmin kullanılır."""
+    for pair in pairs:
+        for mode in MODES:
+            prompt = pair[mode]
+            pair[f'{mode}_tokens'] = model.count_tokens(prompt).total_tokens if model else estimate_tokens(prompt)
+
+
+def measure_latency(pairs, model, runs):
+    """Her prompt'u `runs` kez modele gönderip uçtan uca süreleri (saniye) toplar."""
+    latencies = {mode: [] for mode in MODES}
+    for run in range(runs):
+        for index, pair in enumerate(pairs):
+            order = MODES if (index + run) % 2 == 0 else tuple(reversed(MODES))
+            for mode in order:
+                started = time.perf_counter()
+                try:
+                    model.generate_content(pair[mode]).text
+                except Exception as e:
+                    print(f"Uyarı: Model çağrısı başarısız ({mode}): {e}")
+                    continue
+                latencies[mode].append(time.perf_counter() - started)
+    return latencies
+
+
+# --- 3.0 Rapor ---
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(pairs, latencies):
+    """Mod başına token ve gecikme özetini döndürür."""
+    summary = {}
+    for mode in MODES:
+        tokens = [pair[f'{mode}_tokens'] for pair in pairs]
+        times = latencies.get(mode, [])
+        summary[mode] = {
+            'prompts': len(tokens),
+            'tokens_total': sum(tokens),
+            'tokens_mean': round(statistics.mean(tokens), 1),
+            'tokens_median': statistics.median(tokens),
+            'latency_p50': percentile(times, 0.50),
+            'latency_p95': percentile(times, 0.95),
+            'latency_samples': len(times),
+        }
+    normal, compact = summary['normal'], summary['compact']
+    summary['token_reduction_pct'] = round(100.0 * (1 - compact['tokens_total'] / normal['tokens_total']), 2)
+    if normal['latency_p50'] and compact['latency_p50']:
+        summary['latency_p50_change_pct'] = round(100.0 * (compact['latency_p50'] / normal['latency_p50'] - 1), 2)
+    return summary
+
+
+def print_report(summary, live):
+    source = 'model (count_tokens)' if live else 'tahmin (karakter/4)'
+    print(f"Token kaynağı: {source}")
+    print(f"{'Mod':<10}{'prompt':>8}{'ort. token':>12}{'medyan':>10}{'toplam':>10}{'p50 s':>10}{'p95 s':>10}")
+    for mode in MODES:
+        row = summary[mode]
+        p50 = f"{row['latency_p50']:.2f}" if row['latency_p50'] is not None else '-'
+        p95 = f"{row['latency_p95']:.2f}" if row['latency_p95'] is not None else '-'
+        print(f"{mode:<10}{row['prompts']:>8}{row['tokens_mean']:>12}{row['tokens_median']:>10}"
+              f"{row['tokens_total']:>10}{p50:>10}{p95:>10}")
+    print(f"Token azalması: %{summary['token_reduction_pct']}")
+    if 'latency_p50_change_pct' in summary:
+        print(f"p50 gecikme değişimi: %{summary['latency_p50_change_pct']}")
+    elif not live:
+        print("Gecikme ölçümü için --live ile çalıştırın.")
+
+
+# --- 4.0 Ana Yürütme ---
+
+def main():
+    parser = argparse.ArgumentParser(description='Sıkıştırılmış ve normal prompt karşılaştırma raporu')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='Haber metinlerinden oluşan JSON dizisi')
+    parser.add_argument('--live', action='store_true', help='Token sayımı ve gecikme için modeli çağır')
+    parser.add_argument('--runs', type=int, default=1, help='Canlı modda her prompt için çağrı sayısı')
+    parser.add_argument('--json', help='Özeti bu dosyaya JSON olarak yaz')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"HATA: Derlem boş: {args.corpus}")
+        return 1
+
+    pairs = build_pairs(PromptService(), corpus)
+    model = make_model() if args.live else None
+    count_tokens(pairs, model)
+    latencies = measure_latency(pairs, model, args.runs) if model else {}
+
+    summary = summarize(pairs, latencies)
+    print_report(summary, args.live)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Bu modül, kıyaslamaların MySQL sunucusu olmadan çalışabilmesi için
+# tohumlanmış (seeded) bir SQLite veritabanı hazırlar. Şema ve varsayılan
+# konfigürasyon, uygulamanın gömülü SQLite arka ucundan
+# (database/sqlite_backend.py) gelir; bu modül yalnızca geçmiş kayıtlarını ve
+# kullanıcı sayaçlarını ekler. install() çağrıldığında DatabaseConnection
+# bağlantılarını DB_BACKEND=sqlite ile bu dosyadan alır; servis kodu
+# değişmeden çalışır.
+#
+# Mutlak süreler MySQL ile karşılaştırılamaz; amaç, aynı makinede sürümler
+# arası göreli değişimi (regresyonları) yakalamaktır.
+#
+# İçindekiler:
+# 1.0 Tohum Verisi
+#     - create_database: Şemayı oluşturur ve veritabanını tekrarlanabilir verilerle doldurur.
+# 2.0 Kurulum
+#     - install: DatabaseConnection'ı verilen SQLite dosyasına yönlendirir.
+
+import json
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from database.sqlite_backend import ensure_schema, translate_query
+from services import history_store, text_codec, user_stats
+from services.model_backend import FAKE_RESPONSE
+
+# --- 1.0 Tohum Verisi ---
+
+# (durum, ağırlık) - gerçek kullanımda kayıtların çoğu tamamlanmıştır
+STATUS_WEIGHTS = (('completed', 85), ('error', 8), ('processing', 4), ('pending', 3))
+
+
+def user_ids(users):
+    """Tohum verisindeki kullanıcı kimliklerini döndürür."""
+    return [f'bench_user_{index:03d}' for index in range(users)]
+
+
+def create_database(path, corpus, users=20, history_per_user=1000, seed=42):
+    """
+    Uygulamanın SQLite şemasını (varsayılan konfigürasyon dahil) oluşturur;
+    her kullanıcı için `history_per_user` geçmiş kaydını ve kullanıcı
+    sayaçlarını ekler. Aynı parametrelerle her zaman aynı veri üretilir.
+
+    Returns:
+        dict: Veri kümesinin özeti (kullanıcı, kayıt sayısı, tohum).
+    """
+    if ensure_schema(path) is None:
+        raise RuntimeError(f"SQLite şeması oluşturulamadı: {path}")
+
+    rng = random.Random(seed)
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        connection.execute("BEGIN")
+        config_id = connection.execute("SELECT id FROM prompt_configs WHERE is_default = TRUE").fetchone()[0]
+        processed = text_codec.column_values({'processed_text': json.dumps(FAKE_RESPONSE, ensure_ascii=False, indent=2)})
+        empty = text_codec.column_values({'processed_text': None})
+        settings_hash, settings_json = history_store.encode_settings({'targetCategory': 'auto', 'tagCount': '5'})
+        connection.execute("INSERT OR IGNORE INTO settings_snapshots (settings_hash, settings_json) VALUES (?, ?)",
+                           (settings_hash, settings_json))
+        statuses = [status for status, _ in STATUS_WEIGHTS]
+        weights = [weight for _, weight in STATUS_WEIGHTS]
+        started = datetime(2025, 1, 1)
+        for user_id in user_ids(users):
+            rows = []
+            for index in range(history_per_user):
+                status = rng.choices(statuses, weights)[0]
+                created_at = started + timedelta(minutes=index * 30 + rng.randint(0, 29))
+                original_text = rng.choice(corpus) * rng.randint(1, 6)
+                values = processed if status == 'completed' else empty
+                rows.append((
+                    user_id, config_id, original_text, text_codec.text_size(original_text),
+                    values['processed_text'], values['processed_data'], values['processed_size'], values['text_codec'],
+                    settings_hash,
+                    status,
+                    'read' if rng.random() < 0.7 else 'unread',
+                    'AI işleme hatası: taklit hata' if status == 'error' else None,
+                    created_at,
+                    created_at + timedelta(seconds=rng.randint(2, 40)) if status in ('completed', 'error') else None,
+                ))
+            connection.executemany(
+                "INSERT INTO processing_history (user_id, config_id, original_text, original_size, processed_text, "
+                "processed_data, processed_size, text_codec, settings_hash, processing_status, read_status, "
+                "error_message, created_at, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        connection.execute(translate_query(
+            f"INSERT INTO user_processing_stats (user_id, {', '.join(user_stats.COUNTER_COLUMNS)}) "
+            + user_stats.AGGREGATE_QUERY.format(table='processing_history', where='')
+        ))
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    return {'users': users, 'history_per_user': history_per_user, 'history_rows': users * history_per_user, 'seed': seed}
+
+
+# --- 2.0 Kurulum ---
+
+def install(path):
+    """
+    DatabaseConnection'ın bundan sonraki bağlantılarını verilen SQLite
+    dosyasından almasını sağlar ve kullanılan havuzu döndürür. Havuz süreç
+    içinde ilk kez oluşturulmadan önce çağrılmalıdır.
+    """
+    os.environ['DB_BACKEND'] = 'sqlite'
+    os.environ['SQLITE_PATH'] = path
+
+    from database.pool import get_pool
+    return get_pool()
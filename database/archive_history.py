@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# İşlem Geçmişi Arşivleme Betiği
+# ==============================
+# Bu betik, `processing_history` tablosundaki belirli bir yaştan eski,
+# son durumuna ulaşmış (completed/error) ve okunmuş kayıtları
+# `processing_history_archive` tablosuna taşır (bkz. services/history_archive.py).
+# Uygulama çalışırken, örneğin günlük bir zamanlanmış görevle çalıştırılabilir:
+# kayıtlar id sırasıyla küçük gruplar hâlinde, her grup kendi kısa işleminde
+# taşınır ve gruplar arasında beklenerek kilit yığılması önlenir.
+#
+# Kullanım:
+#   python database/archive_history.py [--older-than-days 180] [--batch-size 500] [--sleep 0.2] [--dry-run]
+#
+# İçindekiler:
+# -------------
+# 1.0 Ana Yürütme
+#     1.1 main(): Betiğin ana işlevini yerine getirir.
+
+# --- Gerekli Kütüphaneler ---
+import argparse
+import os
+import sys
+import time
+
+# --- Proje İçi Modüller ---
+# Ana dizini path'e ekleyerek modüllerin içe aktarılmasını sağla
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import DatabaseConnection
+from services import history_archive
+
+# ==============================================================================
+# 1.0 ANA YÜRÜTME
+# ==============================================================================
+
+def main():
+    """
+    1.1 Ana Fonksiyon
+    -----------------
+    Eski kayıtları gruplar hâlinde arşive taşır ve taşınan kayıt sayısını raporlar.
+    """
+    parser = argparse.ArgumentParser(description='Eski işlem geçmişi kayıtlarını arşiv tablosuna taşır.')
+    parser.add_argument('--older-than-days', type=int, default=history_archive.ARCHIVE_AFTER_DAYS,
+                        help='Bu yaştan (gün) eski kayıtları taşı (varsayılan: HISTORY_ARCHIVE_AFTER_DAYS)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Bir işlemde taşınacak kayıt sayısı')
+    parser.add_argument('--sleep', type=float, default=0.2, help='Gruplar arasında beklenecek süre (saniye)')
+    parser.add_argument('--dry-run', action='store_true', help='Taşımadan yalnızca kayıt sayısını raporla')
+    args = parser.parse_args()
+
+    # Uygulama, pencereden genç kayıtların arşivde olmadığını varsayarak
+    # arşive bakmayı atlar; daha genç kayıtları taşımak sayfaları eksik bırakır.
+    if args.older_than_days < history_archive.ARCHIVE_AFTER_DAYS:
+        print(f"HATA: --older-than-days, HISTORY_ARCHIVE_AFTER_DAYS ({history_archive.ARCHIVE_AFTER_DAYS}) "
+              f"değerinden küçük olamaz.")
+        return 1
+
+    cutoff = history_archive.archive_cutoff(args.older_than_days)
+    print(f"Bilgi: {cutoff:%Y-%m-%d %H:%M} öncesindeki kayıtlar arşivlenecek.")
+    after_id, total = 0, 0
+    try:
+        with DatabaseConnection() as db:
+            while True:
+                last_id, count = history_archive.archive_batch(
+                    db, cutoff, after_id, args.batch_size, args.dry_run
+                )
+                if last_id is None:
+                    break
+                after_id = last_id
+                total += count
+                print(f"Bilgi: {total} kayıt {'bulundu' if args.dry_run else 'taşındı'} (son id: {after_id}).")
+                if args.sleep:
+                    time.sleep(args.sleep)
+    except Exception as e:
+        print(f"HATA: Arşivleme {after_id} numaralı kayıttan sonra durdu: {e}")
+        return 1
+
+    if not total:
+        print("Başarılı: Arşivlenecek kayıt yok.")
+    elif args.dry_run:
+        print(f"Bilgi: --dry-run verildiği için {total} kayıt taşınmadı.")
+    else:
+        print(f"Başarılı: {total} kayıt arşive taşındı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
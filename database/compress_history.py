@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Geçmiş Metinlerini Sıkıştırma Betiği
+# ====================================
+# Bu betik, `processing_history` ve `processing_history_archive` tablolarında
+# henüz sıkıştırılmamış (veya daha eski bir sözlük sürümüyle sıkıştırılmış)
+# kayıtların AI çıktısını ve satır içi prompt'unu hedef kodlayıcı sürümüyle
+# yeniden yazar (bkz. services/text_codec.py); çıktının açılmış boyutu
+# (processed_size) da bu sırada yazılır. Uygulama çalışırken çalıştırılabilir: kayıtlar
+# id sırasıyla küçük gruplar hâlinde, her grup kendi işleminde satır kilidiyle
+# işlenir ve gruplar arasında beklenerek veritabanına yük bindirilmez.
+# Betik kesilirse yeniden çalıştırıldığında kaldığı yerden devam eder.
+#
+# Kullanım:
+#   python database/compress_history.py [--version N] [--batch-size 500] [--sleep 0.2] [--dry-run]
+#
+# İçindekiler:
+# -------------
+# 1.0 Sıkıştırma
+#     1.1 compress_batch(): Bir grup kaydı hedef sürümle yeniden yazar.
+#
+# 2.0 Ana Yürütme
+#     2.1 main(): Betiğin ana işlevini yerine getirir.
+
+# --- Gerekli Kütüphaneler ---
+import argparse
+import os
+import sys
+import time
+
+# --- Proje İçi Modüller ---
+# Ana dizini path'e ekleyerek modüllerin içe aktarılmasını sağla
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import DatabaseConnection
+from services import history_archive, text_codec
+
+FIELDS = tuple(text_codec.COMPRESSED_FIELDS)
+
+# ==============================================================================
+# 1.0 SIKIŞTIRMA
+# ==============================================================================
+
+def _stored_size(row):
+    """Satırdaki metin alanlarının saklanan toplam bayt boyutunu döndürür."""
+    size = 0
+    for field, data_column in text_codec.COMPRESSED_FIELDS.items():
+        if row.get(field) is not None:
+            size += len(row[field].encode('utf-8'))
+        if row.get(data_column) is not None:
+            size += len(row[data_column])
+    return size
+
+
+def compress_batch(db, table, after_id, batch_size, version, dry_run=False):
+    """
+    1.1 Grup Sıkıştırma
+    -------------------
+    `table` tablosunda `after_id`'den sonraki, text_codec değeri hedef
+    sürümden küçük en fazla `batch_size` kaydı kilitleyip metin alanlarını hedef sürümle yeniden yazar.
+
+    Returns:
+        tuple: (son işlenen id veya kayıt kalmadıysa None, kayıt sayısı,
+                önceki boyut, sonraki boyut).
+    """
+    with db.transaction():
+        rows = db.execute_query(
+            f"""
+            SELECT id, {text_codec.select_columns(*FIELDS)}
+            FROM {table}
+            WHERE id > %s AND text_codec < %s
+            ORDER BY id LIMIT %s
+            FOR UPDATE
+            """,
+            (after_id, version, batch_size), fetch_all=True
+        ) or []
+        if not rows:
+            return None, 0, 0, 0
+
+        before = after = 0
+        columns, params = None, []
+        for row in rows:
+            before += _stored_size(row)
+            text_codec.decode_fields(row, *FIELDS)
+            values = text_codec.column_values({field: row.get(field) for field in FIELDS}, version)
+            after += _stored_size(values)
+            columns = columns or list(values)
+            params.append(tuple(values[column] for column in columns) + (row['id'],))
+
+        if not dry_run:
+            db.execute_many(
+                f"UPDATE {table} SET {', '.join(f'{column} = %s' for column in columns)} WHERE id = %s",
+                params
+            )
+    return rows[-1]['id'], len(rows), before, after
+
+# ==============================================================================
+# 2.0 ANA YÜRÜTME
+# ==============================================================================
+
+def main():
+    """
+    2.1 Ana Fonksiyon
+    -----------------
+    Kayıtları gruplar hâlinde hedef sürüme taşır ve boyut değişimini raporlar.
+    """
+    parser = argparse.ArgumentParser(description='Geçmiş kayıtlarının metin alanlarını arka planda sıkıştırır.')
+    parser.add_argument('--version', type=int, default=text_codec.CODEC_VERSION,
+                        help='Hedef kodlayıcı sürümü (varsayılan: HISTORY_CODEC_VERSION)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Bir işlemde yazılacak kayıt sayısı')
+    parser.add_argument('--sleep', type=float, default=0.2, help='Gruplar arasında beklenecek süre (saniye)')
+    parser.add_argument('--dry-run', action='store_true', help='Yazmadan yalnızca kazancı raporla')
+    args = parser.parse_args()
+
+    if args.version < 1:
+        print("HATA: Hedef sürüm 1 veya daha büyük olmalıdır.")
+        return 1
+    try:
+        text_codec.load_dictionary(args.version)
+    except ValueError as e:
+        print(f"HATA: {e}")
+        return 1
+
+    table, after_id, total, before, after = None, 0, 0, 0, 0
+    try:
+        with DatabaseConnection() as db:
+            for table in (history_archive.HOT_TABLE, history_archive.ARCHIVE_TABLE):
+                after_id = 0
+                while True:
+                    last_id, count, batch_before, batch_after = compress_batch(
+                        db, table, after_id, args.batch_size, args.version, args.dry_run
+                    )
+                    if last_id is None:
+                        break
+                    after_id = last_id
+                    total += count
+                    before += batch_before
+                    after += batch_after
+                    print(f"Bilgi: {table}: {total} kayıt işlendi (son id: {after_id}).")
+                    if args.sleep:
+                        time.sleep(args.sleep)
+    except Exception as e:
+        print(f"HATA: Sıkıştırma {table} tablosunda {after_id} numaralı kayıttan sonra durdu: {e}")
+        return 1
+
+    if not total:
+        print(f"Başarılı: Tüm kayıtlar zaten {args.version} veya daha yeni sürümde.")
+        return 0
+    print(f"Bilgi: {total} kayıt, metin boyutu {before} -> {after} bayt"
+          f" ({after / before:.1%})." if before else f"Bilgi: {total} kayıt işlendi.")
+    if args.dry_run:
+        print("Bilgi: --dry-run verildiği için değişiklik yapılmadı.")
+    else:
+        print("Başarılı: Kayıtlar sıkıştırıldı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
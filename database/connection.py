@@ -4,21 +4,30 @@
 # ===========================
 # Bu modül, MySQL veritabanı ile bağlantı kurmak, bağlantıyı sonlandırmak
 # ve SQL sorgularını yürütmek için bir sınıf (`DatabaseConnection`) sağlar.
+# Fiziksel bağlantılar süreç geneli havuzdan (`database.pool`) alınır ve
+# `disconnect()` çağrıldığında kapatılmak yerine havuza iade edilir.
 #
 # İçindekiler:
 # -------------
 # 1.0 DatabaseConnection Sınıfı
 #     1.1 __init__(): Sınıfın yapıcı metodu, otomatik bağlantı kurar.
-#     1.2 connect(): Veritabanı bağlantısını kurar ve karakter setini ayarlar.
-#     1.3 disconnect(): Veritabanı bağlantısını güvenli bir şekilde kapatır.
-#     1.4 execute_query(): SQL sorgularını çalıştırır ve sonuçları döndürür.
+#     1.2 connect(): Havuzdan bir bağlantı alır.
+#     1.3 disconnect(): Bağlantıyı havuza iade eder.
+#     1.4 execute_query(): SQL sorgularını çalıştırır ve sonuçları döndürür (süreleri metriklere yazılır).
+#         execute_many(): Aynı sorguyu birden çok parametre setiyle tek seferde çalıştırır.
+#     1.5 __enter__/__exit__: `with` bloğu sonunda bağlantıyı otomatik iade eder.
+#     1.6 transaction(): Birden çok sorguyu tek bir işlem (transaction) içinde çalıştırır.
 
 # --- Gerekli Kütüphaneler ---
-import os
-import mysql.connector
+import time
+from contextlib import contextmanager
+
 from mysql.connector import Error
 from dotenv import load_dotenv
 
+from database.pool import get_pool, PoolTimeoutError
+from utils.metrics import get_metrics, normalize_statement
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -40,6 +49,7 @@ class DatabaseConnection:
         """
         self.connection = None
         self.cursor = None
+        self.in_transaction = False
         self.connect()
 
     # --------------------------------------------------------------------------
@@ -47,28 +57,14 @@ class DatabaseConnection:
     # --------------------------------------------------------------------------
     def connect(self):
         """
-        Veritabanı bağlantısını kurar ve Türkçe karakter desteği için
-        gerekli karakter seti (utf8mb4) ayarlarını yapar.
+        Süreç geneli havuzdan bir bağlantı alır. Karakter seti (utf8mb4) ayarları
+        havuz tarafından her fiziksel bağlantı için bir kez uygulanmıştır.
         """
         try:
-            self.connection = mysql.connector.connect(
-                host=os.getenv('DB_HOST', 'localhost'),
-                database=os.getenv('DB_NAME', 'haber_editor'),
-                user=os.getenv('DB_USER', 'root'),
-                password=os.getenv('DB_PASSWORD', ''),
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci',
-                use_unicode=True,
-                connection_timeout=10
-            )
-            if self.connection.is_connected():
-                self.cursor = self.connection.cursor(dictionary=True)
-                # Karakter seti ayarlarını zorla uygula
-                self.cursor.execute("SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci")
-                self.cursor.execute("SET CHARACTER SET utf8mb4")
-                print("Başarılı: MySQL veritabanına bağlanıldı ve karakter seti yapılandırıldı.")
-                return True
-        except Error as e:
+            self.connection = get_pool().acquire()
+            self.cursor = self.connection.cursor(dictionary=True)
+            return True
+        except (Error, PoolTimeoutError) as e:
             print(f"HATA: Veritabanı bağlantısı kurulamadı: {e}")
             self.connection = None
             self.cursor = None
@@ -79,12 +75,24 @@ class DatabaseConnection:
     # --------------------------------------------------------------------------
     def disconnect(self):
         """
-        Mevcut veritabanı bağlantısını ve imleci güvenli bir şekilde kapatır.
+        İmleci kapatır ve bağlantıyı havuza iade eder. Birden fazla kez
+        çağrılması güvenlidir.
         """
-        if self.connection and self.connection.is_connected():
-            self.cursor.close()
-            self.connection.close()
-            print("Bilgi: MySQL bağlantısı kapatıldı.")
+        connection, self.connection = self.connection, None
+        if connection is None:
+            return
+        try:
+            if self.cursor is not None:
+                self.cursor.close()
+        except Error:
+            pass
+        self.cursor = None
+        get_pool().release(connection)
+
+    def __del__(self):
+        """Nesne silinirken bağlantı hâlâ alınmışsa havuza iade eder."""
+        if getattr(self, 'connection', None) is not None:
+            self.disconnect()
 
     # --------------------------------------------------------------------------
     # 1.4 Sorgu Yürütme
@@ -102,14 +110,19 @@ class DatabaseConnection:
         Returns:
             - SELECT sorguları için: Sonuç listesi veya tek bir sonuç.
             - INSERT, UPDATE, DELETE sorguları için: Etkilenen satır sayısı.
-            - Hata durumunda: None.
+            - Hata durumunda: None. `transaction()` bloğu içinde hata yutulmaz,
+              fırlatılır ve işlem geri alınır.
         """
-        # Bağlantı koptuysa yeniden bağlanmayı dene
-        if not self.connection or not self.connection.is_connected():
-            print("Uyarı: Veritabanı bağlantısı kopmuş. Yeniden bağlanılıyor...")
+        # Bağlantı yoksa havuzdan yeniden almayı dene. Canlılık kontrolü havuz
+        # tarafından teslim sırasında yapıldığı için her sorguda ping atılmaz.
+        if self.connection is None:
+            print("Uyarı: Veritabanı bağlantısı yok. Havuzdan yeni bağlantı alınıyor...")
             if not self.connect():
                 return None
 
+        metrics = get_metrics()
+        statement = normalize_statement(query)
+        started = time.perf_counter()
         try:
             # Sorguyu yürüt
             self.cursor.execute(query, params or ())
@@ -123,13 +136,112 @@ class DatabaseConnection:
                 # fetch_all veya tanımsızsa tüm sonuçları döndür
                 return self.cursor.fetchall()
             elif query_type in ('INSERT', 'UPDATE', 'DELETE'):
-                self.connection.commit()
+                if not self.in_transaction:
+                    self.connection.commit()
                 return self.cursor.rowcount
             else: # CREATE, DROP, vb. için
-                self.connection.commit()
+                if not self.in_transaction:
+                    self.connection.commit()
                 return True
                 
         except Error as e:
+            metrics.inc('db_query_errors_total', (statement,))
             print(f"HATA: Sorgu çalıştırılırken bir sorun oluştu: {e}")
             print(f"Sorgu: {query}")
+            if self.in_transaction:
+                raise
             return None
+        finally:
+            metrics.observe('db_query_duration_seconds', (statement,), time.perf_counter() - started)
+
+    def execute_many(self, query, params_list):
+        """
+        Aynı INSERT/UPDATE sorgusunu birden çok parametre setiyle çalıştırır.
+        INSERT ... VALUES sorguları sürücü tarafından tek bir çok satırlı
+        INSERT'e dönüştürülür ve tek bir commit ile yazılır.
+
+        Args:
+            query (str): Çalıştırılacak SQL sorgusu.
+            params_list (list): Her satır için parametre tuple'larının listesi.
+
+        Returns:
+            - Etkilenen toplam satır sayısı.
+            - Hata durumunda: None (hiçbir satır yazılmaz).
+        """
+        if self.connection is None:
+            print("Uyarı: Veritabanı bağlantısı yok. Havuzdan yeni bağlantı alınıyor...")
+            if not self.connect():
+                return None
+
+        metrics = get_metrics()
+        statement = normalize_statement(query)
+        started = time.perf_counter()
+        try:
+            self.cursor.executemany(query, params_list)
+            if not self.in_transaction:
+                self.connection.commit()
+            return self.cursor.rowcount
+        except Error as e:
+            metrics.inc('db_query_errors_total', (statement,))
+            print(f"HATA: Toplu sorgu çalıştırılırken bir sorun oluştu: {e}")
+            print(f"Sorgu: {query}")
+            if self.in_transaction:
+                raise
+            try:
+                self.connection.rollback()
+            except Error:
+                pass
+            return None
+        finally:
+            metrics.observe('db_query_duration_seconds', (statement,), time.perf_counter() - started)
+
+    # --------------------------------------------------------------------------
+    # 1.5 Context Manager Desteği
+    # --------------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+        return False
+
+    # --------------------------------------------------------------------------
+    # 1.6 İşlem (Transaction) Desteği
+    # --------------------------------------------------------------------------
+    @contextmanager
+    def transaction(self):
+        """
+        Blok içindeki sorguları tek bir işlem olarak çalıştırır. Blok içinde
+        `execute_query` ve `execute_many` ara commit yapmaz; blok hatasız
+        biterse commit edilir, herhangi bir hata olursa geri alınır ve hata
+        yeniden fırlatılır.
+
+        Kullanım:
+            with DatabaseConnection() as db, db.transaction():
+                db.execute_query(...)
+                db.execute_query(...)
+        """
+        if self.connection is None and not self.connect():
+            raise Error("Veritabanı bağlantısı kurulamadı.")
+        if self.in_transaction:
+            # İç içe kullanımda dıştaki işleme katıl
+            yield self
+            return
+
+        # autocommit kapalı olduğundan önceki SELECT'ler örtük bir işlem açmış
+        # olabilir; yeni işlem güncel bir anlık görüntüyle başlasın.
+        if self.connection.in_transaction:
+            self.connection.commit()
+        self.connection.start_transaction()
+        self.in_transaction = True
+        try:
+            yield self
+            self.connection.commit()
+        except Exception:
+            try:
+                self.connection.rollback()
+            except Error:
+                pass
+            raise
+        finally:
+            self.in_transaction = False
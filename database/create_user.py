@@ -91,9 +91,10 @@ def create_user_profile():
             
         config_id = active_config['id']
         
-        # Kullanıcı ayarlarını tek tek kaydet
-        for key, value in default_settings.items():
-            prompt_service.save_user_setting(user_data['user_id'], config_id, key, value)
+        # Kullanıcı ayarlarını tek sorguda kaydet
+        if not prompt_service.save_user_settings(user_data['user_id'], config_id, default_settings):
+            print("HATA: Varsayılan ayarlar kaydedilemedi.")
+            return False
         
         print(f"Başarılı: {len(default_settings)} adet varsayılan ayar kaydedildi.")
         
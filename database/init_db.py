@@ -22,8 +22,12 @@
 # --- Gerekli Kütüphaneler ---
 import mysql.connector
 import os
+import sys
 from dotenv import load_dotenv
 
+# Proje kök dizinini Python yoluna ekle (SQLite arka ucu için)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # --- Ortam Değişkenleri ---
 load_dotenv()
 
@@ -171,6 +175,15 @@ def main():
     -----------------
     Veritabanı başlatma sürecini adım adım yönetir.
     """
+    # DB_BACKEND=sqlite: şema dosyası ve migration'lar gömülü veritabanına uygulanır
+    if os.getenv('DB_BACKEND', 'mysql').strip().lower() == 'sqlite':
+        from database.sqlite_backend import ensure_schema
+        path = os.getenv('SQLITE_PATH', 'data/haber_editor.db')
+        if ensure_schema(path) is None:
+            return False
+        print(f"\nSONUÇ: SQLite veritabanı hazır: {path}")
+        return True
+
     # 1. Adım: Veritabanını oluştur (eğer yoksa)
     if not create_database_if_not_exists():
         return False
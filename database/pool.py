@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Veritabanı Bağlantı Havuzu
+# ==========================
+# Bu modül, süreç genelinde paylaşılan, thread-safe bir MySQL bağlantı havuzu
+# (`ConnectionPool`) sağlar. Her istekte yeni bir TCP bağlantısı açmak yerine
+# fiziksel bağlantılar yeniden kullanılır; karakter seti ayarları her fiziksel
+# bağlantı için yalnızca bir kez uygulanır.
+#
+# İçindekiler:
+# -------------
+# 1.0 PoolTimeoutError: Havuzdan bağlantı alınamadığında fırlatılan hata.
+# 2.0 ConnectionPool Sınıfı
+#     2.1 __init__(): Havuz parametrelerini ayarlar.
+#     2.2 acquire(): Havuzdan bir bağlantı alır (gerekirse bekler).
+#     2.3 release(): Bağlantıyı temizleyip havuza iade eder.
+#     2.4 stats(): Havuz istatistiklerini döndürür.
+#     2.5 close_all(): Boştaki tüm bağlantıları kapatır.
+# 3.0 Süreç Geneli Havuz
+#     3.1 get_pool(): Ortam değişkenlerine göre yapılandırılmış tekil havuzu döndürür.
+#         DB_BACKEND=sqlite ile gömülü SQLite havuzu (database/sqlite_backend.py) kullanılır.
+
+# --- Gerekli Kütüphaneler ---
+import os
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ==============================================================================
+# 1.0 HATA SINIFI
+# ==============================================================================
+
+class PoolTimeoutError(Exception):
+    """Belirtilen süre içinde havuzdan boş bağlantı alınamadığında fırlatılır."""
+
+
+# ==============================================================================
+# 2.0 CONNECTIONPOOL SINIFI
+# ==============================================================================
+
+class ConnectionPool:
+    """
+    Sabit üst sınırlı, thread-safe MySQL bağlantı havuzu.
+
+    Bağlantılar ihtiyaç oldukça açılır (en fazla `size` adet). Havuz doluysa
+    çağıran thread `timeout` saniyeye kadar bekler. Belirli bir süreden uzun
+    boşta kalan bağlantılar teslim edilmeden önce ping ile kontrol edilir.
+    """
+
+    SESSION_STATEMENTS = (
+        "SET NAMES utf8mb4 COLLATE utf8mb4_unicode_ci",
+        "SET CHARACTER SET utf8mb4",
+    )
+
+    # --------------------------------------------------------------------------
+    # 2.1 Yapıcı Metot
+    # --------------------------------------------------------------------------
+    def __init__(self, connect_kwargs, size=10, timeout=5.0, ping_interval=30.0):
+        """
+        Args:
+            connect_kwargs (dict): `mysql.connector.connect` için parametreler.
+            size (int): Aynı anda açık olabilecek en fazla bağlantı sayısı.
+            timeout (float): Boş bağlantı için beklenecek en uzun süre (saniye).
+            ping_interval (float): Bu süreden uzun boşta kalan bağlantılar
+                                   teslim edilmeden önce ping ile doğrulanır.
+        """
+        self.connect_kwargs = connect_kwargs
+        self.size = max(1, int(size))
+        self.timeout = float(timeout)
+        self.ping_interval = float(ping_interval)
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()  # (bağlantı, son kullanım zamanı) çiftleri
+        self._created = 0
+        self._in_use = 0
+
+        # İstatistik sayaçları
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._reconnects = 0
+
+    def _open_connection(self):
+        """Yeni bir fiziksel bağlantı açar ve oturum ayarlarını bir kez uygular."""
+        connection = mysql.connector.connect(**self.connect_kwargs)
+        cursor = connection.cursor()
+        for statement in self.SESSION_STATEMENTS:
+            cursor.execute(statement)
+        cursor.close()
+        return connection
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    @staticmethod
+    def _is_alive(connection):
+        """Bağlantının sunucu tarafında hâlâ açık olup olmadığını ping ile kontrol eder."""
+        try:
+            # reconnect=False: yeniden bağlanma oturum ayarlarını sıfırlayacağı için
+            # kopmuş bağlantılar burada değil, yenisi açılarak değiştirilir.
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    # --------------------------------------------------------------------------
+    # 2.2 Bağlantı Alma
+    # --------------------------------------------------------------------------
+    def acquire(self, timeout=None):
+        """
+        Havuzdan bir bağlantı alır. Boş bağlantı yoksa ve üst sınıra ulaşılmamışsa
+        yeni bir bağlantı açar; aksi halde bir bağlantı iade edilene kadar bekler.
+
+        Raises:
+            PoolTimeoutError: Süre dolduğunda hâlâ boş bağlantı yoksa.
+            mysql.connector.Error: Yeni bağlantı açılamazsa.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        connection, last_used = None, None
+
+        with self._cond:
+            waited = False
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    # Yer ayır; bağlantı kilit dışında açılacak
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"{timeout:.1f} saniye içinde havuzdan bağlantı alınamadı "
+                        f"(boyut: {self.size})."
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._checkouts += 1
+            if waited:
+                waited_for = time.monotonic() - started
+                self._waits += 1
+                self._wait_time += waited_for
+                self._max_wait = max(self._max_wait, waited_for)
+
+        try:
+            if connection is None:
+                connection = self._open_connection()
+            elif time.monotonic() - last_used > self.ping_interval and not self._is_alive(connection):
+                self._close_quietly(connection)
+                connection = self._open_connection()
+                with self._cond:
+                    self._reconnects += 1
+        except Exception:
+            # Ayrılan yeri geri ver ki bekleyen thread'ler ilerleyebilsin
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return connection
+
+    # --------------------------------------------------------------------------
+    # 2.3 Bağlantı İade Etme
+    # --------------------------------------------------------------------------
+    def release(self, connection):
+        """
+        Bağlantıyı havuza iade eder. Okunmamış sonuçlar tüketilir ve açık kalan
+        işlem geri alınır; böylece bir sonraki kullanıcı eski bir anlık görüntü
+        (snapshot) veya yarım kalmış bir işlem devralmaz. Temizlenemeyen
+        bağlantılar kapatılır ve havuzdan düşülür.
+        """
+        reusable = True
+        try:
+            if connection.unread_result:
+                connection.consume_results()
+            if connection.in_transaction:
+                connection.rollback()
+        except Error:
+            reusable = False
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._created -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._close_quietly(connection)
+
+    # --------------------------------------------------------------------------
+    # 2.4 İstatistikler
+    # --------------------------------------------------------------------------
+    def stats(self):
+        """Havuzun anlık durumunu ve kümülatif bekleme istatistiklerini döndürür."""
+        with self._cond:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_ms': round(self._wait_time * 1000, 3),
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+                'timeouts': self._timeouts,
+                'reconnects': self._reconnects,
+            }
+
+    # --------------------------------------------------------------------------
+    # 2.5 Havuzu Kapatma
+    # --------------------------------------------------------------------------
+    def close_all(self):
+        """Boştaki tüm bağlantıları kapatır. Kullanımdaki bağlantılar iade edildiğinde yeniden havuza girer."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._created -= len(idle)
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+
+# ==============================================================================
+# 3.0 SÜREÇ GENELİ HAVUZ
+# ==============================================================================
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Süreç genelinde paylaşılan bağlantı havuzunu döndürür, yoksa oluşturur.
+
+    Havuz, fork sonrası (örn. gunicorn worker'ları) ebeveyn sürecin soketlerini
+    paylaşmamak için süreç kimliğine (PID) göre yeniden oluşturulur.
+
+    DB_BACKEND=sqlite olduğunda MySQL yerine SQLITE_PATH dosyasına bağlanan
+    SqlitePool döndürülür; şema ve bekleyen migration'lar ilk kullanımda uygulanır.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            if os.getenv('DB_BACKEND', 'mysql').strip().lower() == 'sqlite':
+                _pool = _create_sqlite_pool()
+                _pool_pid = pid
+                return _pool
+            _pool = ConnectionPool(
+                connect_kwargs={
+                    'host': os.getenv('DB_HOST', 'localhost'),
+                    'database': os.getenv('DB_NAME', 'haber_editor'),
+                    'user': os.getenv('DB_USER', 'root'),
+                    'password': os.getenv('DB_PASSWORD', ''),
+                    'charset': 'utf8mb4',
+                    'collation': 'utf8mb4_unicode_ci',
+                    'use_unicode': True,
+                    'connection_timeout': 10,
+                },
+                size=int(os.getenv('DB_POOL_SIZE', '10')),
+                timeout=float(os.getenv('DB_POOL_TIMEOUT', '5')),
+                ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', '30')),
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def _create_sqlite_pool():
+    """SQLITE_PATH dosyası için şemayı hazırlar ve SQLite havuzunu oluşturur."""
+    # sqlite_backend bu modülü içe aktardığı için içe aktarma burada yapılır
+    from database.sqlite_backend import SqlitePool, ensure_schema
+
+    path = os.getenv('SQLITE_PATH', 'data/haber_editor.db')
+    ensure_schema(path)
+    return SqlitePool(
+        path,
+        size=int(os.getenv('DB_POOL_SIZE', '10')),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', '5')),
+        ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', '30')),
+    )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Kullanıcı Sayaçlarını Yeniden Oluşturma Betiği
+# ===============================================
+# Bu betik, `user_processing_stats` tablosundaki sayaçları `processing_history`
+# tablosundan yeniden hesaplar, farkları raporlar ve düzeltir. Sayaçlar normalde
+# yazma anında güncellenir; bu betik elle yapılan veritabanı değişiklikleri veya
+# olası bir sapma sonrasında uzlaştırma için kullanılır.
+#
+# Kullanım:
+#   python database/rebuild_user_stats.py [--user USER_ID] [--dry-run]
+#
+# İçindekiler:
+# -------------
+# 1.0 Uzlaştırma
+#     1.1 print_drift(): Bulunan farkları yazdırır.
+#
+# 2.0 Ana Yürütme
+#     2.1 main(): Betiğin ana işlevini yerine getirir.
+
+# --- Gerekli Kütüphaneler ---
+import argparse
+import os
+import sys
+
+# --- Proje İçi Modüller ---
+# Ana dizini path'e ekleyerek modüllerin içe aktarılmasını sağla
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import DatabaseConnection
+from services.user_stats import rebuild_user_stats, COUNTER_COLUMNS
+
+# ==============================================================================
+# 1.0 UZLAŞTIRMA
+# ==============================================================================
+
+def print_drift(drift):
+    """
+    1.1 Farkları Yazdırma
+    ---------------------
+    Her kullanıcı için yalnızca değeri farklı olan sayaçları "mevcut -> doğru"
+    biçiminde yazdırır.
+    """
+    for user_id, current, expected in drift:
+        changes = ', '.join(
+            f"{col}: {current[col]} -> {expected[col]}"
+            for col in COUNTER_COLUMNS if current[col] != expected[col]
+        )
+        print(f"  {user_id}: {changes}")
+
+# ==============================================================================
+# 2.0 ANA YÜRÜTME
+# ==============================================================================
+
+def main():
+    """
+    2.1 Ana Fonksiyon
+    -----------------
+    Sayaçları uzlaştırır. --dry-run verilirse sadece farkları raporlar.
+    """
+    parser = argparse.ArgumentParser(description='Kullanıcı işlem sayaçlarını geçmişten yeniden oluşturur.')
+    parser.add_argument('--user', help='Yalnızca bu kullanıcının sayaçlarını uzlaştır')
+    parser.add_argument('--dry-run', action='store_true', help='Değişiklik yapmadan farkları göster')
+    args = parser.parse_args()
+
+    try:
+        with DatabaseConnection() as db:
+            drift = rebuild_user_stats(db, user_id=args.user, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"HATA: Sayaçlar yeniden oluşturulamadı: {e}")
+        return 1
+
+    if not drift:
+        print("Başarılı: Tüm sayaçlar geçmişle uyumlu.")
+        return 0
+
+    print(f"Bilgi: {len(drift)} kullanıcının sayaçlarında fark bulundu:")
+    print_drift(drift)
+    if args.dry_run:
+        print("Bilgi: --dry-run verildiği için değişiklik yapılmadı.")
+    else:
+        print("Başarılı: Sayaçlar düzeltildi.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+-- =============================================================================
+-- Veritabanı Şeması (SQLite): AI Haber Editörü
+-- Kaynak: database/schema.sql + migrations/001-009
+-- Açıklama: DB_BACKEND=sqlite ile çalışan tek sunuculu kurulumlar için
+--           MySQL şemasının SQLite karşılığıdır. Tablolar migration'lar
+--           uygulanmış son hâlleriyle tanımlanır. Veritabanı dosyası boşsa
+--           database/sqlite_backend.py tarafından otomatik olarak yüklenir;
+--           sonraki değişiklikler migrations/sqlite/ altındaki dosyalarla gelir.
+--
+-- MySQL'den farklar:
+--   - AUTO_INCREMENT yerine INTEGER PRIMARY KEY AUTOINCREMENT kullanılır.
+--   - ENUM sütunları CHECK kısıtlı metin, JSON/MEDIUMTEXT sütunları TEXT'tir.
+--   - ON UPDATE CURRENT_TIMESTAMP desteklenmez; updated_at yalnızca uygulama
+--     tarafından açıkça yazıldığında değişir.
+--   - Zaman varsayılanları yerel saattir (MySQL NOW() ile aynı).
+--   - processing_history ve user_prompt_settings'teki users(user_id) yabancı
+--     anahtarları tanımlanmaz: oturum tabanlı kullanıcılar users tablosunda
+--     kayıtlı olmayabilir.
+--   - processing_history.original_text üzerindeki FULLTEXT indeksinin
+--     karşılığı yoktur.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Tanımları
+--     1.1 users
+--     1.2 prompt_configs (006: revision)
+--     1.3 prompt_sections
+--     1.4 prompt_rules
+--     1.5 prompt_rule_options
+--     1.6 user_prompt_settings
+--     1.7 processing_history (001-004, 006, 007, 009)
+--     1.8 processing_result_cache (005)
+--     1.9 user_processing_stats (008)
+-- 2.0 Varsayılan Veri Ekleme
+-- -----------------------------------------------------------------------------
+
+
+-- =============================================================================
+-- 1.0 TABLO TANIMLARI
+-- =============================================================================
+
+-- 1.1 Kullanıcılar Tablosu (`users`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(100) UNIQUE NOT NULL,
+    username VARCHAR(100) NOT NULL,
+    email VARCHAR(255) UNIQUE,
+    display_name VARCHAR(150),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    is_active BOOLEAN DEFAULT TRUE
+);
+CREATE INDEX IF NOT EXISTS idx_username ON users (username);
+CREATE INDEX IF NOT EXISTS idx_is_active ON users (is_active);
+
+
+-- 1.2 Ana Prompt Konfigürasyonları (`prompt_configs`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS prompt_configs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description TEXT,
+    is_active BOOLEAN DEFAULT FALSE,
+    is_default BOOLEAN DEFAULT FALSE,
+    version VARCHAR(50) DEFAULT '1.0',
+    revision INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_configs_is_active ON prompt_configs (is_active);
+CREATE INDEX IF NOT EXISTS idx_configs_is_default ON prompt_configs (is_default);
+
+
+-- 1.3 Prompt Bölümleri (`prompt_sections`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS prompt_sections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    config_id INTEGER NOT NULL REFERENCES prompt_configs (id) ON DELETE CASCADE,
+    section_key VARCHAR(100) NOT NULL,
+    section_name VARCHAR(255) NOT NULL,
+    prompt_text TEXT NOT NULL,
+    display_order INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT TRUE,
+    UNIQUE (config_id, section_key)
+);
+
+
+-- 1.4 Dinamik Prompt Kuralları (`prompt_rules`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS prompt_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    config_id INTEGER NOT NULL REFERENCES prompt_configs (id) ON DELETE CASCADE,
+    rule_key VARCHAR(100) NOT NULL,
+    rule_name VARCHAR(255) NOT NULL,
+    rule_type VARCHAR(20) NOT NULL CHECK (rule_type IN ('select', 'toggle', 'text', 'multiselect')),
+    rule_category VARCHAR(100) NOT NULL,
+    default_value TEXT,
+    display_order INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT TRUE,
+    UNIQUE (config_id, rule_key)
+);
+
+
+-- 1.5 Kural Seçenekleri (`prompt_rule_options`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS prompt_rule_options (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rule_id INTEGER NOT NULL REFERENCES prompt_rules (id) ON DELETE CASCADE,
+    option_key VARCHAR(100) NOT NULL,
+    option_label VARCHAR(255) NOT NULL,
+    display_order INTEGER DEFAULT 0,
+    is_active BOOLEAN DEFAULT TRUE,
+    UNIQUE (rule_id, option_key)
+);
+
+
+-- 1.6 Kullanıcı Ayarları (`user_prompt_settings`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS user_prompt_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(100) NOT NULL,
+    config_id INTEGER NOT NULL REFERENCES prompt_configs (id) ON DELETE CASCADE,
+    rule_key VARCHAR(100) NOT NULL,
+    setting_value TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (user_id, config_id, rule_key)
+);
+
+
+-- 1.7 İşlem Geçmişi (`processing_history`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS processing_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(100) NOT NULL,
+    batch_id CHAR(32) DEFAULT NULL,
+    config_id INTEGER REFERENCES prompt_configs (id) ON DELETE SET NULL,
+    original_text TEXT NOT NULL,
+    prompt_text TEXT DEFAULT NULL,
+    prompt_tokens INTEGER DEFAULT NULL,
+    processed_text TEXT,
+    settings_used TEXT DEFAULT NULL,
+    processing_status VARCHAR(20) DEFAULT 'pending'
+        CHECK (processing_status IN ('pending', 'processing', 'completed', 'failed', 'error')),
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    read_status VARCHAR(10) DEFAULT 'unread' CHECK (read_status IN ('unread', 'read')),
+    error_message TEXT,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+    completed_at DATETIME DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_history ON processing_history (user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_processing_status ON processing_history (processing_status, created_at);
+CREATE INDEX IF NOT EXISTS idx_batch_id ON processing_history (batch_id, id);
+
+
+-- 1.8 İşlem Sonucu Önbelleği (`processing_result_cache`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS processing_result_cache (
+    cache_key CHAR(64) NOT NULL PRIMARY KEY,
+    config_id INTEGER DEFAULT NULL,
+    processed_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    expires_at DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_config ON processing_result_cache (config_id);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON processing_result_cache (expires_at);
+
+
+-- 1.9 Kullanıcı İşlem Sayaçları (`user_processing_stats`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS user_processing_stats (
+    user_id VARCHAR(100) NOT NULL PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    pending INTEGER NOT NULL DEFAULT 0,
+    processing INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    unread INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+
+-- =============================================================================
+-- 2.0 VARSAYILAN VERİ EKLEME
+-- =============================================================================
+
+INSERT OR IGNORE INTO prompt_configs (name, description, is_active, is_default, version)
+VALUES ('Default News Editor', 'Varsayılan haber editörü AI prompt konfigürasyonu', TRUE, TRUE, '1.1');
+
+INSERT OR IGNORE INTO prompt_sections (config_id, section_key, section_name, prompt_text, display_order)
+SELECT c.id, s.section_key, s.section_name, s.prompt_text, s.display_order
+FROM prompt_configs c, (
+    SELECT 'gorev_tanimi' AS section_key, 'AI Editör Görev Tanımı' AS section_name, 'Sen, kurumsal bir gazetenin web sitesi için içerik üreten profesyonel bir yapay zeka editörüsün. Görevin, sana verilen orijinal haber metnini ve kuralları kullanarak, belirtilen JSON formatında profesyonel ve özgün bir haber içeriği oluşturmaktır.' AS prompt_text, 1 AS display_order
+    UNION ALL SELECT 'ozgunluk', 'Özgünlük ve İçerik Koruma Kuralları', 'Metin tamamen yeniden yazılmalı, kopya olmamalıdır. Ancak orijinal haberdeki tüm temel bilgiler, veriler, isimler ve tarihler korunmalıdır.', 2
+    UNION ALL SELECT 'kurumsal_dil', 'Yazım Stili ve Dil Kuralları', 'Kullanılacak dil resmi, profesyonel ve bilgilendirici olmalıdır. Argo veya clickbait ifadelerden kaçınılmalıdır.', 3
+    UNION ALL SELECT 'ciktinin_formati', 'Çıktı Formatı ve Yapı Kuralları', 'Çıktı, yalnızca ve yalnızca geçerli bir JSON nesnesi olmalıdır. Cevabına asla açıklama veya ek metin ekleme, sadece JSON çıktısı ver.', 4
+    UNION ALL SELECT 'etkili_baslik', 'Başlık Oluşturma Kuralları', 'Haberi net yansıtan, profesyonel, dikkat çekici, yanıltıcı olmayan bir başlık oluştur.', 5
+    UNION ALL SELECT 'haber_ozeti', 'Özet Oluşturma Kuralları', 'Haberin en önemli noktalarını içeren, 2-3 cümlelik kısa bir özet yaz.', 6
+    UNION ALL SELECT 'ozgun_haber_metni', 'Haber Metni Yeniden Yazma Kuralları', 'Tüm bilgileri koruyarak, metni özgün cümlelerle baştan yaz. İsimleri sansürle (örn: A.B.), özel şirket ve plaka bilgisi verme.', 7
+    UNION ALL SELECT 'muhtemel_kategori', 'Kategori Belirleme Kuralları', 'Verilen kategori listesinden en uygun olanı seç: Asayiş, Gündem, Ekonomi, Siyaset, Spor, Teknoloji, Sağlık, Yaşam, Eğitim, Dünya, Kültür & Sanat, Magazin, Genel', 8
+    UNION ALL SELECT 'etiketler', 'Etiket Oluşturma ve SEO Kuralları', 'Haberle ilgili, SEO uyumlu, belirtilen sayıda etiket oluştur ve bunları bir dizi (array) olarak listele.', 9
+) s
+WHERE c.name = 'Default News Editor';
+
+INSERT OR IGNORE INTO prompt_rules (config_id, rule_key, rule_name, rule_type, rule_category, default_value, display_order)
+SELECT c.id, r.rule_key, r.rule_name, r.rule_type, r.rule_category, r.default_value, r.display_order
+FROM prompt_configs c, (
+    SELECT 'targetCategory' AS rule_key, 'Hedef Kategori' AS rule_name, 'select' AS rule_type, 'content' AS rule_category, 'auto' AS default_value, 1 AS display_order
+    UNION ALL SELECT 'titleCityInfo', 'Başlıkta Şehir Bilgisi', 'toggle', 'content', 'False', 2
+    UNION ALL SELECT 'removeCompanyInfo', 'Şirket Bilgisi Kaldır', 'toggle', 'privacy', 'True', 3
+    UNION ALL SELECT 'tagCount', 'Etiket Sayısı', 'select', 'content', '5', 4
+    UNION ALL SELECT 'customInstructions', 'Özel Talimatlar', 'text', 'content', '', 5
+    UNION ALL SELECT 'outputFormat', 'Çıktı Formatı', 'select', 'format', 'json', 6
+) r
+WHERE c.name = 'Default News Editor';
+
+INSERT OR IGNORE INTO prompt_rule_options (rule_id, option_key, option_label, display_order)
+SELECT r.id, o.option_key, o.option_label, o.display_order
+FROM prompt_rules r
+JOIN prompt_configs c ON c.id = r.config_id AND c.name = 'Default News Editor'
+JOIN (
+    SELECT 'targetCategory' AS rule_key, 'auto' AS option_key, 'Otomatik Seç' AS option_label, 1 AS display_order
+    UNION ALL SELECT 'targetCategory', 'Asayiş', 'Asayiş', 2
+    UNION ALL SELECT 'targetCategory', 'Gündem', 'Gündem', 3
+    UNION ALL SELECT 'targetCategory', 'Ekonomi', 'Ekonomi', 4
+    UNION ALL SELECT 'targetCategory', 'Spor', 'Spor', 5
+    UNION ALL SELECT 'tagCount', '3', '3 Etiket', 1
+    UNION ALL SELECT 'tagCount', '5', '5 Etiket', 2
+    UNION ALL SELECT 'tagCount', '7', '7 Etiket', 3
+    UNION ALL SELECT 'outputFormat', 'json', 'JSON', 1
+    UNION ALL SELECT 'outputFormat', 'text', 'Düz Metin', 2
+) o ON o.rule_key = r.rule_key;
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# SQLite Depolama Arka Ucu
+# ========================
+# Bu modül, tek sunuculu ve uç (edge) kurulumlar için MySQL sunucusu
+# gerektirmeyen gömülü bir SQLite arka ucu sağlar. DB_BACKEND=sqlite
+# olduğunda `database.pool.get_pool()` bu modüldeki `SqlitePool`'u döndürür;
+# `DatabaseConnection` ve onu kullanan servisler (PromptService, AIService)
+# değişmeden çalışır.
+#
+# Uygulamadaki sorgular MySQL sözdizimiyle yazılmıştır. `translate_query()`
+# bunların SQLite'ta farklı olan kısımlarını çevirir: yer tutucular, satır
+# kilidi ekleri, ON DUPLICATE KEY UPDATE, INSERT IGNORE ve zaman fonksiyonları.
+# SQLite satır kilidi desteklemez; bunun yerine işlemler BEGIN IMMEDIATE ile
+# başlatılır ve yazma kilidi işlemin başında alınır (FOR UPDATE ile aynı
+# sıralama garantisi, veritabanı düzeyinde).
+#
+# Hatalar, servislerin zaten yakaladığı `mysql.connector.Error` türüne
+# dönüştürülür; böylece hata işleme yolları iki arka uçta da aynıdır.
+#
+# İçindekiler:
+# -------------
+# 1.0 Sorgu Çevirisi
+#     1.1 translate_query(): MySQL sorgusunu SQLite sözdizimine çevirir.
+# 2.0 Bağlantı Uyarlayıcısı
+#     2.1 SqliteCursor: mysql.connector'ın sözlük döndüren imleci gibi davranır.
+#     2.2 SqliteConnection: Havuz ve DatabaseConnection'ın kullandığı bağlantı arayüzü.
+# 3.0 Bağlantı Havuzu
+#     3.1 SqlitePool: ConnectionPool'un SQLite bağlantıları açan sürümü.
+# 4.0 Şema Yönetimi
+#     4.1 ensure_schema(): Şemayı ve bekleyen SQLite migration'larını uygular.
+
+# --- Gerekli Kütüphaneler ---
+import glob
+import hashlib
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+from mysql.connector import Error
+
+from database.pool import ConnectionPool
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema_sqlite.sql')
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations', 'sqlite')
+
+# ==============================================================================
+# 1.0 SORGU ÇEVİRİSİ
+# ==============================================================================
+
+_LOCK_SUFFIX = re.compile(r'\s+(FOR\s+UPDATE|LOCK\s+IN\s+SHARE\s+MODE)\s*$', re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r'^(\s*)INSERT\s+IGNORE\b', re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.IGNORECASE)
+_VALUES_REF = re.compile(r'\bVALUES\s*\(\s*(\w+)\s*\)', re.IGNORECASE)
+_NOW = re.compile(r'\b(CURRENT_TIMESTAMP|NOW\s*\(\s*\))', re.IGNORECASE)
+_PLACEHOLDER = re.compile(r'%([s%])')
+
+
+@lru_cache(maxsize=1024)
+def translate_query(query):
+    """
+    MySQL sözdizimiyle yazılmış bir sorguyu SQLite'a çevirir. Sorgular
+    uygulamada sabit metinler olduğu için sonuç önbelleğe alınır.
+
+    - %s yer tutucuları ?'e, %% ise %'ye çevrilir.
+    - FOR UPDATE / LOCK IN SHARE MODE ekleri kaldırılır (kilit, BEGIN IMMEDIATE ile alınır).
+    - INSERT IGNORE -> INSERT OR IGNORE
+    - ON DUPLICATE KEY UPDATE col = VALUES(col) -> ON CONFLICT DO UPDATE SET col = excluded.col
+    - CURRENT_TIMESTAMP / NOW() -> yerel saat (MySQL oturum saatiyle aynı biçimde)
+    """
+    query = _LOCK_SUFFIX.sub('', query.strip())
+    query = _INSERT_IGNORE.sub(r'\1INSERT OR IGNORE', query)
+
+    parts = _ON_DUPLICATE.split(query, maxsplit=1)
+    if len(parts) == 2:
+        # VALUES(col) yalnızca güncelleme kısmında eklenmek istenen değeri ifade eder
+        query = parts[0] + 'ON CONFLICT DO UPDATE SET' + _VALUES_REF.sub(r'excluded.\1', parts[1])
+
+    query = _NOW.sub("datetime('now', 'localtime')", query)
+    return _PLACEHOLDER.sub(lambda match: '?' if match.group(1) == 's' else '%', query)
+
+
+# MySQL sürücüsü gibi DATETIME/TIMESTAMP sütunlarını datetime, DATE sütunlarını
+# date olarak döndür. Zamanlar saniye hassasiyetinde yazılır (MySQL DATETIME).
+def _convert_datetime(value):
+    return datetime.fromisoformat(value.decode('utf-8'))
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode('utf-8')[:10])
+
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' ', timespec='seconds'))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter('DATETIME', _convert_datetime)
+sqlite3.register_converter('TIMESTAMP', _convert_datetime)
+sqlite3.register_converter('DATE', _convert_date)
+
+
+def _sha2(value, bits=256):
+    """MySQL SHA2() karşılığı (yalnızca 256 bit): UTF-8 metnin onaltılık SHA-256 özeti."""
+    if value is None or bits not in (0, 256):
+        return None
+    data = value if isinstance(value, bytes) else str(value).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def _register_functions(connection):
+    """Uygulama ve migration'ların kullandığı MySQL fonksiyonlarını bağlantıya ekler."""
+    connection.create_function('SHA2', 2, _sha2, deterministic=True)
+
+# ==============================================================================
+# 2.0 BAĞLANTI UYARLAYICISI
+# ==============================================================================
+
+class SqliteCursor:
+    """
+    mysql.connector'ın `cursor(dictionary=True)` imlecinin uygulamada
+    kullanılan kısmı: execute, executemany, fetchone, fetchall, rowcount,
+    lastrowid ve close.
+    """
+
+    def __init__(self, connection, dictionary=True):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate_query(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(f"SQLite: {e}") from e
+
+    def executemany(self, query, params_list):
+        try:
+            self._cursor.executemany(translate_query(query), [tuple(params) for params in params_list])
+        except sqlite3.Error as e:
+            raise Error(f"SQLite: {e}") from e
+
+    def _as_dict(self, row):
+        if not self._dictionary:
+            return row
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._as_dict(row) if row is not None else None
+
+    def fetchall(self):
+        return [self._as_dict(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        try:
+            self._cursor.close()
+        except sqlite3.Error:
+            pass
+
+
+class SqliteConnection:
+    """
+    mysql.connector bağlantısının havuz ve DatabaseConnection tarafından
+    kullanılan kısmı. Bağlantı autocommit modunda açılır (isolation_level=None);
+    işlemler yalnızca start_transaction() ile açıkça başlatılır.
+    """
+
+    # SQLite imleçleri sonuçları tembel okur; havuz iadesinde tüketilecek sonuç kalmaz
+    unread_result = False
+
+    def __init__(self, path, pragmas=(), timeout=5.0):
+        try:
+            self._connection = sqlite3.connect(
+                path, timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                isolation_level=None, check_same_thread=False,
+            )
+            _register_functions(self._connection)
+            for pragma in pragmas:
+                self._connection.execute(f"PRAGMA {pragma}")
+        except sqlite3.Error as e:
+            raise Error(f"SQLite: {e}") from e
+
+    def cursor(self, dictionary=False):
+        return SqliteCursor(self._connection, dictionary=dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._connection.in_transaction
+
+    def _run(self, statement):
+        try:
+            self._connection.execute(statement)
+        except sqlite3.Error as e:
+            raise Error(f"SQLite: {e}") from e
+
+    def start_transaction(self):
+        # Yazma kilidi işlemin başında alınır: işlem içinde okunan satırlar
+        # commit'e kadar başka bir yazar tarafından değiştirilemez.
+        self._run("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self._connection.in_transaction:
+            self._run("COMMIT")
+
+    def rollback(self):
+        if self._connection.in_transaction:
+            self._run("ROLLBACK")
+
+    def ping(self, reconnect=False):
+        self._run("SELECT 1")
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        try:
+            self._connection.close()
+        except sqlite3.Error as e:
+            raise Error(f"SQLite: {e}") from e
+
+# ==============================================================================
+# 3.0 BAĞLANTI HAVUZU
+# ==============================================================================
+
+class SqlitePool(ConnectionPool):
+    """
+    Aynı veritabanı dosyasına açılan SQLite bağlantılarını yeniden kullanan
+    havuz. WAL modunda okuyucular birbirini ve yazarı beklemez; yazarlar
+    busy_timeout süresince sırayla kilit bekler.
+    """
+
+    SESSION_STATEMENTS = ()
+
+    def __init__(self, path, size=10, timeout=5.0, ping_interval=30.0, pragmas=None):
+        """
+        Args:
+            path (str): Veritabanı dosyasının yolu.
+            pragmas (tuple, optional): Her bağlantıda uygulanacak PRAGMA ifadeleri.
+                                       Verilmezse ortam değişkenlerinden okunur.
+        """
+        super().__init__(connect_kwargs={'database': path}, size=size, timeout=timeout,
+                         ping_interval=ping_interval)
+        self.path = path
+        self.pragmas = tuple(pragmas) if pragmas is not None else default_pragmas()
+        self.busy_timeout = _busy_timeout_ms() / 1000.0
+
+    def _open_connection(self):
+        """Yeni bir SQLite bağlantısı açar ve PRAGMA ayarlarını uygular."""
+        return SqliteConnection(self.path, self.pragmas, timeout=self.busy_timeout)
+
+
+def _busy_timeout_ms():
+    return int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))
+
+
+def default_pragmas():
+    """
+    Her bağlantıda uygulanan PRAGMA ayarlarını ortam değişkenlerinden oluşturur.
+
+    - journal_mode=WAL: Okuyucular yazarı beklemez (kalıcıdır, dosyada saklanır).
+    - synchronous=NORMAL: WAL modunda güvenli; her commit'te fsync yapılmaz.
+    - foreign_keys=ON: ON DELETE CASCADE/SET NULL kısıtları uygulanır.
+    - busy_timeout: Kilit beklenirken hata vermeden önceki süre (ms).
+    - cache_size: Bağlantı başına sayfa önbelleği (negatif değer KiB).
+    - temp_store=MEMORY: Sıralama ve geçici tablolar bellekte tutulur.
+    - mmap_size: Okumalar için bellek eşlemeli G/Ç (bayt, 0: kapalı).
+    """
+    return (
+        "journal_mode = WAL",
+        f"synchronous = {os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        "foreign_keys = ON",
+        f"busy_timeout = {_busy_timeout_ms()}",
+        f"cache_size = {int(os.getenv('SQLITE_CACHE_SIZE', '-16000'))}",
+        "temp_store = MEMORY",
+        f"mmap_size = {int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))}",
+    )
+
+# ==============================================================================
+# 4.0 ŞEMA YÖNETİMİ
+# ==============================================================================
+
+def _split_statements(sql):
+    """SQL betiğini, yorumlar ve metinler içindeki ';' karakterlerini dikkate alarak ifadelere böler."""
+    statements, buffer = [], ''
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                statements.append(buffer)
+            buffer = ''
+    # Sonda noktalı virgülsüz kalan ifade (yalnızca yorum değilse)
+    if any(line.strip() and not line.strip().startswith('--') for line in buffer.splitlines()):
+        statements.append(buffer)
+    return statements
+
+
+def _apply(connection, version, sql):
+    """Bir şema sürümünü tek bir işlem içinde uygular; başka bir süreç önce uyguladıysa atlar."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        if connection.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,)).fetchone():
+            connection.execute("ROLLBACK")
+            return False
+        for statement in _split_statements(sql):
+            connection.execute(statement)
+        connection.execute("INSERT INTO schema_migrations (version) VALUES (?)", (version,))
+        connection.execute("COMMIT")
+        return True
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+
+
+def ensure_schema(path):
+    """
+    Veritabanı dosyasını hazırlar: dosya boşsa `schema_sqlite.sql` uygulanır,
+    ardından `migrations/sqlite/` altındaki henüz uygulanmamış dosyalar sırayla
+    çalıştırılır. Uygulanan sürümler `schema_migrations` tablosunda tutulur;
+    birden çok süreç aynı anda başlasa da her sürüm bir kez uygulanır.
+
+    Returns:
+        list: Bu çağrıda uygulanan sürümler; hata durumunda None.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    applied = []
+    try:
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=_busy_timeout_ms() / 1000.0, isolation_level=None)
+    except (OSError, sqlite3.Error) as e:
+        print(f"HATA: SQLite veritabanı açılamadı ({path}): {e}")
+        return None
+
+    try:
+        _register_functions(connection)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(100) NOT NULL PRIMARY KEY, "
+            "applied_at TIMESTAMP DEFAULT (datetime('now', 'localtime')))"
+        )
+        files = [('schema', SCHEMA_PATH)] + [
+            (os.path.splitext(os.path.basename(file_path))[0], file_path)
+            for file_path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '*.sql')))
+        ]
+        done = {row[0] for row in connection.execute("SELECT version FROM schema_migrations")}
+        for version, file_path in files:
+            if version in done:
+                continue
+            with open(file_path, 'r', encoding='utf-8') as f:
+                sql = f.read()
+            if _apply(connection, version, sql):
+                print(f"SQLite şeması güncellendi: {version}")
+                applied.append(version)
+        return applied
+    except (OSError, sqlite3.Error) as e:
+        print(f"HATA: SQLite şeması uygulanamadı ({path}): {e}")
+        return None
+    finally:
+        connection.close()
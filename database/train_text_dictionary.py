@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Metin Sıkıştırma Sözlüğü Eğitme Betiği
+# ======================================
+# Bu betik, geçmiş kayıtlarının sıkıştırılmasında kullanılan zlib ön
+# sözlüğünü (zdict) örnek metinlerden üretir. Örneklerde sık geçen kelime
+# dizileri, kazandırdıkları bayt miktarına göre seçilir ve en değerlileri
+# sona gelecek şekilde (zlib yakın mesafeli eşleşmeleri daha ucuz kodlar)
+# config/text_dictionaries/vN.txt dosyasına yazılır.
+#
+# Örnekler, sıkıştırılacak verinin kendisini temsil etmelidir: sözlük
+# --from-db ile üretim kayıtlarından eğitilir. Kayıtların bir kısmı (--holdout)
+# eğitime alınmaz ve raporlanan kazanç yalnızca bu ayrılmış kayıtlar üzerinde
+# ölçülür; eğitim örnekleri üzerinde ölçülen oran sözlüğün ezberlediği
+# ifadeler yüzünden gerçekte olduğundan iyi görünür. Bir kaydın haber metni ve
+# AI çıktısı birbirine çok benzediğinden ikisi her zaman aynı tarafa düşer.
+#
+# Var olan bir sürümün dosyası, o sürümle yazılmış kayıtlar okunamaz hâle
+# geleceği için üzerine yazılmaz; yeni sözlük her zaman yeni bir sürümdür.
+# Sürüm 1 sözlüksüz zlib'e ayrılmıştır; sözlükler 2'den başlar. Sözlük
+# yalnızca kısa metinlere (HISTORY_DICTIONARY_MAX_SIZE) uygulandığından kazanç
+# da bu metinler üzerinde raporlanır.
+# Yeni sürüm tüm sunuculara dağıtıldıktan sonra HISTORY_CODEC_VERSION ile
+# etkinleştirilir; eski kayıtlar database/compress_history.py --version N
+# ile yeni sürüme taşınabilir.
+#
+# Kullanım:
+#   python database/train_text_dictionary.py --version 2 --from-db 2000 [--corpus dosya.json] [--holdout 0.2] [--seed 0] [--size 16384] [--max-words 3]
+#
+# İçindekiler:
+# -------------
+# 1.0 Örnek Toplama
+#     1.1 load_samples_from_db(): Son tamamlanan kayıtlardan örnek metinleri okur.
+#     1.2 split_holdout(): Kayıtları eğitim ve ölçüm gruplarına ayırır.
+# 2.0 Eğitim
+#     2.1 train_dictionary(): Örneklerden sözlüğü üretir.
+#     2.2 compression_report(): Sözlüklü ve sözlüksüz boyutları ölçer.
+# 3.0 Ana Yürütme
+#     3.1 main(): Betiğin ana işlevini yerine getirir.
+
+# --- Gerekli Kütüphaneler ---
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import zlib
+from collections import Counter
+
+# --- Proje İçi Modüller ---
+# Ana dizini path'e ekleyerek modüllerin içe aktarılmasını sağla
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import text_codec
+
+# zlib penceresi 32 KB'tır; sözlüğün pencereden taşan başı kullanılamaz
+MAX_DICTIONARY_SIZE = 32 * 1024
+_TOKEN = re.compile(r'\s*\S+')
+
+# ==============================================================================
+# 1.0 ÖRNEK TOPLAMA
+# ==============================================================================
+
+def load_samples_from_db(limit):
+    """
+    1.1 Veritabanından Örnekler
+    ---------------------------
+    Son tamamlanan `limit` kaydın haber metinlerini ve AI çıktılarını, her
+    kayıt için bir liste olacak şekilde döndürür.
+    """
+    from database.connection import DatabaseConnection
+
+    with DatabaseConnection() as db:
+        rows = db.execute_query(
+            f"""
+            SELECT original_text, {text_codec.select_columns('processed_text')}
+            FROM processing_history
+            WHERE processing_status = 'completed'
+            ORDER BY id DESC LIMIT %s
+            """,
+            (limit,), fetch_all=True
+        ) or []
+    records = []
+    for row in rows:
+        text_codec.decode_fields(row, 'processed_text')
+        texts = [text for text in (row['original_text'], row['processed_text']) if text]
+        if texts:
+            records.append(texts)
+    return records
+
+
+def split_holdout(records, fraction, seed=0):
+    """
+    1.2 Ölçüm Ayrımı
+    ----------------
+    Kayıtları karıştırıp `fraction` kadarını ölçüm için ayırır. Bir kaydın
+    metinleri bölünmez.
+
+    Returns:
+        tuple: (eğitim metinleri, ölçüm metinleri)
+    """
+    records = list(records)
+    random.Random(seed).shuffle(records)
+    held = int(round(len(records) * fraction))
+    if fraction > 0 and len(records) > 1:
+        held = min(max(held, 1), len(records) - 1)
+    train = [text for record in records[held:] for text in record]
+    holdout = [text for record in records[:held] for text in record]
+    return train, holdout
+
+# ==============================================================================
+# 2.0 EĞİTİM
+# ==============================================================================
+
+def train_dictionary(samples, size=16 * 1024, max_words=3):
+    """
+    2.1 Sözlük Üretme
+    -----------------
+    Örneklerdeki 1..max_words kelimelik dizileri (önlerindeki boşlukla birlikte)
+    sayar. En az iki kez geçen her dizinin değeri (tekrar - 1) * bayt uzunluğudur.
+    Diziler değere göre seçilir; seçilmiş bir dizinin içinde kalanlar atlanır.
+
+    Returns:
+        bytes: Sözlük içeriği (en fazla `size` bayt).
+    """
+    counts = Counter()
+    for sample in samples:
+        tokens = _TOKEN.findall(sample)
+        for length in range(1, max_words + 1):
+            for start in range(len(tokens) - length + 1):
+                counts[''.join(tokens[start:start + length])] += 1
+
+    scored = sorted(
+        ((count - 1) * len(piece.encode('utf-8')), piece)
+        for piece, count in counts.items() if count >= 2
+    )
+    selected, total = [], 0
+    for score, piece in reversed(scored):
+        encoded = piece.encode('utf-8')
+        if total + len(encoded) > size:
+            continue
+        if any(piece in chosen for chosen in selected):
+            continue
+        selected.append(piece)
+        total += len(encoded)
+
+    # En değerli diziler sona (bir sonraki metne en yakın konuma) yazılır
+    return ''.join(reversed(selected)).encode('utf-8')
+
+
+def compression_report(samples, zdict):
+    """
+    2.2 Kazanç Ölçümü
+    -----------------
+    Sözlüklü ve sözlüksüz toplam sıkıştırılmış boyutu döndürür. Sözlüğün
+    eğitiminde kullanılmamış örneklerle çağrılmalıdır.
+    """
+    raw = plain = trained = 0
+    for sample in samples:
+        data = sample.encode('utf-8')
+        raw += len(data)
+        plain += len(zlib.compress(data, text_codec.COMPRESSION_LEVEL))
+        compressor = zlib.compressobj(text_codec.COMPRESSION_LEVEL, zdict=zdict)
+        trained += len(compressor.compress(data) + compressor.flush())
+    return raw, plain, trained
+
+# ==============================================================================
+# 3.0 ANA YÜRÜTME
+# ==============================================================================
+
+def main():
+    """
+    3.1 Ana Fonksiyon
+    -----------------
+    Örnekleri toplar, sözlüğü eğitir, kazancı raporlar ve yeni sürüm dosyasını yazar.
+    """
+    parser = argparse.ArgumentParser(description='Geçmiş kayıtları için zlib sıkıştırma sözlüğü üretir.')
+    parser.add_argument('--version', type=int, required=True, help='Yazılacak sözlük sürümü (>= 2)')
+    parser.add_argument('--from-db', type=int, default=0, metavar='N', help='Son N tamamlanan kayıttan örnek al')
+    parser.add_argument('--corpus', action='append', default=[],
+                        help='Metin listesi içeren JSON dosyası (tekrarlanabilir; her metin ayrı bir kayıt sayılır)')
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help='Eğitime alınmayıp kazancın ölçüldüğü kayıt oranı')
+    parser.add_argument('--seed', type=int, default=0, help='Ölçüm ayrımı için rastgelelik tohumu')
+    parser.add_argument('--size', type=int, default=16 * 1024, help='Sözlüğün en büyük boyutu (bayt)')
+    parser.add_argument('--max-words', type=int, default=3,
+                        help='Dizilerin en fazla kelime sayısı (uzun diziler örneklere fazla uyar)')
+    parser.add_argument('--dry-run', action='store_true', help='Dosya yazmadan yalnızca kazancı raporla')
+    args = parser.parse_args()
+
+    if args.version <= text_codec.CODEC_ZLIB:
+        print("HATA: Sözlük sürümü 2 veya daha büyük olmalıdır (0 sıkıştırmasız, 1 sözlüksüz zlib biçimidir).")
+        return 1
+    if not 0 < args.holdout < 1:
+        print("HATA: --holdout 0 ile 1 arasında olmalıdır (kazanç eğitimde kullanılmayan kayıtlarla ölçülür).")
+        return 1
+    path = os.path.join(text_codec.DICTIONARY_DIR, f'v{args.version}.txt')
+    if os.path.exists(path) and not args.dry_run:
+        print(f"HATA: {path} zaten var. Var olan sözlükler değiştirilemez; yeni bir sürüm numarası kullanın.")
+        return 1
+
+    records = []
+    for corpus_path in args.corpus:
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            records.extend([text] for text in json.load(f) if isinstance(text, str) and text)
+    if args.from_db:
+        try:
+            records.extend(load_samples_from_db(args.from_db))
+        except Exception as e:
+            print(f"HATA: Örnekler veritabanından okunamadı: {e}")
+            return 1
+    if len(records) < 2:
+        print("HATA: Eğitim ve ölçüm için en az iki kayıt gerekir (--from-db veya --corpus verin).")
+        return 1
+
+    samples, holdout = split_holdout(records, args.holdout, args.seed)
+    # Sözlük yalnızca kısa metinlere uygulanır; kazanç da onlarda ölçülür
+    holdout = [text for text in holdout if len(text.encode('utf-8')) <= text_codec.DICTIONARY_MAX_SIZE]
+    if not holdout:
+        print(f"HATA: Ölçüm kayıtlarında {text_codec.DICTIONARY_MAX_SIZE} bayttan kısa metin yok.")
+        return 1
+    zdict = train_dictionary(samples, size=min(args.size, MAX_DICTIONARY_SIZE), max_words=args.max_words)
+    raw, plain, trained = compression_report(holdout, zdict)
+    print(f"Eğitim: {len(samples)} metin")
+    print(f"Ölçüm (eğitimde kullanılmadı, en fazla {text_codec.DICTIONARY_MAX_SIZE} bayt): {len(holdout)} metin, {raw} bayt")
+    print(f"Sözlük: {len(zdict)} bayt")
+    print(f"Sözlüksüz zlib: {plain} bayt ({plain / raw:.1%})")
+    print(f"Sözlüklü zlib:  {trained} bayt ({trained / raw:.1%})")
+
+    if args.dry_run:
+        print("Bilgi: --dry-run verildiği için dosya yazılmadı.")
+        return 0
+    os.makedirs(text_codec.DICTIONARY_DIR, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(zdict)
+    print(f"Başarılı: Sözlük yazıldı: {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
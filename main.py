@@ -67,6 +67,26 @@ def internal_error(error):
 from routes import init_app
 init_app(app)
 
+# Arka Plan İş Kuyruğu
+# ---
+# Yeniden başlatma öncesi 'pending'/'processing' durumunda kalan işler, isteği
+# karşılayan süreçte ilk istekle birlikte bir kez kuyruğa geri alınır. Yalnızca
+# sahipliği JOB_STALE_AFTER süresince yenilenmemiş kayıtlar alındığından, yeni
+# başlayan bir süreç canlı süreçlerin kuyruğa aldığı veya çalıştırdığı işlere
+# dokunmaz.
+# (Geliştirme sunucusunun yeniden yükleyici ana süreci istek almadığı için atlanır.)
+_job_recovery_done = False
+
+@app.before_request
+def recover_background_jobs():
+    global _job_recovery_done
+    if _job_recovery_done:
+        return
+    _job_recovery_done = True
+    if os.getenv('JOB_RECOVERY_ON_STARTUP', 'true').lower() == 'true':
+        from services.ai_service import AIService
+        AIService().recover_pending_jobs()
+
 # 5.0 Uygulama Başlatma
 # ---
 if __name__ == '__main__':
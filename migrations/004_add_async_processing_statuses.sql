@@ -0,0 +1,27 @@
+-- =============================================================================
+-- MIGRATION: 004 - Asenkron İşleme Durumları
+-- AÇIKLAMA: Bu betik, arka plan iş kuyruğunun kullandığı 'pending' ve
+--           'processing' durumlarını `processing_status` sütununa ekler ve
+--           yeniden başlatma sonrası kurtarma sorgusu için bir indeks oluşturur.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Sütun Değişikliği (`processing_status`)
+-- 2.0 İndeks Ekleme (Kurtarma sorgusu için)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 SÜTUN DEĞİŞİKLİĞİ (`processing_status`)
+-- -----------------------------------------------------------------------------
+-- Uygulamanın kullandığı tüm durum değerlerini kapsayacak şekilde ENUM'u genişletir:
+--   pending -> processing -> completed | error (eski kayıtlar için 'failed' korunur)
+ALTER TABLE `processing_history`
+MODIFY COLUMN `processing_status` ENUM('pending', 'processing', 'completed', 'failed', 'error') DEFAULT 'pending';
+
+
+-- 2.0 İNDEKS EKLEME (Kurtarma sorgusu için)
+-- -----------------------------------------------------------------------------
+-- Yarım kalan işlerin (`pending`/`processing`) tablo taraması yapılmadan bulunmasını sağlar.
+ALTER TABLE `processing_history` ADD INDEX `idx_processing_status` (`processing_status`, `created_at`);
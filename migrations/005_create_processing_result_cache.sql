@@ -0,0 +1,36 @@
+-- =============================================================================
+-- MIGRATION: 005 - İşlem Sonucu Önbelleği
+-- AÇIKLAMA: Bu betik, aynı haber metni ve ayarlarla üretilmiş AI sonuçlarının
+--           yeniden kullanılması için kalıcı önbellek tablosunu oluşturur ve
+--           `processing_history` tablosuna önbellekten karşılanan kayıtları
+--           işaretleyen `cache_hit` sütununu ekler.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`processing_result_cache`)
+-- 2.0 Yeni Sütun Ekleme (`cache_hit`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`processing_result_cache`)
+-- -----------------------------------------------------------------------------
+-- `cache_key`: Normalize metin + ayarlar + konfigürasyon sürümü + model adının SHA-256 özeti.
+CREATE TABLE IF NOT EXISTS `processing_result_cache` (
+  `cache_key` CHAR(64) NOT NULL,
+  `config_id` INT DEFAULT NULL,
+  `processed_text` MEDIUMTEXT NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `expires_at` DATETIME NOT NULL,
+  PRIMARY KEY (`cache_key`),
+  KEY `idx_cache_config` (`config_id`),
+  KEY `idx_cache_expires` (`expires_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- 2.0 YENİ SÜTUN EKLEME (`cache_hit`)
+-- -----------------------------------------------------------------------------
+-- Kaydın modeli çağırmadan önbellekten karşılandığını belirtir.
+ALTER TABLE `processing_history`
+ADD COLUMN `cache_hit` TINYINT(1) NOT NULL DEFAULT 0 AFTER `processing_status`;
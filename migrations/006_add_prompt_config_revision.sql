@@ -0,0 +1,20 @@
+-- =============================================================================
+-- MIGRATION: 006 - Prompt Konfigürasyonu Revizyon Sayacı
+-- AÇIKLAMA: Bu betik, `prompt_configs` tablosuna her içerik değişikliğinde
+--           artırılan `revision` sütununu ekler. Worker'lar süreç içi
+--           konfigürasyon önbelleğinin güncel olup olmadığını bu sütunla
+--           kontrol eder. `updated_at` saniye çözünürlüklü olduğundan aynı
+--           saniye içindeki iki değişikliği ayırt edemez.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`revision`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`revision`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE `prompt_configs`
+ADD COLUMN `revision` INT UNSIGNED NOT NULL DEFAULT 1 AFTER `version`;
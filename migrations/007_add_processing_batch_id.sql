@@ -0,0 +1,27 @@
+-- =============================================================================
+-- MIGRATION: 007 - Toplu İşlem Kimliği
+-- AÇIKLAMA: Bu betik, `processing_history` tablosuna aynı toplu istekle
+--           (POST /api/v1/news/process-batch) oluşturulan kayıtları
+--           gruplayan `batch_id` sütununu ve sorgulama için indeksini ekler.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`batch_id`)
+-- 2.0 İndeks Ekleme
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`batch_id`)
+-- -----------------------------------------------------------------------------
+-- Tekil işlemler için NULL kalır.
+ALTER TABLE `processing_history`
+ADD COLUMN `batch_id` CHAR(32) DEFAULT NULL AFTER `user_id`;
+
+
+-- 2.0 İNDEKS EKLEME
+-- -----------------------------------------------------------------------------
+-- Toplu işlem durumunun sorgulanması batch_id üzerinden yapılır.
+ALTER TABLE `processing_history`
+ADD INDEX `idx_batch_id` (`batch_id`, `id`);
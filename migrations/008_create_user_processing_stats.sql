@@ -0,0 +1,51 @@
+-- =============================================================================
+-- MIGRATION: 008 - Kullanıcı İşlem Sayaçları
+-- AÇIKLAMA: Bu betik, kullanıcı başına işlem sayaçlarını tutan
+--           `user_processing_stats` tablosunu oluşturur ve mevcut
+--           `processing_history` kayıtlarından ilk değerlerini hesaplar.
+--           Sayaçlar uygulama tarafından her kayıt ekleme, durum değişikliği
+--           ve okundu işaretlemesinde aynı işlem içinde güncellenir.
+--           Sapma olursa `python database/rebuild_user_stats.py` ile uzlaştırılır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`user_processing_stats`)
+-- 2.0 Mevcut Geçmişten Doldurma
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`user_processing_stats`)
+-- -----------------------------------------------------------------------------
+-- `failed`: 'error' ve eski 'failed' durumundaki kayıtlar.
+-- Sayaçlar işaretli (signed) tutulur; olası bir sapma hata yerine rebuild ile düzeltilir.
+CREATE TABLE IF NOT EXISTS `user_processing_stats` (
+  `user_id` VARCHAR(100) NOT NULL,
+  `total` INT NOT NULL DEFAULT 0,
+  `pending` INT NOT NULL DEFAULT 0,
+  `processing` INT NOT NULL DEFAULT 0,
+  `completed` INT NOT NULL DEFAULT 0,
+  `failed` INT NOT NULL DEFAULT 0,
+  `unread` INT NOT NULL DEFAULT 0,
+  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`user_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- 2.0 MEVCUT GEÇMİŞTEN DOLDURMA
+-- -----------------------------------------------------------------------------
+INSERT INTO `user_processing_stats` (`user_id`, `total`, `pending`, `processing`, `completed`, `failed`, `unread`)
+SELECT `user_id`,
+       COUNT(*),
+       SUM(`processing_status` = 'pending'),
+       SUM(`processing_status` = 'processing'),
+       SUM(`processing_status` = 'completed'),
+       SUM(`processing_status` IN ('error', 'failed')),
+       SUM(`read_status` = 'unread')
+FROM `processing_history`
+WHERE `user_id` IS NOT NULL
+GROUP BY `user_id`
+ON DUPLICATE KEY UPDATE
+  `total` = VALUES(`total`), `pending` = VALUES(`pending`), `processing` = VALUES(`processing`),
+  `completed` = VALUES(`completed`), `failed` = VALUES(`failed`), `unread` = VALUES(`unread`);
@@ -0,0 +1,21 @@
+-- =============================================================================
+-- MIGRATION: 009 - Prompt Token Sayısı
+-- AÇIKLAMA: Bu betik, `processing_history` tablosuna modele gönderilen
+--           prompt'un model tarafında sayılan token sayısını tutan
+--           `prompt_tokens` sütununu ekler. Sıkıştırılmış (PROMPT_COMPACTION)
+--           ve normal prompt'ların maliyetini karşılaştırmak için kullanılır.
+--           Önbellekten dönen sonuçlarda model çağrılmadığı için NULL kalır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Sütun Ekleme (`prompt_tokens`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 SÜTUN EKLEME (`prompt_tokens`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE `processing_history`
+  ADD COLUMN `prompt_tokens` INT UNSIGNED DEFAULT NULL
+  COMMENT 'Prompt için model tarafında sayılan token sayısı' AFTER `prompt_text`;
@@ -0,0 +1,93 @@
+-- =============================================================================
+-- MIGRATION: 010 - Prompt Şablonları ve Ayar Anlık Görüntüleri
+-- AÇIKLAMA: Bu betik, `processing_history` kayıtlarında tekrar eden prompt ve
+--           ayar içeriklerini SHA-256 özetiyle bir kez saklayan
+--           `prompt_templates` ve `settings_snapshots` tablolarını oluşturur.
+--           Prompt'taki haber metni '{{ORIGINAL_TEXT}}' yer tutucusuyla
+--           değiştirilerek şablon elde edilir; tam prompt, şablona kaydın
+--           `original_text` alanı konularak yeniden oluşturulur
+--           (bkz. services/history_store.py).
+--           Mevcut kayıtlar doldurulur ve satır içi kopyaları NULL yapılır.
+--           Büyük tablolarda güncelleme uzun sürebilir; düşük trafikli bir
+--           zamanda çalıştırılmalıdır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`prompt_templates`, `settings_snapshots`)
+-- 2.0 Yeni Sütun Ekleme (`prompt_hash`, `settings_hash`)
+-- 3.0 Mevcut Kayıtları Doldurma
+--     3.1 Prompt şablonları
+--     3.2 Ayar anlık görüntüleri
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`prompt_templates`, `settings_snapshots`)
+-- -----------------------------------------------------------------------------
+-- Özetler içeriğin UTF-8 baytlarının SHA-256 değeridir (SHA2(text, 256)).
+-- Satırlar yalnızca eklenir, hiçbir zaman güncellenmez.
+CREATE TABLE IF NOT EXISTS `prompt_templates` (
+  `template_hash` CHAR(64) CHARACTER SET ascii NOT NULL,
+  `template_text` MEDIUMTEXT NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`template_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `settings_snapshots` (
+  `settings_hash` CHAR(64) CHARACTER SET ascii NOT NULL,
+  `settings_json` LONGTEXT NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`settings_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- 2.0 YENİ SÜTUN EKLEME (`prompt_hash`, `settings_hash`)
+-- -----------------------------------------------------------------------------
+-- `prompt_text` ve `settings_used` yalnızca şablona dönüştürülemeyen içerikler
+-- (ör. yer tutucuyu içeren metinler) için satır içinde kullanılmaya devam eder.
+ALTER TABLE `processing_history`
+  ADD COLUMN `prompt_hash` CHAR(64) CHARACTER SET ascii DEFAULT NULL
+    COMMENT 'prompt_templates.template_hash' AFTER `prompt_text`,
+  ADD COLUMN `settings_hash` CHAR(64) CHARACTER SET ascii DEFAULT NULL
+    COMMENT 'settings_snapshots.settings_hash' AFTER `settings_used`;
+
+
+-- 3.0 MEVCUT KAYITLARI DOLDURMA
+-- -----------------------------------------------------------------------------
+-- 3.1 Prompt şablonları
+-- Yer tutucuyu zaten içeren prompt veya haber metinleri birebir geri
+-- oluşturulamayacağı için satır içinde bırakılır.
+INSERT IGNORE INTO `prompt_templates` (`template_hash`, `template_text`)
+SELECT SHA2(`template`, 256), `template`
+FROM (
+  SELECT DISTINCT REPLACE(`prompt_text`, `original_text`, '{{ORIGINAL_TEXT}}') AS `template`
+  FROM `processing_history`
+  WHERE `prompt_text` IS NOT NULL AND `original_text` <> ''
+    AND INSTR(`prompt_text`, '{{ORIGINAL_TEXT}}') = 0
+    AND INSTR(`original_text`, '{{ORIGINAL_TEXT}}') = 0
+) AS `templates`;
+
+UPDATE `processing_history`
+SET `prompt_hash` = SHA2(REPLACE(`prompt_text`, `original_text`, '{{ORIGINAL_TEXT}}'), 256),
+    `prompt_text` = NULL
+WHERE `prompt_text` IS NOT NULL AND `original_text` <> ''
+  AND INSTR(`prompt_text`, '{{ORIGINAL_TEXT}}') = 0
+  AND INSTR(`original_text`, '{{ORIGINAL_TEXT}}') = 0;
+
+-- 3.2 Ayar anlık görüntüleri
+-- Mevcut JSON metinleri olduğu gibi özetlenir; uygulamanın yazdığı kanonik
+-- (anahtarları sıralı) JSON ile aynı ayarlar en fazla iki kez saklanmış olur.
+INSERT IGNORE INTO `settings_snapshots` (`settings_hash`, `settings_json`)
+SELECT DISTINCT SHA2(`settings_used`, 256), `settings_used`
+FROM `processing_history`
+WHERE `settings_used` IS NOT NULL;
+
+UPDATE `processing_history`
+SET `settings_hash` = SHA2(`settings_used`, 256),
+    `settings_used` = NULL
+WHERE `settings_used` IS NOT NULL;
+
+-- Boşalan alan InnoDB tarafından yeniden kullanılır; dosya boyutunu hemen
+-- küçültmek için isteğe bağlı olarak çalıştırılabilir:
+-- OPTIMIZE TABLE `processing_history`;
@@ -0,0 +1,33 @@
+-- =============================================================================
+-- MIGRATION: 011 - Geçmiş Metinlerinin Sıkıştırılması
+-- AÇIKLAMA: Bu betik, `processing_history` tablosundaki büyük metin
+--           alanlarının (AI çıktısı ve satır içi prompt) sıkıştırılmış
+--           olarak saklanacağı BLOB sütunlarını ve her kaydın son yazımında
+--           kullanılan kodlayıcı sürümünü tutan `text_codec` sütununu ekler
+--           (bkz. services/text_codec.py).
+--           `original_text` aranabilir kalması için sıkıştırılmaz.
+--           Mevcut kayıtlar bu betikte DEĞİŞTİRİLMEZ; uygulama iki biçimi de
+--           okur. Eski kayıtlar, tabloyu uzun süre kilitlememek için
+--           database/compress_history.py ile arka planda, küçük gruplar
+--           hâlinde sıkıştırılır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`text_codec`, `processed_data`, `prompt_data`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`text_codec`, `processed_data`, `prompt_data`)
+-- -----------------------------------------------------------------------------
+-- Bir alanın *_data sütunu doluysa düz metin sütunu NULL'dur (veya tersi).
+-- *_data değerinin ilk baytı, o değerin kodlayıcı sürümüdür.
+ALTER TABLE `processing_history`
+  ADD COLUMN `text_codec` TINYINT UNSIGNED NOT NULL DEFAULT 0
+    COMMENT 'Alanların yazıldığı en eski kodlayıcı sürümü (0: sıkıştırılmamış)' AFTER `original_text`,
+  ADD COLUMN `prompt_data` MEDIUMBLOB DEFAULT NULL
+    COMMENT 'Sıkıştırılmış prompt_text' AFTER `prompt_text`,
+  ADD COLUMN `processed_data` MEDIUMBLOB DEFAULT NULL
+    COMMENT 'Sıkıştırılmış processed_text' AFTER `processed_text`;
+
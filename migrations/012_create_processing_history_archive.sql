@@ -0,0 +1,31 @@
+-- =============================================================================
+-- MIGRATION: 012 - İşlem Geçmişi Arşiv Tablosu
+-- AÇIKLAMA: Bu betik, eski `processing_history` kayıtlarının taşındığı
+--           `processing_history_archive` tablosunu oluşturur. Kayıtlar
+--           database/archive_history.py ile, HISTORY_ARCHIVE_AFTER_DAYS
+--           günden eski, son durumuna ulaşmış ve okunmuş olanlar küçük
+--           gruplar hâlinde taşınır; uygulama geçmiş sayfalarında arşive
+--           yalnızca imleç sıcak pencerenin dışına çıktığında bakar
+--           (bkz. services/history_archive.py).
+--
+--           Aylık RANGE bölümleme (partitioning) yerine ayrı tablo seçildi:
+--           InnoDB bölümlenmiş tablolarda FULLTEXT indeksini desteklemez ve
+--           bölümleme sütununun (created_at) birincil anahtara eklenmesini
+--           gerektirir.
+--
+--           `processing_history`'ye ileride eklenen her sütun bu tabloya da
+--           eklenmelidir.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`processing_history_archive`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`processing_history_archive`)
+-- -----------------------------------------------------------------------------
+-- LIKE; sütunları, indeksleri (idx_user_history ve FULLTEXT dahil) kopyalar,
+-- yabancı anahtarları kopyalamaz. Kayıtlar kimlikleriyle birlikte taşınır.
+CREATE TABLE IF NOT EXISTS `processing_history_archive` LIKE `processing_history`;
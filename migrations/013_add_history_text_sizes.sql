@@ -0,0 +1,50 @@
+-- =============================================================================
+-- MIGRATION: 013 - Geçmiş Metin Boyutları
+-- AÇIKLAMA: Bu betik, geçmiş listesinin metinleri okumadan (ve sıkıştırılmış
+--           çıktıyı açmadan) gösterebilmesi için haber metninin ve AI
+--           çıktısının UTF-8 bayt boyutunu tutan `original_size` ve
+--           `processed_size` sütunlarını her iki geçmiş tablosuna ekler.
+--           Yeni kayıtlarda boyutlar uygulama tarafından yazılır.
+--
+--           Mevcut kayıtlarda `original_size` ve düz saklanan çıktıların
+--           `processed_size` değeri bu betikte doldurulur. Sıkıştırılmış
+--           çıktıların boyutu SQL'de hesaplanamadığından bu kayıtların
+--           `text_codec` değeri 0'a çekilir; database/compress_history.py
+--           bunları arka planda yeniden yazarken boyutu da doldurur. Değerin
+--           kendisi sürüm baytını taşıdığından bu kayıtlar okunmaya devam eder.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`original_size`, `processed_size`)
+-- 2.0 Mevcut Kayıtların Doldurulması
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`original_size`, `processed_size`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE `processing_history`
+  ADD COLUMN `original_size` INT UNSIGNED DEFAULT NULL
+    COMMENT 'original_text UTF-8 bayt boyutu' AFTER `original_text`,
+  ADD COLUMN `processed_size` INT UNSIGNED DEFAULT NULL
+    COMMENT 'Açılmış processed_text UTF-8 bayt boyutu' AFTER `processed_data`;
+
+ALTER TABLE `processing_history_archive`
+  ADD COLUMN `original_size` INT UNSIGNED DEFAULT NULL
+    COMMENT 'original_text UTF-8 bayt boyutu' AFTER `original_text`,
+  ADD COLUMN `processed_size` INT UNSIGNED DEFAULT NULL
+    COMMENT 'Açılmış processed_text UTF-8 bayt boyutu' AFTER `processed_data`;
+
+
+-- 2.0 MEVCUT KAYITLARIN DOLDURULMASI
+-- -----------------------------------------------------------------------------
+UPDATE `processing_history`
+SET `original_size` = OCTET_LENGTH(`original_text`),
+    `processed_size` = OCTET_LENGTH(`processed_text`),
+    `text_codec` = IF(`processed_data` IS NULL, `text_codec`, 0);
+
+UPDATE `processing_history_archive`
+SET `original_size` = OCTET_LENGTH(`original_text`),
+    `processed_size` = OCTET_LENGTH(`processed_text`),
+    `text_codec` = IF(`processed_data` IS NULL, `text_codec`, 0);
@@ -0,0 +1,31 @@
+-- =============================================================================
+-- MIGRATION: 014 - İşin Alınma Zamanı
+-- AÇIKLAMA: Bu betik, bir kaydın arka plan worker'ı tarafından 'pending'
+--           durumundan 'processing' durumuna alındığı zamanı tutan
+--           `claimed_at` sütununu her iki geçmiş tablosuna ekler. Takılı
+--           kalmış işler oluşturulma zamanına göre değil, bu zamana göre
+--           belirlenir; böylece kuyrukta uzun süre bekleyip yeni başlamış
+--           işler yeniden kuyruğa alınmaz. Yarım kalan 'pending' kayıtları
+--           kuyruğa geri alan süreç de bu sütunu yeniler; böylece aynı anda
+--           başlayan diğer süreçler aynı kayıtları tekrar kuyruğa almaz.
+--
+--           Mevcut 'processing' kayıtlarında değer NULL kalır; bu kayıtlar
+--           için oluşturulma zamanı kullanılır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Sütun Ekleme (`claimed_at`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 SÜTUN EKLEME (`claimed_at`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE `processing_history`
+  ADD COLUMN `claimed_at` DATETIME DEFAULT NULL
+  COMMENT 'Kaydın bir süreç tarafından alındığı (kuyruğa/işlenmeye) son zaman' AFTER `created_at`;
+
+ALTER TABLE `processing_history_archive`
+  ADD COLUMN `claimed_at` DATETIME DEFAULT NULL
+  COMMENT 'Kaydın bir süreç tarafından alındığı (kuyruğa/işlenmeye) son zaman' AFTER `created_at`;
@@ -0,0 +1,65 @@
+-- =============================================================================
+-- MIGRATION (SQLite): 010 - Prompt Şablonları ve Ayar Anlık Görüntüleri
+-- AÇIKLAMA: migrations/010_create_prompt_templates_and_settings_snapshots.sql
+--           betiğinin SQLite karşılığıdır. SHA2() fonksiyonu
+--           database/sqlite_backend.py tarafından bağlantıya eklenir.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`prompt_templates`, `settings_snapshots`)
+-- 2.0 Yeni Sütun Ekleme (`prompt_hash`, `settings_hash`)
+-- 3.0 Mevcut Kayıtları Doldurma
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`prompt_templates`, `settings_snapshots`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS prompt_templates (
+    template_hash CHAR(64) NOT NULL PRIMARY KEY,
+    template_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS settings_snapshots (
+    settings_hash CHAR(64) NOT NULL PRIMARY KEY,
+    settings_json TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+
+-- 2.0 YENİ SÜTUN EKLEME (`prompt_hash`, `settings_hash`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE processing_history ADD COLUMN prompt_hash CHAR(64) DEFAULT NULL;
+ALTER TABLE processing_history ADD COLUMN settings_hash CHAR(64) DEFAULT NULL;
+
+
+-- 3.0 MEVCUT KAYITLARI DOLDURMA
+-- -----------------------------------------------------------------------------
+INSERT OR IGNORE INTO prompt_templates (template_hash, template_text)
+SELECT SHA2(template, 256), template
+FROM (
+    SELECT DISTINCT REPLACE(prompt_text, original_text, '{{ORIGINAL_TEXT}}') AS template
+    FROM processing_history
+    WHERE prompt_text IS NOT NULL AND original_text <> ''
+      AND INSTR(prompt_text, '{{ORIGINAL_TEXT}}') = 0
+      AND INSTR(original_text, '{{ORIGINAL_TEXT}}') = 0
+);
+
+UPDATE processing_history
+SET prompt_hash = SHA2(REPLACE(prompt_text, original_text, '{{ORIGINAL_TEXT}}'), 256),
+    prompt_text = NULL
+WHERE prompt_text IS NOT NULL AND original_text <> ''
+  AND INSTR(prompt_text, '{{ORIGINAL_TEXT}}') = 0
+  AND INSTR(original_text, '{{ORIGINAL_TEXT}}') = 0;
+
+INSERT OR IGNORE INTO settings_snapshots (settings_hash, settings_json)
+SELECT DISTINCT SHA2(settings_used, 256), settings_used
+FROM processing_history
+WHERE settings_used IS NOT NULL;
+
+UPDATE processing_history
+SET settings_hash = SHA2(settings_used, 256),
+    settings_used = NULL
+WHERE settings_used IS NOT NULL;
@@ -0,0 +1,19 @@
+-- =============================================================================
+-- MIGRATION (SQLite): 011 - Geçmiş Metinlerinin Sıkıştırılması
+-- AÇIKLAMA: migrations/011_add_history_text_compression.sql betiğinin SQLite
+--           karşılığıdır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`text_codec`, `processed_data`, `prompt_data`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`text_codec`, `processed_data`, `prompt_data`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE processing_history ADD COLUMN text_codec INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE processing_history ADD COLUMN prompt_data BLOB DEFAULT NULL;
+ALTER TABLE processing_history ADD COLUMN processed_data BLOB DEFAULT NULL;
+
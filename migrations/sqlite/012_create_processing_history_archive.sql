@@ -0,0 +1,40 @@
+-- =============================================================================
+-- MIGRATION (SQLite): 012 - İşlem Geçmişi Arşiv Tablosu
+-- AÇIKLAMA: migrations/012_create_processing_history_archive.sql betiğinin
+--           SQLite karşılığıdır. SQLite'ta CREATE TABLE ... LIKE olmadığından
+--           sütunlar açıkça tanımlanır; kimlikler sıcak tablodan geldiği için
+--           AUTOINCREMENT kullanılmaz.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Tablo Oluşturma (`processing_history_archive`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 TABLO OLUŞTURMA (`processing_history_archive`)
+-- -----------------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS processing_history_archive (
+    id INTEGER PRIMARY KEY,
+    user_id VARCHAR(100) NOT NULL,
+    batch_id CHAR(32) DEFAULT NULL,
+    config_id INTEGER DEFAULT NULL,
+    original_text TEXT NOT NULL,
+    text_codec INTEGER NOT NULL DEFAULT 0,
+    prompt_text TEXT DEFAULT NULL,
+    prompt_data BLOB DEFAULT NULL,
+    prompt_hash CHAR(64) DEFAULT NULL,
+    prompt_tokens INTEGER DEFAULT NULL,
+    processed_text TEXT,
+    processed_data BLOB DEFAULT NULL,
+    settings_used TEXT DEFAULT NULL,
+    settings_hash CHAR(64) DEFAULT NULL,
+    processing_status VARCHAR(20) DEFAULT 'pending',
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    read_status VARCHAR(10) DEFAULT 'unread',
+    error_message TEXT,
+    created_at DATETIME DEFAULT NULL,
+    completed_at DATETIME DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archive_user_history ON processing_history_archive (user_id, created_at DESC);
@@ -0,0 +1,34 @@
+-- =============================================================================
+-- MIGRATION (SQLite): 013 - Geçmiş Metin Boyutları
+-- AÇIKLAMA: migrations/013_add_history_text_sizes.sql betiğinin SQLite
+--           karşılığıdır. OCTET_LENGTH yerine length(CAST(... AS BLOB))
+--           kullanılır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Yeni Sütun Ekleme (`original_size`, `processed_size`)
+-- 2.0 Mevcut Kayıtların Doldurulması
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 YENİ SÜTUN EKLEME (`original_size`, `processed_size`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE processing_history ADD COLUMN original_size INTEGER DEFAULT NULL;
+ALTER TABLE processing_history ADD COLUMN processed_size INTEGER DEFAULT NULL;
+ALTER TABLE processing_history_archive ADD COLUMN original_size INTEGER DEFAULT NULL;
+ALTER TABLE processing_history_archive ADD COLUMN processed_size INTEGER DEFAULT NULL;
+
+
+-- 2.0 MEVCUT KAYITLARIN DOLDURULMASI
+-- -----------------------------------------------------------------------------
+UPDATE processing_history
+SET original_size = length(CAST(original_text AS BLOB)),
+    processed_size = length(CAST(processed_text AS BLOB)),
+    text_codec = CASE WHEN processed_data IS NULL THEN text_codec ELSE 0 END;
+
+UPDATE processing_history_archive
+SET original_size = length(CAST(original_text AS BLOB)),
+    processed_size = length(CAST(processed_text AS BLOB)),
+    text_codec = CASE WHEN processed_data IS NULL THEN text_codec ELSE 0 END;
@@ -0,0 +1,17 @@
+-- =============================================================================
+-- MIGRATION (SQLite): 014 - İşin Alınma Zamanı
+-- AÇIKLAMA: migrations/014_add_processing_claimed_at.sql betiğinin SQLite
+--           karşılığıdır.
+-- =============================================================================
+
+-- -----------------------------------------------------------------------------
+-- İçindekiler
+-- -----------------------------------------------------------------------------
+-- 1.0 Sütun Ekleme (`claimed_at`)
+-- -----------------------------------------------------------------------------
+
+
+-- 1.0 SÜTUN EKLEME (`claimed_at`)
+-- -----------------------------------------------------------------------------
+ALTER TABLE processing_history ADD COLUMN claimed_at DATETIME DEFAULT NULL;
+ALTER TABLE processing_history_archive ADD COLUMN claimed_at DATETIME DEFAULT NULL;
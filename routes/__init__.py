@@ -18,6 +18,9 @@ from .api.v1.prompts.settings import bp as prompts_settings_bp
 from .api.v1.prompts.sections import bp as prompts_sections_bp
 from .api.v1.prompts.processing import bp as prompts_processing_bp
 
+# Metrikler (/metrics ve istek süresi kancaları)
+from .metrics import init_metrics
+
 def init_app(app):
     """
     Uygulamaya tüm route'ları kaydeder.
@@ -25,6 +28,9 @@ def init_app(app):
     Args:
         app: Flask uygulama örneği
     """
+    # İstek süresi ölçümü tüm blueprint'leri kapsar
+    init_metrics(app)
+    
     # Ana sayfa route'larını kaydet
     app.register_blueprint(pages_bp)
     
@@ -3,16 +3,30 @@
 # Bu dosya, haber işleme ile ilgili API endpoint'lerini içerir.
 #
 # İçindekiler:
-# - process_news: Gönderilen haber metnini AI servisi ile işler.
+# - process_news: Gönderilen haber metnini AI servisi ile işler (senkron veya kuyrukta).
+# - process_news_stream: Model çıktısını Server-Sent Events olarak akıtır.
+# - process_news_batch: Birden çok haber metnini tek istekte işler.
+# - get_batch_status: Bir toplu işlemin durumunu sorgular.
 # - get_statistics: Kullanıcının işlem istatistiklerini getirir.
-# - get_history: Kullanıcının geçmiş işlemlerini listeler.
+# - stream_events: Durum ve istatistik değişikliklerini Server-Sent Events olarak iletir.
+# - get_history: Kullanıcının geçmiş işlemlerini özet olarak listeler.
+# - get_history_item: Bir geçmiş kaydını tam metinleriyle getirir.
+# - search_history: Kullanıcının geçmişinde tam metin araması yapar.
 # - get_processing_status: Belirli bir işlemin durumunu sorgular.
 # - mark_as_read: Bir mesajı okundu olarak işaretler.
+# - mark_many_as_read: Verilen mesajları tek istekte okundu olarak işaretler.
+# - mark_all_as_read: Tüm mesajları (isteğe bağlı olarak bir zamana kadar) okundu olarak işaretler.
+# - get_model_limits: Model hız sınırlayıcısı ve dayanıklılık katmanının durumunu döndürür.
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, url_for, Response, stream_with_context
 from services.ai_service import AIService
+from services import history_archive, history_search, text_codec
+from services.event_bus import get_event_bus
+from services.rate_limiter import get_model_rate_limiter
+from services.resilience import get_model_caller
 from database.connection import DatabaseConnection
-from utils.helpers import get_user_id
+from utils.helpers import get_user_id, wants_async_processing, format_sse, get_page_size
+import os
 import time
 
 # Create a Blueprint for news API endpoints
@@ -24,6 +38,10 @@ def process_news():
     Haber metnini işlemek için kullanılan ana API endpoint'i.
     Gelen JSON verisinden haber metnini ve kullanıcı ayarlarını alır,
     AI servisi aracılığıyla işler ve sonucu döndürür.
+
+    Asenkron modda ('async': true veya ?mode=async) kayıt oluşturulup iş
+    kuyruğa alınır ve 202 ile processing_id döndürülür; sonuç
+    /status/<processing_id> üzerinden sorgulanır.
     """
     try:
         data = request.get_json()
@@ -39,6 +57,23 @@ def process_news():
         user_id = get_user_id()
         ai_service = AIService()
         
+        if wants_async_processing(data):
+            result = ai_service.submit_news(news_text, user_settings, user_id)
+            if result.get('success'):
+                return jsonify({
+                    'success': True,
+                    'processing_id': result.get('processing_id'),
+                    'status': result.get('status'),
+                    'timestamp': result.get('timestamp'),
+                    'status_url': url_for('news_api.get_processing_status', processing_id=result.get('processing_id'))
+                }), 202
+            return jsonify({
+                'success': False,
+                'error': result.get('error'),
+                'processing_id': result.get('processing_id'),
+                'status': result.get('status')
+            }), 503 if result.get('queue_full') else 400
+        
         # AI servisi metni işler (veritabanı kaydı dahil)
         result = ai_service.process_news(news_text, user_settings, user_id)
         
@@ -49,7 +84,8 @@ def process_news():
                 'processed_text': result.get('processed_text'),
                 'processing_id': result.get('processing_id'),
                 'timestamp': result.get('timestamp'),
-                'status': result.get('status')
+                'status': result.get('status'),
+                'cache_hit': result.get('cache_hit', False)
             })
         else:
             return jsonify({
@@ -57,12 +93,116 @@ def process_news():
                 'error': result.get('error'),
                 'processing_id': result.get('processing_id'),
                 'status': result.get('status')
-            }), 400
+            }), 503 if result.get('model_busy') else 400
             
     except Exception as e:
         print(f"Hata (process_news): {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/process/stream', methods=['POST'])
+def process_news_stream():
+    """
+    Haber metnini işler ve model çıktısını üretildikçe Server-Sent Events
+    olarak gönderir. Olaylar: 'start' (processing_id), 'chunk' (metin parçası),
+    'field' (JSON çıktısında tamamlanan üst düzey alan: name, value),
+    'done' (tam metin) ve 'error'. İstemci bağlantıyı keserse üretim iptal edilir.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'Veri sağlanmadı'}), 400
+        
+        news_text = data.get('news_text', '').strip()
+        user_settings = data.get('settings', {})
+        
+        if not news_text:
+            return jsonify({'success': False, 'error': 'Haber metni gerekli'}), 400
+        
+        user_id = get_user_id()
+        ai_service = AIService()
+        
+        def generate():
+            events = ai_service.stream_news(news_text, user_settings, user_id)
+            try:
+                for event, payload in events:
+                    yield format_sse(event, payload)
+            finally:
+                # Bağlantı koptuğunda servis generator'ını da kapat (upstream iptali)
+                events.close()
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        print(f"Hata (process_news_stream): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/process-batch', methods=['POST'])
+def process_news_batch():
+    """
+    Birden çok haber metnini tek istekte işler. Gövde:
+    {"items": [{"news_text": "...", "settings": {...}}, ...], "settings": {...}}
+    Öğe ayarları ortak 'settings' üzerine yazılır. Model çağrıları
+    BATCH_CONCURRENCY ile sınırlıdır; başarısız öğeler diğerlerini durdurmaz.
+
+    Senkron modda öğe sonuçları döndürülür. Asenkron modda ('async': true veya
+    ?mode=async) 202 ile batch_id döner; durum /batch/<batch_id> ile sorgulanır.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'Veri sağlanmadı'}), 400
+        
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'En az bir haber içeren "items" listesi gerekli'}), 400
+        if not all(isinstance(item, dict) for item in items):
+            return jsonify({'success': False, 'error': 'Her öğe news_text içeren bir nesne olmalı'}), 400
+        
+        max_items = int(os.getenv('BATCH_MAX_ITEMS', '200'))
+        if len(items) > max_items:
+            return jsonify({'success': False, 'error': f'Tek istekte en fazla {max_items} haber işlenebilir'}), 413
+        
+        user_id = get_user_id()
+        ai_service = AIService()
+        wait = not wants_async_processing(data)
+        result = ai_service.process_batch(items, user_id, data.get('settings') or {}, wait=wait)
+        
+        if not result.get('success'):
+            return jsonify(result), 503 if result.get('queue_full') else 500
+        
+        result['status_url'] = url_for('news_api.get_batch_status', batch_id=result['batch_id'])
+        result['succeeded'] = sum(1 for item in result['items'] if item['success'])
+        result['failed'] = len(result['items']) - result['succeeded']
+        return jsonify(result), 200 if wait else 202
+        
+    except Exception as e:
+        print(f"Hata (process_news_batch): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/batch/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """
+    Bir toplu işlemin kayıtlarını ve durum özetini getirir. 'finished' alanı
+    bekleyen veya işlenen kayıt kalmadığında true olur.
+    """
+    try:
+        user_id = get_user_id()
+        ai_service = AIService()
+        status = ai_service.get_batch_status(batch_id, user_id)
+        
+        if not status['items']:
+            return jsonify({'success': False, 'error': 'Toplu işlem bulunamadı'}), 404
+        
+        return jsonify({'success': True, 'batch': status})
+        
+    except Exception as e:
+        print(f"Hata (get_batch_status): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @bp.route('/statistics', methods=['GET'])
 def get_statistics():
     """Kullanıcının işlem istatistiklerini getirir."""
@@ -77,46 +217,161 @@ def get_statistics():
         print(f"Hata (get_statistics): {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/events', methods=['GET'])
+def stream_events():
+    """
+    Kullanıcının işlem durumu, okunma bilgisi ve sayaç değişikliklerini
+    Server-Sent Events olarak iletir. Olaylar: 'stats' (güncel sayaçlar),
+    'status' (processing_id, status), 'read' (processing_id) ve 'resync'
+    (olay kaçırıldı; istemci durumu bir kez yeniden sorgulamalı).
+
+    Bağlantı açılışında sayaçlar bir kez okunur; sonrasında veritabanına
+    yalnızca bir değişiklik olduğunda gidilir. Boşta kalan bağlantıya
+    EVENTS_HEARTBEAT saniyede bir yorum satırı gönderilir ve bağlantı
+    EVENTS_MAX_DURATION saniye sonra kapatılır (tarayıcı otomatik yeniden bağlanır).
+    """
+    user_id = get_user_id()
+    heartbeat = float(os.getenv('EVENTS_HEARTBEAT', '15'))
+    max_duration = float(os.getenv('EVENTS_MAX_DURATION', '300'))
+    bus = get_event_bus()
+    subscription = bus.subscribe(user_id)
+
+    def generate():
+        try:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+            yield format_sse('stats', AIService().get_user_statistics(user_id))
+            deadline = time.monotonic() + max_duration
+            while time.monotonic() < deadline:
+                item = subscription.get(timeout=heartbeat)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(*item)
+        finally:
+            bus.unsubscribe(subscription)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @bp.route('/history', methods=['GET'])
 def get_history():
     """
-    Kullanıcının işleme geçmişini getirir.
-    'limit' parametresi ile sonuç sayısı sınırlandırılabilir.
+    Kullanıcının işleme geçmişini en yeniden eskiye sayfa sayfa getirir.
+    'limit' sayfa boyutudur (en fazla HISTORY_MAX_PAGE_SIZE). Sonraki sayfa
+    için yanıttaki 'next_cursor' değeri '?cursor=' ile geri gönderilir;
+    son sayfada 'next_cursor' null olur.
+
+    Kayıtlar tam metinler yerine kısaltılmış bir önizleme ('preview') ve
+    bayt boyutlarını ('original_size', 'processed_size') içerir; tam metinler
+    /history/<processing_id> ile alınır.
     """
     try:
         user_id = get_user_id()
-        limit = request.args.get('limit', 50, type=int)
+        limit = get_page_size(default=50)
+        cursor = request.args.get('cursor') or None
         
         ai_service = AIService()
-        history = ai_service.get_processing_history(user_id, limit)
+        try:
+            history, next_cursor = ai_service.get_processing_history(user_id, limit, cursor)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        return jsonify({'success': True, 'history': history})
+        return jsonify({
+            'success': True,
+            'history': history,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+            'limit': limit
+        })
         
     except Exception as e:
         print(f"Hata (get_history): {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@bp.route('/history/<int:processing_id>', methods=['GET'])
+def get_history_item(processing_id):
+    """
+    Bir geçmiş kaydını tam haber metni ve AI çıktısıyla getirir. Arşive
+    taşınmış kayıtlar da döner. Sadece ilgili kullanıcı kendi kaydını görebilir.
+    """
+    try:
+        user_id = get_user_id()
+        ai_service = AIService()
+        item = ai_service.get_processing_detail(processing_id, user_id)
+        
+        if not item:
+            return jsonify({'success': False, 'error': 'İşlem kaydı bulunamadı'}), 404
+        
+        return jsonify({'success': True, 'item': item})
+        
+    except Exception as e:
+        print(f"Hata (get_history_item): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/history/search', methods=['GET'])
+def search_history():
+    """
+    Kullanıcının geçmişinde haber metni üzerinde tam metin araması yapar.
+    '?q=' arama metnidir; 'status', 'read_status', 'date_from' ve 'date_to'
+    (YYYY-MM-DD) ile süzülebilir. Sonuçlar ilgiye göre sıralanır ve tam metin
+    yerine vurgulu bir kesit içerir. Sonraki sayfa için yanıttaki
+    'next_offset' değeri '?offset=' ile geri gönderilir.
+    """
+    try:
+        user_id = get_user_id()
+        limit = get_page_size(default=20)
+        offset = request.args.get('offset', 0, type=int)
+        
+        try:
+            filters = history_search.parse_filters(
+                status=request.args.get('status') or None,
+                read_status=request.args.get('read_status') or None,
+                date_from=request.args.get('date_from') or None,
+                date_to=request.args.get('date_to') or None
+            )
+            with DatabaseConnection() as db:
+                terms, results, next_offset = history_search.search_history(
+                    db, user_id, request.args.get('q', ''), filters, limit, offset
+                )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'terms': terms,
+            'results': results,
+            'next_offset': next_offset,
+            'has_more': next_offset is not None,
+            'limit': limit
+        })
+        
+    except Exception as e:
+        print(f"Hata (search_history): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @bp.route('/status/<int:processing_id>', methods=['GET'])
 def get_processing_status(processing_id):
     """
     Belirli bir işleme ait (processing_id) detayları ve durumu getirir.
-    Sadece ilgili kullanıcı kendi işlem kaydını görebilir.
+    Sadece ilgili kullanıcı kendi işlem kaydını görebilir. Asenkron işlemlerde
+    durum sırasıyla 'pending', 'processing' ve 'completed'/'error' olur.
+    Arşive taşınmış kayıtlar arşiv tablosundan okunur.
     """
     try:
         user_id = get_user_id()
         
-        db = DatabaseConnection()
-        cursor = db.connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT id, original_text, processed_text, status, created_at, completed_at
-        FROM processing_history 
+        query = f"""
+        SELECT id, original_text, {text_codec.select_columns('processed_text')}, processing_status AS status,
+               read_status, created_at, completed_at
+        FROM {{table}}
         WHERE id = %s AND user_id = %s
         """
-        
-        cursor.execute(query, (processing_id, user_id))
-        result = cursor.fetchone()
-        cursor.close()
+        with DatabaseConnection() as db:
+            row = history_archive.fetch_record(db, query, (processing_id, user_id))
+        result = text_codec.decode_fields(row, 'processed_text')
         
         if not result:
             return jsonify({'success': False, 'error': 'İşlem kaydı bulunamadı'}), 404
@@ -142,3 +397,70 @@ def mark_as_read(processing_id):
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/mark-as-read', methods=['POST'])
+def mark_many_as_read():
+    """
+    JSON gövdesindeki 'ids' listesindeki kayıtları tek sorguyla okundu olarak
+    işaretler. Başka kullanıcılara ait veya zaten okunmuş kayıtlar atlanır;
+    yanıttaki 'updated' gerçekten işaretlenen kayıt sayısıdır.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if 'ids' not in data:
+            return jsonify({'success': False, 'error': 'Kayıt kimlikleri (ids) gerekli'}), 400
+        
+        user_id = get_user_id()
+        ai_service = AIService()
+        try:
+            updated = ai_service.mark_many_as_read(user_id, processing_ids=data['ids'])
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        if updated is None:
+            return jsonify({'success': False, 'error': 'Okundu olarak işaretlenemedi'}), 500
+        return jsonify({'success': True, 'updated': updated})
+            
+    except Exception as e:
+        print(f"Hata (mark_many_as_read): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/mark-as-read/all', methods=['POST'])
+def mark_all_as_read():
+    """
+    Kullanıcının tüm okunmamış kayıtlarını tek sorguyla okundu olarak
+    işaretler. JSON gövdesinde 'before' (ISO zaman) verilirse yalnızca o
+    zamana kadar oluşturulan kayıtlar işaretlenir; böylece sayfa açıldıktan
+    sonra gelen sonuçlar okunmamış kalır.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        user_id = get_user_id()
+        ai_service = AIService()
+        try:
+            updated = ai_service.mark_many_as_read(user_id, before=data.get('before') or None)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        if updated is None:
+            return jsonify({'success': False, 'error': 'Okundu olarak işaretlenemedi'}), 500
+        return jsonify({'success': True, 'updated': updated})
+            
+    except Exception as e:
+        print(f"Hata (mark_all_as_read): {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/model-limits', methods=['GET'])
+def get_model_limits():
+    """
+    Model hız sınırlayıcısının anlık durumunu (eşzamanlılık sınırı,
+    çalışan/bekleyen çağrı sayısı, kalan RPM/TPM kotası, bekleme süreleri) ve
+    dayanıklılık katmanının kararlarını (yeniden deneme, zaman aşımı, yedek
+    istek, devre durumu) döndürür.
+    """
+    return jsonify({
+        'success': True,
+        'limits': get_model_rate_limiter().stats(),
+        'resilience': get_model_caller().stats()
+    })
@@ -5,6 +5,7 @@
 # İçindekiler:
 # - get_prompt_config: Mevcut aktif prompt konfigürasyonunu getirir.
 # - export_configuration: Mevcut aktif konfigürasyonu dışa aktarır.
+# - activate_configuration: Belirtilen konfigürasyonu aktif yapar.
 
 from flask import Blueprint, jsonify, request
 from services.prompt_service import PromptService
@@ -47,3 +48,15 @@ def export_configuration():
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/config/<int:config_id>/activate', methods=['POST'])
+def activate_configuration(config_id):
+    """Belirtilen konfigürasyonu aktif yapar; diğer tüm konfigürasyonlar pasifleşir."""
+    try:
+        prompt_service = PromptService()
+        if prompt_service.activate_config(config_id):
+            return jsonify({'success': True, 'message': 'Konfigürasyon aktif hale getirildi'})
+        return jsonify({'success': False, 'error': 'Konfigürasyon bulunamadı veya aktif hale getirilemedi'}), 404
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -8,7 +8,7 @@
 
 from flask import Blueprint, request, jsonify
 from services.prompt_service import PromptService
-from utils.helpers import get_user_id
+from utils.helpers import get_user_id, wants_async_processing
 import time
 
 # Create a Blueprint for prompt processing endpoints
@@ -57,6 +57,7 @@ def process_news_with_prompt():
     """
     Bir haber metnini, mevcut prompt konfigürasyonu ve kullanıcı ayarlarına göre işler.
     İşlem kaydı oluşturur, AI servisini çağırır ve sonucu günceller.
+    Asenkron modda iş kuyruğa alınır ve 202 ile processing_id döndürülür.
     """
     try:
         user_id = get_user_id()
@@ -77,6 +78,22 @@ def process_news_with_prompt():
         user_settings = data.get('settings', {})
         if not user_settings:
             user_settings = prompt_service.get_user_settings(user_id, active_config['id'])
+        
+        if wants_async_processing(data):
+            # Kayıt AI servisi tarafından 'pending' olarak oluşturulur ve kuyruğa alınır
+            from services.ai_service import AIService
+            ai_service = AIService(prompt_service=prompt_service)
+            result = ai_service.submit_news(news_text, user_settings, user_id)
+            if result.get('success'):
+                return jsonify({
+                    'success': True,
+                    'data': {
+                        'processing_id': result.get('processing_id'),
+                        'status': result.get('status'),
+                        'settings_used': user_settings
+                    }
+                }), 202
+            return jsonify({'success': False, 'error': result.get('error')}), 503 if result.get('queue_full') else 400
             
         # İşlem kaydı oluştur
         record_id = prompt_service.create_processing_record(
@@ -100,7 +117,7 @@ def process_news_with_prompt():
             # Haber metnini işle
             result = ai_service.process_news(
                 news_text=news_text,
-                user_settings=user_settings,
+                rules=user_settings,
                 user_id=user_id
             )
             
@@ -20,8 +20,9 @@
 from flask import Blueprint, render_template, request, jsonify, session
 from services.prompt_service import PromptService
 from services.ai_service import AIService
+from services import history_archive, text_codec
 from database.connection import DatabaseConnection
-from utils.helpers import get_user_id
+from utils.helpers import get_user_id, get_page_size
 import time
 import json
 
@@ -117,17 +118,30 @@ def get_statistics():
 @bp.route('/api/history', methods=['GET'])
 def get_history():
     """
-    Kullanıcının işleme geçmişini getirir.
-    'limit' parametresi ile sonuç sayısı sınırlandırılabilir.
+    Kullanıcının işleme geçmişini en yeniden eskiye sayfa sayfa getirir.
+    'limit' sayfa boyutudur (en fazla HISTORY_MAX_PAGE_SIZE). Sonraki sayfa
+    için yanıttaki 'next_cursor' değeri '?cursor=' ile geri gönderilir;
+    son sayfada 'next_cursor' null olur. Kayıtlar tam metinler yerine önizleme
+    ve bayt boyutlarını içerir; tam metinler /api/v1/news/history/<id> ile alınır.
     """
     try:
         user_id = get_user_id()
-        limit = request.args.get('limit', 50, type=int)
+        limit = get_page_size(default=50)
+        cursor = request.args.get('cursor') or None
         
         ai_service = AIService()
-        history = ai_service.get_processing_history(user_id, limit)
-        
-        return jsonify({'success': True, 'history': history})
+        try:
+            history, next_cursor = ai_service.get_processing_history(user_id, limit, cursor)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'history': history,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
+            'limit': limit
+        })
         
     except Exception as e:
         print(f"Hata (get_history): {e}")
@@ -137,23 +151,21 @@ def get_history():
 def get_processing_status(processing_id):
     """
     Belirli bir işleme ait (processing_id) detayları ve durumu getirir.
-    Sadece ilgili kullanıcı kendi işlem kaydını görebilir.
+    Sadece ilgili kullanıcı kendi işlem kaydını görebilir. Arşive taşınmış
+    kayıtlar arşiv tablosundan okunur.
     """
     try:
         user_id = get_user_id()
         
-        db = DatabaseConnection()
-        cursor = db.connection.cursor(dictionary=True)
-        
-        query = """
-        SELECT id, original_text, processed_text, status, created_at, completed_at
-        FROM processing_history 
+        query = f"""
+        SELECT id, original_text, {text_codec.select_columns('processed_text')}, processing_status AS status,
+               created_at, completed_at
+        FROM {{table}}
         WHERE id = %s AND user_id = %s
         """
-        
-        cursor.execute(query, (processing_id, user_id))
-        result = cursor.fetchone()
-        cursor.close()
+        with DatabaseConnection() as db:
+            row = history_archive.fetch_record(db, query, (processing_id, user_id))
+        result = text_codec.decode_fields(row, 'processed_text')
         
         if not result:
             return jsonify({'success': False, 'error': 'İşlem kaydı bulunamadı'}), 404
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Bu dosya, /metrics endpoint'ini (Prometheus metin formatı) ve tüm
+# blueprint'lerin istek sürelerini ölçen uygulama kancalarını içerir.
+#
+# İçindekiler:
+# - init_metrics: İstek süresi kancalarını ve anlık değer toplayıcılarını kaydeder.
+# - collect_runtime_stats: Havuz, kuyruk, önbellek, olay yolu ve model katmanı değerlerini toplar.
+# - metrics: Tüm metrikleri Prometheus formatında döndürür.
+
+import time
+
+from flask import Blueprint, Response, g, request
+
+from utils.metrics import get_metrics
+
+bp = Blueprint('metrics', __name__)
+
+# Bileşen adı -> (metrik öneki, açıklama)
+RUNTIME_SOURCES = {
+    'db_pool': 'Veritabanı bağlantı havuzu',
+    'job_queue': 'Arka plan iş kuyruğu',
+    'result_cache': 'İşlem sonucu önbelleği',
+    'config_cache': 'Prompt konfigürasyon önbelleği',
+    'event_bus': 'Anlık olay yolu',
+    'model_limiter': 'Model hız sınırlayıcısı',
+    'model_resilience': 'Model dayanıklılık katmanı',
+}
+
+
+def init_metrics(app):
+    """
+    Her isteğin süresini endpoint (blueprint.fonksiyon), metot ve durum koduna
+    göre histograma yazan kancaları ve /metrics endpoint'ini kaydeder.
+    Eşleşmeyen istekler (404) tek bir 'unmatched' serisinde toplanır.
+    """
+    metrics = get_metrics()
+    if not metrics.enabled:
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_duration(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            metrics.observe(
+                'http_request_duration_seconds',
+                (request.endpoint or 'unmatched', request.method, str(response.status_code)),
+                time.perf_counter() - started
+            )
+        return response
+
+    metrics.register_collector(collect_runtime_stats)
+    app.register_blueprint(bp)
+
+
+def collect_runtime_stats():
+    """
+    Süreç geneli bileşenlerin stats() çıktısındaki sayısal değerleri
+    `<bileşen>_<alan>` adlı gauge'lar olarak döndürür.
+    """
+    from database.pool import get_pool
+    from services.job_queue import get_job_queue, get_token_count_queue
+    from services.result_cache import get_result_cache
+    from services.config_cache import get_config_cache
+    from services.event_bus import get_event_bus
+    from services.rate_limiter import get_model_rate_limiter
+    from services.resilience import get_model_caller
+
+    result_cache = get_result_cache()
+    sources = {
+        'db_pool': get_pool().stats(),
+        'job_queue': get_job_queue().stats(),
+        'token_count_queue': get_token_count_queue().stats(),
+        'result_cache': result_cache.stats() if result_cache is not None else {},
+        'config_cache': get_config_cache().stats(),
+        'event_bus': get_event_bus().stats(),
+        'model_limiter': get_model_rate_limiter().stats(),
+        'model_resilience': get_model_caller().stats(),
+    }
+
+    samples = []
+    for component, stats in sources.items():
+        for field, value in stats.items():
+            if field == 'breaker_state':
+                for state in ('closed', 'open', 'half_open'):
+                    samples.append((f'{component}_breaker_state', f'{RUNTIME_SOURCES[component]}: devre durumu',
+                                    {'state': state}, int(value == state)))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                samples.append((f'{component}_{field}', f'{RUNTIME_SOURCES[component]}: {field}', {}, value))
+    return samples
+
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Tüm metrikleri Prometheus metin formatında döndürür."""
+    return Response(get_metrics().render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -7,43 +7,107 @@
 #İçindekiler:
 #1.0 Ana Servis Metotları
 #    - process_news: Bir haber metnini AI ile işler.
-#    - get_processing_history: Kullanıcının geçmiş işlemlerini veritabanından alır.
+#    - stream_news: Bir haber metnini işler ve model çıktısını parça parça verir.
+#    - submit_news: Bir haber metnini arka plan kuyruğunda işlenmek üzere kaydeder.
+#    - process_batch: Birden çok haber metnini sınırlı eşzamanlılıkla işler.
+#    - get_batch_status: Bir toplu işlemin kayıtlarını ve durum özetini döndürür.
+#    - run_processing_job: Kuyruktaki bir işi çalıştırır.
+#    - run_batch_jobs: Bir toplu işlemin işlerini sınırlı sayıda thread ile çalıştırır.
+#    - recover_pending_jobs: Yeniden başlatma sonrası yarım kalan işleri kuyruğa geri alır.
+#    - get_processing_history: Kullanıcının geçmiş işlemlerinin özetini imleç tabanlı sayfalama ile alır.
+#    - get_processing_detail: Tek bir geçmiş kaydının tam metinlerini döndürür.
 #    - mark_as_read: Bir işlem kaydını okundu olarak işaretler.
+#    - mark_many_as_read: Birden çok kaydı (veya tümünü) tek sorguyla okundu olarak işaretler.
 #    - get_user_statistics: Kullanıcının işlem istatistiklerini hesaplar.
 #2.0 Özel Yardımcı Metotlar
-#    - _create_prompt: AI modeline gönderilecek komut metnini (prompt) oluşturur.
+#    - _prepare_prompt: Metni doğrular ve AI modeline gönderilecek prompt'u oluşturur.
+#    - _run_model: Modeli çağırır ve kaydı sonuçla günceller.
+#    - _generate: Hız sınırlayıcı içinde tek bir model denemesi yapar.
+#    - _measure_model: Model çağrısının süresini, hatalarını ve prompt büyüklüğünü metriklere yazar.
+#    - _prompt_tokens: Yanıtta varsa prompt'un kullanım bilgisindeki token sayısını döndürür.
+#    - _schedule_token_count, _record_prompt_tokens, _count_tokens: Prompt'u istek yolunun dışında modele saydırır.
+#    - _complete_from_cache, _store_in_cache: Sonuç önbelleğinden okur ve önbelleğe yazar.
+#    - _cancel_stream: Devam eden bir model akışını iptal eder.
+#    - _field_parser, _field_events: JSON çıktısının üst düzey alanlarını akış sırasında olay olarak çıkarır.
 #    - validate_news: Gelen haber metninin geçerliliğini kontrol eder.
 #3.0 Veritabanı İşlemleri
 #    - _save_processing_record: Yeni bir işlem kaydını veritabanına ekler.
+#    - _save_processing_records: Toplu işlem kayıtlarını tek bir çok satırlı INSERT ile ekler.
 #    - _update_processing_status: Mevcut bir işlem kaydının durumunu günceller.
+#    - _claim_processing_record: Bekleyen bir kaydı atomik olarak işleme alır.
+#    - _get_prompt_text: Kayıtlı prompt metnini (gerekirse şablondan) okur.
+#    - _publish_changes: Değişiklikleri ve güncel sayaçları kullanıcının açık sekmelerine iletir.
 
 import os
-import google.generativeai as genai
-from datetime import datetime
-import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from database.connection import DatabaseConnection
+from services.prompt_service import PromptService, PROMPT_COMPACTION
+from services.job_queue import get_job_queue, get_token_count_queue
+from services.config_cache import ConfigCache
+from services.result_cache import get_result_cache
+from services import history_archive, history_store, text_codec, user_stats
+from services.event_bus import get_event_bus
+from services.model_backend import create_model, send_request, count_tokens
+from services.rate_limiter import get_model_rate_limiter, ModelBusyError, estimate_tokens
+from services.resilience import get_model_caller, CircuitOpenError
+from utils.helpers import encode_cursor, decode_cursor, truncate_text
+from utils.json_stream import JsonFieldStream
+from utils.metrics import get_metrics
+
+# Geçmiş sayfaları (created_at DESC, id ASC) sırasıyla okunur. Bu sıra,
+# idx_user_history (user_id, created_at DESC) indeksinin InnoDB'de örtük
+# olarak sonuna eklenen birincil anahtarla (id ASC) birlikte verdiği sıradır;
+# böylece sıralama için ayrıca dosya sıralaması (filesort) yapılmaz.
+# {table}, history_archive.fetch_page tarafından sıcak veya arşiv tablosuyla doldurulur.
+HISTORY_PAGE_QUERY = """
+SELECT {columns}
+FROM {{table}}
+WHERE user_id = %s {after}
+ORDER BY created_at DESC, id ASC
+LIMIT %s
+"""
+HISTORY_AFTER_CLAUSE = "AND (created_at < %s OR (created_at = %s AND id > %s))"
+
+# Geçmiş listesi tam metinler yerine bu uzunlukta bir önizleme döndürür.
+# Önizlemenin bir karakter fazlası SQL'de kesilir; truncate_text tam metinle
+# aynı sonucu verir ve metnin geri kalanı veritabanından hiç aktarılmaz.
+HISTORY_PREVIEW_LENGTH = int(os.getenv('HISTORY_PREVIEW_LENGTH', '150'))
+HISTORY_LIST_COLUMNS = (
+    f"id, processing_status as status, read_status, created_at, completed_at, "
+    f"SUBSTR(original_text, 1, {HISTORY_PREVIEW_LENGTH + 1}) AS preview, original_size, processed_size"
+)
+HISTORY_DETAIL_QUERY = f"""
+SELECT id, original_text, {text_codec.select_columns('processed_text')}, original_size, processed_size,
+       processing_status as status, read_status, error_message, created_at, completed_at
+FROM {{table}}
+WHERE id = %s AND user_id = %s
+"""
+
+# Tek bir toplu okundu isteğinde verilebilecek en fazla kayıt kimliği
+MARK_READ_MAX_IDS = int(os.getenv('HISTORY_MARK_READ_MAX_IDS', '500'))
 
 class AIService:
     """
     Yapay zeka işlemlerini yöneten servis sınıfı.
     """
+    MODEL_NAME = 'gemini-1.5-flash'
+
     def __init__(self, prompt_service=None):
         """
-        AI servisini başlatır. Ortam değişkenlerinden (environment variables)
-        GEMINI_API_KEY'i okuyarak Gemini modelini yapılandırır.
+        AI servisini başlatır. Model, MODEL_BACKEND ortam değişkenine göre
+        oluşturulur: 'gemini' (varsayılan) GEMINI_API_KEY ile gerçek modeli,
+        'fake' ise yük testleri için yerel taklit modeli kullanır.
         
         Args:
             prompt_service (PromptService, optional): Prompt oluşturma işlemleri için kullanılacak servis.
                                                     Eğer sağlanmazsa yeni bir örnek oluşturulur.
         """
-        self.api_key = os.getenv('GEMINI_API_KEY')
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-        else:
-            self.model = None
-            print("UYARI: GEMINI_API_KEY ortam değişkeni bulunamadı.")
-            
+        self.model = create_model(self.MODEL_NAME)
+
         # PromptService'i başlat
         self.prompt_service = prompt_service if prompt_service is not None else PromptService()
 
@@ -64,43 +128,21 @@ class AIService:
         """
         processing_id = None  # Hata durumlarında da ID'ye erişebilmek için
         try:
-            # Girdi metnini doğrula
-            is_valid, validation_message = self.validate_news(news_text)
-            if not is_valid:
-                return {'success': False, 'error': validation_message, 'status': 'error'}
-
-            # AI için prompt oluştur
-            active_config = self.prompt_service.get_active_config()
-            if not active_config:
-                error_msg = 'Aktif bir prompt konfigürasyonu bulunamadı.'
-                self._update_processing_status(processing_id, 'error', error_msg)
-                return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
-                
-            prompt = self.prompt_service.build_complete_prompt(
-                config_id=active_config['id'],
-                user_settings=rules or {},
-                news_text=news_text
-            )
-            
-            if not prompt:
-                error_msg = 'Prompt oluşturulurken bir hata oluştu.'
-                self._update_processing_status(processing_id, 'error', error_msg)
+            prompt, cache_ref, error_msg = self._prepare_prompt(news_text, rules)
+            if error_msg:
                 return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
 
-            # Veritabanına başlangıç kaydını at
-            processing_id = self._save_processing_record(user_id, news_text, prompt, 'processing', settings_used=rules)
+            # Aynı metin ve ayarlarla daha önce üretilmiş sonuç varsa modeli çağırma
+            cache_hit = self._complete_from_cache(cache_ref, user_id, news_text, prompt, rules)
+            if cache_hit:
+                processing_id, processed_text = cache_hit
+            else:
+                # Veritabanına başlangıç kaydını at
+                processing_id = self._save_processing_record(user_id, news_text, prompt, 'processing', settings_used=rules)
 
-            if not self.model:
-                error_msg = 'Gemini API anahtarı yapılandırılmamış.'
-                self._update_processing_status(processing_id, 'error', error_msg)
-                return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
-
-            # Gemini API'sini çağır
-            response = self.model.generate_content(prompt)
-            processed_text = response.text if response.text else "AI işlemi başarısız oldu."
-
-            # Veritabanındaki kaydı sonuç ile güncelle
-            self._update_processing_status(processing_id, 'completed', processed_text)
+                processed_text, error_msg = self._run_model(processing_id, prompt, cache_ref)
+                if error_msg:
+                    return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
 
             return {
                 'success': True,
@@ -108,9 +150,17 @@ class AIService:
                 'processed_text': processed_text,
                 'status': 'completed',
                 'processing_id': processing_id,
+                'cache_hit': bool(cache_hit),
                 'timestamp': datetime.now().isoformat()
             }
 
+        except (ModelBusyError, CircuitOpenError) as e:
+            # Model kapasitesi dolu; istemci daha sonra yeniden deneyebilir
+            if processing_id:
+                self._update_processing_status(processing_id, 'error', str(e))
+            return {'success': False, 'error': str(e), 'status': 'error',
+                    'processing_id': processing_id, 'model_busy': True}
+
         except Exception as e:
             error_msg = f"AI işleme hatası: {str(e)}"
             if processing_id:
@@ -123,82 +173,817 @@ class AIService:
                 'processing_id': processing_id
             }
 
-    def get_processing_history(self, user_id, limit=50, offset=0):
-        """Kullanıcının geçmiş işlemlerini veritabanından alır."""
+    def stream_news(self, news_text, rules=None, user_id=None):
+        """
+        Haber metnini modelin akış (streaming) API'si ile işler ve üretilen
+        parçaları geldikçe olay olarak verir. Tam metin, akış bittiğinde
+        processing_history kaydına yazılır.
+
+        Çıktı formatı JSON ise parçalar artımlı olarak ayrıştırılır ve üst
+        düzey her alan (baslik, ozet, ...) tamamlandığı anda 'field' olayı
+        olarak ayrıca verilir; haber metni üretilirken başlık gösterilebilir.
+
+        Generator erken kapatılırsa (örn. istemci bağlantıyı kestiğinde)
+        modelden gelen akış iptal edilir ve kayıt hata olarak işaretlenir.
+
+        Yields:
+            tuple: (olay adı, veri) çiftleri. Olaylar: 'start', 'chunk', 'field', 'done', 'error'.
+        """
+        processing_id = None
+        response = None
+        finished = False
         try:
-            db = DatabaseConnection()
-            # Sütun adları ile sonuç almak için dictionary=True kullanılır
-            cursor = db.connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT id, original_text, processed_text, processing_status as status, 
-                   read_status, created_at, completed_at
-            FROM processing_history
-            WHERE user_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, (user_id, limit, offset))
-            results = cursor.fetchall()
-            
-            # Tarih alanlarını ISO formatına çevir
-            for row in results:
+            prompt, cache_ref, error_msg = self._prepare_prompt(news_text, rules)
+            if error_msg:
+                finished = True
+                yield 'error', {'error': error_msg, 'status': 'error', 'processing_id': None}
+                return
+
+            cache_hit = self._complete_from_cache(cache_ref, user_id, news_text, prompt, rules)
+            if cache_hit:
+                processing_id, processed_text = cache_hit
+                finished = True
+                yield 'start', {'processing_id': processing_id, 'status': 'processing'}
+                yield 'chunk', {'text': processed_text}
+                for event in self._field_events(self._field_parser(rules), processing_id, processed_text):
+                    yield event
+                yield 'done', {
+                    'processing_id': processing_id,
+                    'status': 'completed',
+                    'processed_text': processed_text,
+                    'cache_hit': True,
+                    'timestamp': datetime.now().isoformat()
+                }
+                return
+
+            processing_id = self._save_processing_record(user_id, news_text, prompt, 'processing', settings_used=rules)
+            # Akış süresince havuzdan alınmış bağlantı tutulmasın
+            self.prompt_service.close()
+
+            if not self.model:
+                error_msg = 'Gemini API anahtarı yapılandırılmamış.'
+                self._update_processing_status(processing_id, 'error', error_msg)
+                finished = True
+                yield 'error', {'error': error_msg, 'status': 'error', 'processing_id': processing_id}
+                return
+
+            yield 'start', {'processing_id': processing_id, 'status': 'processing'}
+
+            parts = []
+            field_parser = self._field_parser(rules)
+            # Akışın süre sınırı alttaki istemciye verilir; parçalar arasında
+            # veya ilk parçadan önce duran bir akış da süre dolunca kesilir.
+            stream_timeout = float(os.getenv('MODEL_STREAM_TIMEOUT', '120'))
+            # Akış bitene kadar model kapasitesinden bir yer tutulur. Parça
+            # gönderilmeye başlandığı için akış yeniden denenmez; sonucu yalnızca
+            # devre kesiciye işlenir.
+            with get_model_caller().guard(), get_model_rate_limiter().slot(prompt) as usage, \
+                    self._measure_model('stream', prompt):
+                response = send_request(self.model, prompt, stream=True, timeout=stream_timeout)
+                for chunk in response:
+                    text = chunk.text if chunk.parts else ''
+                    if text:
+                        parts.append(text)
+                        yield 'chunk', {'text': text}
+                        for event in self._field_events(field_parser, processing_id, text):
+                            yield event
+                usage['tokens'] = self._used_tokens(response)
+
+            for event in self._field_events(field_parser, processing_id, None):
+                yield event
+
+            processed_text = ''.join(parts)
+            if processed_text:
+                self._store_in_cache(cache_ref, processed_text)
+            else:
+                processed_text = "AI işlemi başarısız oldu."
+            prompt_tokens = self._prompt_tokens(response)
+            self._update_processing_status(processing_id, 'completed', processed_text, prompt_tokens=prompt_tokens)
+            if prompt_tokens is None:
+                self._schedule_token_count(processing_id, prompt)
+            finished = True
+            yield 'done', {
+                'processing_id': processing_id,
+                'status': 'completed',
+                'processed_text': processed_text,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except GeneratorExit:
+            # İstemci bağlantıyı kesti; üretimi durdur ve kaydı kapat
+            self._cancel_stream(response)
+            if processing_id and not finished:
+                self._update_processing_status(processing_id, 'error', 'İstemci bağlantıyı kesti, üretim iptal edildi.')
+            raise
+
+        except Exception as e:
+            error_msg = f"AI işleme hatası: {str(e)}"
+            if processing_id:
+                self._update_processing_status(processing_id, 'error', error_msg)
+            finished = True
+            yield 'error', {'error': error_msg, 'status': 'error', 'processing_id': processing_id}
+
+    def submit_news(self, news_text, rules=None, user_id=None):
+        """
+        Haber metnini arka planda işlenmek üzere kuyruğa alır ve beklemeden döner.
+        Kayıt 'pending' durumunda oluşturulur; sonuç processing_id ile durum
+        endpoint'inden sorgulanır.
+
+        Returns:
+            dict: success, status ('pending' veya 'error') ve processing_id içeren sözlük.
+                  Kuyruk doluysa 'queue_full' anahtarı True olur.
+        """
+        processing_id = None
+        try:
+            prompt, cache_ref, error_msg = self._prepare_prompt(news_text, rules)
+            if error_msg:
+                return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
+
+            # Önbellekte varsa kuyruğa almadan tamamlanmış kayıt oluştur
+            cache_hit = self._complete_from_cache(cache_ref, user_id, news_text, prompt, rules)
+            if cache_hit:
+                return {
+                    'success': True,
+                    'status': 'completed',
+                    'processing_id': cache_hit[0],
+                    'cache_hit': True,
+                    'timestamp': datetime.now().isoformat()
+                }
+
+            processing_id = self._save_processing_record(user_id, news_text, prompt, 'pending', settings_used=rules)
+            if not processing_id:
+                return {'success': False, 'error': 'İşlem kaydı oluşturulamadı.', 'status': 'error', 'processing_id': None}
+
+            # İş kuyrukta beklerken havuzdan alınmış bağlantı tutulmasın
+            self.prompt_service.close()
+
+            if not get_job_queue().submit(self.run_processing_job, processing_id, prompt, cache_ref):
+                error_msg = 'İşlem kuyruğu dolu, lütfen daha sonra tekrar deneyin.'
+                self._update_processing_status(processing_id, 'error', error_msg)
+                return {'success': False, 'error': error_msg, 'status': 'error',
+                        'processing_id': processing_id, 'queue_full': True}
+
+            return {
+                'success': True,
+                'status': 'pending',
+                'processing_id': processing_id,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            error_msg = f"AI işleme hatası: {str(e)}"
+            if processing_id:
+                self._update_processing_status(processing_id, 'error', error_msg)
+            return {'success': False, 'error': error_msg, 'status': 'error', 'processing_id': processing_id}
+
+    def process_batch(self, items, user_id=None, default_rules=None, wait=True):
+        """
+        Birden çok haber metnini tek istekte işler. Tüm geçerli öğeler için
+        processing_history kayıtları tek bir çok satırlı INSERT ile ortak bir
+        batch_id altında oluşturulur; model çağrıları BATCH_CONCURRENCY ile
+        sınırlı sayıda thread'e dağıtılır. Bir öğenin hatası diğerlerini durdurmaz.
+
+        Args:
+            items (list): {'news_text': str, 'settings': dict (isteğe bağlı)} sözlükleri.
+            user_id (str, optional): İşlemi yapan kullanıcının kimliği.
+            default_rules (dict, optional): Öğe ayarlarının üzerine yazıldığı ortak ayarlar.
+            wait (bool): True ise tüm öğeler bitene kadar beklenir ve sonuçlar
+                         döndürülür; False ise toplu iş kuyruğa alınır.
+
+        Returns:
+            dict: batch_id, status ve öğe sırasına göre 'items' listesi. Kuyruk
+                  doluysa 'queue_full' anahtarı True olur.
+        """
+        batch_id = uuid.uuid4().hex
+        results = [None] * len(items)
+        records = []  # (öğe sırası, haber metni, prompt, ayarlar, önbellek referansı, önbellekteki sonuç)
+        cache = get_result_cache()
+
+        for index, item in enumerate(items):
+            news_text = str((item or {}).get('news_text') or '').strip()
+            rules = dict(default_rules or {})
+            rules.update((item or {}).get('settings') or {})
+
+            prompt, cache_ref, error_msg = self._prepare_prompt(news_text, rules)
+            if error_msg:
+                results[index] = {'index': index, 'success': False, 'status': 'error',
+                                  'error': error_msg, 'processing_id': None}
+                continue
+            cached_text = cache.get(cache_ref[0]) if cache is not None and cache_ref is not None else None
+            records.append((index, news_text, prompt, rules, cache_ref, cached_text))
+
+        processing_ids = self._save_processing_records(user_id, batch_id, records) if records else []
+        # Model çağrıları sürerken havuzdan alınmış bağlantı tutulmasın
+        self.prompt_service.close()
+
+        if processing_ids is None:
+            for record in records:
+                results[record[0]] = {'index': record[0], 'success': False, 'status': 'error',
+                                      'error': 'İşlem kaydı oluşturulamadı.', 'processing_id': None}
+            return {'success': False, 'batch_id': batch_id, 'status': 'error', 'items': results}
+
+        jobs = []
+        for record, processing_id in zip(records, processing_ids):
+            index, cached_text = record[0], record[5]
+            results[index] = {'index': index, 'success': True, 'processing_id': processing_id,
+                              'status': 'completed' if cached_text is not None else 'pending',
+                              'cache_hit': cached_text is not None}
+            if cached_text is not None:
+                results[index]['processed_text'] = cached_text
+            else:
+                jobs.append((processing_id, record[2], record[4]))
+
+        if not wait:
+            if jobs and not get_job_queue().submit(self.run_batch_jobs, jobs):
+                error_msg = 'İşlem kuyruğu dolu, lütfen daha sonra tekrar deneyin.'
+                for processing_id, _, _ in jobs:
+                    self._update_processing_status(processing_id, 'error', error_msg)
+                return {'success': False, 'batch_id': batch_id, 'status': 'error',
+                        'error': error_msg, 'queue_full': True, 'items': results}
+            return {'success': True, 'batch_id': batch_id,
+                    'status': 'pending' if jobs else 'completed', 'items': results}
+
+        self.run_batch_jobs(jobs)
+
+        # Sonuçları kayıtlardan oku; modelin hatası ilgili kayda yazılmış olur
+        rows = {row['id']: row for row in self.get_batch_status(batch_id, user_id).get('items', [])}
+        for result in results:
+            row = rows.get(result.get('processing_id')) if result['success'] else None
+            if row is None or result.get('cache_hit'):
+                continue
+            result['status'] = row['status']
+            if row['status'] == 'completed':
+                result['processed_text'] = row['processed_text']
+            else:
+                result['success'] = False
+                result['error'] = row['processed_text'] or 'İşlem tamamlanamadı.'
+
+        return {'success': True, 'batch_id': batch_id, 'status': 'completed', 'items': results}
+
+    def get_batch_status(self, batch_id, user_id):
+        """
+        Bir toplu işlemin kayıtlarını oluşturulma sırasıyla ve durumlara göre
+        sayılarıyla döndürür. Kullanıcı yalnızca kendi toplu işlemini görebilir.
+
+        Returns:
+            dict: batch_id, 'counts', 'finished' ve 'items'. Kayıt yoksa 'items' boştur.
+        """
+        try:
+            with DatabaseConnection() as db:
+                rows = db.execute_query(
+                    f"""
+                    SELECT id, processing_status AS status, {text_codec.select_columns('processed_text')},
+                           cache_hit, created_at, completed_at
+                    FROM processing_history
+                    WHERE batch_id = %s AND user_id = %s
+                    ORDER BY id
+                    """,
+                    (batch_id, user_id), fetch_all=True
+                ) or []
+        except Exception as e:
+            print(f"Veritabanı hatası (get_batch_status): {e}")
+            rows = []
+
+        counts = {'pending': 0, 'processing': 0, 'completed': 0, 'error': 0}
+        for row in rows:
+            status = 'error' if row['status'] == 'failed' else row['status']
+            counts[status] = counts.get(status, 0) + 1
+            text_codec.decode_fields(row, 'processed_text')
+            row['cache_hit'] = bool(row.get('cache_hit'))
+            row['created_at'] = row['created_at'].isoformat() if row.get('created_at') else None
+            row['completed_at'] = row['completed_at'].isoformat() if row.get('completed_at') else None
+
+        return {
+            'batch_id': batch_id,
+            'total': len(rows),
+            'counts': counts,
+            'finished': counts['pending'] == 0 and counts['processing'] == 0,
+            'items': rows
+        }
+
+    def run_processing_job(self, processing_id, prompt=None, cache_ref=None):
+        """
+        Kuyruktan gelen bir işi çalıştırır. Kayıt önce 'pending' durumundan
+        'processing' durumuna atomik olarak alınır; böylece aynı iş birden fazla
+        worker veya süreç tarafından çalıştırılmaz.
+
+        Args:
+            processing_id (int): İşlenecek kaydın ID'si.
+            prompt (str, optional): Hazır prompt. Verilmezse kayıttaki prompt_text kullanılır.
+            cache_ref (tuple, optional): Sonucun yazılacağı (önbellek anahtarı, config_id) çifti.
+        """
+        if not self._claim_processing_record(processing_id):
+            return
+        try:
+            if prompt is None:
+                prompt = self._get_prompt_text(processing_id)
+            if not prompt:
+                self._update_processing_status(processing_id, 'error', 'Kayıtlı prompt bulunamadı.')
+                return
+            self._run_model(processing_id, prompt, cache_ref)
+        except Exception as e:
+            self._update_processing_status(processing_id, 'error', f"AI işleme hatası: {str(e)}")
+
+    def run_batch_jobs(self, jobs):
+        """
+        Toplu işlemin işlerini en fazla BATCH_CONCURRENCY thread ile çalıştırır
+        ve hepsi bitene kadar bekler. Her iş run_processing_job ile çalıştığı
+        için hatalar ilgili kayda yazılır, diğer işler etkilenmez.
+
+        Args:
+            jobs (list): (processing_id, prompt, cache_ref) üçlüleri.
+        """
+        if not jobs:
+            return
+        concurrency = min(len(jobs), max(1, int(os.getenv('BATCH_CONCURRENCY', '4'))))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='news-batch') as executor:
+            for _ in executor.map(lambda job: self.run_processing_job(*job), jobs):
+                pass
+
+    def recover_pending_jobs(self, stale_after=None):
+        """
+        Uygulama yeniden başlatıldığında yarım kalan işleri kuyruğa geri alır.
+        Yalnızca sahipliği süresi dolmuş kayıtlar alınır: bir worker tarafından
+        alınalı (claimed_at) JOB_STALE_AFTER saniyeden uzun süre geçmiş
+        'processing' kayıtlar ve o süreden uzun süredir kuyrukta bekleyen
+        'pending' kayıtlar. Kuyrukta uzun süre bekleyip yeni başlamış işler,
+        oluşturulma zamanları eski olsa da takılı sayılmaz.
+
+        Her süreç kendi ilk isteğinde bu fonksiyonu çalıştırdığından, kuyruğa
+        alınan 'pending' kayıtların claimed_at değeri aynı işlemde yenilenir;
+        aynı anda başlayan diğer süreçler bu kayıtları süre yeniden dolana
+        kadar almaz. Canlı süreçlerin yeni kuyruğa aldığı işlere dokunulmaz.
+
+        Returns:
+            int: Kuyruğa yeniden alınan iş sayısı.
+        """
+        if stale_after is None:
+            stale_after = int(os.getenv('JOB_STALE_AFTER', '600'))
+        job_queue = get_job_queue()
+        now = datetime.now()
+        cutoff = now - timedelta(seconds=stale_after)
+        capacity = job_queue.max_size - job_queue.stats()['queued']
+        try:
+            with DatabaseConnection() as db:
+                with db.transaction():
+                    stale = db.execute_query(
+                        """
+                        SELECT id, user_id FROM processing_history
+                        WHERE processing_status = 'processing' AND COALESCE(claimed_at, created_at) < %s
+                        FOR UPDATE
+                        """,
+                        (cutoff,), fetch_all=True
+                    ) or []
+                    if stale:
+                        db.execute_query(
+                            f"""
+                            UPDATE processing_history SET processing_status = 'pending', claimed_at = NULL
+                            WHERE id IN ({', '.join(['%s'] * len(stale))})
+                            """,
+                            tuple(row['id'] for row in stale)
+                        )
+                        per_user = {}
+                        for row in stale:
+                            per_user[row['user_id']] = per_user.get(row['user_id'], 0) + 1
+                        for stale_user, count in per_user.items():
+                            user_stats.record_status_change(db, stale_user, 'processing', 'pending', count)
+                for stale_user in {row['user_id'] for row in stale}:
+                    self._publish_changes(stale_user, [
+                        ('status', {'processing_id': row['id'], 'status': 'pending'})
+                        for row in stale if row['user_id'] == stale_user
+                    ])
+                if capacity <= 0:
+                    return 0
+                with db.transaction():
+                    rows = db.execute_query(
+                        """
+                        SELECT id FROM processing_history
+                        WHERE processing_status = 'pending' AND COALESCE(claimed_at, created_at) < %s
+                          AND (prompt_hash IS NOT NULL OR prompt_text IS NOT NULL OR prompt_data IS NOT NULL)
+                        ORDER BY id LIMIT %s
+                        FOR UPDATE
+                        """,
+                        (cutoff, capacity), fetch_all=True
+                    ) or []
+                    if rows:
+                        db.execute_query(
+                            f"""
+                            UPDATE processing_history SET claimed_at = %s
+                            WHERE id IN ({', '.join(['%s'] * len(rows))})
+                            """,
+                            (now,) + tuple(row['id'] for row in rows)
+                        )
+        except Exception as e:
+            print(f"Veritabanı hatası (recover_pending_jobs): {e}")
+            return 0
+
+        recovered = 0
+        for row in rows:
+            if not job_queue.submit(self.run_processing_job, row['id']):
+                break
+            recovered += 1
+        if recovered:
+            print(f"Bilgi: {recovered} yarım kalmış işlem kuyruğa geri alındı.")
+        return recovered
+
+    def get_processing_history(self, user_id, limit=50, cursor=None):
+        """
+        Kullanıcının geçmiş işlemlerini en yeniden eskiye, anahtar tabanlı
+        (keyset) sayfalama ile alır. Sayfa ne kadar derin olursa olsun sorgu
+        idx_user_history indeksinde imleçten başlayıp yalnızca `limit` kayıt okur.
+        Arşiv tablosu yalnızca sayfa sıcak pencerenin dışına taştığında okunur.
+
+        Kayıtlar tam metinleri içermez: haber metninin kısaltılmış önizlemesi
+        ('preview') ve iki metnin bayt boyutları döner. Tam metinler
+        get_processing_detail ile kayıt açıldığında okunur.
+
+        Args:
+            user_id (str): Kullanıcı kimliği.
+            limit (int): Sayfa boyutu.
+            cursor (str, optional): Önceki sayfanın döndürdüğü next_cursor.
+
+        Returns:
+            tuple: (kayıt listesi, sonraki sayfa imleci veya son sayfadaysa None).
+
+        Raises:
+            ValueError: İmleç geçersizse.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            with DatabaseConnection() as db:
+                rows = history_archive.fetch_page(
+                    db,
+                    HISTORY_PAGE_QUERY.format(
+                        columns=HISTORY_LIST_COLUMNS,
+                        after=HISTORY_AFTER_CLAUSE if after else ''
+                    ),
+                    (user_id,) + ((after[0], after[0], after[1]) if after else ()) + (limit + 1,),
+                    user_id, limit
+                )
+            if rows is None:
+                return [], None
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+            # Önizlemeyi kısalt, tarih alanlarını ISO formatına çevir
+            for row in rows:
+                row['preview'] = truncate_text(row['preview'] or '', HISTORY_PREVIEW_LENGTH)
                 row['created_at'] = row['created_at'].isoformat() if row.get('created_at') else None
                 row['completed_at'] = row['completed_at'].isoformat() if row.get('completed_at') else None
-
-            cursor.close()
-            return results
+            return rows, next_cursor
             
         except Exception as e:
             print(f"Veritabanı hatası (get_processing_history): {e}")
-            return []
+            return [], None
+
+    def get_processing_detail(self, processing_id, user_id):
+        """
+        Kullanıcıya ait tek bir geçmiş kaydını tam haber metni ve AI çıktısıyla
+        döndürür. Kayıt sıcak tabloda yoksa arşivden okunur.
+
+        Returns:
+            dict: Kayıt; bulunamazsa veya hata olursa None.
+        """
+        try:
+            with DatabaseConnection() as db:
+                row = history_archive.fetch_record(db, HISTORY_DETAIL_QUERY, (processing_id, user_id))
+        except Exception as e:
+            print(f"Veritabanı hatası (get_processing_detail): {e}")
+            return None
+        if not row:
+            return None
+
+        text_codec.decode_fields(row, 'processed_text')
+        row['created_at'] = row['created_at'].isoformat() if row.get('created_at') else None
+        row['completed_at'] = row['completed_at'].isoformat() if row.get('completed_at') else None
+        return row
 
     def mark_as_read(self, processing_id, user_id):
-        """Belirtilen işlem kaydını okundu olarak işaretler."""
+        """
+        Belirtilen işlem kaydını okundu olarak işaretler. Kayıt daha önce
+        okunmamışsa kullanıcının okunmamış sayacı aynı işlemde azaltılır.
+        """
+        changed = False
         try:
-            db = DatabaseConnection()
-            cursor = db.cursor
-            
-            query = "UPDATE processing_history SET read_status = 'read' WHERE id = %s AND user_id = %s"
-            cursor.execute(query, (processing_id, user_id))
-            db.connection.commit()
-            cursor.close()
-            return True
+            with DatabaseConnection() as db, db.transaction():
+                record = user_stats.lock_record(db, processing_id)
+                if record and record['user_id'] == user_id and record['read_status'] != 'read':
+                    db.execute_query(
+                        "UPDATE processing_history SET read_status = 'read' WHERE id = %s",
+                        (processing_id,)
+                    )
+                    user_stats.record_read(db, user_id)
+                    changed = True
             
         except Exception as e:
             print(f"Veritabanı hatası (mark_as_read): {e}")
             return False
 
+        if changed:
+            self._publish_changes(user_id, [('read', {'processing_id': processing_id, 'read_status': 'read'})])
+        return True
+
+    def mark_many_as_read(self, user_id, processing_ids=None, before=None):
+        """
+        Kullanıcının okunmamış kayıtlarını tek bir UPDATE ile okundu olarak
+        işaretler ve okunmamış sayacını aynı işlemde etkilenen kayıt sayısı
+        kadar azaltır. Arşivde yalnızca okunmuş kayıtlar bulunduğundan yalnızca
+        sıcak tablo güncellenir.
+
+        Args:
+            user_id (str): Kullanıcı kimliği.
+            processing_ids (list, optional): İşaretlenecek kayıtlar. Verilmezse
+                kullanıcının tüm okunmamış kayıtları işaretlenir.
+            before (str, optional): ISO biçiminde zaman; verilirse yalnızca bu
+                zamandan önce veya bu zamanda oluşturulan kayıtlar işaretlenir.
+
+        Returns:
+            int: Okundu olarak işaretlenen kayıt sayısı; hata durumunda None.
+
+        Raises:
+            ValueError: Kimlik listesi veya zaman geçersizse.
+        """
+        conditions, params = ["user_id = %s", "read_status = 'unread'"], [user_id]
+        if processing_ids is not None:
+            if (not isinstance(processing_ids, list)
+                    or not all(isinstance(item, int) and not isinstance(item, bool) for item in processing_ids)):
+                raise ValueError("Kayıt kimlikleri bir tam sayı listesi olmalıdır.")
+            if len(processing_ids) > MARK_READ_MAX_IDS:
+                raise ValueError(f"Tek istekte en fazla {MARK_READ_MAX_IDS} kayıt işaretlenebilir.")
+            if not processing_ids:
+                return 0
+            processing_ids = sorted(set(processing_ids))
+            conditions.append(f"id IN ({', '.join(['%s'] * len(processing_ids))})")
+            params.extend(processing_ids)
+        if before is not None:
+            try:
+                before = datetime.fromisoformat(before)
+            except (TypeError, ValueError):
+                raise ValueError("Geçersiz zaman; ISO biçiminde olmalıdır (örn. 2025-01-31T12:00:00).")
+            if before.tzinfo:
+                # Kayıt zamanları sunucunun yerel saatinde saklanır
+                before = before.astimezone().replace(tzinfo=None)
+            conditions.append("created_at <= %s")
+            params.append(before)
+
+        try:
+            with DatabaseConnection() as db, db.transaction():
+                count = db.execute_query(
+                    f"UPDATE processing_history SET read_status = 'read' WHERE {' AND '.join(conditions)}",
+                    tuple(params)
+                )
+                user_stats.record_read(db, user_id, count)
+        except Exception as e:
+            print(f"Veritabanı hatası (mark_many_as_read): {e}")
+            return None
+
+        if count:
+            self._publish_changes(user_id, [('read', {
+                'processing_ids': processing_ids, 'before': before.isoformat() if before else None,
+                'count': count, 'read_status': 'read'
+            })])
+        return count
+
     def get_user_statistics(self, user_id):
-        """Kullanıcının işlem istatistiklerini (toplam, tamamlanan vb.) hesaplar."""
+        """
+        Kullanıcının işlem istatistiklerini (toplam, tamamlanan vb.) döndürür.
+        Sayaçlar yazma anında güncellendiği için bu tek satırlık bir
+        birincil anahtar okumasıdır.
+        """
         try:
-            db = DatabaseConnection()
-            cursor = db.connection.cursor(dictionary=True)
-            
-            query = """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN processing_status = 'completed' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN processing_status = 'failed' THEN 1 ELSE 0 END) as failed,
-                SUM(CASE WHEN processing_status = 'processing' THEN 1 ELSE 0 END) as processing
-            FROM processing_history
-            WHERE user_id = %s
-            """
-            cursor.execute(query, (user_id,))
-            stats = cursor.fetchone()
-            cursor.close()
-            
-            # Sonuçları int'e çevir, None ise 0 ata
-            return {key: int(value) if value else 0 for key, value in stats.items()}
+            with DatabaseConnection() as db:
+                return user_stats.get_user_stats(db, user_id)
             
         except Exception as e:
             print(f"Veritabanı hatası (get_user_statistics): {e}")
-            return {'total': 0, 'completed': 0, 'failed': 0, 'processing': 0}
+            return dict.fromkeys(user_stats.COUNTER_COLUMNS, 0)
 
     # --- 2.0 Özel Yardımcı Metotlar ---
 
+    def _prepare_prompt(self, news_text, rules):
+        """
+        Metni doğrular ve aktif konfigürasyona göre prompt'u oluşturur.
+
+        Returns:
+            tuple: (prompt, önbellek referansı, None) başarılıysa, (None, None, hata mesajı)
+                   aksi halde. Önbellek referansı (anahtar, config_id) çiftidir;
+                   önbellek kapalıysa None olur.
+        """
+        is_valid, validation_message = self.validate_news(news_text)
+        if not is_valid:
+            return None, None, validation_message
+
+        active_config = self.prompt_service.get_active_config()
+        if not active_config:
+            return None, None, 'Aktif bir prompt konfigürasyonu bulunamadı.'
+
+        prompt = self.prompt_service.build_complete_prompt(
+            config_id=active_config['id'],
+            user_settings=rules or {},
+            news_text=news_text
+        )
+        if not prompt:
+            return None, None, 'Prompt oluşturulurken bir hata oluştu.'
+
+        cache_ref = None
+        if get_result_cache() is not None:
+            config_version = ConfigCache.version_stamp(active_config)
+            if PROMPT_COMPACTION:
+                # Sıkıştırılmış prompt'la üretilen sonuçlar ayrı anahtarlanır
+                config_version += ':compact'
+            cache_key = get_result_cache().make_key(news_text, rules, config_version, self.MODEL_NAME,
+                                                    self.prompt_service.template_version)
+            cache_ref = (cache_key, active_config['id'])
+        return prompt, cache_ref, None
+
+    def _complete_from_cache(self, cache_ref, user_id, news_text, prompt, rules):
+        """
+        Önbellekte sonuç varsa modeli çağırmadan 'completed' ve cache_hit olarak
+        işaretlenmiş bir geçmiş kaydı oluşturur.
+
+        Returns:
+            tuple: (processing_id, işlenmiş metin) isabet varsa, aksi halde None.
+        """
+        cache = get_result_cache()
+        if cache is None or cache_ref is None:
+            return None
+        processed_text = cache.get(cache_ref[0])
+        if processed_text is None:
+            return None
+        processing_id = self._save_processing_record(
+            user_id, news_text, prompt, 'completed', settings_used=rules,
+            processed_text=processed_text, cache_hit=True
+        )
+        return processing_id, processed_text
+
+    @staticmethod
+    def _store_in_cache(cache_ref, processed_text):
+        """Başarılı model çıktısını sonuç önbelleğine yazar."""
+        cache = get_result_cache()
+        if cache is not None and cache_ref is not None:
+            cache.put(cache_ref[0], cache_ref[1], processed_text)
+
+    def _run_model(self, processing_id, prompt, cache_ref=None):
+        """
+        Gemini API'sini çağırır, kaydı sonuca göre günceller ve başarılı
+        sonucu (cache_ref verilmişse) önbelleğe yazar.
+
+        Returns:
+            tuple: (işlenmiş metin, None) başarılıysa, (None, hata mesajı) aksi halde.
+        """
+        if not self.model:
+            error_msg = 'Gemini API anahtarı yapılandırılmamış.'
+            self._update_processing_status(processing_id, 'error', error_msg)
+            return None, error_msg
+
+        response = get_model_caller().call(lambda deadline: self._generate(prompt, deadline))
+        if response.text:
+            processed_text = response.text
+            self._store_in_cache(cache_ref, processed_text)
+        else:
+            processed_text = "AI işlemi başarısız oldu."
+
+        # Veritabanındaki kaydı sonuçla güncelle; yanıtta kullanım bilgisi
+        # yoksa prompt'un token sayısı istek yolunun dışında sorulur
+        prompt_tokens = self._prompt_tokens(response)
+        self._update_processing_status(processing_id, 'completed', processed_text, prompt_tokens=prompt_tokens)
+        if prompt_tokens is None:
+            self._schedule_token_count(processing_id, prompt)
+        return processed_text, None
+
+    def _generate(self, prompt, deadline):
+        """
+        Tek bir model denemesi: hız sınırlayıcıdan yer alır ve isteği gönderir.
+        Dayanıklılık katmanı tarafından (gerekirse yeniden deneme veya yedek
+        istek olarak) çağrılır. İstek, denemenin kalan süresiyle sınırlı
+        gönderilir; süresi dolan deneme thread'ini ve sınırlayıcıdaki yerini
+        bağlantı kendiliğinden kapanmasını beklemeden bırakır.
+        """
+        with get_model_rate_limiter().slot(prompt, timeout=deadline - time.monotonic()) as usage, \
+                self._measure_model('generate', prompt):
+            response = send_request(self.model, prompt, timeout=max(0.0, deadline - time.monotonic()))
+            usage['tokens'] = self._used_tokens(response)
+        return response
+
+    @staticmethod
+    @contextmanager
+    def _measure_model(kind, prompt):
+        """
+        Model çağrısının süresini (sıra beklemesi hariç), sonucunu, hata türünü
+        ve prompt büyüklüğünü metriklere yazar.
+        """
+        metrics = get_metrics()
+        metrics.observe('model_prompt_tokens', (kind,), estimate_tokens(prompt))
+        started = time.perf_counter()
+        outcome = 'success'
+        try:
+            yield
+        except Exception as e:
+            outcome = 'error'
+            metrics.inc('model_errors_total', (kind, type(e).__name__))
+            raise
+        except BaseException:
+            outcome = 'cancelled'
+            raise
+        finally:
+            metrics.observe('model_request_duration_seconds', (kind, outcome), time.perf_counter() - started)
+
+    @staticmethod
+    def _prompt_tokens(response):
+        """
+        Yanıttaki kullanım bilgisinden prompt'un token sayısını döndürür.
+        Sürüm sabitlenmiş istemcinin (google-generativeai 0.3.2) yanıtlarında
+        usage_metadata bulunmaz; bu durumda None döner ve sayı
+        _schedule_token_count ile sonradan yazılır.
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        count = getattr(usage, 'prompt_token_count', None)
+        return count if isinstance(count, int) and count > 0 else None
+
+    def _schedule_token_count(self, processing_id, prompt):
+        """
+        Prompt'un model tarafındaki token sayısını ayrı bir kuyrukta sordurur.
+        Sayım isteği yanıtı geciktirmez; kuyruk doluysa sayım atlanır ve
+        kaydın prompt_tokens değeri boş kalır.
+        """
+        if not get_token_count_queue().submit(self._record_prompt_tokens, processing_id, prompt):
+            print(f"Uyarı: Token sayım kuyruğu dolu, {processing_id} numaralı kaydın prompt'u sayılmadı.")
+
+    def _record_prompt_tokens(self, processing_id, prompt):
+        """
+        Prompt'u dayanıklılık katmanı ve hız sınırlayıcı üzerinden modele
+        saydırır ve sonucu kayda yazar. Sayılamazsa kayıt değiştirilmez.
+        """
+        try:
+            tokens = get_model_caller().call(lambda deadline: self._count_tokens(prompt, deadline))
+        except Exception as e:
+            print(f"Uyarı: Prompt token sayısı alınamadı: {e}")
+            return
+        try:
+            with DatabaseConnection() as db:
+                db.execute_query(
+                    "UPDATE processing_history SET prompt_tokens = %s WHERE id = %s",
+                    (tokens, processing_id)
+                )
+        except Exception as e:
+            print(f"Veritabanı hatası (prompt token): {e}")
+
+    def _count_tokens(self, prompt, deadline):
+        """
+        Tek bir sayım denemesi: hız sınırlayıcıdan yer alır ve isteği kalan
+        süreyle sınırlı gönderir. Sayım çıktı üretmediğinden ayrılan token
+        kotası iade edilir.
+        """
+        with get_model_rate_limiter().slot(prompt, timeout=deadline - time.monotonic()) as usage, \
+                self._measure_model('count_tokens', prompt):
+            tokens = count_tokens(self.model, prompt, timeout=max(0.0, deadline - time.monotonic()))
+            usage['tokens'] = 0
+        return tokens
+
+    @staticmethod
+    def _used_tokens(response):
+        """Yanıttaki gerçek token kullanımını döndürür; bilgi yoksa None."""
+        usage = getattr(response, 'usage_metadata', None)
+        total = getattr(usage, 'total_token_count', None)
+        return total if isinstance(total, int) and total > 0 else None
+
+    @staticmethod
+    def _cancel_stream(response):
+        """
+        Devam eden bir akış yanıtının alttaki gRPC/HTTP akışını iptal eder.
+        Kütüphane bunun için açık bir API sunmadığından, iptal edilebilir
+        iç iteratör varsa doğrudan kapatılır.
+        """
+        iterator = getattr(response, '_iterator', None) if response is not None else None
+        cancel = getattr(iterator, 'cancel', None)
+        if callable(cancel):
+            try:
+                cancel()
+            except Exception as e:
+                print(f"Uyarı: Model akışı iptal edilemedi: {e}")
+
+    @staticmethod
+    def _field_parser(rules):
+        """Çıktı formatı JSON ise akış için yeni bir alan ayrıştırıcısı döndürür, değilse None."""
+        if (rules or {}).get('outputFormat', 'json') != 'json':
+            return None
+        return JsonFieldStream()
+
+    @staticmethod
+    def _field_events(parser, processing_id, text):
+        """
+        Parçayı ayrıştırıcıya verir ve tamamlanan her alan için bir 'field'
+        olayı döndürür. `text` None ise akışın bittiği kabul edilir.
+        """
+        if parser is None:
+            return []
+        fields = parser.finish() if text is None else parser.feed(text)
+        return [('field', {'processing_id': processing_id, 'name': name, 'value': value})
+                for name, value in fields]
 
-        
     def validate_news(self, news_text):
         """Haber metninin uzunluk gibi temel kurallara uygunluğunu doğrular."""
         if not news_text or len(news_text.strip()) < 10:
@@ -209,43 +994,193 @@ class AIService:
 
     # --- 3.0 Veritabanı İşlemleri ---
 
-    def _save_processing_record(self, user_id, original_text, prompt_text, status, settings_used=None):
-        """Yeni bir işlem kaydını veritabanına ekler ve ID'sini döndürür."""
+    def _save_processing_record(self, user_id, original_text, prompt_text, status, settings_used=None,
+                                processed_text=None, cache_hit=False):
+        """
+        Yeni bir işlem kaydını veritabanına ekler ve ID'sini döndürür.
+        Önbellekten karşılanan kayıtlar doğrudan 'completed' olarak ve
+        cache_hit işaretiyle yazılır. Prompt şablonu ve ayarlar özetleriyle
+        (bkz. history_store) saklanır.
+        """
+        prompt_hash, template, inline_prompt = history_store.encode_prompt(prompt_text, original_text)
+        settings_hash, settings_json = history_store.encode_settings(settings_used)
         try:
-            db = DatabaseConnection()
-            cursor = db.cursor
-            
-            query = """
-            INSERT INTO processing_history 
-            (user_id, original_text, prompt_text, processing_status, settings_used, created_at) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            settings_json = json.dumps(settings_used) if settings_used else None
-            
-            cursor.execute(query, (user_id, original_text, prompt_text, status, settings_json, datetime.now()))
-            db.connection.commit()
-            processing_id = cursor.lastrowid
-            cursor.close()
-            return processing_id
+            with DatabaseConnection() as db, db.transaction():
+                history_store.save_contents(
+                    db,
+                    templates={prompt_hash: template} if prompt_hash else None,
+                    snapshots={settings_hash: settings_json} if settings_hash else None
+                )
+                now = datetime.now()
+                columns = {
+                    'user_id': user_id, 'original_text': original_text,
+                    'original_size': text_codec.text_size(original_text), 'prompt_hash': prompt_hash,
+                    'processing_status': status, 'settings_hash': settings_hash, 'cache_hit': int(cache_hit),
+                    'created_at': now, 'completed_at': now if status == 'completed' else None,
+                }
+                columns.update(text_codec.column_values({'prompt_text': inline_prompt, 'processed_text': processed_text}))
+                db.execute_query(
+                    f"INSERT INTO processing_history ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columns))})",
+                    tuple(columns.values())
+                )
+                processing_id = db.cursor.lastrowid
+                user_stats.record_created(db, user_id, {status: 1})
             
         except Exception as e:
             print(f"Veritabanı hatası (kayıt): {e}")
             return None
 
-    def _update_processing_status(self, processing_id, status, processed_text=None):
-        """Mevcut bir işlem kaydının durumunu ve işlenmiş metnini günceller."""
+        self._publish_changes(user_id, [('status', {'processing_id': processing_id, 'status': status})])
+        return processing_id
+
+    def _save_processing_records(self, user_id, batch_id, records):
+        """
+        Toplu işlem kayıtlarını tek bir çok satırlı INSERT ile ekler. Önbellekte
+        sonucu bulunan öğeler doğrudan 'completed', diğerleri 'pending' yazılır.
+        Aynı ayarlara sahip öğeler tek bir prompt şablonunu paylaşır.
+
+        Args:
+            records (list): (öğe sırası, haber metni, prompt, ayarlar, önbellek referansı,
+                            önbellekteki sonuç) demetleri.
+
+        Returns:
+            list: Kayıtların ID'leri (records ile aynı sırada), hata durumunda None.
+        """
+        now = datetime.now()
+        columns, params, statuses, templates, snapshots = None, [], [], {}, {}
+        for _, news_text, prompt, rules, _, cached_text in records:
+            cached = cached_text is not None
+            prompt_hash, template, inline_prompt = history_store.encode_prompt(prompt, news_text)
+            settings_hash, settings_json = history_store.encode_settings(rules)
+            if prompt_hash:
+                templates[prompt_hash] = template
+            if settings_hash:
+                snapshots[settings_hash] = settings_json
+            row = {
+                'user_id': user_id, 'batch_id': batch_id, 'original_text': news_text,
+                'original_size': text_codec.text_size(news_text), 'prompt_hash': prompt_hash,
+                'processing_status': 'completed' if cached else 'pending', 'settings_hash': settings_hash,
+                'cache_hit': int(cached), 'created_at': now, 'completed_at': now if cached else None,
+            }
+            row.update(text_codec.column_values({'prompt_text': inline_prompt, 'processed_text': cached_text}))
+            columns = columns or list(row)
+            params.append(tuple(row[column] for column in columns))
+            statuses.append(row['processing_status'])
+        query = (f"INSERT INTO processing_history ({', '.join(columns)}) "
+                 f"VALUES ({', '.join(['%s'] * len(columns))})")
+        status_counts = {}
+        for status in statuses:
+            status_counts[status] = status_counts.get(status, 0) + 1
+        try:
+            with DatabaseConnection() as db, db.transaction():
+                history_store.save_contents(db, templates, snapshots)
+                db.execute_many(query, params)
+                # Tek bir INSERT içindeki otomatik ID'ler satır sırasıyla artar;
+                # ardışık olmaları garanti olmadığından ID'ler batch_id ile okunur.
+                rows = db.execute_query(
+                    "SELECT id FROM processing_history WHERE batch_id = %s ORDER BY id",
+                    (batch_id,), fetch_all=True
+                )
+                user_stats.record_created(db, user_id, status_counts)
+        except Exception as e:
+            print(f"Veritabanı hatası (toplu kayıt): {e}")
+            return None
+
+        if not rows or len(rows) != len(records):
+            print(f"Veritabanı hatası (toplu kayıt): {len(records)} kayıt beklenirken {len(rows or [])} bulundu.")
+            return None
+        self._publish_changes(user_id, [
+            ('status', {'processing_id': row['id'], 'status': statuses[index], 'batch_id': batch_id})
+            for index, row in enumerate(rows)
+        ])
+        return [row['id'] for row in rows]
+
+    def _update_processing_status(self, processing_id, status, processed_text=None, prompt_tokens=None):
+        """
+        Mevcut bir işlem kaydının durumunu ve işlenmiş metnini günceller.
+        `prompt_tokens` verilirse prompt'un token sayısı da yazılır.
+        Kullanıcı sayaçları aynı işlem içinde eski durumdan yenisine aktarılır.
+        """
+        completed_at = datetime.now()
+        text_assignments, text_params = text_codec.update_assignments({'processed_text': processed_text})
+        assignments = f"processing_status = %s, completed_at = %s, {text_assignments}"
+        params = (status, completed_at) + text_params
+        if prompt_tokens is not None:
+            assignments += ", prompt_tokens = %s"
+            params += (prompt_tokens,)
         try:
-            db = DatabaseConnection()
-            cursor = db.cursor
+            with DatabaseConnection() as db, db.transaction():
+                record = user_stats.lock_record(db, processing_id)
+                if not record:
+                    return
             
-            query = """
-            UPDATE processing_history 
-            SET processing_status = %s, processed_text = %s, completed_at = %s
-            WHERE id = %s
-            """
-            cursor.execute(query, (status, processed_text, datetime.now(), processing_id))
-            db.connection.commit()
-            cursor.close()
+                db.execute_query(
+                    f"UPDATE processing_history SET {assignments} WHERE id = %s",
+                    params + (processing_id,)
+                )
+                user_stats.record_status_change(db, record['user_id'], record['processing_status'], status)
             
         except Exception as e:
             print(f"Veritabanı hatası (güncelleme): {e}")
+            return
+
+        self._publish_changes(record['user_id'], [('status', {
+            'processing_id': processing_id,
+            'status': status,
+            'completed_at': completed_at.isoformat()
+        })])
+
+    def _claim_processing_record(self, processing_id):
+        """
+        Kaydı 'pending' durumundan 'processing' durumuna alır ve alınma
+        zamanını (claimed_at) yazar; takılı iş tespiti bu zamana göre yapılır.
+        Kayıt satır kilidiyle okunduğu için aynı işi yalnızca bir worker
+        alabilir. Başarılıysa True döner.
+        """
+        try:
+            with DatabaseConnection() as db, db.transaction():
+                record = user_stats.lock_record(db, processing_id)
+                if not record or record['processing_status'] != 'pending':
+                    return False
+                db.execute_query(
+                    "UPDATE processing_history SET processing_status = 'processing', claimed_at = %s WHERE id = %s",
+                    (datetime.now(), processing_id)
+                )
+                user_stats.record_status_change(db, record['user_id'], 'pending', 'processing')
+        except Exception as e:
+            print(f"Veritabanı hatası (iş alma): {e}")
+            return False
+
+        self._publish_changes(record['user_id'], [('status', {'processing_id': processing_id, 'status': 'processing'})])
+        return True
+
+    def _get_prompt_text(self, processing_id):
+        """
+        Bir işlem kaydına ait prompt metnini döndürür. Şablonla saklanan
+        prompt'lar kaydın haber metniyle yeniden oluşturulur.
+        """
+        try:
+            with DatabaseConnection() as db:
+                return history_store.load_prompt(db, processing_id)
+        except Exception as e:
+            print(f"Veritabanı hatası (prompt okuma): {e}")
+            return None
+
+    @staticmethod
+    def _publish_changes(user_id, events):
+        """
+        Commit edilmiş değişiklikleri kullanıcının açık sekmelerine olay olarak
+        iletir ve ardından güncel sayaçları 'stats' olayıyla gönderir. Kullanıcının
+        dinleyen sekmesi yoksa hiçbir sorgu yapılmaz.
+        """
+        bus = get_event_bus()
+        if not user_id or not bus.has_subscribers(user_id):
+            return
+        for event, payload in events:
+            bus.publish(user_id, event, payload)
+        try:
+            with DatabaseConnection() as db:
+                bus.publish(user_id, 'stats', user_stats.get_user_stats(db, user_id))
+        except Exception as e:
+            print(f"Veritabanı hatası (olay yayınlama): {e}")
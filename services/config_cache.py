@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, prompt konfigürasyon grafiğinin (konfigürasyon, bölümler, kurallar
+#ve kural seçenekleri) süreç içi, sürümlü önbelleğini sağlar. Her istekte
+#MySQL'e gidilmez; grafik bir kez yüklenir ve yazma yolları tarafından
+#açıkça geçersiz kılınır.
+#
+#Birden fazla worker çalıştığında, başka bir süreçte yapılan değişiklikler
+#`prompt_configs` tablosunun sürüm bilgisinin (id, version, revision,
+#is_active) en fazla CONFIG_CACHE_CHECK_INTERVAL saniyede bir sorgulanmasıyla
+#fark edilir.
+#
+#İçindekiler:
+#1.0 ConfigCache Sınıfı
+#    - get_active_graph: Aktif konfigürasyonun grafiğini döndürür.
+#    - get_graph: Belirli bir konfigürasyonun grafiğini döndürür.
+#    - invalidate: Bir veya tüm konfigürasyonların grafiğini geçersiz kılar.
+#    - stats: İsabet/yükleme sayaçlarını döndürür.
+#    - version_stamp: Konfigürasyon satırının sürüm damgasını üretir.
+#    - _refresh_versions: Sürüm bilgisini gerektiğinde veritabanından tazeler.
+#    - _is_fresh: Sürüm bilgisinin kontrol aralığı içinde olup olmadığını döndürür.
+#    - _with_db: Gerekirse havuzdan geçici bağlantı alır.
+#    - _load_graph: Bir konfigürasyonun grafiğini veritabanından yükler.
+#2.0 Süreç Geneli Önbellek
+#    - get_config_cache: Ortam değişkenlerine göre yapılandırılmış tekil önbelleği döndürür.
+
+import os
+import threading
+import time
+
+from database.connection import DatabaseConnection
+
+# Kural ve seçenekler tek sorguda (LEFT JOIN) okunur; seçenek sütunları bu
+# önekle ayrıştırılır.
+OPTION_PREFIX = 'opt_'
+
+
+class ConfigCache:
+    """
+    Konfigürasyon grafiklerini config_id'ye göre tutan süreç içi önbellek.
+    Döndürülen grafikler paylaşılır ve salt okunur kabul edilmelidir.
+    """
+
+    def __init__(self, check_interval=5.0):
+        """
+        Args:
+            check_interval (float): Sürüm bilgisinin veritabanından yeniden
+                                    okunacağı en kısa aralık (saniye). 0 ise
+                                    her erişimde kontrol edilir.
+        """
+        self.check_interval = float(check_interval)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._generation = 0    # invalidate() her çağrıldığında artar
+        self._graphs = {}       # config_id -> grafik
+        self._versions = {}     # config_id -> sürüm damgası (son kontrole göre)
+        self._active_id = None
+        self._checked_at = None
+        self._counters = {'hits': 0, 'loads': 0, 'checks': 0, 'invalidations': 0}
+
+    # --- 1.0 Önbellek İşlemleri ---
+
+    def get_active_graph(self, db=None):
+        """Aktif konfigürasyonun grafiğini döndürür; aktif konfigürasyon yoksa None."""
+        self._refresh_versions(db)
+        active_id = self._active_id
+        if active_id is None:
+            return None
+        return self.get_graph(active_id, db)
+
+    def get_graph(self, config_id, db=None):
+        """
+        Belirtilen konfigürasyonun grafiğini döndürür. Grafik önbellekte yoksa
+        veya sürümü değişmişse veritabanından yüklenir. `db` verilmezse
+        yalnızca sorgu gerektiğinde havuzdan bağlantı alınır.
+
+        Returns:
+            dict: {'config', 'sections', 'rules', 'rule_options', 'version'} veya None.
+        """
+        self._refresh_versions(db)
+        with self._lock:
+            graph = self._graphs.get(config_id)
+            if graph is not None and graph['version'] == self._versions.get(config_id):
+                self._counters['hits'] += 1
+                return graph
+
+        graph = self._with_db(db, lambda conn: self._load_graph(config_id, conn))
+        if graph is None:
+            return None
+        with self._lock:
+            self._counters['loads'] += 1
+            self._versions[config_id] = graph['version']
+            self._graphs[config_id] = graph
+        return graph
+
+    def invalidate(self, config_id=None):
+        """
+        Belirtilen konfigürasyonun (None ise tümünün) grafiğini siler ve bir
+        sonraki erişimde sürüm bilgisinin yeniden okunmasını sağlar.
+        """
+        with self._lock:
+            if config_id is None:
+                self._graphs.clear()
+            else:
+                self._graphs.pop(config_id, None)
+            self._checked_at = None
+            self._generation += 1
+            self._counters['invalidations'] += 1
+
+    def stats(self):
+        """Önbellek sayaçlarını ve tutulan grafik sayısını döndürür."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['graphs'] = len(self._graphs)
+            stats['active_id'] = self._active_id
+        return stats
+
+    def _is_fresh(self):
+        """Sürüm bilgisi yüklenmiş ve `check_interval` içinde kontrol edilmişse True döner."""
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    def _refresh_versions(self, db):
+        """
+        Son kontrolden bu yana `check_interval` geçtiyse tüm konfigürasyonların
+        sürüm damgalarını tek bir hafif sorguyla okur. Damgası değişen
+        grafikler atılır. Aynı anda yalnızca bir thread kontrol yapar.
+
+        Sürüm bilgisi hiç yüklenmemişse (ilk erişim veya invalidate sonrası)
+        diğer thread'ler yükleme bitene kadar bekler; yalnızca süresi dolmuş
+        ama geçerli bir bilgi varken mevcut sürümlerle devam edilir.
+        `_checked_at` yalnızca başarılı bir yüklemeden sonra güncellenir.
+        """
+        with self._lock:
+            if self._is_fresh():
+                return
+            loaded = self._checked_at is not None
+        if not self._refresh_lock.acquire(blocking=not loaded):
+            # Başka bir thread kontrol ediyor; mevcut sürümler kullanılır
+            return
+        try:
+            with self._lock:
+                if self._is_fresh():
+                    return
+                generation = self._generation
+                self._counters['checks'] += 1
+
+            rows = self._with_db(db, lambda conn: conn.execute_query(
+                "SELECT id, version, revision, is_active FROM prompt_configs ORDER BY id",
+                fetch_all=True
+            ))
+            if rows is None:
+                # Sorgu başarısızsa bir sonraki erişimde yeniden denenir
+                return
+
+            versions = {row['id']: self.version_stamp(row) for row in rows}
+            active_id = next((row['id'] for row in rows if row['is_active']), None)
+            with self._lock:
+                for config_id in list(self._graphs):
+                    if self._graphs[config_id]['version'] != versions.get(config_id):
+                        del self._graphs[config_id]
+                self._versions = versions
+                self._active_id = active_id
+                # Sorgu sürerken invalidate edildiyse sonuç eski olabilir; bir
+                # sonraki erişim yeniden kontrol eder
+                if generation == self._generation:
+                    self._checked_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    @staticmethod
+    def _with_db(db, func):
+        """
+        Verilen bağlantıyla çalışır; bağlantı yoksa yalnızca bu iş için havuzdan
+        bir bağlantı alıp iade eder. Önbellek isabetlerinde bağlantı hiç alınmaz.
+        """
+        if db is not None:
+            return func(db)
+        with DatabaseConnection() as own_db:
+            return func(own_db)
+
+    @staticmethod
+    def version_stamp(config_row):
+        """Konfigürasyon satırından sürüm damgası üretir (id, version, revision)."""
+        return f"{config_row['id']}:{config_row.get('version')}:{config_row.get('revision')}"
+
+    def _load_graph(self, config_id, db):
+        """
+        Bir konfigürasyonun grafiğini yükler. Kurallar ve seçenekleri tek bir
+        LEFT JOIN ile okunur (kural başına ayrı sorgu yapılmaz). Bölümler ayrı
+        bir sorguyla alınır; aynı sorguya katılmaları bölüm × seçenek sayısı
+        kadar satır üretirdi.
+        """
+        config = db.execute_query("SELECT * FROM prompt_configs WHERE id = %s", (config_id,), fetch_one=True)
+        if not config:
+            return None
+
+        sections = db.execute_query(
+            "SELECT * FROM prompt_sections WHERE config_id = %s AND is_active = TRUE ORDER BY display_order",
+            (config_id,), fetch_all=True
+        )
+        rule_rows = db.execute_query(
+            f"""
+            SELECT r.*,
+                   o.id AS {OPTION_PREFIX}id, o.rule_id AS {OPTION_PREFIX}rule_id,
+                   o.option_key AS {OPTION_PREFIX}option_key, o.option_label AS {OPTION_PREFIX}option_label,
+                   o.display_order AS {OPTION_PREFIX}display_order, o.is_active AS {OPTION_PREFIX}is_active
+            FROM prompt_rules r
+            LEFT JOIN prompt_rule_options o ON o.rule_id = r.id AND o.is_active = TRUE
+            WHERE r.config_id = %s AND r.is_active = TRUE
+            ORDER BY r.display_order, r.id, o.display_order
+            """,
+            (config_id,), fetch_all=True
+        )
+        if sections is None or rule_rows is None:
+            return None
+
+        rules, rule_options = {}, {}
+        for row in rule_rows:
+            rule_key = row['rule_key']
+            if rule_key not in rules:
+                rules[rule_key] = {k: v for k, v in row.items() if not k.startswith(OPTION_PREFIX)}
+                rule_options[rule_key] = []
+            if row[f'{OPTION_PREFIX}id'] is not None:
+                rule_options[rule_key].append(
+                    {k[len(OPTION_PREFIX):]: v for k, v in row.items() if k.startswith(OPTION_PREFIX)}
+                )
+
+        return {
+            'config': config,
+            'sections': {row['section_key']: row for row in sections},
+            'rules': rules,
+            'rule_options': rule_options,
+            'version': self.version_stamp(config),
+        }
+
+
+# --- 2.0 Süreç Geneli Önbellek ---
+
+_config_cache = None
+_config_cache_lock = threading.Lock()
+
+
+def get_config_cache():
+    """
+    Süreç genelinde paylaşılan konfigürasyon önbelleğini döndürür, yoksa
+    oluşturur. Kontrol aralığı CONFIG_CACHE_CHECK_INTERVAL ile ayarlanır.
+    """
+    global _config_cache
+    if _config_cache is None:
+        with _config_cache_lock:
+            if _config_cache is None:
+                _config_cache = ConfigCache(
+                    check_interval=float(os.getenv('CONFIG_CACHE_CHECK_INTERVAL', '5')),
+                )
+    return _config_cache
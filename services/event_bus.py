@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, kullanıcıya özel olayların (işlem durumu değişti, okundu bilgisi
+#değişti, sayaçlar güncellendi) açık tarayıcı sekmelerine anlık iletilmesi
+#için süreç içi bir yayın/abone (publish/subscribe) olay yolu sağlar.
+#Olaylar, veritabanına yazan kod yollarından yayınlanır; sekmeler
+#/api/v1/news/events üzerinden Server-Sent Events ile dinler ve periyodik
+#sorgu yapmaz.
+#
+#Not: Olay yolu süreç içidir; birden fazla worker süreci çalıştığında bir
+#olay yalnızca aynı süreçteki abonelere ulaşır.
+#
+#İçindekiler:
+#1.0 Subscription Sınıfı
+#    - get: Sıradaki olayı bekler.
+#    - put: Olayı aboneliğin kuyruğuna bırakır (dolarsa yeniden senkronizasyon ister).
+#2.0 EventBus Sınıfı
+#    - subscribe, unsubscribe: Kullanıcı için abonelik açar/kapatır.
+#    - publish: Bir kullanıcının tüm aboneliklerine olay gönderir.
+#    - has_subscribers: Kullanıcının dinleyen sekmesi olup olmadığını döndürür.
+#    - stats: Abone ve olay sayaçlarını döndürür.
+#3.0 Süreç Geneli Olay Yolu
+#    - get_event_bus: Tekil olay yolunu döndürür.
+
+import os
+import queue
+import threading
+
+
+class Subscription:
+    """
+    Tek bir dinleyiciye (örn. bir tarayıcı sekmesi) ait sınırlı olay kuyruğu.
+    Kuyruk dolarsa yeni olaylar atılır ve dinleyiciye bir kez 'resync'
+    olayı gönderilir; istemci bu durumda güncel durumu bir kez sorgular.
+    """
+
+    def __init__(self, user_id, max_size=100):
+        self.user_id = user_id
+        self._queue = queue.Queue(maxsize=max_size)
+        self._overflowed = False
+
+    # --- 1.0 Abonelik İşlemleri ---
+
+    def get(self, timeout=None):
+        """
+        Sıradaki (olay adı, veri) çiftini döndürür. Süre dolarsa None döner.
+        Kuyruk taşmışsa bekleyen olaylar atılır ve ('resync', {}) döndürülür;
+        istemci zaten güncel durumu yeniden okuyacaktır.
+        """
+        if self._overflowed:
+            self._overflowed = False
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            return 'resync', {}
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, event, data):
+        try:
+            self._queue.put_nowait((event, data))
+        except queue.Full:
+            self._overflowed = True
+
+
+class EventBus:
+    """Kullanıcı kimliğine göre gruplanmış abonelikler üzerinden olay dağıtır."""
+
+    def __init__(self, queue_size=100):
+        """
+        Args:
+            queue_size (int): Her aboneliğin bekletebileceği en fazla olay sayısı.
+        """
+        self.queue_size = max(1, int(queue_size))
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> Subscription kümesi
+        self._published = 0
+        self._delivered = 0
+
+    # --- 2.0 Olay Yolu İşlemleri ---
+
+    def subscribe(self, user_id):
+        """Kullanıcı için yeni bir abonelik açar ve döndürür."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Aboneliği kapatır. Birden fazla kez çağrılması güvenlidir."""
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event, data):
+        """
+        Kullanıcının tüm aboneliklerine olay gönderir. Dinleyen yoksa hiçbir
+        şey yapmaz; yayınlayan taraf hiçbir zaman bloklanmaz.
+        """
+        if not user_id:
+            return
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+            self._published += 1
+            self._delivered += len(subscriptions)
+        for subscription in subscriptions:
+            subscription.put(event, data)
+
+    def has_subscribers(self, user_id):
+        """Kullanıcının en az bir açık aboneliği varsa True döner."""
+        with self._lock:
+            return bool(self._subscribers.get(user_id))
+
+    def stats(self):
+        """Açık abonelik sayısını ve olay sayaçlarını döndürür."""
+        with self._lock:
+            return {
+                'users': len(self._subscribers),
+                'subscriptions': sum(len(subs) for subs in self._subscribers.values()),
+                'published': self._published,
+                'delivered': self._delivered,
+            }
+
+
+# --- 3.0 Süreç Geneli Olay Yolu ---
+
+_event_bus = None
+_event_bus_pid = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """
+    Süreç genelinde paylaşılan olay yolunu döndürür, yoksa oluşturur.
+    Abonelik kuyruğu boyutu EVENTS_QUEUE_SIZE ile ayarlanır.
+    """
+    global _event_bus, _event_bus_pid
+    pid = os.getpid()
+    if _event_bus is not None and _event_bus_pid == pid:
+        return _event_bus
+
+    with _event_bus_lock:
+        if _event_bus is None or _event_bus_pid != pid:
+            _event_bus = EventBus(queue_size=int(os.getenv('EVENTS_QUEUE_SIZE', '100')))
+            _event_bus_pid = pid
+    return _event_bus
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, processing_history tablosunun sıcak (hot) ve arşiv olarak
+#ikiye ayrılmasını yönetir. Belirli bir yaştan eski, tamamlanmış ve okunmuş
+#kayıtlar database/archive_history.py ile `processing_history_archive`
+#tablosuna taşınır; kayıtlar kimliklerini korur. Böylece kullanıcı sorguları,
+#indeksler ve FULLTEXT indeksi yalnızca yakın dönemin kayıtlarını taşır.
+#
+#Geçmiş sayfaları önce sıcak tablodan okunur. Arşiv, yalnızca sayfa sıcak
+#pencerenin dışına taştığında (imleç arşivdeki en yeni kayda ulaştığında)
+#sorgulanır ve iki tablonun sonuçları aynı sıralamayla birleştirilir.
+#
+#Arşive yalnızca okunmuş ve son durumuna ulaşmış kayıtlar taşındığı için
+#durum güncellemeleri, okundu işaretleme ve kullanıcı sayaçları arşive hiç
+#yazmaz. processing_history'ye eklenen her sütun arşiv tablosuna da
+#eklenmelidir.
+#
+#İçindekiler:
+#1.0 Sayfa Okuma
+#    - fetch_page: Geçmiş sayfasını gerekirse arşivle tamamlayarak okur.
+#    - archive_boundary: Kullanıcının arşivdeki en yeni kaydının zamanını döndürür.
+#    - fetch_record: Tek bir kaydı önce sıcak tablodan, yoksa arşivden okur.
+#2.0 Arşivleme
+#    - archive_cutoff: Verilen yaştan eski kayıtlar için sınır zamanını hesaplar.
+#    - archive_batch: Bir grup eski kaydı arşiv tablosuna taşır.
+
+import os
+from datetime import datetime, timedelta
+
+HOT_TABLE = 'processing_history'
+ARCHIVE_TABLE = 'processing_history_archive'
+# Bu yaştan (gün) genç kayıtlar hiçbir zaman arşive taşınmaz
+ARCHIVE_AFTER_DAYS = int(os.getenv('HISTORY_ARCHIVE_AFTER_DAYS', '180'))
+ARCHIVE_STATUSES = ('completed', 'error', 'failed')
+
+# İki tabloda ortak olan sütunlar (taşıma sırasında açıkça listelenir)
+ARCHIVE_COLUMNS = (
+    'id', 'user_id', 'batch_id', 'config_id', 'original_text', 'original_size', 'text_codec',
+    'prompt_text', 'prompt_data', 'prompt_hash', 'prompt_tokens',
+    'processed_text', 'processed_data', 'processed_size', 'settings_used', 'settings_hash',
+    'processing_status', 'cache_hit', 'read_status', 'error_message',
+    'created_at', 'claimed_at', 'completed_at',
+)
+
+
+# --- 1.0 Sayfa Okuma ---
+
+def archive_boundary(db, user_id):
+    """Kullanıcının arşivdeki en yeni kaydının oluşturulma zamanını döndürür; arşivi yoksa None."""
+    row = db.execute_query(
+        f"SELECT created_at FROM {ARCHIVE_TABLE} WHERE user_id = %s ORDER BY created_at DESC LIMIT 1",
+        (user_id,), fetch_one=True
+    )
+    return row['created_at'] if row else None
+
+
+def fetch_page(db, query, params, user_id, limit):
+    """
+    Geçmiş sayfasını (en fazla limit + 1 kayıt) created_at DESC, id ASC
+    sırasıyla okur. `query` tablo adı için {table} yer tutucusu içerir.
+
+    Sıcak tablo sayfayı doldurduysa ve son kaydı arşiv penceresinden
+    yeniyse arşive hiç bakılmaz. Aksi hâlde kullanıcının arşivdeki en yeni
+    kaydı sayfanın son kaydından yeni değilse aynı sorgu arşivde de
+    çalıştırılır ve sonuçlar birleştirilir.
+
+    Returns:
+        list: Kayıtlar; sıcak tablo sorgusu başarısızsa None.
+    """
+    rows = db.execute_query(query.format(table=HOT_TABLE), params, fetch_all=True)
+    if rows is None:
+        return None
+    if len(rows) > limit and rows[-1]['created_at'] >= archive_cutoff():
+        return rows
+
+    boundary = archive_boundary(db, user_id)
+    if boundary is None or (len(rows) > limit and rows[-1]['created_at'] > boundary):
+        return rows
+    archived = db.execute_query(query.format(table=ARCHIVE_TABLE), params, fetch_all=True) or []
+    rows = sorted(rows + archived, key=lambda row: (row['created_at'], -row['id']), reverse=True)
+    return rows[:limit + 1]
+
+
+def fetch_record(db, query, params):
+    """
+    Tek bir kaydı önce sıcak tablodan okur; bulunamazsa (kayıt arşive
+    taşınmış olabilir) aynı sorguyu arşiv tablosunda çalıştırır. `query` tablo
+    adı için {table} yer tutucusu içerir.
+
+    Returns:
+        dict: Kayıt; iki tabloda da yoksa None.
+    """
+    row = db.execute_query(query.format(table=HOT_TABLE), params, fetch_one=True)
+    if row is None:
+        row = db.execute_query(query.format(table=ARCHIVE_TABLE), params, fetch_one=True)
+    return row
+
+
+# --- 2.0 Arşivleme ---
+
+def archive_cutoff(days=None):
+    """`days` (verilmezse ARCHIVE_AFTER_DAYS) günden eski kayıtlar için sınır zamanını döndürür."""
+    return datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def archive_batch(db, cutoff, after_id=0, batch_size=500, dry_run=False):
+    """
+    `after_id`'den sonraki, `cutoff`'tan önce oluşturulmuş, son durumuna
+    ulaşmış ve okunmuş en fazla `batch_size` kaydı kilitler; arşive kopyalayıp
+    sıcak tablodan siler. Kopyalama ve silme aynı işlemdedir; yarıda kalan bir
+    grup geri alınır.
+
+    Returns:
+        tuple: (son bakılan id veya kayıt kalmadıysa None, taşınan kayıt sayısı).
+    """
+    with db.transaction():
+        rows = db.execute_query(
+            f"""
+            SELECT id FROM {HOT_TABLE}
+            WHERE id > %s AND created_at < %s AND read_status = 'read'
+              AND processing_status IN ({', '.join(['%s'] * len(ARCHIVE_STATUSES))})
+            ORDER BY id LIMIT %s
+            FOR UPDATE
+            """,
+            (after_id, cutoff) + ARCHIVE_STATUSES + (batch_size,), fetch_all=True
+        ) or []
+        if not rows:
+            return None, 0
+
+        ids = tuple(row['id'] for row in rows)
+        if not dry_run:
+            placeholders = ', '.join(['%s'] * len(ids))
+            columns = ', '.join(ARCHIVE_COLUMNS)
+            db.execute_query(
+                f"INSERT INTO {ARCHIVE_TABLE} ({columns}) SELECT {columns} FROM {HOT_TABLE} WHERE id IN ({placeholders})",
+                ids
+            )
+            db.execute_query(f"DELETE FROM {HOT_TABLE} WHERE id IN ({placeholders})", ids)
+    return ids[-1], len(ids)
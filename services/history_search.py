@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, kullanıcının işlem geçmişinde sunucu tarafında tam metin araması
+#yapar. MySQL'de original_text üzerindeki FULLTEXT indeksi (ft_original_text,
+#bkz. migration 001) MATCH ... AGAINST ile kullanılır; sonuçlar ilgiye göre
+#sıralanır ve istemciye tam metin yerine eşleşmenin çevresindeki kısa bir
+#kesit (snippet) ile vurgulanacak aralıklar döner.
+#
+#Sorgu Türkçeye göre normalize edilir: I/İ harfleri Türkçe kurala göre
+#küçültülür, kelimeler ayrılır, FULLTEXT indeksinin saymadığı kısa kelimeler
+#atılır ve her kelime ek almış hâllerini de bulmak için önek olarak aranır
+#("ankara" -> "Ankara'da", "Ankara'nın").
+#
+#Eski kayıtlar arşiv tablosunda olduğundan (bkz. history_archive) arama,
+#kullanıcının arşivde aralığa giren kaydı varsa arşivde de yapılır.
+#SQLite arka ucunda FULLTEXT olmadığından LIKE ile (ilgi sırası olmadan,
+#en yeniden eskiye) aranır.
+#
+#İçindekiler:
+#1.0 Sorgu Normalizasyonu
+#    - fold: Metni eşleştirme için Türkçeye uygun şekilde katlar.
+#    - normalize_query: Arama metnini terimlere ayırır.
+#    - parse_filters: Durum, okunma ve tarih filtrelerini doğrular.
+#2.0 Arama
+#    - search_history: Kullanıcının geçmişinde arar ve bir sonuç sayfası döndürür.
+#3.0 Kesit
+#    - make_snippet: Metinden eşleşmenin çevresindeki kesiti ve vurguları üretir.
+
+import os
+import re
+from datetime import datetime, timedelta
+
+from services import history_archive
+
+# FULLTEXT indeksinin kelime saydığı en kısa uzunluk (innodb_ft_min_token_size)
+MIN_TERM_LENGTH = int(os.getenv('HISTORY_SEARCH_MIN_TERM_LENGTH', '3'))
+MAX_TERMS = 8
+# İlgi sıralaması tüm eşleşmeler üzerinden yapılır; sayfalama bu kadar sonuçla sınırlıdır
+MAX_RESULTS = int(os.getenv('HISTORY_SEARCH_MAX_RESULTS', '1000'))
+SNIPPET_LENGTH = 200
+
+# Arayüzdeki durum filtresi -> processing_status değerleri
+STATUS_FILTERS = {
+    'pending': ('pending',),
+    'processing': ('processing',),
+    'completed': ('completed',),
+    'failed': ('error', 'failed'),
+    'error': ('error', 'failed'),
+}
+READ_FILTERS = ('read', 'unread')
+
+_TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Eşleştirmede aksanlı harfler ve ı, utf8mb4_unicode_ci gibi düz karşılıklarıyla aynı sayılır
+_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_WORD = re.compile(r'\w+')
+
+
+# --- 1.0 Sorgu Normalizasyonu ---
+
+def _lower(text):
+    """Metni Türkçe kurala göre (I -> ı, İ -> i) küçültür."""
+    return text.translate(_TURKISH_UPPER).lower()
+
+
+def fold(text):
+    """
+    Metni karakter karakter küçültür ve aksanlarını kaldırır. Her karakter
+    tek karakterle değiştirildiği için sonuçtaki konumlar orijinal metinle aynıdır.
+    """
+    folded = []
+    for char in text:
+        lowered = _lower(char)
+        folded.append(lowered if len(lowered) == 1 else char)
+    return ''.join(folded).translate(_FOLD)
+
+
+def normalize_query(query):
+    """
+    Arama metnini tekrarsız, Türkçe kurala göre küçültülmüş terimlere ayırır.
+    MIN_TERM_LENGTH'ten kısa kelimeler FULLTEXT indeksinde bulunmadığından atılır.
+
+    Returns:
+        list: Terimler (en fazla MAX_TERMS).
+
+    Raises:
+        ValueError: Aranabilir terim yoksa.
+    """
+    terms = []
+    for word in _WORD.findall(_lower(query or '')):
+        if len(word) >= MIN_TERM_LENGTH and word not in terms:
+            terms.append(word)
+    if not terms:
+        raise ValueError(f'Arama için en az {MIN_TERM_LENGTH} harfli bir kelime girin.')
+    return terms[:MAX_TERMS]
+
+
+def parse_filters(status=None, read_status=None, date_from=None, date_to=None):
+    """
+    İstekten gelen filtreleri doğrular. Tarihler YYYY-MM-DD biçimindedir ve
+    date_to günü sonuna kadar dahildir.
+
+    Returns:
+        dict: statuses, read_status, created_from, created_before.
+
+    Raises:
+        ValueError: Filtrelerden biri geçersizse.
+    """
+    if status and status not in STATUS_FILTERS:
+        raise ValueError('Geçersiz durum filtresi.')
+    if read_status and read_status not in READ_FILTERS:
+        raise ValueError('Geçersiz okunma filtresi.')
+    try:
+        created_from = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+        created_before = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+    except ValueError:
+        raise ValueError('Tarihler YYYY-AA-GG biçiminde olmalıdır.')
+    if created_from and created_before and created_from >= created_before:
+        raise ValueError('Başlangıç tarihi bitiş tarihinden sonra olamaz.')
+    return {
+        'statuses': STATUS_FILTERS.get(status),
+        'read_status': read_status or None,
+        'created_from': created_from,
+        'created_before': created_before,
+    }
+
+
+# --- 2.0 Arama ---
+
+def _fulltext_available():
+    """FULLTEXT araması yalnızca MySQL arka ucunda vardır."""
+    return os.getenv('DB_BACKEND', 'mysql').strip().lower() != 'sqlite'
+
+
+def _filter_clause(user_id, filters):
+    """Kullanıcı ve filtreler için WHERE koşullarını ve parametrelerini üretir."""
+    conditions, params = ['user_id = %s'], [user_id]
+    if filters['statuses']:
+        conditions.append(f"processing_status IN ({', '.join(['%s'] * len(filters['statuses']))})")
+        params.extend(filters['statuses'])
+    if filters['read_status']:
+        conditions.append('read_status = %s')
+        params.append(filters['read_status'])
+    if filters['created_from']:
+        conditions.append('created_at >= %s')
+        params.append(filters['created_from'])
+    if filters['created_before']:
+        conditions.append('created_at < %s')
+        params.append(filters['created_before'])
+    return ' AND '.join(conditions), params
+
+
+def _search_table(db, table, terms, where, params, count):
+    """Tek bir tabloda arar; (id, score, ...) satırlarını ilgi sırasıyla döndürür."""
+    columns = "id, processing_status AS status, read_status, created_at, completed_at"
+    if _fulltext_available():
+        boolean_query = ' '.join(f'+{term}*' for term in terms)
+        rows = db.execute_query(
+            f"""
+            SELECT {columns}, MATCH(original_text) AGAINST (%s IN BOOLEAN MODE) AS score
+            FROM {table}
+            WHERE MATCH(original_text) AGAINST (%s IN BOOLEAN MODE) AND {where}
+            ORDER BY score DESC, id DESC
+            LIMIT %s
+            """,
+            (boolean_query, boolean_query) + tuple(params) + (count,), fetch_all=True
+        ) or []
+    else:
+        rows = db.execute_query(
+            f"""
+            SELECT {columns}, 0 AS score
+            FROM {table}
+            WHERE {' AND '.join(['original_text LIKE %s'] * len(terms))} AND {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s
+            """,
+            tuple(f'%{term}%' for term in terms) + tuple(params) + (count,), fetch_all=True
+        ) or []
+    for row in rows:
+        row['score'] = float(row['score'] or 0)
+        row['_table'] = table
+    return rows
+
+
+def search_history(db, user_id, query, filters=None, limit=20, offset=0):
+    """
+    Kullanıcının geçmişinde original_text üzerinde arar ve ilgiye göre
+    sıralanmış bir sonuç sayfası döndürür. Yalnızca sayfadaki kayıtların
+    metni okunur; her sonuç tam metin yerine bir kesit içerir.
+
+    Args:
+        db (DatabaseConnection): Kullanılacak bağlantı.
+        user_id (str): Kullanıcı kimliği; sonuçlar bu kullanıcıyla sınırlıdır.
+        query (str): Arama metni.
+        filters (dict, optional): parse_filters sonucu.
+        limit (int): Sayfa boyutu.
+        offset (int): Atlanacak sonuç sayısı (en fazla MAX_RESULTS).
+
+    Returns:
+        tuple: (terimler, sonuç listesi, sonraki sayfanın offset'i veya None).
+
+    Raises:
+        ValueError: Sorgu veya sayfa konumu geçersizse.
+    """
+    terms = normalize_query(query)
+    filters = filters or parse_filters()
+    if offset < 0 or offset >= MAX_RESULTS:
+        raise ValueError(f'Arama sonuçlarında en fazla {MAX_RESULTS} kayda kadar ilerlenebilir.')
+    count = min(offset + limit + 1, MAX_RESULTS)
+    where, params = _filter_clause(user_id, filters)
+
+    rows = _search_table(db, history_archive.HOT_TABLE, terms, where, params, count)
+    boundary = history_archive.archive_boundary(db, user_id)
+    if boundary is not None and (filters['created_from'] is None or filters['created_from'] <= boundary):
+        rows += _search_table(db, history_archive.ARCHIVE_TABLE, terms, where, params, count)
+        if _fulltext_available():
+            rows.sort(key=lambda row: (row['score'], row['id']), reverse=True)
+        else:
+            rows.sort(key=lambda row: (row['created_at'], row['id']), reverse=True)
+
+    page = rows[offset:offset + limit + 1]
+    next_offset = None
+    if len(page) > limit and offset + limit < MAX_RESULTS:
+        next_offset = offset + limit
+    page = page[:limit]
+
+    # Metinler yalnızca sayfadaki kayıtlar için okunur
+    texts = {}
+    for table in {row['_table'] for row in page}:
+        ids = [row['id'] for row in page if row['_table'] == table]
+        for text_row in db.execute_query(
+            f"SELECT id, original_text FROM {table} WHERE id IN ({', '.join(['%s'] * len(ids))})",
+            tuple(ids), fetch_all=True
+        ) or []:
+            texts[text_row['id']] = text_row['original_text']
+
+    for row in page:
+        row.pop('_table')
+        row['snippet'], row['highlights'] = make_snippet(texts.get(row['id']) or '', terms)
+        row['created_at'] = row['created_at'].isoformat() if row.get('created_at') else None
+        row['completed_at'] = row['completed_at'].isoformat() if row.get('completed_at') else None
+    return terms, page, next_offset
+
+
+# --- 3.0 Kesit ---
+
+def make_snippet(text, terms, length=SNIPPET_LENGTH):
+    """
+    Metinde terimlerden birinin ilk geçtiği yerin çevresinden en fazla
+    `length` karakterlik bir kesit alır. Kesit kelime sınırlarından kesilir;
+    baştan veya sondan kısaltıldıysa '…' eklenir.
+
+    Returns:
+        tuple: (kesit, [[başlangıç, bitiş], ...]) - vurgulanacak kelimelerin
+               kesit içindeki aralıkları. Terimler kelime başında eşleşir ve
+               vurgu kelimenin sonuna kadar uzar.
+    """
+    folded = fold(text)
+    folded_terms = [fold(term) for term in terms]
+
+    def word_starts(term):
+        position = folded.find(term)
+        while position != -1:
+            if position == 0 or not folded[position - 1].isalnum():
+                yield position
+            position = folded.find(term, position + 1)
+
+    first = min((next(word_starts(term), len(text)) for term in folded_terms), default=len(text))
+    if first == len(text):
+        first = 0
+
+    start = max(0, first - length // 4)
+    if start > 0:
+        space = text.find(' ', start, first)
+        start = space + 1 if space != -1 else start
+    end = min(len(text), start + length)
+    if end < len(text):
+        space = text.rfind(' ', first, end)
+        end = space if space > first else end
+
+    prefix = '…' if start > 0 else ''
+    snippet = prefix + text[start:end].strip() + ('…' if end < len(text) else '')
+    offset = len(prefix) - start - (len(text[start:end]) - len(text[start:end].lstrip()))
+
+    highlights = []
+    for term in folded_terms:
+        for position in word_starts(term):
+            if position < start or position + len(term) > end:
+                continue
+            stop = position + len(term)
+            while stop < end and folded[stop].isalnum():
+                stop += 1
+            highlights.append([position + offset, stop + offset])
+    highlights.sort()
+    merged = []
+    for begin, stop in highlights:
+        if merged and begin <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([begin, stop])
+    return snippet, merged
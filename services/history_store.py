@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, processing_history kayıtlarındaki tekrar eden büyük alanların
+#içerik adresli (content-addressed) olarak tek kez saklanmasını sağlar.
+#
+#Modele gönderilen prompt, haber metni dışında aynı konfigürasyon ve ayarlarla
+#yapılan her istekte aynıdır. Bu yüzden prompt'taki haber metni bir yer
+#tutucuyla değiştirilerek elde edilen şablon `prompt_templates` tablosunda,
+#ayarların JSON anlık görüntüsü ise `settings_snapshots` tablosunda SHA-256
+#özetiyle bir kez saklanır. Geçmiş kaydı yalnızca özetleri tutar; tam prompt,
+#şablondaki yer tutucuya kaydın original_text alanı konularak yeniden
+#oluşturulur.
+#
+#Buradaki yazma fonksiyonları çağıranın açtığı `db.transaction()` bloğu
+#içinde çağrılmalıdır; kendileri commit yapmaz.
+#
+#İçindekiler:
+#1.0 Prompt Şablonları
+#    - encode_prompt: Prompt'u (özet, şablon, satır içi metin) üçlüsüne ayırır.
+#    - expand_prompt: Şablondan tam prompt'u yeniden oluşturur.
+#2.0 Ayar Anlık Görüntüleri
+#    - encode_settings: Ayarları kanonik JSON'a çevirip özetini döndürür.
+#    - decode_settings: Saklanan JSON'u sözlüğe çevirir.
+#3.0 Veritabanı İşlemleri
+#    - save_contents: Şablonları ve anlık görüntüleri (yoksa) ekler.
+#    - load_prompt: Bir kaydın tam prompt metnini okur.
+
+import hashlib
+import json
+
+from services import text_codec
+
+# Şablonda haber metninin yerini tutan işaret. Kendisiyle örtüşen bir önek/sonek
+# içermediği için şablondaki her geçişi gerçek bir haber metni konumudur.
+PROMPT_PLACEHOLDER = '{{ORIGINAL_TEXT}}'
+
+# Geçmiş sorgularında özetlerden tam içeriğe ulaşmak için kullanılan birleştirmeler
+CONTENT_JOINS = """
+LEFT JOIN prompt_templates pt ON pt.template_hash = h.prompt_hash
+LEFT JOIN settings_snapshots ss ON ss.settings_hash = h.settings_hash
+"""
+CONTENT_COLUMNS = "pt.template_text, ss.settings_json"
+
+
+def content_hash(text):
+    """Metnin SHA-256 özetini (MySQL SHA2(text, 256) ile aynı) döndürür."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# --- 1.0 Prompt Şablonları ---
+
+def encode_prompt(prompt_text, original_text):
+    """
+    Prompt'taki haber metnini yer tutucuyla değiştirerek paylaşılabilir bir
+    şablon üretir. Şablondan prompt birebir geri elde edilemiyorsa (örn. metin
+    yer tutucuyu içeriyorsa) prompt satır içinde saklanmak üzere döndürülür.
+
+    Returns:
+        tuple: (şablon özeti, şablon, None) veya (None, None, satır içi prompt).
+               prompt_text boşsa (None, None, None).
+    """
+    if not prompt_text:
+        return None, None, None
+    if not original_text or PROMPT_PLACEHOLDER in prompt_text or PROMPT_PLACEHOLDER in original_text:
+        return None, None, prompt_text
+
+    template = prompt_text.replace(original_text, PROMPT_PLACEHOLDER)
+    if expand_prompt(template, original_text) != prompt_text:
+        return None, None, prompt_text
+    return content_hash(template), template, None
+
+
+def expand_prompt(template, original_text):
+    """Şablondaki yer tutucuları haber metniyle değiştirerek tam prompt'u döndürür."""
+    if template is None:
+        return None
+    return template.replace(PROMPT_PLACEHOLDER, original_text or '')
+
+
+# --- 2.0 Ayar Anlık Görüntüleri ---
+
+def encode_settings(settings):
+    """
+    Ayarları anahtarları sıralı kanonik JSON'a çevirir; böylece aynı ayarlar
+    hangi sırayla gelirse gelsin aynı özeti üretir.
+
+    Returns:
+        tuple: (özet, JSON metni); ayar yoksa (None, None).
+    """
+    if not settings:
+        return None, None
+    settings_json = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return content_hash(settings_json), settings_json
+
+
+def decode_settings(settings_json):
+    """Saklanan ayar JSON'unu sözlüğe çevirir; geçersizse boş sözlük döndürür."""
+    if not settings_json:
+        return {}
+    try:
+        return json.loads(settings_json)
+    except (TypeError, ValueError):
+        return {}
+
+
+# --- 3.0 Veritabanı İşlemleri ---
+
+def save_contents(db, templates=None, snapshots=None):
+    """
+    Şablonları ve ayar anlık görüntülerini, aynı özetle daha önce
+    kaydedilmemişlerse ekler. Aynı içerik her zaman aynı özeti ürettiği için
+    var olan satırlar değiştirilmez.
+
+    Args:
+        db (DatabaseConnection): İşlem içindeki bağlantı.
+        templates (dict, optional): şablon özeti -> şablon metni.
+        snapshots (dict, optional): ayar özeti -> ayar JSON'u.
+    """
+    if templates:
+        db.execute_many(
+            "INSERT IGNORE INTO prompt_templates (template_hash, template_text) VALUES (%s, %s)",
+            sorted(templates.items())
+        )
+    if snapshots:
+        db.execute_many(
+            "INSERT IGNORE INTO settings_snapshots (settings_hash, settings_json) VALUES (%s, %s)",
+            sorted(snapshots.items())
+        )
+
+
+def load_prompt(db, processing_id):
+    """
+    Bir işlem kaydının modele gönderilen tam prompt metnini döndürür. Şablona
+    dönüştürülmemiş (satır içi saklanan) prompt'lar olduğu gibi döner.
+
+    Returns:
+        str: Prompt metni; kayıt veya prompt yoksa None.
+    """
+    row = db.execute_query(
+        f"""
+        SELECT h.original_text, {text_codec.select_columns('prompt_text', prefix='h.')}, pt.template_text
+        FROM processing_history h
+        LEFT JOIN prompt_templates pt ON pt.template_hash = h.prompt_hash
+        WHERE h.id = %s
+        """,
+        (processing_id,), fetch_one=True
+    )
+    if not row:
+        return None
+    text_codec.decode_fields(row, 'prompt_text')
+    if row['prompt_text'] is not None:
+        return row['prompt_text']
+    return expand_prompt(row['template_text'], row['original_text'])
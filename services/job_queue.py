@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, uzun süren işlerin (örn. Gemini çağrıları) web worker'larını
+#bloklamadan arka planda çalıştırılması için sınırlı kapasiteli bir iş
+#kuyruğu ve sabit sayıda worker thread'den oluşan bir havuz sağlar.
+#
+#İçindekiler:
+#1.0 JobQueue Sınıfı
+#    - submit: Bir işi kuyruğa ekler; kuyruk doluysa False döndürür.
+#    - stats: Kuyruk derinliği ve işlenen iş sayıları gibi istatistikleri döndürür.
+#    - _worker_loop: Kuyruktan iş alıp çalıştıran worker döngüsü.
+#2.0 Süreç Geneli Kuyruklar
+#    - get_job_queue: Ortam değişkenlerine göre yapılandırılmış tekil kuyruğu döndürür.
+#    - get_token_count_queue: Prompt token sayımları için ayrı kuyruğu döndürür.
+
+import os
+import queue
+import threading
+import traceback
+
+
+class JobQueue:
+    """
+    Sınırlı derinlikte bir kuyruk ve sabit sayıda daemon worker thread'i.
+    Worker'lar ilk iş eklendiğinde başlatılır.
+    """
+    def __init__(self, workers=4, max_size=100, name='job-worker'):
+        """
+        Args:
+            workers (int): Aynı anda çalışacak en fazla iş sayısı.
+            max_size (int): Kuyrukta bekleyebilecek en fazla iş sayısı.
+            name (str): Worker thread'lerine verilecek isim öneki.
+        """
+        self.workers = max(1, int(workers))
+        self.max_size = max(1, int(max_size))
+        self.name = name
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+
+    # --- 1.0 Kuyruk İşlemleri ---
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Bir işi kuyruğa ekler. Kuyruk doluysa beklemeden False döndürür;
+        çağıran taraf bu durumda isteği reddetmelidir (örn. HTTP 503).
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            return False
+        with self._stats_lock:
+            self._submitted += 1
+        return True
+
+    def stats(self):
+        """Kuyruğun anlık durumunu ve kümülatif sayaçlarını döndürür."""
+        with self._stats_lock:
+            return {
+                'workers': self.workers,
+                'max_size': self.max_size,
+                'queued': self._queue.qsize(),
+                'active': self._active,
+                'submitted': self._submitted,
+                'rejected': self._rejected,
+                'completed': self._completed,
+                'failed': self._failed,
+            }
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"{self.name}-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker_loop(self):
+        """Kuyruktan sırayla iş alır ve çalıştırır. Bir işin hatası worker'ı durdurmaz."""
+        while True:
+            func, args, kwargs = self._queue.get()
+            with self._stats_lock:
+                self._active += 1
+            try:
+                func(*args, **kwargs)
+                succeeded = True
+            except Exception as e:
+                succeeded = False
+                print(f"HATA: Arka plan işi başarısız oldu ({getattr(func, '__name__', func)}): {e}")
+                traceback.print_exc()
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+                self._queue.task_done()
+            with self._stats_lock:
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+
+# --- 2.0 Süreç Geneli Kuyruklar ---
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def _process_queue(name, workers, max_size):
+    """
+    Verilen isimdeki süreç geneli kuyruğu döndürür, yoksa oluşturur. Fork
+    edilen süreçler ebeveynin (thread'leri taşınmayan) kuyruğunu kullanmaz.
+    """
+    pid = os.getpid()
+    entry = _queues.get(name)
+    if entry is not None and entry[1] == pid:
+        return entry[0]
+
+    with _queues_lock:
+        entry = _queues.get(name)
+        if entry is None or entry[1] != pid:
+            entry = (JobQueue(workers=workers, max_size=max_size, name=name), pid)
+            _queues[name] = entry
+    return entry[0]
+
+
+def get_job_queue():
+    """
+    Süreç genelinde paylaşılan iş kuyruğunu döndürür, yoksa oluşturur.
+    Worker sayısı JOB_WORKERS, kuyruk derinliği JOB_QUEUE_SIZE ile ayarlanır.
+    """
+    return _process_queue(
+        'news-worker',
+        workers=int(os.getenv('JOB_WORKERS', '4')),
+        max_size=int(os.getenv('JOB_QUEUE_SIZE', '100')),
+    )
+
+
+def get_token_count_queue():
+    """
+    Prompt token sayımlarını istek yolunun dışında çalıştıran kuyruğu
+    döndürür. Haber işleri kuyruğundan ayrıdır; dolduğunda sayım atlanır,
+    haber işleri etkilenmez. TOKEN_COUNT_WORKERS ve TOKEN_COUNT_QUEUE_SIZE
+    ile ayarlanır.
+    """
+    return _process_queue(
+        'token-count',
+        workers=int(os.getenv('TOKEN_COUNT_WORKERS', '1')),
+        max_size=int(os.getenv('TOKEN_COUNT_QUEUE_SIZE', '200')),
+    )
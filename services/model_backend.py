@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, AIService'in kullandığı model nesnesini MODEL_BACKEND ortam
+#değişkenine göre oluşturur. 'gemini' (varsayılan) gerçek Gemini modelini,
+#'fake' ise kota harcamadan ve ağa çıkmadan yük testi yapabilmek için yerel
+#bir taklit modeli döndürür.
+#
+#Taklit model, generate_content (akışlı ve akışsız) ve count_tokens için
+#requirements.txt'de sabitlenen Gemini istemcisiyle (google-generativeai
+#0.3.2) aynı imzaları ve yanıt yapısını sunar; istemcinin kabul etmediği
+#argümanlar testlerde de hata verir. Yapılandırılabilir gecikme dağılımı,
+#hata ve kota (429) oranlarıyla hazır bir JSON yanıt döndürür. Hatalar,
+#dayanıklılık katmanının tanıdığı sınıf adları ve kodlarla fırlatılır.
+#
+#Sabitlenen istemcinin generate_content ve count_tokens metotları istek
+#başına süre sınırı kabul etmez. send_request ve count_tokens, isteği aynı
+#istemcinin kurduğu biçimde oluşturup alttaki GAPIC istemcisine `timeout` ile
+#gönderir; süresi dolan çağrı thread'i ve hız sınırlayıcı yerini bırakır.
+#Taklit model de aynı iç yüzeyi (_prepare_request, _client) sunar.
+#
+#İçindekiler:
+#1.0 Model Oluşturma
+#    - create_model: MODEL_BACKEND değerine göre model nesnesini döndürür.
+#    - send_request: İçeriği süre sınırıyla (akışlı veya akışsız) gönderir.
+#    - count_tokens: İçeriğin token sayısını süre sınırıyla sorar.
+#2.0 Gecikme Dağılımları
+#    - parse_latency: 'lognormal:1.5,0.5' gibi bir tanımı örnekleyici fonksiyona çevirir.
+#3.0 Taklit Hatalar
+#    - ServiceUnavailable, ResourceExhausted, DeadlineExceeded
+#4.0 FakeModel Sınıfı
+#    - generate_content: Gecikme ve hata oranlarına göre hazır yanıt döndürür.
+#    - count_tokens: Prompt için tahmini token sayısını döndürür.
+#    - from_env: FAKE_MODEL_* ortam değişkenlerine göre taklit modeli oluşturur.
+#    - _FakeClient: GAPIC istemcisinin taklidi; süre sınırını uygular.
+
+import contextlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from services.rate_limiter import estimate_tokens
+
+MODEL_BACKENDS = ('gemini', 'fake')
+
+# Taklit modelin döndürdüğü varsayılan yanıt (prompt'taki JSON çıktı formatına uygun)
+FAKE_RESPONSE = {
+    'baslik': "Kadıköy'de otomobil ile kamyonet çarpıştı: 2 yaralı",
+    'ozet': "Kadıköy'de sabah saatlerinde meydana gelen kazada iki kişi yaralandı.",
+    'haber_metni': (
+        "İstanbul'un Kadıköy ilçesinde sabah saatlerinde bir otomobil ile kamyonet çarpıştı. "
+        "Kazada yaralanan 2 kişi, olay yerine gelen sağlık ekiplerince yakındaki hastaneye kaldırıldı. "
+        "Polis ekipleri kazayla ilgili inceleme başlattı."
+    ),
+    'kategori': 'Gündem',
+    'etiketler': ['Kadıköy', 'trafik kazası', 'yaralı', 'İstanbul', 'polis'],
+}
+
+
+# --- 1.0 Model Oluşturma ---
+
+def create_model(model_name):
+    """
+    MODEL_BACKEND ortam değişkenine göre model nesnesini oluşturur.
+
+    Returns:
+        object: generate_content / count_tokens sunan model nesnesi; Gemini
+                seçiliyken API anahtarı yoksa veya arka uç tanınmıyorsa None.
+    """
+    backend = os.getenv('MODEL_BACKEND', 'gemini').strip().lower()
+    if backend == 'fake':
+        return _get_fake_model(model_name)
+    if backend != 'gemini':
+        print(f"HATA: Bilinmeyen MODEL_BACKEND değeri: {backend} (geçerli değerler: {', '.join(MODEL_BACKENDS)})")
+        return None
+
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("UYARI: GEMINI_API_KEY ortam değişkeni bulunamadı.")
+        return None
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+def send_request(model, contents, stream=False, timeout=None):
+    """
+    İçeriği modelin alttaki istemcisine `timeout` saniyelik süre sınırıyla
+    gönderir. Akışlı istekte süre, akışın tamamı için geçerlidir: parçalar
+    arasında veya ilk parçadan önce duran bir akış da süre dolunca
+    DeadlineExceeded ile sonlanır.
+
+    Returns:
+        GenerateContentResponse (taklit modelde karşılığı).
+    """
+    request = model._prepare_request(contents=contents)
+    if isinstance(model, FakeModel):
+        response_type, stream_errors = _FakeResponse, contextlib.nullcontext
+    else:
+        from google.generativeai import client
+        from google.generativeai.types import generation_types
+        if model._client is None:
+            model._client = client.get_default_generative_client()
+        response_type, stream_errors = generation_types.GenerateContentResponse, generation_types.rewrite_stream_error
+
+    if stream:
+        with stream_errors():
+            iterator = model._client.stream_generate_content(request, timeout=timeout)
+        return response_type.from_iterator(iterator)
+    return response_type.from_response(model._client.generate_content(request, timeout=timeout))
+
+
+def count_tokens(model, contents, timeout=None):
+    """
+    İçeriğin model tarafındaki token sayısını `timeout` saniyelik süre
+    sınırıyla sorar.
+
+    Returns:
+        int: Token sayısı.
+    """
+    if isinstance(model, FakeModel):
+        request = _FakeRequest(contents)
+    else:
+        import google.ai.generativelanguage as glm
+        from google.generativeai import client
+        from google.generativeai.types import content_types
+        if model._client is None:
+            model._client = client.get_default_generative_client()
+        request = glm.CountTokensRequest(model=model.model_name, contents=content_types.to_contents(contents))
+    return model._client.count_tokens(request, timeout=timeout).total_tokens
+
+
+_fake_model = None
+_fake_model_lock = threading.Lock()
+
+
+def _get_fake_model(model_name):
+    """
+    Süreç genelinde tek bir taklit model kullanılır; böylece FAKE_MODEL_SEED
+    verildiğinde örnekler her istekte baştan başlamaz, tüm çalışma boyunca
+    tekrarlanabilir tek bir dizi oluşturur.
+    """
+    global _fake_model
+    with _fake_model_lock:
+        if _fake_model is None:
+            _fake_model = FakeModel.from_env(model_name)
+    return _fake_model
+
+
+# --- 2.0 Gecikme Dağılımları ---
+
+def parse_latency(spec):
+    """
+    Gecikme tanımını, her çağrıldığında saniye cinsinden bir süre üreten
+    fonksiyona çevirir. Desteklenen tanımlar:
+      fixed:1.0            - sabit süre
+      uniform:0.5,2.0      - alt ve üst sınır arasında eşit dağılım
+      exponential:1.0      - verilen ortalamayla üstel dağılım
+      lognormal:1.5,0.5    - medyan ve sigma ile log-normal dağılım (model gecikmelerine en yakın)
+
+    Returns:
+        callable: rng (random.Random) alıp süre döndüren fonksiyon; tanım geçersizse None.
+    """
+    kind, _, args = (spec or '').strip().lower().partition(':')
+    try:
+        values = [float(value) for value in args.split(',') if value.strip()]
+    except ValueError:
+        return None
+
+    if kind == 'fixed' and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'exponential' and len(values) == 1 and values[0] > 0:
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    if kind == 'lognormal' and len(values) == 2 and values[0] > 0:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    return None
+
+
+# --- 3.0 Taklit Hatalar ---
+# Sınıf adları ve kodlar, rate_limiter.is_throttle_error ve
+# resilience.is_retryable tarafından gerçek API hataları gibi tanınır.
+
+class ServiceUnavailable(Exception):
+    """Taklit 503 hatası (geçici sunucu hatası)."""
+    code = 503
+
+
+class ResourceExhausted(Exception):
+    """Taklit 429 hatası (kota aşımı)."""
+    code = 429
+
+
+class DeadlineExceeded(TimeoutError):
+    """Taklit 504 hatası: örneklenen gecikme isteğin süre sınırını aştı."""
+    code = 504
+
+
+# --- 4.0 FakeModel Sınıfı ---
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+        self.parts = [text] if text else []
+
+
+class _ChunkIterator:
+    """
+    Akış parçalarını gecikmelerle üreten, cancel() ile durdurulabilen
+    iteratör. Süre sınırı verilmişse sınırı aşan parça yerine süre dolunca
+    DeadlineExceeded fırlatılır.
+    """
+
+    def __init__(self, text, chunks, delays, timeout=None):
+        self.text = text
+        self._chunks = list(zip(chunks, delays))
+        self._cancelled = threading.Event()
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._chunks or self._cancelled.is_set():
+            raise StopIteration
+        text, delay = self._chunks.pop(0)
+        if self._deadline is not None and time.monotonic() + delay > self._deadline:
+            if self._cancelled.wait(max(0.0, self._deadline - time.monotonic())):
+                raise StopIteration
+            raise DeadlineExceeded('504 Taklit model: akış zaman aşımına uğradı')
+        if self._cancelled.wait(delay):
+            raise StopIteration
+        return _Chunk(text)
+
+    def cancel(self):
+        self._cancelled.set()
+
+
+class _FakeResponse:
+    """
+    Gemini yanıtının AIService tarafından kullanılan kısmını taklit eder.
+    Sabitlenen istemci sürümünde olduğu gibi usage_metadata alanı yoktur.
+    """
+
+    def __init__(self, text, iterator=None):
+        self.text = text
+        self.parts = [text] if text else []
+        self._iterator = iterator
+
+    @classmethod
+    def from_response(cls, text):
+        return cls(text)
+
+    @classmethod
+    def from_iterator(cls, iterator):
+        return cls(iterator.text, iterator)
+
+    def __iter__(self):
+        return iter(self._iterator if self._iterator is not None else [_Chunk(self.text)])
+
+
+class _FakeRequest:
+    def __init__(self, contents):
+        self.contents = contents
+
+
+class _TokenCount:
+    def __init__(self, total_tokens):
+        self.total_tokens = total_tokens
+
+
+class _FakeClient:
+    """
+    GAPIC istemcisinin taklidi. Örneklenen gecikme `timeout` süresini aşarsa
+    süre sonunda DeadlineExceeded fırlatır.
+    """
+
+    def __init__(self, model):
+        self._model = model
+
+    def generate_content(self, request, timeout=None):
+        delay = self._model._sample_delay(timeout)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise DeadlineExceeded('504 Taklit model: istek zaman aşımına uğradı')
+        time.sleep(delay)
+        return self._model.response_text
+
+    def stream_generate_content(self, request, timeout=None):
+        model = self._model
+        delay = model._sample_delay(timeout)
+        text = model.response_text
+        size = -(-len(text) // model.stream_chunks)
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        first = delay * model.first_chunk_ratio
+        rest = (delay - first) / max(1, len(chunks) - 1)
+        delays = [first] + [rest] * (len(chunks) - 1)
+        return _ChunkIterator(text, chunks, delays, timeout)
+
+    def count_tokens(self, request, timeout=None):
+        return _TokenCount(estimate_tokens(request.contents))
+
+
+class FakeModel:
+    """
+    Gemini istemcisinin yerine geçen yerel taklit model. Thread güvenlidir;
+    her çağrı kendi gecikmesini bağımsız olarak örnekler.
+    """
+
+    def __init__(self, model_name='fake', latency=None, error_rate=0.0, throttle_rate=0.0,
+                 stream_chunks=8, first_chunk_ratio=0.3, response_text=None, seed=None):
+        self.model_name = model_name
+        self.latency = latency or parse_latency('lognormal:1.5,0.4')
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.first_chunk_ratio = min(1.0, max(0.0, first_chunk_ratio))
+        self.response_text = response_text or (
+            '```json\n' + json.dumps(FAKE_RESPONSE, ensure_ascii=False, indent=2) + '\n```'
+        )
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._client = _FakeClient(self)
+
+    @classmethod
+    def from_env(cls, model_name='fake'):
+        """
+        Taklit modeli FAKE_MODEL_LATENCY, FAKE_MODEL_ERROR_RATE,
+        FAKE_MODEL_THROTTLE_RATE, FAKE_MODEL_STREAM_CHUNKS, FAKE_MODEL_RESPONSE_FILE
+        ve FAKE_MODEL_SEED ortam değişkenlerine göre oluşturur.
+        """
+        latency_spec = os.getenv('FAKE_MODEL_LATENCY', 'lognormal:1.5,0.4')
+        latency = parse_latency(latency_spec)
+        if latency is None:
+            print(f"Uyarı: Geçersiz FAKE_MODEL_LATENCY değeri ({latency_spec}), varsayılan kullanılıyor.")
+
+        response_text = None
+        response_file = os.getenv('FAKE_MODEL_RESPONSE_FILE')
+        if response_file:
+            try:
+                with open(response_file, 'r', encoding='utf-8') as f:
+                    response_text = f.read()
+            except OSError as e:
+                print(f"Uyarı: FAKE_MODEL_RESPONSE_FILE okunamadı: {e}")
+
+        seed = os.getenv('FAKE_MODEL_SEED')
+        return cls(
+            model_name=model_name,
+            latency=latency,
+            error_rate=float(os.getenv('FAKE_MODEL_ERROR_RATE', '0')),
+            throttle_rate=float(os.getenv('FAKE_MODEL_THROTTLE_RATE', '0')),
+            stream_chunks=int(os.getenv('FAKE_MODEL_STREAM_CHUNKS', '8')),
+            response_text=response_text,
+            seed=int(seed) if seed else None,
+        )
+
+    def generate_content(self, contents, *, generation_config=None, safety_settings=None,
+                         stream=False, **kwargs):
+        """
+        Örneklenen gecikme kadar bekleyip hazır yanıtı döndürür. Akışlı modda
+        yanıt parçalara bölünür; ilk parça gecikmenin first_chunk_ratio
+        kadarından sonra gelir. İmza sabitlenen istemciyle aynıdır: istemcinin
+        isteğe aktaramadığı ek argümanlar (ör. request_options) onunki gibi
+        ValueError fırlatır.
+        """
+        request = self._prepare_request(contents=contents, generation_config=generation_config,
+                                        safety_settings=safety_settings, **kwargs)
+        if stream:
+            return _FakeResponse.from_iterator(self._client.stream_generate_content(request))
+        return _FakeResponse.from_response(self._client.generate_content(request))
+
+    def count_tokens(self, contents):
+        """İçerik için tahmini token sayısını döndürür."""
+        return self._client.count_tokens(_FakeRequest(contents))
+
+    def _prepare_request(self, *, contents, generation_config=None, safety_settings=None, **kwargs):
+        """İstemcinin istek oluşturucusu gibi bilinmeyen alanları reddeder."""
+        if not contents:
+            raise TypeError("contents must not be empty")
+        for name in kwargs:
+            raise ValueError(f"Unknown field for GenerateContentRequest: {name}")
+        return _FakeRequest(contents)
+
+    def _sample_delay(self, timeout=None):
+        """
+        Çağrının gecikmesini örnekler; çağrı hata veya kota hatasıyla
+        sonuçlanacaksa gecikmenin bir kısmı (gerçek API'de olduğu gibi)
+        geçtikten sonra hatayı fırlatır.
+        """
+        with self._rng_lock:
+            delay = max(0.0, self.latency(self._rng))
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            time.sleep(min(delay * 0.1, delay if timeout is None else timeout))
+            raise ResourceExhausted('429 Taklit model: kota aşıldı')
+        if roll < self.throttle_rate + self.error_rate:
+            time.sleep(min(delay * 0.5, delay if timeout is None else timeout))
+            raise ServiceUnavailable('503 Taklit model: servis geçici olarak kullanılamıyor')
+        return delay
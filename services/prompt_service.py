@@ -7,30 +7,70 @@
 #
 #İçindekiler:
 #1.0 Başlatma ve Yardımcı Metotlar
-#    - __init__, __del__: Sınıfın başlatılması ve sonlandırılması.
-#    - _load_prompt_templates: Şablonları JSON dosyasından yükler.
+#    - __init__, db, close, __del__: Sınıfın başlatılması, bağlantının tembel alınması ve iadesi.
+#    - _load_prompt_templates: Şablonları JSON dosyasından yükler (süreç genelinde bir kez).
 #    - _get_default_templates: Varsayılan şablonları döndürür.
 #    - _get_category_display_name: Kategori anahtarına karşılık gelen görünen adı döndürür.
-#2.0 Konfigürasyon Getirme Metotları
+#2.0 Konfigürasyon Getirme Metotları (süreç içi konfigürasyon önbelleğinden)
 #    - get_active_config: Aktif prompt konfigürasyonunu getirir.
 #    - get_config_sections, get_config_rules, get_rule_options: Konfigürasyonun parçalarını getirir.
 #    - get_full_config_data: Arayüz için tüm konfigürasyon verisini toplar.
 #    - export_config: Konfigürasyonu JSON olarak dışa aktarır.
 #3.0 Kullanıcı Ayar Metotları
 #    - get_user_settings: Kullanıcının ayarlarını veritabanından okur.
-#    - save_user_setting, save_user_settings: Kullanıcı ayarlarını kaydeder.
+#    - save_user_setting: Kullanıcının tek bir ayarını kaydeder.
+#    - save_user_settings: Değişen ayarları tek bir çok satırlı upsert ile kaydeder.
 #4.0 Prompt Oluşturma Metotları
-#    - build_complete_prompt: Tüm parçaları birleştirerek nihai prompt'u oluşturur.
+#    - build_complete_prompt: Derlenmiş önek/soneki haber metniyle birleştirerek nihai prompt'u oluşturur.
+#    - compile_prompt: Haber metni dışındaki bölümleri derler ve önbelleğe alır.
+#    - _compile_compact, compact_text: Tekrarlanan talimatları çıkaran sıkıştırılmış modu üretir.
 #    - _build_...: Prompt'un her bir bölümünü (görev tanımı, kurallar vb.) oluşturan yardımcı metotlar.
 #5.0 Veritabanı İşlem Metotları
-#    - update_prompt_section: Bir prompt bölümünü günceller.
+#    - update_prompt_section: Bir prompt bölümünü günceller ve önbellekleri geçersiz kılar.
+#    - activate_config: Aktif konfigürasyonu değiştirir ve önbellekleri geçersiz kılar.
 #    - create_processing_record, update_processing_record: İşlem geçmişi kayıtlarını yönetir.
-#    - get_user_history: Kullanıcının işlem geçmişini alır.
+#    - get_user_history: Kullanıcının işlem geçmişini imleç tabanlı sayfalama ile alır.
 
+import hashlib
 import json
 import os
+import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from database.connection import DatabaseConnection
+from services.config_cache import get_config_cache
+from services.result_cache import get_result_cache
+from services import history_archive, history_store, text_codec, user_stats
+from utils.helpers import encode_cursor, decode_cursor
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'prompt_templates.json')
+
+# Şablon dosyası süreç genelinde bir kez okunur; dosya değiştiğinde (mtime) yeniden yüklenir.
+_templates_lock = threading.Lock()
+_templates_state = {'mtime': None, 'templates': None, 'version': None}
+
+# Derlenmiş prompt önek/sonek çiftleri için sınırlı boyutlu LRU önbellek.
+# Anahtar: (şablon sürümü, config_id, kanonik kullanıcı ayarları)
+_compiled_lock = threading.Lock()
+_compiled_prompts = OrderedDict()
+COMPILED_PROMPT_CACHE_SIZE = int(os.getenv('PROMPT_CACHE_SIZE', '256'))
+
+# Sıkıştırılmış (compact) prompt modu: tekrarlanan talimatlar çıkarılır,
+# kategori listesi tek satıra indirilir ve boşluklar sadeleştirilir.
+PROMPT_COMPACTION = os.getenv('PROMPT_COMPACTION', 'false').lower() == 'true'
+# Sıkıştırılmış modda atlanan yazım kuralları. 'output_format' kuralı, çıktı
+# formatı bölümü ve son talimat tarafından zaten söyleniyor (ve seçili format
+# JSON değilse onlarla çelişiyor).
+COMPACT_SKIPPED_RULES = ('output_format',)
+CATEGORY_NAMES = ["Asayiş", "Gündem", "Ekonomi", "Siyaset", "Spor", "Teknoloji", "Sağlık", "Yaşam", "Eğitim", "Dünya", "Kültür & Sanat", "Magazin", "Genel"]
+FORMAT_LABELS = {'json': 'JSON', 'xml': 'XML', 'plain': 'düz metin'}
+
+
+def clear_compiled_prompt_cache():
+    """Derlenmiş prompt önbelleğini temizler (örn. konfigürasyon değiştiğinde)."""
+    with _compiled_lock:
+        _compiled_prompts.clear()
 
 class PromptService:
     """
@@ -38,25 +78,58 @@ class PromptService:
     """
     # --- 1.0 Başlatma ve Yardımcı Metotlar ---
 
-    def __init__(self):
-        """Servisi başlatır, veritabanı bağlantısı kurar ve prompt şablonlarını yükler."""
-        self.db = DatabaseConnection()
+    def __init__(self, db=None):
+        """
+        Servisi başlatır ve prompt şablonlarını yükler. Veritabanı bağlantısı
+        ilk sorguda havuzdan alınır; yalnızca prompt oluşturan istekler
+        bağlantı tutmaz.
+
+        Args:
+            db (DatabaseConnection, optional): Kullanılacak bağlantı. Sağlanmazsa
+                                               ihtiyaç anında yeni bir bağlantı alınır.
+        """
+        self._db = db
+        self.template_version = None
         self.prompt_templates = self._load_prompt_templates()
 
+    @property
+    def db(self):
+        """Veritabanı bağlantısını ilk erişimde havuzdan alır."""
+        if self._db is None:
+            self._db = DatabaseConnection()
+        return self._db
+
+    def close(self):
+        """Alınmış veritabanı bağlantısını havuza iade eder. Sonraki sorgu yeni bağlantı alır."""
+        db, self._db = getattr(self, '_db', None), None
+        if db is not None:
+            db.disconnect()
+
     def __del__(self):
-        """Nesne silinirken veritabanı bağlantısını temizler."""
-        if hasattr(self, 'db'):
-            self.db.disconnect()
+        """Nesne silinirken veritabanı bağlantısını havuza iade eder."""
+        self.close()
 
     def _load_prompt_templates(self):
-        """Prompt şablonlarını 'config/prompt_templates.json' dosyasından yükler."""
+        """
+        Prompt şablonlarını 'config/prompt_templates.json' dosyasından yükler.
+        Dosya süreç genelinde bir kez okunur ve değişiklik zamanı (mtime)
+        değişmedikçe yeniden ayrıştırılmaz. Dosya içeriğinin özeti
+        `template_version` olarak saklanır.
+        """
         try:
-            # Dosya yolunu dinamik olarak belirle
-            config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'prompt_templates.json')
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.path.getmtime(TEMPLATES_PATH)
+            with _templates_lock:
+                if _templates_state['mtime'] != mtime:
+                    with open(TEMPLATES_PATH, 'rb') as f:
+                        raw = f.read()
+                    _templates_state['templates'] = json.loads(raw.decode('utf-8'))
+                    _templates_state['version'] = hashlib.sha1(raw).hexdigest()[:12]
+                    _templates_state['mtime'] = mtime
+                self.template_version = _templates_state['version']
+                return _templates_state['templates']
         except Exception as e:
             print(f"Hata: Prompt şablonları yüklenemedi: {e}")
+            self.template_version = 'default'
             return self._get_default_templates()
 
     def _get_default_templates(self):
@@ -80,47 +153,37 @@ class PromptService:
     # --- 2.0 Konfigürasyon Getirme Metotları ---
 
     def get_active_config(self):
-        """Veritabanından 'is_active' olarak işaretlenmiş prompt konfigürasyonunu getirir."""
-        query = "SELECT * FROM prompt_configs WHERE is_active = TRUE LIMIT 1"
-        return self.db.execute_query(query, fetch_one=True)
+        """'is_active' olarak işaretlenmiş prompt konfigürasyonunu (önbellekten) getirir."""
+        graph = get_config_cache().get_active_graph(self._db)
+        return graph['config'] if graph else None
 
     def get_config_sections(self, config_id):
         """Belirli bir konfigürasyona ait tüm prompt bölümlerini getirir."""
-        query = "SELECT * FROM prompt_sections WHERE config_id = %s AND is_active = TRUE ORDER BY display_order"
-        results = self.db.execute_query(query, (config_id,), fetch_all=True)
-        return {row['section_key']: row for row in results} if results else {}
+        graph = get_config_cache().get_graph(config_id, self._db)
+        return graph['sections'] if graph else {}
 
     def get_config_rules(self, config_id):
         """Belirli bir konfigürasyona ait tüm kuralları getirir."""
-        query = "SELECT * FROM prompt_rules WHERE config_id = %s AND is_active = TRUE ORDER BY display_order"
-        results = self.db.execute_query(query, (config_id,), fetch_all=True)
-        return {row['rule_key']: row for row in results} if results else {}
+        graph = get_config_cache().get_graph(config_id, self._db)
+        return graph['rules'] if graph else {}
 
     def get_rule_options(self, config_id, rule_key):
         """Belirli bir kurala ait (örn: 'newsType') seçenekleri (örn: 'social', 'comprehensive') getirir."""
-        query = """
-            SELECT o.* FROM prompt_rule_options o
-            JOIN prompt_rules r ON o.rule_id = r.id
-            WHERE r.config_id = %s AND r.rule_key = %s AND o.is_active = TRUE
-            ORDER BY o.display_order
-        """
-        return self.db.execute_query(query, (config_id, rule_key), fetch_all=True)
+        graph = get_config_cache().get_graph(config_id, self._db)
+        return graph['rule_options'].get(rule_key, []) if graph else []
 
     def get_full_config_data(self, config_id=None):
         """Arayüzde (frontend) kullanılmak üzere tüm konfigürasyon verilerini bir araya getirir."""
-        if not config_id:
-            active_config = self.get_active_config()
-            if not active_config: return None
-            config_id = active_config['id']
-        
-        rules = self.get_config_rules(config_id)
-        rule_options = {key: self.get_rule_options(config_id, key) for key in rules}
-        
+        cache = get_config_cache()
+        graph = cache.get_graph(config_id, self._db) if config_id else cache.get_active_graph(self._db)
+        if not graph:
+            return None
+
         return {
-            'config': self.get_active_config(),
-            'sections': self.get_config_sections(config_id),
-            'rules': rules,
-            'rule_options': rule_options
+            'config': graph['config'],
+            'sections': graph['sections'],
+            'rules': graph['rules'],
+            'rule_options': graph['rule_options']
         }
 
     def export_config(self, config_id):
@@ -147,35 +210,94 @@ class PromptService:
         return True
 
     def save_user_settings(self, user_id, config_id, settings_dict):
-        """Kullanıcının birden çok ayarını tek seferde kaydeder."""
-        for rule_key, setting_value in settings_dict.items():
-            self.save_user_setting(user_id, config_id, rule_key, str(setting_value))
-        return True
+        """
+        Kullanıcının birden çok ayarını tek seferde kaydeder. Kayıtlı değerler
+        önce tek sorguda okunur; yalnızca değişen ayarlar tek bir çok satırlı
+        INSERT ... ON DUPLICATE KEY UPDATE ile yazılır. Hiçbir değer
+        değişmemişse yazma yapılmaz.
+        """
+        settings = {str(key): str(value) for key, value in (settings_dict or {}).items()}
+        stored = self.get_user_settings(user_id, config_id)
+        changed = [(key, value) for key, value in settings.items() if stored.get(key) != value]
+        if not changed:
+            return True
+
+        query = f"""
+            INSERT INTO user_prompt_settings (user_id, config_id, rule_key, setting_value)
+            VALUES {', '.join(['(%s, %s, %s, %s)'] * len(changed))}
+            ON DUPLICATE KEY UPDATE setting_value = VALUES(setting_value)
+        """
+        params = tuple(value for key, setting in changed for value in (user_id, config_id, key, setting))
+        return self.db.execute_query(query, params) is not None
 
     # --- 4.0 Prompt Oluşturma Metotları ---
 
-    def build_complete_prompt(self, config_id, user_settings, news_text=''):
+    def build_complete_prompt(self, config_id, user_settings, news_text='', compact=None):
         """
         Tüm şablonları, kuralları ve kullanıcı ayarlarını birleştirerek
         AI modeline gönderilecek olan nihai, tam prompt metnini oluşturur.
+        Haber metni dışındaki her şey derlenmiş önek/sonek olarak önbellekten
+        gelir; bu yüzden aynı ayarlarla yapılan istekler tek bir birleştirmedir.
+        `compact` verilmezse PROMPT_COMPACTION ayarı kullanılır.
         """
+        compact = PROMPT_COMPACTION if compact is None else bool(compact)
         try:
-            prompt_parts = [
-                self._build_task_definition(),
-                self._build_writing_rules(user_settings),
-                self._build_output_requirements_modular(user_settings),
-                self._build_category_list(user_settings),
-                self._build_output_format(user_settings),
-                self._build_custom_instructions(user_settings),
-                self._build_news_content(news_text),
-                self._build_final_instruction()
-            ]
+            prefix, suffix = self.compile_prompt(config_id, user_settings, compact)
+            news_part = self._build_news_content(news_text)
+            if compact:
+                # Haber metninde yalnızca boşluklar sadeleştirilir; tekrar eden satırlar korunur
+                news_part = self.compact_text(news_part, dedupe=False)
             # Sadece dolu olan kısımları birleştir
-            return '\n\n'.join(filter(None, (part.strip() for part in prompt_parts)))
+            return '\n\n'.join(part for part in (prefix, news_part, suffix) if part)
         except Exception as e:
             print(f"Hata: Prompt oluşturulamadı: {e}")
             return None
 
+    def compile_prompt(self, config_id, user_settings, compact=None):
+        """
+        Haber metninden önce ve sonra gelen prompt bölümlerini derleyip
+        (önek, sonek) çifti olarak döndürür. Sonuç; şablon sürümü, config_id,
+        sıkıştırma modu ve kanonik kullanıcı ayarlarına göre süreç genelinde
+        önbelleğe alınır.
+        """
+        compact = PROMPT_COMPACTION if compact is None else bool(compact)
+        settings_key = json.dumps(user_settings or {}, sort_keys=True, ensure_ascii=False, default=str)
+        key = (self.template_version, config_id, compact, settings_key)
+
+        with _compiled_lock:
+            compiled = _compiled_prompts.get(key)
+            if compiled is not None:
+                _compiled_prompts.move_to_end(key)
+                return compiled
+
+        if compact:
+            compiled = self._compile_compact(user_settings or {})
+            with _compiled_lock:
+                _compiled_prompts[key] = compiled
+                while len(_compiled_prompts) > COMPILED_PROMPT_CACHE_SIZE:
+                    _compiled_prompts.popitem(last=False)
+            return compiled
+
+        head_parts = [
+            self._build_task_definition(),
+            self._build_writing_rules(user_settings),
+            self._build_output_requirements_modular(user_settings),
+            self._build_category_list(user_settings),
+            self._build_output_format(user_settings),
+            self._build_custom_instructions(user_settings),
+        ]
+        tail_parts = [self._build_final_instruction()]
+        compiled = (
+            '\n\n'.join(filter(None, (part.strip() for part in head_parts))),
+            '\n\n'.join(filter(None, (part.strip() for part in tail_parts))),
+        )
+
+        with _compiled_lock:
+            _compiled_prompts[key] = compiled
+            while len(_compiled_prompts) > COMPILED_PROMPT_CACHE_SIZE:
+                _compiled_prompts.popitem(last=False)
+        return compiled
+
     def _build_task_definition(self):
         return f"GÖREV TANIMI:\n{self.prompt_templates.get('task_definition', {}).get('text', '')}"
 
@@ -247,44 +369,200 @@ class PromptService:
     def _build_final_instruction(self):
         return self.prompt_templates.get('final_instruction', {}).get('text', '')
 
+    def _compile_compact(self, user_settings):
+        """
+        Sıkıştırılmış modda (önek, sonek) çiftini üretir. Normal moddan farkları:
+        kategori listesi ayrı bir blok (Python liste gösterimi) yerine kategori
+        maddesine tek satır olarak eklenir, çıktı formatını tekrarlayan yazım
+        kuralı atlanır, format şablonu sözlük gösterimi yerine yalnızca
+        şablonuyla yazılır ve görev tanımı/son talimat seçili formata uyarlanır.
+        """
+        format_key = user_settings.get('outputFormat', 'json')
+        format_label = FORMAT_LABELS.get(format_key, str(format_key).upper())
+
+        def for_format(text):
+            return text.replace('JSON', format_label) if format_key != 'json' else text
+
+        rules = [text for key, text in self.prompt_templates.get('writing_rules', {}).items()
+                 if key not in COMPACT_SKIPPED_RULES]
+        category_line = self._build_category_requirements(user_settings).strip()
+        if category_line:
+            category_line += f" Liste: {', '.join(CATEGORY_NAMES)}."
+        outputs = [
+            self._build_title_requirements(user_settings),
+            self._build_summary_requirements(user_settings),
+            self._build_content_requirements(user_settings),
+            category_line,
+            self._build_tags_requirements(user_settings),
+        ]
+        output_format = self.prompt_templates.get('output_formats', {}).get(format_key, {})
+        format_template = output_format.get('template', '') if isinstance(output_format, dict) else str(output_format)
+
+        head_parts = [
+            f"GÖREV TANIMI:\n{for_format(self.prompt_templates.get('task_definition', {}).get('text', ''))}",
+            "KURALLAR:\n" + "\n".join(rules) if rules else "",
+            "İSTENEN ÇIKTILAR:\n" + "\n".join(part.strip() for part in outputs if part.strip()),
+            f"ÇIKTI FORMATI ({format_label}):\n{format_template}" if format_template else "",
+            self._build_custom_instructions(user_settings),
+        ]
+        return (
+            self.compact_text('\n\n'.join(filter(None, head_parts))),
+            self.compact_text(for_format(self._build_final_instruction())),
+        )
+
+    @staticmethod
+    def compact_text(text, dedupe=True):
+        """
+        Satır içi boşlukları tek boşluğa indirir, boş satırları kaldırır ve
+        `dedupe` ise daha önce geçmiş bir satırı (büyük/küçük harf ve boşluk
+        farkı gözetmeden) tekrar etmez. Satır başındaki girinti, format şablonlarında anlamlı
+        olduğu için korunur.
+        """
+        seen = set()
+        lines = []
+        for line in text.splitlines():
+            indent = line[:len(line) - len(line.lstrip())]
+            body = re.sub(r'[ \t]+', ' ', line.strip())
+            if not body:
+                continue
+            signature = body.casefold()
+            # Yapısal satırlar ({, }, </haber> vb.) tekrar edebilir
+            if dedupe and signature in seen and len(body) > 2 and not body.startswith('<'):
+                continue
+            seen.add(signature)
+            lines.append(indent + body)
+        return '\n'.join(lines)
+
     # --- 5.0 Veritabanı İşlem Metotları ---
 
     def update_prompt_section(self, config_id, section_key, prompt_text):
-        """Bir prompt bölümünün metnini günceller."""
+        """
+        Bir prompt bölümünün metnini günceller. Konfigürasyonun revizyonu da
+        artırılır; böylece diğer worker'lar sürüm kontrolünde değişikliği
+        görür, bu sürümle üretilmiş önbellek anahtarları geçersiz hale gelir
+        ve kayıtlı sonuçlar silinir.
+        """
         query = "UPDATE prompt_sections SET prompt_text = %s WHERE config_id = %s AND section_key = %s"
         result = self.db.execute_query(query, (prompt_text, config_id, section_key))
-        return result is not None
+        if result is None:
+            return False
+
+        self.db.execute_query("UPDATE prompt_configs SET revision = revision + 1 WHERE id = %s", (config_id,))
+        self._invalidate_config_caches(config_id)
+        cache = get_result_cache()
+        if cache is not None:
+            cache.invalidate_config(config_id)
+        return True
+
+    def activate_config(self, config_id):
+        """
+        Belirtilen konfigürasyonu aktif yapar, diğerlerini pasifleştirir.
+        Tek bir UPDATE ile yapıldığı için arada aktif konfigürasyonsuz bir an oluşmaz.
+        """
+        exists = self.db.execute_query("SELECT id FROM prompt_configs WHERE id = %s", (config_id,), fetch_one=True)
+        if not exists:
+            return False
+
+        query = "UPDATE prompt_configs SET is_active = (id = %s) WHERE is_active = TRUE OR id = %s"
+        result = self.db.execute_query(query, (config_id, config_id))
+        if result is None:
+            return False
+
+        self._invalidate_config_caches()
+        return True
+
+    def _invalidate_config_caches(self, config_id=None):
+        """Bu süreçteki konfigürasyon grafiği ve derlenmiş prompt önbelleklerini temizler."""
+        get_config_cache().invalidate(config_id)
+        clear_compiled_prompt_cache()
 
     def create_processing_record(self, user_id, config_id, original_text, settings_used):
-        """Veritabanında yeni bir işlem geçmişi kaydı oluşturur."""
+        """
+        Veritabanında yeni bir işlem geçmişi kaydı oluşturur ve kullanıcı sayaçlarını günceller.
+        Ayarlar özetiyle paylaşılan bir anlık görüntü olarak saklanır.
+        """
         query = """
-            INSERT INTO processing_history (user_id, config_id, original_text, settings_used, processing_status)
-            VALUES (%s, %s, %s, %s, 'pending')
+            INSERT INTO processing_history (user_id, config_id, original_text, original_size, settings_hash,
+                                            text_codec, processing_status)
+            VALUES (%s, %s, %s, %s, %s, %s, 'pending')
         """
-        settings_json = json.dumps(settings_used, ensure_ascii=False)
-        self.db.execute_query(query, (user_id, config_id, original_text, settings_json))
-        id_result = self.db.execute_query("SELECT LAST_INSERT_ID() as id", fetch_one=True)
-        return id_result['id'] if id_result else None
+        settings_hash, settings_json = history_store.encode_settings(settings_used)
+        try:
+            with self.db.transaction():
+                history_store.save_contents(self.db, snapshots={settings_hash: settings_json} if settings_hash else None)
+                self.db.execute_query(query, (user_id, config_id, original_text, text_codec.text_size(original_text),
+                                              settings_hash, text_codec.CODEC_VERSION))
+                record_id = self.db.cursor.lastrowid
+                user_stats.record_created(self.db, user_id, {'pending': 1})
+                return record_id
+        except Exception as e:
+            print(f"Veritabanı hatası (create_processing_record): {e}")
+            return None
 
     def update_processing_record(self, record_id, **kwargs):
-        """Bir işlem geçmişi kaydını günceller. (status, processed_text vb.)"""
-        fields = [f"{key} = %s" for key in kwargs]
+        """
+        Bir işlem geçmişi kaydını günceller. (processing_status, processed_text vb.)
+        Durum değişiyorsa kullanıcı sayaçları aynı işlem içinde güncellenir.
+        Metin alanları text_codec ile kodlanarak yazılır.
+        """
+        texts = {key: kwargs[key] for key in text_codec.COMPRESSED_FIELDS if key in kwargs}
+        fields = [f"{key} = %s" for key in kwargs if key not in texts]
+        values = [value for key, value in kwargs.items() if key not in texts]
+        if texts:
+            text_assignments, text_params = text_codec.update_assignments(texts)
+            fields.append(text_assignments)
+            values.extend(text_params)
         query = f"UPDATE processing_history SET {', '.join(fields)}, completed_at = CURRENT_TIMESTAMP WHERE id = %s"
-        values = list(kwargs.values()) + [record_id]
-        result = self.db.execute_query(query, tuple(values))
-        return result is not None
+        values.append(record_id)
+        try:
+            with self.db.transaction():
+                record = user_stats.lock_record(self.db, record_id)
+                if not record:
+                    return False
+                self.db.execute_query(query, tuple(values))
+                if 'processing_status' in kwargs:
+                    user_stats.record_status_change(self.db, record['user_id'], record['processing_status'],
+                                                    kwargs['processing_status'])
+                return True
+        except Exception as e:
+            print(f"Veritabanı hatası (update_processing_record): {e}")
+            return False
 
-    def get_user_history(self, user_id, limit=20, offset=0):
-        """Kullanıcının işlem geçmişini veritabanından alır."""
-        query = """
-            SELECT h.*, c.name as config_name FROM processing_history h
+    def get_user_history(self, user_id, limit=20, cursor=None):
+        """
+        Kullanıcının işlem geçmişini anahtar tabanlı (keyset) sayfalama ile
+        veritabanından alır. Sıralama ve imleç koşulu için bkz. ai_service.HISTORY_PAGE_QUERY.
+        Prompt ve ayarlar, özetle saklanıyorsa şablon ve anlık görüntüden tamamlanır.
+        Sayfa sıcak pencerenin dışına taşarsa arşiv tablosu da okunur (bkz. history_archive).
+
+        Returns:
+            tuple: (kayıt listesi, sonraki sayfa imleci veya son sayfadaysa None).
+
+        Raises:
+            ValueError: İmleç geçersizse.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        query = f"""
+            SELECT h.*, c.name as config_name, {history_store.CONTENT_COLUMNS} FROM {{table}} h
             LEFT JOIN prompt_configs c ON h.config_id = c.id
-            WHERE h.user_id = %s ORDER BY h.created_at DESC LIMIT %s OFFSET %s
+            {history_store.CONTENT_JOINS}
+            WHERE h.user_id = %s
+            {"AND (h.created_at < %s OR (h.created_at = %s AND h.id > %s))" if after else ""}
+            ORDER BY h.created_at DESC, h.id ASC LIMIT %s
         """
-        results = self.db.execute_query(query, (user_id, limit, offset), fetch_all=True)
-        if results:
-            for row in results:
-                if row.get('settings_used'):
-                    try: row['settings_used'] = json.loads(row['settings_used'])
-                    except: row['settings_used'] = {}
-        return results if results else []
+        params = (user_id,) + ((after[0], after[0], after[1]) if after else ()) + (limit + 1,)
+        results = history_archive.fetch_page(self.db, query, params, user_id, limit) or []
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor(results[-1]['created_at'], results[-1]['id'])
+        for row in results:
+            text_codec.decode_fields(row, 'processed_text', 'prompt_text')
+            template_text, settings_json = row.pop('template_text', None), row.pop('settings_json', None)
+            if row.get('prompt_text') is None:
+                row['prompt_text'] = history_store.expand_prompt(template_text, row['original_text'])
+            settings_json = row.get('settings_used') or settings_json
+            if settings_json:
+                row['settings_used'] = history_store.decode_settings(settings_json)
+        return results, next_cursor
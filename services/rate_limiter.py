@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, model (Gemini) çağrıları için süreç genelinde bir hız sınırlayıcı
+#sağlar. Dakikalık istek (RPM) ve token (TPM) kotaları birer token kovası
+#(token bucket) ile, aynı anda yapılan çağrı sayısı ise AIMD (toplamsal artış,
+#çarpımsal azalış) ile yönetilir: 429/503 yanıtlarında eşzamanlılık yarıya
+#iner, başarılı çağrılarla yavaşça geri artar.
+#
+#Kapasite dolduğunda çağıranlar hemen hata almaz; sınırlı uzunlukta bir FIFO
+#bekleme sırasına girer ve en fazla verilen süre kadar bekler.
+#
+#İçindekiler:
+#1.0 Yardımcılar
+#    - ModelBusyError: Bekleme sırası dolu veya süre aşıldığında fırlatılır.
+#    - estimate_tokens: Metin için kaba token tahmini yapar.
+#    - is_throttle_error: Bir hatanın kota/aşırı yük (429/503) hatası olup olmadığını belirler.
+#2.0 TokenBucket Sınıfı
+#    - consume, refund, wait_time: Dakikalık kotayı takip eder.
+#3.0 ModelRateLimiter Sınıfı
+#    - slot: Bir model çağrısını sınırlayıcı içinde çalıştıran context manager.
+#    - acquire, release: Çağrı için yer ayırır / bırakır ve AIMD ayarını yapar.
+#    - stats: Anlık limit, sıra uzunluğu ve bekleme sürelerini döndürür.
+#4.0 Süreç Geneli Sınırlayıcı
+#    - get_model_rate_limiter: Ortam değişkenlerine göre yapılandırılmış tekil sınırlayıcıyı döndürür.
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Token tahmininde kullanılan ortalama karakter/token oranı
+CHARS_PER_TOKEN = 4
+# Bu HTTP kodları kota aşımı veya geçici aşırı yük anlamına gelir
+THROTTLE_STATUS_CODES = (429, 503)
+THROTTLE_ERROR_NAMES = ('ResourceExhausted', 'ServiceUnavailable', 'TooManyRequests')
+
+
+# --- 1.0 Yardımcılar ---
+
+class ModelBusyError(Exception):
+    """Model çağrısı için bekleme sırası dolu olduğunda veya bekleme süresi aşıldığında fırlatılır."""
+
+
+def estimate_tokens(text):
+    """Metnin token sayısını karakter sayısından kabaca tahmin eder."""
+    return max(1, math.ceil(len(text or '') / CHARS_PER_TOKEN))
+
+
+def is_throttle_error(error):
+    """Hatanın kota aşımı (429) veya geçici aşırı yük (503) olup olmadığını döndürür."""
+    if type(error).__name__ in THROTTLE_ERROR_NAMES:
+        return True
+    for attr in ('code', 'status_code'):
+        code = getattr(error, attr, None)
+        code = code() if callable(code) else code
+        if getattr(code, 'value', code) in THROTTLE_STATUS_CODES:
+            return True
+    return False
+
+
+# --- 2.0 TokenBucket Sınıfı ---
+
+class TokenBucket:
+    """
+    Dakikada `per_minute` birim dolan ve en fazla `per_minute` birim biriktiren
+    kova. Thread güvenli değildir; ModelRateLimiter'ın kilidi altında kullanılır.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def wait_time(self, amount, now):
+        """`amount` birimin harcanabilmesi için beklenmesi gereken süre (saniye)."""
+        if self.capacity <= 0:
+            return 0.0
+        self._refill(now)
+        # Kovadan büyük istekler kova dolduğunda tek başına geçebilir
+        needed = min(amount, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount, now):
+        if self.capacity > 0:
+            self._refill(now)
+            self.tokens -= amount
+
+    def refund(self, amount, now):
+        """Tahminden fazla ayrılan birimleri iade eder (negatifse borç olarak düşer)."""
+        if self.capacity > 0:
+            self._refill(now)
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+# --- 3.0 ModelRateLimiter Sınıfı ---
+
+class ModelRateLimiter:
+    """
+    RPM/TPM kovaları ve AIMD ile ayarlanan eşzamanlılık sınırı. Bekleyenler
+    geliş sırasıyla (FIFO) ilerler; sıradaki ilk çağıran geçemiyorsa arkadakiler
+    de bekler, böylece büyük istekler küçükler tarafından aç bırakılmaz.
+    """
+
+    def __init__(self, rpm=60, tpm=1000000, max_concurrency=8, min_concurrency=1,
+                 max_waiters=50, max_wait=30.0, cooldown=2.0):
+        """
+        Args:
+            rpm (int): Dakikalık en fazla istek sayısı (0: sınırsız).
+            tpm (int): Dakikalık en fazla token sayısı (0: sınırsız).
+            max_concurrency (int): Eşzamanlılık sınırının çıkabileceği en yüksek değer.
+            min_concurrency (int): Geri çekilmede inilebilecek en düşük değer.
+            max_waiters (int): Bekleme sırasındaki en fazla çağıran sayısı.
+            max_wait (float): Bir çağıranın varsayılan en uzun bekleme süresi (saniye).
+            cooldown (float): Kota hatasından sonra yeni çağrıların bekletileceği süre (saniye).
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.max_waiters = max(0, int(max_waiters))
+        self.max_wait = float(max_wait)
+        self.cooldown = float(cooldown)
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._cond = threading.Condition()
+        self._waiters = deque()
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._counters = {
+            'acquired': 0, 'rejected': 0, 'timeouts': 0,
+            'succeeded': 0, 'failed': 0, 'throttled': 0,
+            'wait_total': 0.0, 'wait_max': 0.0,
+        }
+
+    # --- 3.1 Yer Ayırma ---
+
+    @contextmanager
+    def slot(self, prompt, timeout=None):
+        """
+        Bir model çağrısını sınırlayıcı içinde çalıştırır. Çağrının tahmini
+        token'ları (prompt + benzer uzunlukta çıktı) kotadan ayrılır; blok
+        içinde `usage['tokens']` atanırsa fark kovaya iade edilir.
+
+        Blok içindeki hata 429/503 ise eşzamanlılık azaltılır; istemci
+        bağlantıyı keserse (GeneratorExit) sınır değiştirilmez.
+
+        Raises:
+            ModelBusyError: Sıra doluysa veya bekleme süresi aşıldıysa.
+        """
+        reserved = estimate_tokens(prompt) * 2
+        if not self.acquire(reserved, timeout):
+            raise ModelBusyError("Model şu anda yoğun, lütfen biraz sonra tekrar deneyin.")
+        usage = {'tokens': None}
+        outcome = 'success'
+        try:
+            yield usage
+        except Exception as e:
+            outcome = 'throttled' if is_throttle_error(e) else 'error'
+            raise
+        except BaseException:
+            outcome = 'cancelled'
+            raise
+        finally:
+            self.release(outcome, reserved, usage['tokens'])
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Bir çağrı için yer ayırır; gerekirse sırada bekler.
+
+        Returns:
+            bool: Yer ayrıldıysa True; sıra doluysa veya süre aşıldıysa False.
+        """
+        started = time.monotonic()
+        deadline = started + (self.max_wait if timeout is None else float(timeout))
+        ticket = object()
+        with self._cond:
+            if not self._waiters and self._can_start(tokens, started) == 0:
+                self._start(tokens, started, 0.0)
+                return True
+            if len(self._waiters) >= self.max_waiters:
+                self._counters['rejected'] += 1
+                return False
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._can_start(tokens, now) if self._waiters[0] is ticket else None
+                    if delay == 0:
+                        self._start(tokens, now, now - started)
+                        return True
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        return False
+                    self._cond.wait(remaining if delay is None else min(delay, remaining))
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    def release(self, outcome='success', reserved=0, used=None):
+        """
+        Ayrılan yeri bırakır ve sonuca göre eşzamanlılık sınırını ayarlar:
+        başarıda sınır 1/sınır kadar artar, kota hatasında yarıya iner ve
+        yeni çağrılar `cooldown` süresi kadar bekletilir.
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._in_flight -= 1
+            if used is not None:
+                self._tokens.refund(reserved - used, now)
+            if outcome == 'success':
+                self._counters['succeeded'] += 1
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            elif outcome == 'throttled':
+                self._counters['throttled'] += 1
+                self._limit = max(self.min_concurrency, self._limit / 2.0)
+                self._paused_until = max(self._paused_until, now + self.cooldown)
+            elif outcome == 'error':
+                self._counters['failed'] += 1
+            self._cond.notify_all()
+
+    def _can_start(self, tokens, now):
+        """
+        Yeni bir çağrının başlayabilmesi için beklenecek süreyi döndürür:
+        0 hemen başlayabilir, None bir çağrının bitmesi beklenmeli demektir.
+        """
+        if self._in_flight >= int(self._limit):
+            return None
+        return max(self._paused_until - now, self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now), 0.0)
+
+    def _start(self, tokens, now, waited):
+        """Kotalardan düşer, çağrıyı başlamış sayar ve bekleme süresini kaydeder."""
+        self._requests.consume(1, now)
+        self._tokens.consume(tokens, now)
+        self._in_flight += 1
+        self._counters['acquired'] += 1
+        self._counters['wait_total'] += waited
+        self._counters['wait_max'] = max(self._counters['wait_max'], waited)
+
+    # --- 3.2 Gözlem ---
+
+    def stats(self):
+        """Anlık eşzamanlılık sınırını, sıra uzunluğunu, kota durumunu ve bekleme sürelerini döndürür."""
+        now = time.monotonic()
+        with self._cond:
+            counters = dict(self._counters)
+            self._requests._refill(now)
+            self._tokens._refill(now)
+            stats = {
+                'concurrency_limit': int(self._limit),
+                'concurrency_target': round(self._limit, 2),
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self._in_flight,
+                'waiting': len(self._waiters),
+                'max_waiters': self.max_waiters,
+                'paused_for': round(max(0.0, self._paused_until - now), 3),
+                'requests_available': int(self._requests.tokens) if self._requests.capacity else None,
+                'tokens_available': int(self._tokens.tokens) if self._tokens.capacity else None,
+            }
+        acquired = counters.pop('acquired')
+        wait_total = counters.pop('wait_total')
+        stats.update(counters)
+        stats['acquired'] = acquired
+        stats['wait_avg'] = round(wait_total / acquired, 4) if acquired else 0.0
+        stats['wait_max'] = round(counters['wait_max'], 4)
+        return stats
+
+
+# --- 4.0 Süreç Geneli Sınırlayıcı ---
+
+_rate_limiter = None
+_rate_limiter_pid = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_model_rate_limiter():
+    """
+    Süreç genelinde paylaşılan model hız sınırlayıcısını döndürür, yoksa
+    oluşturur. Kotalar GEMINI_RPM ve GEMINI_TPM, eşzamanlılık
+    GEMINI_MAX_CONCURRENCY / GEMINI_MIN_CONCURRENCY, bekleme sırası
+    GEMINI_QUEUE_SIZE ve GEMINI_MAX_WAIT ile ayarlanır.
+
+    Not: Kotalar süreç başınadır; birden fazla worker süreci çalışıyorsa
+    sağlayıcı kotası worker sayısına bölünerek verilmelidir.
+    """
+    global _rate_limiter, _rate_limiter_pid
+    pid = os.getpid()
+    if _rate_limiter is not None and _rate_limiter_pid == pid:
+        return _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None or _rate_limiter_pid != pid:
+            _rate_limiter = ModelRateLimiter(
+                rpm=int(os.getenv('GEMINI_RPM', '60')),
+                tpm=int(os.getenv('GEMINI_TPM', '1000000')),
+                max_concurrency=int(os.getenv('GEMINI_MAX_CONCURRENCY', '8')),
+                min_concurrency=int(os.getenv('GEMINI_MIN_CONCURRENCY', '1')),
+                max_waiters=int(os.getenv('GEMINI_QUEUE_SIZE', '50')),
+                max_wait=float(os.getenv('GEMINI_MAX_WAIT', '30')),
+                cooldown=float(os.getenv('GEMINI_THROTTLE_COOLDOWN', '2')),
+            )
+            _rate_limiter_pid = pid
+    return _rate_limiter
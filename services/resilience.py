@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, model (Gemini) çağrılarını yavaş veya sağlıksız bir servise karşı
+#koruyan dayanıklılık katmanını içerir:
+#  - Her denemenin bir son tarihi (deadline) vardır; süre dolunca beklenmez.
+#  - Yeniden denenebilir hatalar (zaman aşımı, 429, 5xx) rastgele dağıtılmış
+#    (jitter) üstel bekleme ile yeniden denenir.
+#  - İsteğe bağlı olarak, deneme son gecikmelerin p95 değerinden uzun sürerse
+#    ikinci bir yedek (hedged) istek gönderilir; ilk biten kullanılır.
+#  - Art arda hatalarda devre kesici (circuit breaker) açılır ve servis
+#    iyileşene kadar çağrılar beklemeden reddedilir.
+#Tüm kararlar sayaçlara yazılır ve stats() ile okunabilir.
+#
+#İçindekiler:
+#1.0 Hatalar ve Sınıflandırma
+#    - ModelTimeoutError, CircuitOpenError: Katmanın fırlattığı hatalar.
+#    - is_retryable: Bir hatanın yeniden denenip denenmeyeceğini belirler.
+#2.0 CircuitBreaker Sınıfı
+#    - allow, record_success, record_failure: Kapalı / açık / yarı açık durum makinesi.
+#3.0 ResilientCaller Sınıfı
+#    - call: Fonksiyonu zaman aşımı, yeniden deneme, yedek istek ve devre kesici ile çalıştırır.
+#    - guard: Akış (streaming) çağrıları için devre kesici koruması sağlayan context manager.
+#    - stats: Karar sayaçlarını, gecikme yüzdeliklerini ve devre durumunu döndürür.
+#4.0 Süreç Geneli Çağırıcı
+#    - get_model_caller: Ortam değişkenlerine göre yapılandırılmış tekil çağırıcıyı döndürür.
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+
+from services.rate_limiter import ModelBusyError, is_throttle_error
+
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+RETRYABLE_ERROR_NAMES = (
+    'DeadlineExceeded', 'ServiceUnavailable', 'InternalServerError', 'BadGateway',
+    'GatewayTimeout', 'ResourceExhausted', 'TooManyRequests', 'Aborted',
+)
+# p95 hesaplamak için tutulan son başarılı deneme süresi sayısı
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+# --- 1.0 Hatalar ve Sınıflandırma ---
+
+class ModelTimeoutError(TimeoutError):
+    """Bir model denemesi son tarihine kadar tamamlanmadığında fırlatılır."""
+
+
+class CircuitOpenError(Exception):
+    """Devre kesici açıkken yapılan çağrılar beklemeden bu hatayla reddedilir."""
+
+
+def is_retryable(error):
+    """
+    Hatanın geçici olup olmadığını döndürür. Zaman aşımı, bağlantı hataları,
+    429 ve 5xx yeniden denenir; geçersiz istek veya yetki hataları denenmez.
+    Yerel kapasite hatası (ModelBusyError) yeniden denenmez.
+    """
+    if isinstance(error, (ModelBusyError, CircuitOpenError)):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)) or is_throttle_error(error):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    code = getattr(error, 'code', None)
+    return getattr(code, 'value', code) in RETRYABLE_STATUS_CODES
+
+
+def _counts_as_failure(error):
+    """Devre kesici açısından hatanın servis sağlığıyla ilgili olup olmadığını döndürür."""
+    return is_retryable(error)
+
+
+# --- 2.0 CircuitBreaker Sınıfı ---
+
+class CircuitBreaker:
+    """
+    Art arda `threshold` hatada açılır ve `reset_timeout` saniye çağrılara
+    izin vermez. Süre dolunca yarı açık duruma geçer ve tek bir deneme
+    çağrısına izin verir; deneme başarılıysa kapanır, değilse yeniden açılır.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        self.threshold = max(1, int(threshold))
+        self.reset_timeout = float(reset_timeout)
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+
+    def allow(self):
+        """Çağrıya izin verilip verilmeyeceğini döndürür."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Hatayı kaydeder; devre bu hatayla açıldıysa True döner."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failures >= self.threshold):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.opened_count += 1
+                return True
+            return False
+
+    def release_probe(self):
+        """Sonucu sağlıkla ilgisiz biten (örn. iptal edilen) deneme çağrısını serbest bırakır."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+
+# --- 3.0 ResilientCaller Sınıfı ---
+
+class ResilientCaller:
+    """
+    Bir fonksiyonu zaman aşımı, yeniden deneme, yedek istek ve devre kesici
+    ile çalıştırır. Çalıştırılan fonksiyon tek argüman olarak denemenin son
+    tarihini (time.monotonic() cinsinden) alır; alt çağrılarını (örn. yerel
+    sıra beklemesi ve ağ isteği) buna göre sınırlamalıdır. Süresi dolan
+    denemenin sonucu burada beklenmez; denemenin kendisinin de son tarihte
+    bitmesi, thread'in ve kaynaklarının serbest kalması için gereklidir.
+    """
+
+    def __init__(self, timeout=30.0, max_attempts=3, base_delay=0.5, max_delay=8.0,
+                 hedge=False, hedge_min_delay=2.0, breaker_threshold=5, breaker_reset=30.0,
+                 max_workers=32, name='model'):
+        """
+        Args:
+            timeout (float): Tek bir denemenin en uzun süresi (saniye).
+            max_attempts (int): İlk deneme dahil en fazla deneme sayısı.
+            base_delay (float): Üstel beklemenin taban süresi (saniye).
+            max_delay (float): Denemeler arası en uzun bekleme (saniye).
+            hedge (bool): Yavaş denemeler için yedek istek gönderilip gönderilmeyeceği.
+            hedge_min_delay (float): Yedek istekten önce beklenecek en kısa süre (saniye).
+            breaker_threshold (int): Devreyi açan art arda hata sayısı.
+            breaker_reset (float): Devrenin açık kalacağı süre (saniye).
+            max_workers (int): Denemeleri çalıştıran thread sayısı.
+        """
+        self.timeout = float(timeout)
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.hedge = bool(hedge)
+        self.hedge_min_delay = float(hedge_min_delay)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self._executor = ThreadPoolExecutor(max_workers=max(2, int(max_workers)), thread_name_prefix=f'{name}-call')
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {
+            'calls': 0, 'attempts': 0, 'retries': 0, 'timeouts': 0,
+            'hedges': 0, 'hedge_wins': 0, 'successes': 0, 'failures': 0,
+            'short_circuited': 0, 'breaker_opened': 0,
+        }
+
+    # --- 3.1 Çağrı ---
+
+    def call(self, func):
+        """
+        Fonksiyonu çalıştırır ve sonucunu döndürür.
+
+        Raises:
+            CircuitOpenError: Devre açıksa.
+            ModelTimeoutError: Son deneme de süresinde bitmezse.
+            Exception: Yeniden denenemeyen veya son denemede alınan hata.
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError("Model servisi geçici olarak kullanılamıyor, lütfen daha sonra tekrar deneyin.")
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self._count('retries')
+                time.sleep(self._backoff(attempt))
+            try:
+                result = self._attempt(func)
+            except Exception as e:
+                if not _counts_as_failure(e):
+                    self.breaker.release_probe()
+                    self._count('failures')
+                    raise
+                if self.breaker.record_failure():
+                    self._count('breaker_opened')
+                if attempt == self.max_attempts - 1 or self.breaker.state != CircuitBreaker.CLOSED:
+                    self._count('failures')
+                    raise
+                print(f"Uyarı: Model çağrısı başarısız ({type(e).__name__}), yeniden denenecek ({attempt + 1}/{self.max_attempts}).")
+                continue
+            self.breaker.record_success()
+            self._count('successes')
+            return result
+
+    @contextmanager
+    def guard(self):
+        """
+        Akış (streaming) çağrıları için devre kesici koruması. Akış yeniden
+        denenmez (istemciye parça gönderilmiş olabilir), ancak sonucu devre
+        durumuna ve sayaçlara işlenir.
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError("Model servisi geçici olarak kullanılamıyor, lütfen daha sonra tekrar deneyin.")
+        self._count('attempts')
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._count('failures')
+            if not _counts_as_failure(e):
+                self.breaker.release_probe()
+            elif self.breaker.record_failure():
+                self._count('breaker_opened')
+            raise
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success()
+        self._count('successes')
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+
+    def _attempt(self, func):
+        """
+        Tek bir denemeyi son tarihine kadar bekler. Yedek istek açıksa ve
+        deneme p95 gecikmesini aşarsa aynı fonksiyon bir kez daha başlatılır;
+        önce başarıyla biten sonucun kullanılır.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        primary = self._submit(func, deadline)
+        pending = {primary}
+        hedge_at = self._hedge_delay()
+        hedged = None
+        error = None
+
+        while pending:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                self._count('timeouts')
+                raise ModelTimeoutError(f"Model {self.timeout:g} saniye içinde yanıt vermedi.")
+            wait_for = remaining
+            if hedge_at is not None and hedged is None:
+                wait_for = min(remaining, max(0.0, started + hedge_at - now))
+
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedged:
+                        self._count('hedge_wins')
+                    return future.result()
+                error = future.exception()
+
+            if error is not None and not pending:
+                raise error
+            if hedge_at is not None and hedged is None and pending and time.monotonic() - started >= hedge_at:
+                self._count('hedges')
+                hedged = self._submit(func, deadline)
+                pending.add(hedged)
+        raise error
+
+    def _submit(self, func, deadline):
+        """Bir denemeyi thread havuzunda başlatır; başarılı denemelerin süresini kaydeder."""
+        self._count('attempts')
+
+        def run():
+            started = time.monotonic()
+            result = func(deadline)
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+            return result
+
+        return self._executor.submit(run)
+
+    def _backoff(self, attempt):
+        """Tam rastgele dağıtılmış (full jitter) üstel bekleme süresi."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _hedge_delay(self):
+        """Yedek isteğin gönderileceği gecikme; yeterli örnek yoksa veya kapalıysa None."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            p95 = self._percentile(sorted(self._latencies), 0.95)
+        delay = max(self.hedge_min_delay, p95)
+        return delay if delay < self.timeout else None
+
+    @staticmethod
+    def _percentile(sorted_values, fraction):
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    # --- 3.2 Gözlem ---
+
+    def stats(self):
+        """Karar sayaçlarını, son gecikmelerin p50/p95 değerlerini ve devre durumunu döndürür."""
+        with self._lock:
+            stats = dict(self._counters)
+            latencies = sorted(self._latencies)
+        stats['latency_p50'] = round(self._percentile(latencies, 0.50), 4)
+        stats['latency_p95'] = round(self._percentile(latencies, 0.95), 4)
+        stats['latency_samples'] = len(latencies)
+        stats['hedge_delay'] = self._hedge_delay()
+        stats['breaker_state'] = self.breaker.state
+        return stats
+
+
+# --- 4.0 Süreç Geneli Çağırıcı ---
+
+_model_caller = None
+_model_caller_pid = None
+_model_caller_lock = threading.Lock()
+
+
+def get_model_caller():
+    """
+    Model çağrıları için süreç genelinde paylaşılan dayanıklı çağırıcıyı
+    döndürür. MODEL_TIMEOUT, MODEL_MAX_ATTEMPTS, MODEL_RETRY_BASE_DELAY,
+    MODEL_RETRY_MAX_DELAY, MODEL_HEDGE_ENABLED, MODEL_HEDGE_MIN_DELAY,
+    MODEL_BREAKER_THRESHOLD ve MODEL_BREAKER_RESET ile ayarlanır.
+    """
+    global _model_caller, _model_caller_pid
+    pid = os.getpid()
+    if _model_caller is not None and _model_caller_pid == pid:
+        return _model_caller
+
+    with _model_caller_lock:
+        if _model_caller is None or _model_caller_pid != pid:
+            _model_caller = ResilientCaller(
+                timeout=float(os.getenv('MODEL_TIMEOUT', '30')),
+                max_attempts=int(os.getenv('MODEL_MAX_ATTEMPTS', '3')),
+                base_delay=float(os.getenv('MODEL_RETRY_BASE_DELAY', '0.5')),
+                max_delay=float(os.getenv('MODEL_RETRY_MAX_DELAY', '8')),
+                hedge=os.getenv('MODEL_HEDGE_ENABLED', 'false').lower() == 'true',
+                hedge_min_delay=float(os.getenv('MODEL_HEDGE_MIN_DELAY', '2')),
+                breaker_threshold=int(os.getenv('MODEL_BREAKER_THRESHOLD', '5')),
+                breaker_reset=float(os.getenv('MODEL_BREAKER_RESET', '30')),
+            )
+            _model_caller_pid = pid
+    return _model_caller
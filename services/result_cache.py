@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, AI tarafından işlenmiş haber sonuçları için içerik adresli
+#(content-addressed) iki katmanlı bir önbellek sağlar. Aynı ajans haberi aynı
+#ayarlarla birden fazla editör tarafından gönderildiğinde Gemini yeniden
+#çağrılmaz.
+#
+#Anahtar; normalize edilmiş haber metni, etkin kullanıcı ayarları, aktif prompt
+#konfigürasyonunun sürümü ve model adından üretilen SHA-256 özetidir.
+#
+#İçindekiler:
+#1.0 ResultCache Sınıfı
+#    - make_key: Önbellek anahtarını üretir.
+#    - get: Önce bellek, sonra veritabanı katmanına bakar.
+#    - put: Sonucu her iki katmana yazar.
+#    - invalidate_config: Bir konfigürasyona ait tüm sonuçları geçersiz kılar.
+#    - purge_expired: Süresi dolmuş kalıcı kayıtları siler.
+#    - stats: İsabet/ıska sayaçlarını döndürür.
+#2.0 Süreç Geneli Önbellek
+#    - get_result_cache: Ortam değişkenlerine göre yapılandırılmış tekil önbelleği döndürür.
+
+import hashlib
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from database.connection import DatabaseConnection
+
+
+class ResultCache:
+    """
+    Bellek içi LRU (TTL destekli) ve MySQL tabanlı kalıcı katmandan oluşan
+    sonuç önbelleği. Kalıcı katman, yeniden başlatmalar ve worker'lar arasında
+    sonuçların paylaşılmasını sağlar.
+    """
+    PURGE_EVERY = 500  # Bu kadar yazmada bir süresi dolmuş kalıcı kayıtlar temizlenir
+
+    def __init__(self, max_entries=1000, ttl=86400, persistent=True):
+        """
+        Args:
+            max_entries (int): Bellek katmanında tutulacak en fazla sonuç sayısı.
+            ttl (int): Bir sonucun geçerli kalacağı süre (saniye).
+            persistent (bool): Veritabanı katmanının kullanılıp kullanılmayacağı.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = int(ttl)
+        self.persistent = persistent
+        self._entries = OrderedDict()  # anahtar -> (sonuç, son geçerlilik, config_id)
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0, 'db_hits': 0, 'misses': 0,
+            'stores': 0, 'evictions': 0, 'invalidations': 0,
+        }
+
+    # --- 1.0 Önbellek İşlemleri ---
+
+    @staticmethod
+    def make_key(news_text, settings, config_version, model_name, template_version=None):
+        """
+        Önbellek anahtarını üretir. Metin Unicode NFC'ye çevrilir ve boşlukları
+        sadeleştirilir; ayarlar, prompt oluşturucunun yorumladığı gibi metne
+        çevrilip anahtar sırasına göre dizilir. `template_version`
+        (PromptService.template_version) prompt_templates.json değiştiğinde
+        eski sonuçların kullanılmamasını sağlar.
+        """
+        normalized_text = ' '.join(unicodedata.normalize('NFC', news_text or '').split())
+        canonical_settings = json.dumps(
+            {str(key): str(value) for key, value in (settings or {}).items()},
+            sort_keys=True, ensure_ascii=False
+        )
+        material = '\x1f'.join([normalized_text, canonical_settings, str(config_version), str(model_name),
+                                 str(template_version)])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Anahtara ait sonucu döndürür; bulunamazsa veya süresi dolmuşsa None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return entry[0]
+                del self._entries[key]
+
+        row = self._load_persistent(key) if self.persistent else None
+        with self._lock:
+            if row is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['db_hits'] += 1
+        self._remember(key, row['processed_text'], row['config_id'])
+        return row['processed_text']
+
+    def put(self, key, config_id, processed_text):
+        """Sonucu bellek ve (etkinse) veritabanı katmanına yazar."""
+        self._remember(key, processed_text, config_id)
+        with self._lock:
+            self._counters['stores'] += 1
+            should_purge = self._counters['stores'] % self.PURGE_EVERY == 0
+        if self.persistent:
+            self._store_persistent(key, config_id, processed_text)
+            if should_purge:
+                self.purge_expired()
+
+    def invalidate_config(self, config_id):
+        """Belirtilen konfigürasyonla üretilmiş tüm sonuçları her iki katmandan siler."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] == config_id]
+            for key in stale:
+                del self._entries[key]
+            self._counters['invalidations'] += 1
+        if self.persistent:
+            try:
+                with DatabaseConnection() as db:
+                    db.execute_query("DELETE FROM processing_result_cache WHERE config_id = %s", (config_id,))
+            except Exception as e:
+                print(f"Veritabanı hatası (önbellek geçersiz kılma): {e}")
+
+    def purge_expired(self):
+        """Süresi dolmuş kalıcı önbellek kayıtlarını siler."""
+        try:
+            with DatabaseConnection() as db:
+                db.execute_query("DELETE FROM processing_result_cache WHERE expires_at < %s", (datetime.now(),))
+        except Exception as e:
+            print(f"Veritabanı hatası (önbellek temizleme): {e}")
+
+    def stats(self):
+        """Önbellek sayaçlarını ve bellek katmanının doluluğunu döndürür."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['db_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _remember(self, key, processed_text, config_id):
+        with self._lock:
+            self._entries[key] = (processed_text, time.time() + self.ttl, config_id)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def _load_persistent(self, key):
+        try:
+            with DatabaseConnection() as db:
+                return db.execute_query(
+                    """
+                    SELECT config_id, processed_text FROM processing_result_cache
+                    WHERE cache_key = %s AND expires_at > %s
+                    """,
+                    (key, datetime.now()), fetch_one=True
+                )
+        except Exception as e:
+            print(f"Veritabanı hatası (önbellek okuma): {e}")
+            return None
+
+    def _store_persistent(self, key, config_id, processed_text):
+        try:
+            with DatabaseConnection() as db:
+                db.execute_query(
+                    """
+                    INSERT INTO processing_result_cache (cache_key, config_id, processed_text, expires_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE processed_text = VALUES(processed_text), expires_at = VALUES(expires_at)
+                    """,
+                    (key, config_id, processed_text, datetime.now() + timedelta(seconds=self.ttl))
+                )
+        except Exception as e:
+            print(f"Veritabanı hatası (önbellek yazma): {e}")
+
+
+# --- 2.0 Süreç Geneli Önbellek ---
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    Süreç genelinde paylaşılan sonuç önbelleğini döndürür. RESULT_CACHE_ENABLED
+    'false' ise None döner ve çağıranlar önbelleği atlar.
+    """
+    global _result_cache
+    if os.getenv('RESULT_CACHE_ENABLED', 'true').lower() != 'true':
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(
+                    max_entries=int(os.getenv('RESULT_CACHE_SIZE', '1000')),
+                    ttl=int(os.getenv('RESULT_CACHE_TTL', '86400')),
+                    persistent=os.getenv('RESULT_CACHE_PERSISTENT', 'true').lower() == 'true',
+                )
+    return _result_cache
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, processing_history tablosundaki büyük metin alanlarının
+#(processed_text, prompt_text) sıkıştırılarak saklanmasını sağlayan kodlayıcıyı
+#içerir. Sıkıştırılmış değerler `processed_data` / `prompt_data` BLOB
+#sütunlarına yazılır; eski kayıtlar düz metin sütunlarında kalır ve okuma
+#sırasında iki biçim de aynı şekilde döner.
+#
+#Her saklanan değerin ilk baytı kodlayıcı sürümüdür: 0 düz UTF-8 (kısa veya
+#sıkışmayan metinler), 1 sözlüksüz zlib (varsayılan), N >= 2 ise
+#config/text_dictionaries/vN.txt sözlüğüyle zlib. Kısa metinler tek başına iyi
+#sıkışmaz; önceden eğitilmiş sözlük (database/train_text_dictionary.py) sık
+#geçen ifadeleri baştan sağlar. Sözlük yalnızca HISTORY_DICTIONARY_MAX_SIZE
+#bayttan kısa metinlere uygulanır; daha uzun metinler sözlüklü sürüm
+#seçiliyken de sözlüksüz zlib ile yazılır.
+#Kaydın `text_codec` sütunu, alanlarının yazıldığı en eski sürümü tutar (0: en
+#az bir alan henüz sıkıştırılmamış); database/compress_history.py bu sütuna
+#göre eski kayıtları hedef sürüme taşır.
+#
+#Bir sözlük dosyası, o sürümle yazılmış kayıt olduğu sürece DEĞİŞTİRİLMEMELİDİR;
+#yeni bir sözlük her zaman yeni bir sürüm numarasıyla eklenir.
+#
+#Depoyla birlikte sözlük dağıtılmaz: sözlük, üretim kayıtlarından alınmış
+#temsili bir örnekle eğitilip kazancı eğitimde kullanılmayan kayıtlar
+#üzerinde ölçüldükten sonra HISTORY_CODEC_VERSION ile isteğe bağlı olarak
+#etkinleştirilir.
+#
+#İçindekiler:
+#1.0 Kodlama
+#    - encode: Metni yazılacak sürümle kodlar.
+#    - decode: Saklanan değeri (sürüm baytına göre) metne çevirir.
+#    - load_dictionary: Bir sürümün sözlüğünü okur.
+#2.0 Sütun Eşleme
+#    - text_size: Metnin UTF-8 bayt boyutunu döndürür.
+#    - column_values: Yazılacak alanları sütun/değer çiftlerine çevirir.
+#    - update_assignments: Var olan kayıt için SET ifadesini üretir.
+#    - select_columns: Okunacak alanlar için SELECT sütun listesini üretir.
+#    - decode_fields: Satırdaki istenen alanları çözer.
+
+import os
+import threading
+import zlib
+
+from utils.metrics import get_metrics
+
+# 0: sıkıştırma kapalı, düz metin sütunlarına yazılır
+CODEC_PLAIN = 0
+# 1: sözlüksüz zlib; 2 ve üzeri eğitilmiş sözlük sürümleridir
+CODEC_ZLIB = 1
+CODEC_VERSION = int(os.getenv('HISTORY_CODEC_VERSION', '1'))
+COMPRESSION_LEVEL = int(os.getenv('HISTORY_COMPRESSION_LEVEL', '6'))
+# Bundan kısa metinlerde başlık maliyeti kazancı aşar; düz saklanır
+MIN_COMPRESS_SIZE = int(os.getenv('HISTORY_COMPRESSION_MIN_SIZE', '64'))
+# Sözlük bu boyuttan (bayt) kısa metinlere uygulanır; uzun metinler kendi
+# içindeki tekrarlardan yeterince kazanır
+DICTIONARY_MAX_SIZE = int(os.getenv('HISTORY_DICTIONARY_MAX_SIZE', '4096'))
+
+DICTIONARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'text_dictionaries')
+
+# Düz metin alanı -> sıkıştırılmış değerin yazıldığı sütun
+COMPRESSED_FIELDS = {
+    'processed_text': 'processed_data',
+    'prompt_text': 'prompt_data',
+}
+# Açılmış bayt boyutu ayrıca saklanan alanlar (liste metni açmadan gösterir)
+SIZE_COLUMNS = {
+    'processed_text': 'processed_size',
+}
+
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+
+
+# --- 1.0 Kodlama ---
+
+def load_dictionary(version):
+    """
+    Belirtilen sürümün sözlüğünü (ham bayt olarak) döndürür; sözlüksüz
+    sürümlerde None. Sözlükler süreç boyunca bir kez okunur.
+
+    Raises:
+        ValueError: Sürümün sözlük dosyası yoksa.
+    """
+    if version <= CODEC_ZLIB:
+        return None
+    with _dictionaries_lock:
+        zdict = _dictionaries.get(version)
+        if zdict is None:
+            path = os.path.join(DICTIONARY_DIR, f'v{version}.txt')
+            try:
+                with open(path, 'rb') as f:
+                    zdict = f.read()
+            except OSError as e:
+                raise ValueError(f"Metin kodlayıcı sözlüğü bulunamadı (sürüm {version}): {e}") from e
+            _dictionaries[version] = zdict
+    return zdict
+
+
+def encode(text, version=None):
+    """
+    Metni verilen (verilmezse yapılandırılmış) kodlayıcı sürümüyle kodlar.
+    Sözlüklü sürümlerde DICTIONARY_MAX_SIZE'tan uzun metinler sözlüksüz
+    zlib ile yazılır. Sıkıştırma kazanç sağlamıyorsa metin düz olarak saklanır.
+
+    Returns:
+        bytes: Sürüm baytı + içerik; text None ise None.
+    """
+    if text is None:
+        return None
+    version = CODEC_VERSION if version is None else version
+    data = text.encode('utf-8')
+    if version != CODEC_PLAIN and len(data) >= MIN_COMPRESS_SIZE:
+        if len(data) > DICTIONARY_MAX_SIZE:
+            version = CODEC_ZLIB
+        compressor = _compressor(version)
+        packed = compressor.compress(data) + compressor.flush()
+        if len(packed) < len(data):
+            return bytes((version,)) + packed
+    return bytes((CODEC_PLAIN,)) + data
+
+
+def decode(value):
+    """
+    Saklanan değeri metne çevirir. Sürüm değerin kendisinde yazılı olduğundan
+    farklı sürümlerle yazılmış alanlar aynı satırda bulunabilir.
+
+    Returns:
+        str: Metin; value None ise None.
+    """
+    if value is None:
+        return None
+    value = bytes(value)
+    version, body = value[0], value[1:]
+    if version == CODEC_PLAIN:
+        return body.decode('utf-8')
+    zdict = load_dictionary(version)
+    decompressor = zlib.decompressobj() if zdict is None else zlib.decompressobj(zdict=zdict)
+    return (decompressor.decompress(body) + decompressor.flush()).decode('utf-8')
+
+
+def _compressor(version):
+    zdict = load_dictionary(version)
+    if zdict is None:
+        return zlib.compressobj(COMPRESSION_LEVEL)
+    return zlib.compressobj(COMPRESSION_LEVEL, zdict=zdict)
+
+
+# --- 2.0 Sütun Eşleme ---
+
+def text_size(text):
+    """Metnin UTF-8 bayt boyutunu döndürür; text None ise None."""
+    return None if text is None else len(text.encode('utf-8'))
+
+
+def column_values(fields, version=None):
+    """
+    Yazılacak alanları sütun -> değer sözlüğüne çevirir. Sıkıştırma açıksa
+    metin *_data sütununa yazılır ve düz sütun boşaltılır; kapalıysa tersi
+    yapılır. Böylece okuma tarafı hangi sütunun geçerli olduğunu her zaman bilir.
+    SIZE_COLUMNS'taki alanların açılmış boyutu da yazılır.
+
+    Args:
+        fields (dict): Alan adı (COMPRESSED_FIELDS anahtarı) -> metin.
+
+    Returns:
+        dict: Sütun adı -> yazılacak değer ('text_codec' dahil).
+    """
+    version = CODEC_VERSION if version is None else version
+    metrics = get_metrics()
+    columns = {}
+    for field, text in fields.items():
+        data_column = COMPRESSED_FIELDS[field]
+        if field in SIZE_COLUMNS:
+            columns[SIZE_COLUMNS[field]] = text_size(text)
+        if version == CODEC_PLAIN or text is None:
+            columns[field], columns[data_column] = text, None
+            continue
+        data = encode(text, version)
+        columns[field], columns[data_column] = None, data
+        metrics.inc('history_text_bytes_total', (field, 'raw'), text_size(text))
+        metrics.inc('history_text_bytes_total', (field, 'stored'), len(data))
+    columns['text_codec'] = version
+    return columns
+
+
+def update_assignments(fields, version=None):
+    """
+    Var olan bir kaydın alanlarını güncellemek için SET ifadesini ve
+    parametrelerini üretir. Kaydın diğer alanları daha eski bir sürümle
+    yazılmış olabileceğinden `text_codec` en küçük sürümde tutulur; arka plan
+    sıkıştırması böyle kayıtları yeniden bulabilir.
+
+    Returns:
+        tuple: ("col = %s, ..." ifadesi, parametre demeti).
+    """
+    columns = column_values(fields, version)
+    version = columns.pop('text_codec')
+    assignments = [f'{column} = %s' for column in columns]
+    assignments.append('text_codec = CASE WHEN text_codec < %s THEN text_codec ELSE %s END')
+    return ', '.join(assignments), tuple(columns.values()) + (version, version)
+
+
+def select_columns(*fields, prefix=''):
+    """
+    İstenen alanları okumak için gereken sütunları virgülle ayrılmış olarak
+    döndürür (örn. 'processed_text, processed_data'). İstenmeyen alanların
+    sıkıştırılmış verisi hiç okunmaz.
+    """
+    return ', '.join(f'{prefix}{column}' for field in fields for column in (field, COMPRESSED_FIELDS[field]))
+
+
+def decode_fields(row, *fields):
+    """
+    Satırdaki istenen alanları çözer: *_data sütunu doluysa açılıp düz alan
+    adına yazılır, *_data anahtarı satırdan çıkarılır. Yalnızca istenen alanlar
+    açılır; diğerleri olduğu gibi bırakılır.
+
+    Returns:
+        dict: Aynı satır.
+    """
+    if not row:
+        return row
+    for field in fields:
+        data = row.pop(COMPRESSED_FIELDS[field], None)
+        if data is not None:
+            row[field] = decode(data)
+    return row
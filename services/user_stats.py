@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, kullanıcı başına işlem sayaçlarının (`user_processing_stats`)
+#artımlı olarak tutulmasını sağlar. processing_history'ye kayıt eklenen,
+#kaydın durumu veya okunma bilgisi değişen her yazma işlemi, sayaçları aynı
+#veritabanı işlemi (transaction) içinde günceller. Böylece istatistik
+#endpoint'i tüm geçmişi taramak yerine tek satırlık birincil anahtar okuması yapar.
+#
+#Buradaki fonksiyonlar çağıranın açtığı `db.transaction()` bloğu içinde
+#çağrılmalıdır; kendileri commit yapmaz.
+#
+#İçindekiler:
+#1.0 Sayaç Güncelleme
+#    - record_created: Yeni kayıtlar için sayaçları artırır.
+#    - record_status_change: Durum değişikliğinde eski/yeni durum sayaçlarını günceller.
+#    - record_read: Okundu olarak işaretlenen kayıtlar için okunmamış sayacını azaltır.
+#    - lock_record: Bir geçmiş kaydını kilitleyip mevcut durumunu döndürür.
+#2.0 Sayaç Okuma
+#    - get_user_stats: Kullanıcının sayaçlarını tek satır olarak okur.
+#3.0 Yeniden Oluşturma
+#    - rebuild_user_stats: Sayaçları processing_history'den (arşiv dahil) yeniden hesaplayıp uzlaştırır.
+
+# processing_history.processing_status değerinin hangi sayaca yazılacağı.
+# 'failed' eski kayıtlardan kalan durumdur ve 'error' ile birlikte sayılır.
+STATUS_COUNTERS = {
+    'pending': 'pending',
+    'processing': 'processing',
+    'completed': 'completed',
+    'error': 'failed',
+    'failed': 'failed',
+}
+COUNTER_COLUMNS = ('total', 'pending', 'processing', 'completed', 'failed', 'unread')
+
+# Geçmiş tablosundan ({table}: processing_history veya arşivi) sayaçların
+# doğru değerini hesaplayan sorgu.
+HISTORY_TABLES = ('processing_history', 'processing_history_archive')
+AGGREGATE_QUERY = """
+SELECT user_id,
+       COUNT(*) AS total,
+       SUM(processing_status = 'pending') AS pending,
+       SUM(processing_status = 'processing') AS processing,
+       SUM(processing_status = 'completed') AS completed,
+       SUM(processing_status IN ('error', 'failed')) AS failed,
+       SUM(read_status = 'unread') AS unread
+FROM {table}
+WHERE user_id IS NOT NULL {where}
+GROUP BY user_id
+"""
+
+
+# --- 1.0 Sayaç Güncelleme ---
+
+def record_created(db, user_id, status_counts, unread=None):
+    """
+    Yeni eklenen kayıtlar için kullanıcının sayaçlarını artırır; satır yoksa oluşturur.
+
+    Args:
+        db (DatabaseConnection): İşlem içindeki bağlantı.
+        user_id (str): Kullanıcı kimliği. None ise hiçbir şey yapılmaz.
+        status_counts (dict): Duruma göre eklenen kayıt sayısı (örn. {'pending': 3}).
+        unread (int, optional): Okunmamış eklenen kayıt sayısı. Verilmezse
+                                tüm kayıtlar okunmamış kabul edilir.
+    """
+    if not user_id:
+        return
+    deltas = dict.fromkeys(COUNTER_COLUMNS, 0)
+    for status, count in status_counts.items():
+        deltas[STATUS_COUNTERS.get(status, 'pending')] += count
+        deltas['total'] += count
+    deltas['unread'] = deltas['total'] if unread is None else unread
+    if not deltas['total']:
+        return
+
+    db.execute_query(
+        f"""
+        INSERT INTO user_processing_stats (user_id, {', '.join(COUNTER_COLUMNS)})
+        VALUES (%s, {', '.join(['%s'] * len(COUNTER_COLUMNS))})
+        ON DUPLICATE KEY UPDATE {', '.join(f'{col} = {col} + VALUES({col})' for col in COUNTER_COLUMNS)}
+        """,
+        (user_id,) + tuple(deltas[col] for col in COUNTER_COLUMNS)
+    )
+
+
+def record_status_change(db, user_id, old_status, new_status, count=1):
+    """Bir veya daha çok kaydın durumu değiştiğinde eski ve yeni durum sayaçlarını günceller."""
+    old_column = STATUS_COUNTERS.get(old_status)
+    new_column = STATUS_COUNTERS.get(new_status)
+    if not user_id or old_column == new_column or not count:
+        return
+
+    assignments = []
+    if old_column:
+        assignments.append(f"{old_column} = {old_column} - %s")
+    if new_column:
+        assignments.append(f"{new_column} = {new_column} + %s")
+    db.execute_query(
+        f"UPDATE user_processing_stats SET {', '.join(assignments)} WHERE user_id = %s",
+        (count,) * len(assignments) + (user_id,)
+    )
+
+
+def record_read(db, user_id, count=1):
+    """Okundu olarak işaretlenen kayıtlar için okunmamış sayacını azaltır."""
+    if not user_id or not count:
+        return
+    db.execute_query(
+        "UPDATE user_processing_stats SET unread = unread - %s WHERE user_id = %s",
+        (count, user_id)
+    )
+
+
+def lock_record(db, processing_id):
+    """
+    Bir geçmiş kaydını işlem sonuna kadar kilitler (SELECT ... FOR UPDATE) ve
+    sayaç güncellemesi için gereken alanlarını döndürür.
+
+    Returns:
+        dict: user_id, processing_status ve read_status; kayıt yoksa None.
+    """
+    return db.execute_query(
+        "SELECT user_id, processing_status, read_status FROM processing_history WHERE id = %s FOR UPDATE",
+        (processing_id,), fetch_one=True
+    )
+
+
+# --- 2.0 Sayaç Okuma ---
+
+def get_user_stats(db, user_id):
+    """
+    Kullanıcının sayaçlarını birincil anahtar üzerinden tek satır olarak okur.
+    Henüz kaydı olmayan kullanıcılar için tüm sayaçlar 0 döner.
+    """
+    row = db.execute_query(
+        f"SELECT {', '.join(COUNTER_COLUMNS)} FROM user_processing_stats WHERE user_id = %s",
+        (user_id,), fetch_one=True
+    )
+    return {col: int((row or {}).get(col) or 0) for col in COUNTER_COLUMNS}
+
+
+# --- 3.0 Yeniden Oluşturma ---
+
+def rebuild_user_stats(db, user_id=None, dry_run=False):
+    """
+    Sayaçları processing_history'den (arşiv dahil) yeniden hesaplar ve tablodaki değerlerle
+    karşılaştırır. dry_run değilse farklı olan satırlar tek bir işlem içinde
+    düzeltilir; geçmişi kalmamış kullanıcıların satırları silinir.
+
+    Args:
+        db (DatabaseConnection): Kullanılacak bağlantı.
+        user_id (str, optional): Yalnızca bu kullanıcıyı uzlaştır.
+        dry_run (bool): True ise sadece farkları raporla.
+
+    Returns:
+        list: (user_id, mevcut sayaçlar, doğru sayaçlar) farkları.
+    """
+    where, params = ("AND user_id = %s", (user_id,)) if user_id else ("", ())
+    with db.transaction():
+        # Geçmiş satırları okunurken kilitlenir; uzlaştırma sürerken yapılan
+        # yazmalar bu işlem bitene kadar bekler ve sayaçlar kaymaz.
+        expected = {}
+        for table in HISTORY_TABLES:
+            rows = db.execute_query(
+                AGGREGATE_QUERY.format(table=table, where=where) + " LOCK IN SHARE MODE", params, fetch_all=True
+            ) or []
+            for row in rows:
+                counters = expected.setdefault(row['user_id'], dict.fromkeys(COUNTER_COLUMNS, 0))
+                for col in COUNTER_COLUMNS:
+                    counters[col] += int(row[col] or 0)
+        current_rows = db.execute_query(
+            f"SELECT user_id, {', '.join(COUNTER_COLUMNS)} FROM user_processing_stats"
+            + (" WHERE user_id = %s" if user_id else "") + " FOR UPDATE",
+            params, fetch_all=True
+        ) or []
+
+        current = {row['user_id']: {col: int(row[col] or 0) for col in COUNTER_COLUMNS} for row in current_rows}
+        zeros = dict.fromkeys(COUNTER_COLUMNS, 0)
+
+        drift = []
+        for uid in sorted(set(expected) | set(current)):
+            if expected.get(uid) != current.get(uid):
+                drift.append((uid, current.get(uid, zeros), expected.get(uid, zeros)))
+
+        if dry_run or not drift:
+            return drift
+
+        for uid, _, counters in drift:
+            if uid not in expected:
+                db.execute_query("DELETE FROM user_processing_stats WHERE user_id = %s", (uid,))
+                continue
+            db.execute_query(
+                f"""
+                INSERT INTO user_processing_stats (user_id, {', '.join(COUNTER_COLUMNS)})
+                VALUES (%s, {', '.join(['%s'] * len(COUNTER_COLUMNS))})
+                ON DUPLICATE KEY UPDATE {', '.join(f'{col} = VALUES({col})' for col in COUNTER_COLUMNS)}
+                """,
+                (uid,) + tuple(counters[col] for col in COUNTER_COLUMNS)
+            )
+    return drift
@@ -20,6 +20,7 @@
  * 2.6 debounce() - Fonksiyon çağırma sıklığını sınırlar.
  * 2.7 apiRequest() - API istekleri için yardımcı fonksiyon.
  * 2.8 storage - LocalStorage işlemleri (set, get, remove).
+ * 2.9 streamRequest() - Server-Sent Events akışını okuyup olay olay işler.
  * 3.0 Global Olay Yöneticileri
  * 3.1 DOMContentLoaded - Sayfa yüklendiğinde çalışan olaylar.
  */
@@ -36,11 +37,15 @@ const AppConfig = {
     apiEndpoints: {
         // News processing endpoints
         processNews: '/api/v1/news/process',
+        processNewsStream: '/api/v1/news/process/stream',
         
         // History endpoints
         getHistory: '/api/v1/news/history',
+        searchHistory: '/api/v1/news/history/search',
         getStatistics: '/api/v1/news/statistics',
         markAsRead: '/api/v1/news/mark-as-read',
+        markAllAsRead: '/api/v1/news/mark-as-read/all',
+        events: '/api/v1/news/events',
         
         // Prompt endpoints
         getPromptConfig: '/api/v1/prompts/config',
@@ -246,6 +251,57 @@ const Utils = {
         }
     },
 
+    /**
+     * 2.9 streamRequest()
+     * POST isteği gönderir ve `text/event-stream` yanıtını okuyarak her olayı
+     * geldiği anda `onEvent(eventName, data)` ile bildirir. EventSource yalnızca
+     * GET desteklediği için akış fetch + ReadableStream ile okunur.
+     * @param {string} url - İstek yapılacak URL.
+     * @param {object} body - JSON olarak gönderilecek gövde.
+     * @param {Function} onEvent - Her olay için çağrılacak fonksiyon.
+     * @param {AbortSignal} signal - İsteği (ve sunucudaki üretimi) iptal etmek için sinyal.
+     * @returns {Promise<void>} - Akış bittiğinde çözülür.
+     */
+    streamRequest: async function(url, body, onEvent, signal = undefined) {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+            body: JSON.stringify(body),
+            signal: signal
+        });
+
+        if (!response.ok || !response.body) {
+            throw new Error(`HTTP Hatası! Durum: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder('utf-8');
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // Olaylar boş bir satırla ayrılır
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                const dataLines = [];
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+                });
+                if (dataLines.length > 0) {
+                    onEvent(eventName, JSON.parse(dataLines.join('\n')));
+                }
+            }
+        }
+    },
+
     /**
      * 2.8 storage
      * LocalStorage üzerinde veri okuma, yazma ve silme işlemleri için yardımcı fonksiyonlar.
@@ -281,6 +281,13 @@ const MainContentComponent = {
             };
 
             console.log('Haber işleme API isteği gönderiliyor:', requestData);
+
+            // Tarayıcı akış okumayı destekliyorsa çıktıyı üretildikçe göster
+            if (window.ReadableStream && window.TextDecoder) {
+                await this.processNewsStreaming(requestData);
+                return;
+            }
+
             const response = await Utils.apiRequest(AppConfig.apiEndpoints.processNews, {
                 method: 'POST',
                 body: JSON.stringify(requestData)
@@ -291,12 +298,88 @@ const MainContentComponent = {
             this.saveToHistory(requestData, response);
 
         } catch (error) {
+            // Yeni bir işlem başlatıldığı için iptal edilen akış hata sayılmaz
+            if (error.name === 'AbortError') return;
             console.error('Haber işleme sırasında bir hata oluştu:', error);
             this.hideLoading();
             Utils.showNotification('İşlem sırasında bir hata oluştu. Lütfen tekrar deneyin.', 'danger');
         }
     },
 
+    /**
+     * Haberi akış endpoint'i ile işler; gelen her parçayı sonuç alanına ekler.
+     * Akış tamamlandığında sonuç, normal işleme yanıtıyla aynı biçimde gösterilir.
+     * Devam eden bir akış varsa iptal edilir (sunucu tarafında üretim de durur).
+     * @param {Object} requestData - API'ye gönderilecek veri.
+     */
+    processNewsStreaming: async function(requestData) {
+        if (this.streamController) {
+            this.streamController.abort();
+        }
+        this.streamController = new AbortController();
+
+        let streamedText = '';
+        let finalResult = null;
+
+        await Utils.streamRequest(AppConfig.apiEndpoints.processNewsStream, requestData, (eventName, data) => {
+            if (eventName === 'chunk') {
+                if (!streamedText) {
+                    this.hideLoading();
+                    this.showStreamingResult();
+                }
+                streamedText += data.text;
+                const output = this.elements.processedContent?.querySelector('pre');
+                if (output) output.textContent = streamedText;
+            } else if (eventName === 'field') {
+                this.showStreamedField(data.name, data.value);
+            } else if (eventName === 'done') {
+                finalResult = { success: true, original_text: requestData.news_text, ...data };
+            } else if (eventName === 'error') {
+                finalResult = { success: false, ...data };
+            }
+        }, this.streamController.signal);
+
+        this.streamController = null;
+        this.hideLoading();
+
+        if (!finalResult || !finalResult.success) {
+            Utils.showNotification((finalResult && finalResult.error) || AppConfig.messages.tr.processingError, 'danger');
+            return;
+        }
+        this.showResults(finalResult);
+        this.saveToHistory(requestData, finalResult);
+    },
+
+    /**
+     * Akış sırasında parçaların yazılacağı boş sonuç alanını gösterir.
+     */
+    showStreamingResult: function() {
+        if (!this.elements.resultSection || !this.elements.processedContent) return;
+        this.elements.processedContent.innerHTML = '<div class="json-result streaming-fields"></div><pre class="streaming-output"></pre>';
+        this.elements.resultSection.style.display = 'block';
+    },
+
+    /**
+     * JSON çıktısında tamamlanan başlık ve özet alanlarını, haber metni
+     * üretilmeye devam ederken akış çıktısının üstünde gösterir.
+     * @param {string} name - Alan adı (örn. 'baslik').
+     * @param {*} value - Alanın değeri.
+     */
+    showStreamedField: function(name, value) {
+        const labels = { baslik: 'Başlık:', ozet: 'Özet:' };
+        const container = this.elements.processedContent?.querySelector('.streaming-fields');
+        if (!container || !labels[name] || typeof value !== 'string') return;
+
+        const item = document.createElement('div');
+        item.className = 'result-item';
+        const title = document.createElement('h6');
+        title.textContent = labels[name];
+        const text = document.createElement('p');
+        text.textContent = value;
+        item.append(title, text);
+        container.appendChild(item);
+    },
+
     // 5.0 - Sonuçların Gösterimi ve Yönetimi
 
     /**
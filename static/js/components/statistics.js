@@ -2,10 +2,12 @@
  * @file statistics.js
  * @description Bu dosya, uygulama genelindeki işlem istatistiklerini
  * (bekleyen, tamamlanan, hatalı) ve işlem geçmişini yöneten sınıfı içerir.
- * API'den periyodik olarak veri çeker ve arayüzü günceller.
+ * Değişiklikler sunucudan Server-Sent Events (/api/v1/news/events) ile
+ * anlık alınır; EventSource desteklenmiyorsa periyodik sorguya geri döner.
  *
  * İçindekiler:
  * 1.0 - Sınıf Başlatma ve Yapılandırma
+ * 1.1 - Anlık Olay Bağlantısı
  * 2.0 - İstatistik Yönetimi
  * 3.0 - Geçmiş Paneli Yönetimi
  * 4.0 - Geçmiş Öğesi Eylemleri ve Modal
@@ -21,17 +23,20 @@ class StatisticsManager {
     constructor() {
         this.isHistoryPanelOpen = false;
         this.statsUpdateInterval = null;
+        this.eventSource = null;
         this.init();
     }
 
     /**
-     * Sınıfı başlatır, ilk istatistikleri yükler ve periyodik güncellemeyi ayarlar.
+     * Sınıfı başlatır ve anlık olay bağlantısını açar. İlk istatistikler
+     * bağlantı açıldığında sunucudan 'stats' olayı olarak gelir.
      */
     init() {
-        this.loadStatistics();
-        
-        // İstatistikleri her 30 saniyede bir otomatik olarak güncelle
-        this.statsUpdateInterval = setInterval(() => this.loadStatistics(), 30000);
+        if (window.EventSource) {
+            this.connectEvents();
+        } else {
+            this.startPolling();
+        }
         
         this.initializeTooltips();
         console.log('İstatistik Yöneticisi (StatisticsManager) başlatıldı.');
@@ -41,12 +46,60 @@ class StatisticsManager {
      * Sınıf yok edildiğinde periyodik güncellemeyi temizler.
      */
     destroy() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
         if (this.statsUpdateInterval) {
             clearInterval(this.statsUpdateInterval);
             console.log('İstatistik Yöneticisi periyodik güncellemesi durduruldu.');
         }
     }
 
+    // 1.1 - Anlık Olay Bağlantısı
+
+    /**
+     * Sunucuya SSE bağlantısı açar. Tarayıcı kopan bağlantıyı kendisi yeniden
+     * kurar; bağlantı kalıcı olarak kapanırsa periyodik sorguya geçilir.
+     */
+    connectEvents() {
+        const source = new EventSource(AppConfig.apiEndpoints.events);
+        this.eventSource = source;
+
+        source.addEventListener('stats', (event) => {
+            this.updateStatisticsDisplay(JSON.parse(event.data));
+        });
+        ['status', 'read'].forEach(type => {
+            source.addEventListener(type, () => {
+                if (this.isHistoryPanelOpen) this.loadHistory();
+            });
+        });
+        source.addEventListener('resync', () => {
+            // Olay kaçırıldı; güncel durumu bir kez sorgula
+            this.loadStatistics();
+            if (this.isHistoryPanelOpen) this.loadHistory();
+        });
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                console.warn('Anlık olay bağlantısı kapandı, periyodik güncellemeye geçiliyor.');
+                this.eventSource = null;
+                this.startPolling();
+            }
+        };
+    }
+
+    /**
+     * İstatistikleri her 30 saniyede bir sorgular. Sekme arka plandayken
+     * istek gönderilmez.
+     */
+    startPolling() {
+        if (this.statsUpdateInterval) return;
+        this.loadStatistics();
+        this.statsUpdateInterval = setInterval(() => {
+            if (!document.hidden) this.loadStatistics();
+        }, 30000);
+    }
+
     // 2.0 - İstatistik Yönetimi
 
     /**
@@ -161,7 +214,7 @@ class StatisticsManager {
         return `
             <div class="history-item ${isUnread ? 'unread' : 'read'}" data-id="${item.id}">
                 <div class="history-content" onclick="statisticsManager.showMessageModal(${item.id})">
-                    <div class="history-text">${this.truncateText(item.original_text, 80)}</div>
+                    <div class="history-text">${this.truncateText(item.preview || '', 80)}</div>
                     <div class="history-meta">
                         <span class="history-status status-${item.status}">${this.getStatusText(item.status)}</span>
                         <span class="history-date">${this.formatDate(item.created_at)}</span>
@@ -170,7 +223,7 @@ class StatisticsManager {
                 </div>
                 <div class="history-actions">
                     <button class="btn-action" onclick="event.stopPropagation(); statisticsManager.refreshStatus(${item.id})" title="Yenile"><i class="fas fa-sync-alt"></i></button>
-                    ${item.processed_text ? `<button class="btn-action" onclick="event.stopPropagation(); statisticsManager.copyText('${this.escapeText(item.processed_text)}')" title="Kopyala"><i class="fas fa-copy"></i></button>` : ''}
+                    ${item.processed_size ? `<button class="btn-action" onclick="event.stopPropagation(); statisticsManager.copyItem(${item.id})" title="Kopyala"><i class="fas fa-copy"></i></button>` : ''}
                 </div>
             </div>
         `;
@@ -178,23 +231,29 @@ class StatisticsManager {
 
     // 4.0 - Geçmiş Öğesi Eylemleri ve Modal
 
+    /**
+     * Bir geçmiş öğesinin tam metinlerini detay endpoint'inden alır.
+     * Liste yalnızca önizleme içerdiği için metinler öğe açıldığında istenir.
+     * @param {number} messageId - Öğenin ID'si.
+     * @returns {Promise<Object|null>} - Öğe; bulunamazsa null.
+     */
+    async fetchHistoryItem(messageId) {
+        const response = await fetch(`${AppConfig.apiEndpoints.getHistory}/${messageId}`);
+        const data = await response.json();
+        return data.success ? data.item : null;
+    }
+
     /**
      * Belirli bir geçmiş öğesinin detaylarını gösteren bir modal açar.
      * @param {number} messageId - Gösterilecek mesajın ID'si.
      */
     async showMessageModal(messageId) {
         try {
-            // Not: Normalde tek bir öğe çekmek daha verimli olurdu. API varsayımı ile devam ediliyor.
-            const response = await fetch(`/api/history`);
-            const data = await response.json();
-            
-            if (data.success) {
-                const message = data.history.find(item => item.id === messageId);
-                if (message) {
-                    this.openMessageModal(message);
-                    if (message.read_status === 'unread') {
-                        await this.markAsRead(messageId);
-                    }
+            const message = await this.fetchHistoryItem(messageId);
+            if (message) {
+                this.openMessageModal(message);
+                if (message.read_status === 'unread') {
+                    await this.markAsRead(messageId);
                 }
             }
         } catch (error) {
@@ -234,9 +293,11 @@ class StatisticsManager {
         const modal = document.querySelector('.message-modal-overlay');
         if (modal) {
             modal.remove();
-            // Okundu durumunu yansıtmak için listeyi ve istatistikleri yenile
-            this.loadHistory();
-            this.loadStatistics();
+            // Anlık bağlantı yoksa okundu durumunu yansıtmak için listeyi ve istatistikleri yenile
+            if (!this.eventSource) {
+                this.loadHistory();
+                this.loadStatistics();
+            }
         }
     }
     
@@ -262,6 +323,22 @@ class StatisticsManager {
         await this.checkProcessingStatus(itemId);
     }
     
+    /**
+     * Bir geçmiş öğesinin AI cevabını sunucudan alıp panoya kopyalar.
+     * @param {number} itemId - Öğenin ID'si.
+     */
+    async copyItem(itemId) {
+        try {
+            const item = await this.fetchHistoryItem(itemId);
+            if (item?.processed_text) {
+                this.copyText(item.processed_text);
+            }
+        } catch (error) {
+            console.error('Kopyalanacak metin yüklenirken hata:', error);
+            this.showNotification('Kopyalama başarısız oldu.', 'error');
+        }
+    }
+    
     // 5.0 - Yardımcı Fonksiyonlar ve Bildirimler
 
     /**
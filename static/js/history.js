@@ -10,18 +10,23 @@
  * 1.1 constructor() - Sınıfın başlangıç durumu.
  * 1.2 init() - Olayları bağlar ve verileri yükler.
  * 1.3 bindEvents() - Arama, filtreleme ve modal olaylarını bağlar.
- * 1.4 loadHistory() - API'den tüm geçmiş verilerini yükler.
+ * 1.4 loadHistory() - API'den geçmişin ilk sayfasını yükler.
+ * 1.4.1 loadMoreHistory() - Sunucudan sonraki sayfayı (next_cursor) yükleyip listeye ekler.
+ * 1.4.2 renderLoadMore() - "Daha Fazla Yükle" butonunu gösterir/gizler.
  * 1.5 loadStatistics() - İstatistik verilerini yükler.
  * 1.6 updateStatistics() - İstatistik arayüzünü günceller.
- * 1.7 filterHistory() - Geçmiş listesini arama ve filtre kriterlerine göre süzer.
+ * 1.7 filterHistory() - Geçmiş listesini filtre kriterlerine göre süzer; arama varsa sunucuda arar.
+ * 1.7.1 searchHistory() - Sunucuda tam metin araması yapar (sonuçlar kesit olarak gelir).
+ * 1.7.2 highlightSnippet() - Arama kesitindeki eşleşmeleri vurgular.
  * 1.8 renderHistory() - Filtrelenmiş geçmiş verilerini ekrana çizer.
  * 1.9 createHistoryItemHTML() - Tek bir geçmiş öğesi için HTML oluşturur.
  * 1.10 renderPagination() - Sayfalama kontrollerini oluşturur.
  * 1.11 hidePagination() - Sayfalamayı gizler.
  * 1.12 goToPage() - Belirtilen sayfaya gider.
- * 1.13 showMessageModal() - Geçmiş öğesinin detaylarını modalda gösterir.
+ * 1.13 showMessageModal() - Geçmiş öğesinin tam metinlerini sunucudan alıp modalda gösterir.
  * 1.14 updateModalContent() - Modal içeriğini günceller.
  * 1.15 markAsRead() - Bir mesajı okundu olarak işaretler.
+ * 1.15.1 markAllAsRead() - Listedeki okunmamış mesajları tek istekte okundu olarak işaretler.
  * 1.16 Yardımcı Metotlar (getStatusIcon, getStatusText, formatDate vb.)
  * 2.0 Global Başlatma
  * 2.1 DOM yüklendiğinde HistoryManager'ın otomatik başlatılması.
@@ -44,11 +49,17 @@ class HistoryManager {
         this.allHistory = [];
         this.filteredHistory = [];
         this.currentModal = null;
+        this.serverPageSize = 100;   // Sunucudan tek seferde istenen kayıt sayısı
+        this.nextCursor = null;      // Sunucudaki sonraki sayfanın imleci (yoksa null)
+        this.isLoadingMore = false;
+        this.searchState = null;     // Sunucu araması: { term, nextOffset } (arama yoksa null)
+        this.searchRequestId = 0;    // Geç gelen eski arama yanıtlarını yok saymak için
+        this.detailCache = new Map(); // Açılan kayıtların tam metinleri (id -> kayıt)
         
         // Bind all methods to ensure 'this' context is maintained
         const methods = [
-            'init', 'bindEvents', 'loadHistory', 'loadStatistics', 'renderHistory',
-            'filterHistory', 'showMessageModal', 'markAsRead', 'renderPagination',
+            'init', 'bindEvents', 'loadHistory', 'loadMoreHistory', 'renderLoadMore', 'loadStatistics', 'renderHistory',
+            'filterHistory', 'searchHistory', 'highlightSnippet', 'showMessageModal', 'markAsRead', 'markAllAsRead', 'renderPagination',
             'goToPage', 'createHistoryItemHTML', 'updateModalContent', 'getStatusIcon',
             'getStatusText', 'getStatusColor', 'formatDate', 'truncateText', 'escapeText',
             'copyToClipboard', 'downloadText', 'showLoading', 'hideLoading', 'showError',
@@ -87,7 +98,9 @@ class HistoryManager {
         }
         
         document.getElementById('status-filter')?.addEventListener('change', () => this.filterHistory());
+        document.getElementById('load-more-btn')?.addEventListener('click', () => this.loadMoreHistory());
         document.getElementById('read-filter')?.addEventListener('change', () => this.filterHistory());
+        document.getElementById('mark-all-read-btn')?.addEventListener('click', () => this.markAllAsRead());
         
         const modal = document.getElementById('messageModal');
         if (modal) {
@@ -109,14 +122,15 @@ class HistoryManager {
     
     /**
      * 1.4 loadHistory()
-     * API üzerinden tüm geçmiş kayıtlarını asenkron olarak yükler.
+     * API üzerinden geçmişin ilk sayfasını asenkron olarak yükler. Daha eski
+     * kayıtlar `loadMoreHistory()` ile imleç kullanılarak istenir.
      */
     async loadHistory() {
         try {
             console.log('Bilgi: Geçmiş verileri API\'den yükleniyor...');
             this.showLoading();
             
-            const response = await fetch(`${AppConfig.apiEndpoints.getHistory}?limit=1000`);
+            const response = await fetch(`${AppConfig.apiEndpoints.getHistory}?limit=${this.serverPageSize}`);
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
@@ -126,6 +140,7 @@ class HistoryManager {
             
             if (data && data.success) {
                 this.allHistory = Array.isArray(data.history) ? data.history : [];
+                this.nextCursor = data.next_cursor || null;
                 this.filteredHistory = [...this.allHistory];
                 this.totalItems = this.allHistory.length;
                 console.log(`Bilgi: ${this.totalItems} adet geçmiş kaydı başarıyla yüklendi.`);
@@ -185,6 +200,63 @@ class HistoryManager {
         }
     }
     
+    /**
+     * 1.4.1 loadMoreHistory()
+     * Sunucudan `nextCursor` ile sonraki geçmiş sayfasını yükler, mevcut
+     * listeye ekler ve filtreleri yeniden uygular. Mevcut sayfa korunur.
+     */
+    async loadMoreHistory() {
+        if (this.searchState) {
+            if (this.searchState.nextOffset !== null && !this.isLoadingMore) {
+                await this.searchHistory(this.searchState.term, true);
+            }
+            return;
+        }
+        if (!this.nextCursor || this.isLoadingMore) return;
+        this.isLoadingMore = true;
+        const button = document.getElementById('load-more-btn');
+        if (button) button.disabled = true;
+        
+        try {
+            const url = `${AppConfig.apiEndpoints.getHistory}?limit=${this.serverPageSize}&cursor=${encodeURIComponent(this.nextCursor)}`;
+            const response = await fetch(url);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const data = await response.json();
+            if (!data || !data.success) {
+                throw new Error(data?.error || 'Bilinmeyen bir sunucu hatası oluştu.');
+            }
+            
+            const page = Array.isArray(data.history) ? data.history : [];
+            this.allHistory = this.allHistory.concat(page);
+            this.totalItems = this.allHistory.length;
+            this.nextCursor = data.next_cursor || null;
+            
+            const currentPage = this.currentPage;
+            this.filterHistory();
+            this.goToPage(currentPage);
+        } catch (error) {
+            console.error('Hata: Sonraki geçmiş sayfası yüklenemedi.', error);
+            this.showNotification('Daha fazla kayıt yüklenemedi.', 'error');
+        } finally {
+            this.isLoadingMore = false;
+            if (button) button.disabled = false;
+            this.renderLoadMore();
+        }
+    }
+    
+    /**
+     * 1.4.2 renderLoadMore()
+     * Sunucuda yüklenmemiş kayıt (veya arama sonucu) varsa "Daha Fazla Yükle" butonunu gösterir.
+     */
+    renderLoadMore() {
+        const container = document.getElementById('load-more-container');
+        const hasMore = this.searchState ? this.searchState.nextOffset !== null : Boolean(this.nextCursor);
+        if (container) container.style.display = hasMore ? 'block' : 'none';
+    }
+    
     /**
      * 1.5 loadStatistics()
      * API üzerinden istatistik verilerini (toplam, tamamlanan vb.) yükler.
@@ -213,33 +285,115 @@ class HistoryManager {
     
     /**
      * 1.7 filterHistory()
-     * Arama ve filtreleme kriterlerine göre `allHistory` dizisini filtreleyerek
-     * `filteredHistory` dizisini günceller ve arayüzü yeniden çizer.
+     * Arama kutusu boşsa yüklenmiş kayıtları durum ve okunma filtrelerine göre
+     * süzer. Arama metni varsa arama sunucuda (FULLTEXT) yapılır; tüm geçmişi
+     * indirmeye gerek kalmaz.
      */
     filterHistory() {
-        const searchTerm = document.getElementById('search-input')?.value.toLowerCase() || '';
+        const searchTerm = document.getElementById('search-input')?.value.trim() || '';
         const statusFilter = document.getElementById('status-filter')?.value || '';
         const readFilter = document.getElementById('read-filter')?.value || '';
         
+        if (searchTerm) {
+            this.searchHistory(searchTerm);
+            return;
+        }
+        
+        this.searchState = null;
+        this.searchRequestId++;
         this.filteredHistory = this.allHistory.filter(item => {
-            const matchesSearch = !searchTerm || 
-                item.original_text.toLowerCase().includes(searchTerm) ||
-                (item.processed_text && item.processed_text.toLowerCase().includes(searchTerm));
             const matchesStatus = !statusFilter || item.status === statusFilter;
             const matchesRead = !readFilter || item.read_status === readFilter;
-            return matchesSearch && matchesStatus && matchesRead;
+            return matchesStatus && matchesRead;
         });
         
         this.currentPage = 1;
         this.renderHistory();
     }
     
+    /**
+     * 1.7.1 searchHistory()
+     * Sunucuda tam metin araması yapar. Durum ve okunma filtreleri sunucuya
+     * gönderilir; sonuçlar ilgiye göre sıralı ve kesit olarak gelir.
+     * @param {string} term - Arama metni.
+     * @param {boolean} append - true ise sonraki sonuç sayfası listeye eklenir.
+     */
+    async searchHistory(term, append = false) {
+        const params = new URLSearchParams({ q: term, limit: 50 });
+        const statusFilter = document.getElementById('status-filter')?.value || '';
+        const readFilter = document.getElementById('read-filter')?.value || '';
+        if (statusFilter) params.set('status', statusFilter);
+        if (readFilter) params.set('read_status', readFilter);
+        if (append) params.set('offset', this.searchState.nextOffset);
+        
+        const requestId = ++this.searchRequestId;
+        this.isLoadingMore = true;
+        try {
+            const response = await fetch(`${AppConfig.apiEndpoints.searchHistory}?${params}`);
+            const data = await response.json();
+            if (requestId !== this.searchRequestId) return;
+            if (!data || !data.success) {
+                // Kısa kelimeler gibi geçersiz aramalar sonuçsuz gösterilir
+                this.searchState = { term, nextOffset: null };
+                this.filteredHistory = [];
+                if (response.status !== 400) this.showNotification(data?.error || 'Arama yapılamadı.', 'error');
+                this.renderHistory();
+                return;
+            }
+            
+            const items = (Array.isArray(data.results) ? data.results : []).map(result => ({
+                ...result,
+                preview: result.snippet,
+                isSearchResult: true
+            }));
+            this.searchState = { term, nextOffset: data.next_offset ?? null };
+            if (append) {
+                const currentPage = this.currentPage;
+                this.filteredHistory = this.filteredHistory.concat(items);
+                this.goToPage(currentPage);
+            } else {
+                this.filteredHistory = items;
+                this.currentPage = 1;
+                this.renderHistory();
+            }
+        } catch (error) {
+            console.error('Hata: Geçmişte arama yapılamadı.', error);
+            this.showNotification('Arama yapılamadı.', 'error');
+        } finally {
+            if (requestId === this.searchRequestId) {
+                this.isLoadingMore = false;
+                this.renderLoadMore();
+            }
+        }
+    }
+    
+    /**
+     * 1.7.2 highlightSnippet()
+     * Sunucunun döndürdüğü kesitte vurgu aralıklarını <mark> ile işaretler.
+     * Metin parçaları HTML'e kaçışlanarak eklenir.
+     * @param {string} snippet - Arama kesiti.
+     * @param {Array} highlights - [başlangıç, bitiş] aralıkları.
+     * @param {Function} escapeHtml - Kaçışlama fonksiyonu.
+     * @returns {string} - Vurgulu HTML.
+     */
+    highlightSnippet(snippet, highlights, escapeHtml) {
+        let html = '';
+        let position = 0;
+        (highlights || []).forEach(([start, end]) => {
+            if (start < position) return;
+            html += escapeHtml(snippet.slice(position, start)) + `<mark>${escapeHtml(snippet.slice(start, end))}</mark>`;
+            position = end;
+        });
+        return html + escapeHtml(snippet.slice(position));
+    }
+    
     /**
      * 1.8 renderHistory()
      * `filteredHistory` dizisindeki mevcut sayfa verilerini ekrana yazar.
      * Eğer hiç sonuç yoksa "Sonuç bulunamadı" mesajını gösterir.
      */
     renderHistory() {
+        this.renderLoadMore();
         try {
             const historyList = document.getElementById('history-list');
             const noResults = document.getElementById('no-results');
@@ -349,7 +503,7 @@ class HistoryManager {
             const statusIcon = this.getStatusIcon(item.status || 'pending');
             const statusText = this.getStatusText(item.status || 'pending');
             const formattedDate = this.formatDate(item.created_at || new Date().toISOString());
-            const truncatedText = this.truncateText(item.original_text || 'İçerik yok', 150);
+            const truncatedText = item.preview || 'İçerik yok';
             const isUnread = item.read_status === 'unread';
             const itemId = item.id || Date.now();
             
@@ -366,6 +520,9 @@ class HistoryManager {
             };
             
             const safeTruncatedText = escapeHtml(truncatedText);
+            const bodyHTML = item.isSearchResult
+                ? this.highlightSnippet(item.snippet || '', item.highlights, escapeHtml)
+                : safeTruncatedText;
             
             return `
                 <div class="history-item ${isUnread ? 'unread' : ''}" 
@@ -387,7 +544,7 @@ class HistoryManager {
                                     ${isUnread ? '<div class="unread-indicator"></div>' : ''}
                                 </div>
                             </div>
-                            <div class="history-item-text">${safeTruncatedText}</div>
+                            <div class="history-item-text">${bodyHTML}</div>
                         </div>
                     </div>
                 </div>
@@ -459,14 +616,34 @@ class HistoryManager {
     
     /**
      * 1.13 showMessageModal()
-     * Tıklanan geçmiş öğesinin detaylarını bir modal pencerede gösterir.
-     * Mesaj okunmamışsa okundu olarak işaretler.
+     * Tıklanan geçmiş öğesinin tam metinlerini detay endpoint'inden alır ve
+     * bir modal pencerede gösterir. Sonuçlanmış kayıtların detayı yeniden
+     * istenmemek üzere saklanır. Mesaj okunmamışsa okundu olarak işaretler.
      * @param {number} messageId - Gösterilecek mesajın ID'si.
      */
     async showMessageModal(messageId) {
         try {
-            // Find the message in the history
-            const message = this.allHistory.find(item => item.id === messageId);
+            // Liste ve arama sonuçları yalnızca önizleme içerir; tam metinler
+            // kayıt ilk açıldığında sunucudan alınır ve saklanır
+            const listItem = this.allHistory.find(item => item.id === messageId)
+                || this.filteredHistory.find(item => item.id === messageId);
+            let message = null;
+            if (listItem) {
+                let detail = this.detailCache.get(messageId);
+                if (!detail) {
+                    const response = await fetch(`${AppConfig.apiEndpoints.getHistory}/${messageId}`);
+                    const data = await response.json();
+                    if (data && data.success) {
+                        detail = data.item;
+                        if (detail.status === 'completed' || detail.status === 'error') {
+                            this.detailCache.set(messageId, detail);
+                        }
+                    }
+                }
+                if (detail) {
+                    message = { ...detail, read_status: listItem.read_status };
+                }
+            }
             if (!message) {
                 console.error(`Hata: ${messageId} ID'li mesaj bulunamadı.`);
                 this.showNotification('Mesaj bulunamadı', 'error');
@@ -502,6 +679,7 @@ class HistoryManager {
                 try {
                     await this.markAsRead(messageId);
                     message.read_status = 'read';
+                    listItem.read_status = 'read';
                     
                     // Update the UI to reflect the read status
                     const historyItems = document.querySelectorAll('.history-item');
@@ -586,6 +764,65 @@ class HistoryManager {
         }
     }
     
+    /**
+     * 1.15.1 markAllAsRead()
+     * Arama veya filtre varsa listelenen okunmamış mesajları kimlikleriyle,
+     * yoksa yüklenen en yeni kayda kadar tüm okunmamış mesajları tek istekte
+     * okundu olarak işaretler. Sayfa açıldıktan sonra gelen sonuçlar
+     * okunmamış kalır.
+     */
+    async markAllAsRead() {
+        const filtered = this.searchState
+            || document.getElementById('status-filter')?.value
+            || document.getElementById('read-filter')?.value;
+        const unread = (filtered ? this.filteredHistory : this.allHistory).filter(item => item.read_status === 'unread');
+        if (unread.length === 0) {
+            this.showNotification('Okunmamış mesaj yok.', 'info');
+            return;
+        }
+        
+        const button = document.getElementById('mark-all-read-btn');
+        if (button) button.disabled = true;
+        try {
+            const requests = [];
+            if (filtered) {
+                // Sunucu tek istekte en fazla 500 kimlik kabul eder
+                for (let index = 0; index < unread.length; index += 500) {
+                    requests.push({ url: AppConfig.apiEndpoints.markAsRead, body: { ids: unread.slice(index, index + 500).map(item => item.id) } });
+                }
+            } else {
+                requests.push({ url: AppConfig.apiEndpoints.markAllAsRead, body: { before: this.allHistory[0].created_at } });
+            }
+            
+            let updated = 0;
+            for (const { url, body } of requests) {
+                const response = await fetch(url, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(body)
+                });
+                const data = await response.json();
+                if (!response.ok || !data.success) {
+                    throw new Error(data?.error || `HTTP error! status: ${response.status}`);
+                }
+                updated += data.updated;
+            }
+            
+            const marked = new Set(unread.map(item => item.id));
+            this.allHistory.concat(this.filteredHistory).forEach(item => {
+                if (filtered ? marked.has(item.id) : item.read_status === 'unread') item.read_status = 'read';
+            });
+            this.renderHistory();
+            this.loadStatistics();
+            this.showNotification(`${updated} mesaj okundu olarak işaretlendi.`, 'success');
+        } catch (error) {
+            console.error('Hata: Mesajlar okundu olarak işaretlenemedi.', error);
+            this.showNotification('Mesajlar okundu olarak işaretlenemedi.', 'error');
+        } finally {
+            if (button) button.disabled = false;
+        }
+    }
+    
     getStatusIcon(status) {
         const icons = {
             'processing': 'fas fa-spinner fa-spin',
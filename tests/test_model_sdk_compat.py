@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+#Bu dosya, AIService'in model çağrılarının requirements.txt'de sürümü
+#sabitlenmiş Gemini istemcisiyle (google-generativeai) uyumlu olduğunu
+#doğrular. Çağrılar ağa çıkmadan, istemcinin kendi imzası ve istek
+#oluşturucusuyla denetlenir; istemci kurulu değilse bu testler atlanır.
+#
+#İçindekiler:
+#1.0 Yardımcılar
+#    - RecordingClient: GAPIC istemcisine giden istekleri kaydeden istemci.
+#2.0 Testler
+#    - PromptTokensTest: Prompt token sayımının yolunu sınar.
+#    - FakeModelCompatTest: Taklit modelin imza ve yanıt yapısını istemciyle karşılaştırır.
+#    - SendRequestTest: İsteklerin süre sınırıyla gönderildiğini sınar.
+
+import inspect
+import time
+import unittest
+from types import SimpleNamespace
+
+from services.ai_service import AIService
+from services.model_backend import DeadlineExceeded, FakeModel, parse_latency, send_request
+
+try:
+    import google.ai.generativelanguage as glm
+    from google.generativeai import GenerativeModel
+except ImportError:
+    GenerativeModel = None
+
+
+# --- 1.0 Yardımcılar ---
+
+class RecordingClient:
+    """İstekleri ve süre sınırlarını kaydedip sabit bir yanıt döndürür."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _response(self):
+        part = glm.Part(text='yanıt')
+        return glm.GenerateContentResponse(candidates=[glm.Candidate(content=glm.Content(parts=[part]))])
+
+    def generate_content(self, request, timeout=None):
+        self.calls.append(('generate_content', request, timeout))
+        return self._response()
+
+    def stream_generate_content(self, request, timeout=None):
+        self.calls.append(('stream_generate_content', request, timeout))
+        return iter([self._response()])
+
+    def count_tokens(self, request, timeout=None):
+        self.calls.append(('count_tokens', request, timeout))
+        return glm.CountTokensResponse(total_tokens=42)
+
+
+# --- 2.0 Testler ---
+
+@unittest.skipIf(GenerativeModel is None, 'google-generativeai kurulu değil')
+class PromptTokensTest(unittest.TestCase):
+
+    def test_response_without_usage_needs_a_count(self):
+        # 0.3.2 yanıtlarında usage_metadata yoktur; sayım sonradan yapılır
+        self.assertIsNone(AIService._prompt_tokens(SimpleNamespace(text='yanıt')))
+
+    def test_uses_usage_metadata_when_present(self):
+        response = SimpleNamespace(text='yanıt', usage_metadata=SimpleNamespace(prompt_token_count=17))
+        self.assertEqual(AIService._prompt_tokens(response), 17)
+
+    def test_count_goes_to_gapic_client_with_timeout(self):
+        model = GenerativeModel('gemini-pro')
+        model._client = RecordingClient()
+        service = SimpleNamespace(model=model, _measure_model=AIService._measure_model)
+
+        tokens = AIService._count_tokens(service, 'prompt metni', time.monotonic() + 5)
+
+        self.assertEqual(tokens, 42)
+        method, request, timeout = model._client.calls[0]
+        self.assertEqual(method, 'count_tokens')
+        self.assertIsInstance(request, glm.CountTokensRequest)
+        self.assertTrue(0 < timeout <= 5)
+
+
+@unittest.skipIf(GenerativeModel is None, 'google-generativeai kurulu değil')
+class FakeModelCompatTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = FakeModel(latency=parse_latency('fixed:0'), stream_chunks=2, seed=1)
+
+    def assertSameSignature(self, name):
+        expected = inspect.signature(getattr(GenerativeModel, name)).parameters
+        actual = inspect.signature(getattr(FakeModel, name)).parameters
+        self.assertEqual(
+            [(p.name, p.kind, p.default) for p in actual.values()],
+            [(p.name, p.kind, p.default) for p in expected.values()],
+        )
+
+    def test_generate_content_signature_matches_sdk(self):
+        self.assertSameSignature('generate_content')
+
+    def test_count_tokens_signature_matches_sdk(self):
+        self.assertSameSignature('count_tokens')
+
+    def test_rejects_fields_the_sdk_rejects(self):
+        # Gerçek istemci bilinmeyen alanları isteğe eklerken ValueError verir
+        with self.assertRaises(ValueError):
+            GenerativeModel('gemini-pro')._prepare_request(
+                contents='prompt', request_options={'timeout': 5})
+        with self.assertRaises(ValueError):
+            self.model.generate_content('prompt', request_options={'timeout': 5})
+        with self.assertRaises(TypeError):
+            self.model.count_tokens('prompt', request_options={'timeout': 5})
+
+    def test_response_has_no_usage_metadata(self):
+        response = self.model.generate_content('prompt')
+        self.assertTrue(response.text)
+        self.assertFalse(hasattr(response, 'usage_metadata'))
+
+        chunks = list(self.model.generate_content('prompt', stream=True))
+        self.assertEqual(''.join(chunk.text for chunk in chunks), response.text)
+
+
+@unittest.skipIf(GenerativeModel is None, 'google-generativeai kurulu değil')
+class SendRequestTest(unittest.TestCase):
+
+    def test_passes_timeout_to_gapic_client(self):
+        model = GenerativeModel('gemini-pro')
+        model._client = RecordingClient()
+
+        response = send_request(model, 'prompt', timeout=7.5)
+
+        self.assertEqual(response.text, 'yanıt')
+        method, request, timeout = model._client.calls[0]
+        self.assertEqual((method, timeout), ('generate_content', 7.5))
+        self.assertIsInstance(request, glm.GenerateContentRequest)
+
+    def test_passes_timeout_to_stream(self):
+        model = GenerativeModel('gemini-pro')
+        model._client = RecordingClient()
+
+        response = send_request(model, 'prompt', stream=True, timeout=3)
+
+        self.assertEqual(''.join(chunk.text for chunk in response), 'yanıt')
+        self.assertEqual(model._client.calls[0][0::2], ('stream_generate_content', 3))
+
+    def test_timed_out_attempt_returns_at_deadline(self):
+        model = FakeModel(latency=parse_latency('fixed:5'), seed=1)
+        service = SimpleNamespace(model=model, _measure_model=AIService._measure_model)
+
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            AIService._generate(service, 'prompt', time.monotonic() + 0.2)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+    def test_stalled_stream_ends_at_deadline(self):
+        # İlk parça 1,5 sn sonra gelir; akış 0,2 sn'lik sınırda kesilmelidir
+        model = FakeModel(latency=parse_latency('fixed:5'), stream_chunks=4, seed=1)
+
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            list(send_request(model, 'prompt', stream=True, timeout=0.2))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,12 +11,19 @@ Metin temizleme, formatlama, doğrulama ve oturum yönetimi gibi işlemler burad
 3.0 format_date: Tarih nesnesini standart bir metin formatına çevirir.
 4.0 truncate_text: Metni belirtilen uzunlukta kısaltır.
 5.0 get_user_id: Kullanıcı için eşsiz bir oturum kimliği oluşturur veya mevcut olanı döndürür.
+6.0 wants_async_processing: İsteğin arka planda (202 + sorgulama) işlenip işlenmeyeceğini belirler.
+7.0 format_sse: Bir olayı Server-Sent Events formatına çevirir.
+8.0 encode_cursor, decode_cursor: Anahtar tabanlı (keyset) sayfalama imlecini oluşturur ve çözer.
+9.0 get_page_size: İstekteki sayfa boyutunu izin verilen aralığa sınırlar.
 """
 
+import base64
+import json
+import os
 import re
 import uuid
 from datetime import datetime
-from flask import session
+from flask import session, request
 
 # 1.0 Metin Temizleme
 # ---
@@ -100,3 +107,91 @@ def truncate_text(text, max_length=100):
     if len(text) <= max_length:
         return text
     return text[:max_length-3] + "..."
+
+# 6.0 İşleme Modu Seçimi
+# ---
+def wants_async_processing(data=None):
+    """
+    İsteğin arka plan kuyruğunda işlenip işlenmeyeceğini belirler.
+    Öncelik sırası: JSON gövdesindeki 'async' alanı, '?mode=' sorgu parametresi,
+    NEWS_PROCESSING_MODE ortam değişkeni ('sync' veya 'async').
+    
+    Args:
+        data (dict, optional): İsteğin JSON gövdesi.
+        
+    Returns:
+        bool: Arka planda işlenecekse True.
+    """
+    if data and 'async' in data:
+        return str(data.get('async')).lower() in ('1', 'true', 'yes')
+    mode = request.args.get('mode') or os.getenv('NEWS_PROCESSING_MODE', 'sync')
+    return mode.lower() == 'async'
+
+# 7.0 Server-Sent Events Formatlama
+# ---
+def format_sse(event, data):
+    """
+    Bir olayı Server-Sent Events (text/event-stream) formatında metne çevirir.
+    
+    Args:
+        event (str): Olay adı (istemcide dinlenecek tür).
+        data (dict): JSON olarak gönderilecek veri.
+        
+    Returns:
+        str: 'event: ...\ndata: ...\n\n' biçiminde SSE mesajı.
+    """
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+# 8.0 Sayfalama İmleci
+# ---
+def encode_cursor(created_at, record_id):
+    """
+    Bir sayfanın son kaydından, sonraki sayfayı başlatacak opak bir imleç üretir.
+    İstemci imlecin içeriğine bağlı kalmamalıdır; yalnızca geri göndermelidir.
+    
+    Args:
+        created_at (datetime): Son kaydın oluşturulma zamanı.
+        record_id (int): Son kaydın ID'si.
+        
+    Returns:
+        str: URL güvenli base64 imleç.
+    """
+    raw = json.dumps([created_at.isoformat(), int(record_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    encode_cursor ile üretilmiş imleci çözer.
+    
+    Args:
+        cursor (str): İstemciden gelen imleç.
+        
+    Returns:
+        tuple: (created_at, record_id)
+        
+    Raises:
+        ValueError: İmleç bozuk veya geçersizse.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(record_id)
+    except Exception:
+        raise ValueError('Geçersiz sayfa imleci')
+
+# 9.0 Sayfa Boyutu
+# ---
+def get_page_size(default=50, maximum=None):
+    """
+    '?limit=' sorgu parametresini okur ve 1 ile izin verilen en büyük değer
+    arasına sınırlar. En büyük değer verilmezse HISTORY_MAX_PAGE_SIZE kullanılır.
+    
+    Returns:
+        int: Kullanılacak sayfa boyutu.
+    """
+    if maximum is None:
+        maximum = int(os.getenv('HISTORY_MAX_PAGE_SIZE', '100'))
+    limit = request.args.get('limit', default, type=int) or default
+    return max(1, min(limit, maximum))
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Artımlı JSON Alan Ayrıştırıcısı
+
+Bu modül, modelin akış halinde ürettiği JSON nesnesini parça parça okur ve
+üst düzeydeki her alanı (baslik, ozet, haber_metni, ...) tamamlandığı anda
+döndürür. Böylece başlık ve özet, haber metni hâlâ üretilirken gösterilebilir.
+
+Modellerin alışılmış sapmalarına toleranslıdır:
+  - İlk '{' karakterinden önceki her şey (```json kod bloğu açılışı,
+    açıklama cümleleri) atlanır.
+  - Kapanış '}' karakterinden sonraki her şey (kod bloğu kapanışı, ek metin)
+    yok sayılır.
+  - Fazladan virgüller atlanır; JSON olarak çözülemeyen değerler ham metin
+    olarak döndürülür.
+
+İçindekiler:
+1.0 JsonFieldStream Sınıfı
+    - feed: Yeni bir parçayı işler ve tamamlanan alanları döndürür.
+    - finish: Akış bittiğinde yarım kalan son değeri tamamlar.
+"""
+
+import json
+
+_WHITESPACE = ' \t\r\n'
+
+
+# 1.0 JsonFieldStream Sınıfı
+# ---
+class JsonFieldStream:
+    """Akıştaki JSON nesnesinin üst düzey alanlarını tamamlandıkça çıkaran ayrıştırıcı."""
+
+    def __init__(self):
+        self.fields = {}
+        self.done = False
+        self._state = 'seek'
+        self._key = None
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """
+        Bir metin parçasını işler.
+
+        Returns:
+            list: Bu parçayla tamamlanan (alan adı, değer) çiftleri.
+        """
+        completed = []
+        if self.done or not chunk:
+            return completed
+
+        for char in chunk:
+            state = self._state
+            if state == 'seek':
+                if char == '{':
+                    self._state = 'key_or_end'
+
+            elif state == 'key_or_end':
+                if char == '"':
+                    self._start('key')
+                elif char == '}':
+                    self.done = True
+                    break
+
+            elif state == 'key':
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._key = self._decode('"' + ''.join(self._buffer) + '"')
+                    self._state = 'colon'
+                    continue
+                self._buffer.append(char)
+
+            elif state == 'colon':
+                if char == ':':
+                    self._state = 'value_start'
+
+            elif state == 'value_start':
+                if char in _WHITESPACE:
+                    continue
+                self._start('value')
+                self._buffer.append(char)
+                if char == '"':
+                    self._in_string = True
+                elif char in '{[':
+                    self._depth = 1
+                elif char in ',}':
+                    # Değeri boş bırakılmış alan
+                    self._buffer.pop()
+                    completed.append(self._emit(''))
+                    if char == '}':
+                        self.done = True
+                        break
+                    self._state = 'key_or_end'
+
+            elif state == 'value':
+                if self._in_string:
+                    self._buffer.append(char)
+                    if self._escape:
+                        self._escape = False
+                    elif char == '\\':
+                        self._escape = True
+                    elif char == '"':
+                        self._in_string = False
+                        if self._depth == 0:
+                            completed.append(self._emit_buffer())
+                elif self._depth:
+                    self._buffer.append(char)
+                    if char == '"':
+                        self._in_string = True
+                    elif char in '{[':
+                        self._depth += 1
+                    elif char in '}]':
+                        self._depth -= 1
+                        if self._depth == 0:
+                            completed.append(self._emit_buffer())
+                elif char in ',}':
+                    # Sayı, true/false/null gibi düz değerler ayraçla biter
+                    completed.append(self._emit_buffer())
+                    if char == '}':
+                        self.done = True
+                        break
+                    self._state = 'key_or_end'
+                else:
+                    self._buffer.append(char)
+
+            elif state == 'after_value':
+                if char == ',':
+                    self._state = 'key_or_end'
+                elif char == '}':
+                    self.done = True
+                    break
+
+        return completed
+
+    def finish(self):
+        """
+        Akış kapanış '}' gelmeden bittiyse, ayraç beklenen son düz değeri
+        tamamlar. Yarım kalmış metin, dizi veya nesne değerleri döndürülmez.
+
+        Returns:
+            list: Tamamlanan (alan adı, değer) çiftleri.
+        """
+        completed = []
+        if not self.done and self._state == 'value' and not self._in_string and not self._depth:
+            if ''.join(self._buffer).strip():
+                completed.append(self._emit_buffer())
+        self.done = True
+        return completed
+
+    def _start(self, state):
+        self._state = state
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _emit_buffer(self):
+        return self._emit(self._decode(''.join(self._buffer).strip()))
+
+    def _emit(self, value):
+        key = self._key
+        self.fields[key] = value
+        self._key = None
+        self._buffer = []
+        self._state = 'after_value'
+        return key, value
+
+    @staticmethod
+    def _decode(raw):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Metrik Modülü
+
+Bu modül, uygulamanın sayaç (counter) ve gecikme histogramı (histogram)
+metriklerini toplar ve Prometheus metin formatında sunar. Üretimde açık
+bırakılabilecek kadar ucuz olması için:
+  - Her thread kendi parçasına (shard) yazar; yazma yolunda kilit yoktur.
+    Kilit yalnızca bir thread'in ilk yazmasında ve yeni bir seri ilk kez
+    görüldüğünde alınır.
+  - Biten thread'lerin değerleri tek bir "emekli" parçada birleştirilir,
+    böylece istek başına thread açan sunucularda parça sayısı büyümez.
+  - Etiket değerleri sınırlıdır; bir metrik için MAX_SERIES aşılırsa yeni
+    seriler 'other' etiketine yazılır.
+Anlık değerler (havuz, kuyruk, önbellek durumu) kayıtlı toplayıcılardan
+(collector) yalnızca /metrics okunurken alınır.
+
+İçindekiler:
+1.0 Tanımlar: Metrik tanımları ve varsayılan histogram aralıkları.
+2.0 MetricsRegistry Sınıfı
+    - inc: Sayaç artırır.
+    - observe: Histograma bir ölçüm ekler.
+    - timer: Bir bloğun süresini histograma yazan context manager.
+    - register_collector: /metrics okunurken çağrılacak anlık değer kaynağı ekler.
+    - render: Tüm metrikleri Prometheus metin formatında döndürür.
+3.0 SQL Normalleştirme
+    - normalize_statement: Sorguyu etiket olarak kullanılabilecek kalıba indirger.
+4.0 Süreç Geneli Kayıt
+    - get_metrics: Tekil metrik kaydını döndürür.
+"""
+
+import bisect
+import itertools
+import os
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+
+# 1.0 Tanımlar
+# ---
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+MODEL_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+MAX_SERIES = 500
+OVERFLOW_LABEL = 'other'
+
+# ad -> (tür, açıklama, etiket adları, histogram aralıkları)
+DEFINITIONS = {
+    'http_request_duration_seconds': ('histogram', 'HTTP istek süresi (endpoint, metot, durum kodu)', ('endpoint', 'method', 'status'), LATENCY_BUCKETS),
+    'db_query_duration_seconds': ('histogram', 'Veritabanı sorgu süresi (normalleştirilmiş sorgu)', ('statement',), LATENCY_BUCKETS),
+    'db_query_errors_total': ('counter', 'Hata ile biten veritabanı sorguları', ('statement',), None),
+    'model_request_duration_seconds': ('histogram', 'Model çağrısı süresi', ('kind', 'outcome'), MODEL_LATENCY_BUCKETS),
+    'model_errors_total': ('counter', 'Hata ile biten model çağrıları (hata türü)', ('kind', 'error'), None),
+    'model_prompt_tokens': ('histogram', 'Modele gönderilen prompt büyüklüğü (tahmini token)', ('kind',), SIZE_BUCKETS),
+    'history_text_bytes_total': ('counter', 'Geçmiş kayıtlarına yazılan metin boyutu (alan, ham/saklanan)', ('field', 'form'), None),
+}
+
+
+class _ShardOwner:
+    """Thread'e ait parçanın ömrünü izler; thread bittiğinde parça emekli edilir."""
+    __slots__ = ('__weakref__',)
+
+
+# 2.0 MetricsRegistry Sınıfı
+# ---
+class MetricsRegistry:
+    """Thread başına parçalanmış sayaç ve histogram kaydı."""
+
+    def __init__(self, definitions=None, enabled=True):
+        self.definitions = dict(definitions or DEFINITIONS)
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._live = {}       # parça kimliği -> {(ad, etiketler): değer}
+        self._retired = {}    # biten thread'lerden birleştirilmiş değerler
+        self._series = {}     # ad -> bilinen etiket kümeleri
+        self._collectors = []
+
+    def inc(self, name, labels=(), value=1):
+        """Sayacı artırır. `labels`, tanımdaki etiket adlarıyla aynı sırada değerlerdir."""
+        if not self.enabled:
+            return
+        shard = self._shard()
+        key = (name, labels)
+        if key not in shard:
+            key = self._admit(shard, name, labels, int)
+        shard[key] += value
+
+    def observe(self, name, labels, value):
+        """Histograma bir ölçüm ekler."""
+        if not self.enabled:
+            return
+        shard = self._shard()
+        buckets = self.definitions[name][3]
+        cells = shard.get((name, labels))
+        if cells is None:
+            # [aralık sayıları..., +Inf, toplam, adet]
+            cells = shard[self._admit(shard, name, labels, lambda: [0] * (len(buckets) + 3))]
+        cells[bisect.bisect_left(buckets, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    @contextmanager
+    def timer(self, name, labels):
+        """Bloğun süresini (saniye) histograma yazar."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, labels, time.perf_counter() - started)
+
+    def register_collector(self, collector):
+        """
+        /metrics okunurken çağrılacak bir fonksiyon ekler. Fonksiyon
+        (ad, açıklama, {etiket: değer}, sayı) dörtlülerinden oluşan bir liste
+        döndürmelidir; değerler gauge olarak yazılır.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            pass
+        shard, owner, shard_id = {}, _ShardOwner(), next(self._ids)
+        with self._lock:
+            self._live[shard_id] = shard
+        weakref.finalize(owner, self._retire, shard_id)
+        self._local.owner = owner
+        self._local.shard = shard
+        return shard
+
+    def _admit(self, shard, name, labels, factory):
+        """
+        Bu parçada ilk kez görülen seriyi `factory()` ile oluşturur. Metriğin
+        seri sayısı MAX_SERIES'a ulaştıysa etiketler 'other' ile değiştirilir.
+        """
+        with self._lock:
+            known = self._series.setdefault(name, set())
+            if labels not in known:
+                if len(known) >= MAX_SERIES:
+                    labels = tuple(OVERFLOW_LABEL for _ in labels)
+                known.add(labels)
+        key = (name, labels)
+        if key not in shard:
+            shard[key] = factory()
+        return key
+
+    def _retire(self, shard_id):
+        with self._lock:
+            shard = self._live.pop(shard_id, None)
+            if shard:
+                self._merge(self._retired, shard)
+
+    @staticmethod
+    def _merge(target, shard):
+        # list(dict.items()) GIL altında tek adımda kopyalanır; yazan thread'ler beklemez
+        for key, value in list(shard.items()):
+            if isinstance(value, list):
+                cells = target.get(key)
+                if cells is None:
+                    target[key] = list(value)
+                else:
+                    for index, count in enumerate(value):
+                        cells[index] += count
+            else:
+                target[key] = target.get(key, 0) + value
+
+    def snapshot(self):
+        """Tüm parçaların birleştirilmiş değerlerini döndürür."""
+        with self._lock:
+            totals = {}
+            self._merge(totals, self._retired)
+            for shard in self._live.values():
+                self._merge(totals, shard)
+            collectors = list(self._collectors)
+        return totals, collectors
+
+    def render(self):
+        """Tüm metrikleri Prometheus metin formatında (0.0.4) döndürür."""
+        totals, collectors = self.snapshot()
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in self.definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, labels), value in sorted(totals.items(), key=lambda item: item[0]):
+                if metric != name:
+                    continue
+                base = dict(zip(label_names, labels))
+                if kind == 'counter':
+                    lines.append(f"{name}{_format_labels(base)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), value):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(dict(base, le=le))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(base)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(base)} {value[-1]}")
+
+        declared = set()
+        for collector in collectors:
+            try:
+                samples = collector()
+            except Exception as e:
+                print(f"Uyarı: Metrik toplayıcısı çalıştırılamadı ({getattr(collector, '__name__', collector)}): {e}")
+                continue
+            for name, help_text, labels, value in samples:
+                if value is None:
+                    continue
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+# 3.0 SQL Normalleştirme
+# ---
+_WHITESPACE = re.compile(r'\s+')
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)+\s*\)')
+_ROW_LIST = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(query):
+    """
+    Sorguyu etiket olarak kullanılabilecek kalıba indirger: boşluklar
+    sadeleştirilir, sabit değerler '?' olur, uzunluğu değişen IN (...) ve
+    çok satırlı VALUES listeleri tek bir '(...)' ile gösterilir.
+    """
+    statement = _WHITESPACE.sub(' ', query).strip()
+    statement = _STRING_LITERAL.sub('?', statement)
+    statement = _NUMBER_LITERAL.sub('?', statement)
+    statement = _PLACEHOLDER_LIST.sub('(...)', statement)
+    statement = _ROW_LIST.sub(r'\1', statement)
+    return statement[:200]
+
+
+# 4.0 Süreç Geneli Kayıt
+# ---
+_metrics = MetricsRegistry(enabled=os.getenv('METRICS_ENABLED', 'true').lower() == 'true')
+
+
+def get_metrics():
+    """Süreç genelinde paylaşılan metrik kaydını döndürür. METRICS_ENABLED=false ise kayıt yazmaz."""
+    return _metrics